@@ -1,32 +1,258 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Afif Al Mamun
 
-from typing import Optional
+import os
+import secrets
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException
 from loguru import logger
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
 from repoqa.app import RepoQA
 from repoqa.config import config
+from repoqa.embedding.dispatcher import close_shared_dispatchers, get_shared_dispatcher
+from repoqa.embedding.projection import EmbeddingProjection
+from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+from repoqa.indexing.git_indexer import GitRepoIndexer, get_clone_path, is_git_url
+from repoqa.indexing.scope import scope_filter
 from repoqa.llm.llm_factory import get_llm
+from repoqa.retrieval.federated import FederatedRetriever, get_search_executor
+from repoqa.storage.answer_cache import AnswerCache
 from repoqa.storage.collection_manager import (
-    collection_exists_and_has_documents,
+    compact_storage,
     delete_collection,
+    get_answer_cache,
     get_collection_name,
+    get_projection_path,
+    get_storage_usage,
+    list_collections,
+    record_access,
+    validate_collection,
 )
+from repoqa.storage.manifest import (
+    build_manifest,
+    describe_projection,
+    describe_vector_store,
+)
+from repoqa.storage.store_factory import get_vector_store
 from repoqa.util.setup_util import setup
 
 setup()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Optionally load the embedding model before serving requests."""
+    if config.embedding_warmup:
+        logger.info(f"Warming up embedding model '{config.embedding_model}'")
+        SentenceTransformerEmbedding(model_name=config.embedding_model).warmup()
+    yield
+    close_shared_dispatchers()
+
+
 app = FastAPI(
     title=config.api_title,
     description=config.api_description,
     version=config.api_version,
+    lifespan=lifespan,
 )
 
 
-class QuestionRequest(BaseModel):
+def require_admin(authorization: Optional[str] = Header(None)) -> None:
+    """Allow /admin requests only with the configured bearer token.
+
+    The admin endpoints delete collections and clones and expose the disk
+    layout, so they are disabled unless ``api.admin_token`` is set.
+    """
+    token = config.api_admin_token
+    if not token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    scheme, _, given = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        given.encode(), token.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def expected_manifest() -> Dict[str, Any]:
+    """Manifest fields a collection built with the current config must have."""
+    return build_manifest(
+        embedding_model=config.embedding_model,
+        chunker=GitRepoIndexer.__name__,
+        chunk_size=config.vectorstore_chunk_size,
+        projection=describe_projection(
+            config.embedding_projection_method,
+            config.embedding_projection_dim,
+            config.embedding_projection_shared_path,
+        ),
+        vector_store=describe_vector_store(
+            config.vectorstore_backend, vector_store_options()
+        ),
+    )
+
+
+def vector_store_options() -> Dict[str, Any]:
+    """Settings passed to the configured vector store backend."""
+    if config.vectorstore_backend == "faiss":
+        return {
+            "index_type": config.faiss_index_type,
+            "hnsw_threshold": config.faiss_hnsw_threshold,
+            "ivfpq_threshold": config.faiss_ivfpq_threshold,
+            "mmap": config.faiss_mmap,
+        }
+    if config.vectorstore_backend == "quantized":
+        return {
+            "quantization": config.quantized_quantization,
+            "rerank_factor": config.quantized_rerank_factor,
+        }
+    return {}
+
+
+def get_repo_clone_path(repo: str) -> Optional[str]:
+    """Clone directory used for a repository, or None for local paths."""
+    if not is_git_url(repo):
+        return None
+    return get_clone_path(repo, config.repository_clone_directory)
+
+
+def enforce_disk_quotas(
+    collection_name: Optional[str] = None,
+    clone_path: Optional[str] = None,
+    max_collections_mb: Optional[int] = None,
+    max_clones_mb: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Evict least recently used collections and clones beyond the quotas.
+
+    Args:
+        collection_name: Collection to keep regardless of its age.
+        clone_path: Clone to keep regardless of its age.
+        max_collections_mb: Collection quota; defaults to the config.
+        max_clones_mb: Clone quota; defaults to the config.
+
+    Returns:
+        Result of ``compact_storage``.
+    """
+    if max_collections_mb is None:
+        max_collections_mb = config.vectorstore_max_disk_mb
+    if max_clones_mb is None:
+        max_clones_mb = config.repository_max_disk_mb
+
+    return compact_storage(
+        config.vectorstore_persist_directory,
+        max_collection_bytes=max_collections_mb * 1024 * 1024,
+        clone_directory=config.repository_clone_directory,
+        max_clone_bytes=max_clones_mb * 1024 * 1024,
+        protected_collections=[collection_name] if collection_name else [],
+        protected_clones=[clone_path] if clone_path else [],
+    )
+
+
+def load_answer_cache() -> Optional[AnswerCache]:
+    """Shared answer cache configured for /ask, or None when disabled."""
+    if not config.answer_cache_enabled:
+        return None
+    return get_answer_cache(
+        config.vectorstore_persist_directory,
+        similarity_threshold=config.answer_cache_similarity,
+        max_entries=config.answer_cache_max_entries,
+    )
+
+
+def load_query_projection(collection_name: str) -> Optional[EmbeddingProjection]:
+    """Projection applied to queries against a collection, if it has one."""
+    path = config.embedding_projection_shared_path or get_projection_path(
+        config.vectorstore_persist_directory, collection_name
+    )
+    if not os.path.exists(path):
+        return None
+    return EmbeddingProjection.load(path)
+
+
+def build_federated_retriever(
+    collection_names: List[str],
+) -> Tuple[FederatedRetriever, Dict[str, str]]:
+    """Open the collections that match the current configuration.
+
+    Collections are validated and opened on the shared search pool, so
+    opening many collections is as parallel as searching them.
+
+    Args:
+        collection_names: Collections to search.
+
+    Returns:
+        Retriever over the usable collections, and the validation status of
+        each skipped collection keyed by name.
+    """
+    persist_directory = config.vectorstore_persist_directory
+    expected = expected_manifest()
+    executor = get_search_executor(config.search_max_workers)
+
+    def open_shard(name: str) -> Tuple[str, Any, Optional[EmbeddingProjection], str]:
+        status = validate_collection(persist_directory, name, expected)["status"]
+        if status != "ok":
+            return name, None, None, status
+        store = get_vector_store(
+            name,
+            persist_directory,
+            config.vectorstore_backend,
+            **vector_store_options(),
+        )
+        return name, store, load_query_projection(name), status
+
+    shards, projections, skipped = {}, {}, {}
+    for name, store, projection, status in executor.map(
+        open_shard, dict.fromkeys(collection_names)
+    ):
+        if store is None:
+            skipped[name] = status
+            continue
+        shards[name] = store
+        if projection is not None:
+            projections[name] = projection
+
+    retriever = FederatedRetriever(
+        shards,
+        projections=projections,
+        timeout_s=config.search_timeout_s or None,
+        executor=executor,
+    )
+    return retriever, skipped
+
+
+class ScopeRequest(BaseModel):
+    """Optional filters restricting retrieval to part of a repository."""
+
+    languages: Optional[List[str]] = Field(
+        default=None,
+        description="Only search files in these languages, e.g. 'python'",
+    )
+    directories: Optional[List[str]] = Field(
+        default=None,
+        description="Only search these top-level directories of the repository",
+    )
+    extensions: Optional[List[str]] = Field(
+        default=None, description="Only search files with these extensions"
+    )
+    tests: Optional[bool] = Field(
+        default=None,
+        description="True to search only test files, false to leave them out",
+    )
+
+    def metadata_filter(self) -> Optional[Dict[str, Any]]:
+        """Chunk metadata filter for the requested scope, if any."""
+        return scope_filter(
+            self.languages, self.directories, self.extensions, self.tests
+        )
+
+
+class QuestionRequest(ScopeRequest):
     """Request model for asking questions."""
 
     repo: str = Field(
@@ -50,6 +276,35 @@ class QuestionRequest(BaseModel):
     )
 
 
+class SearchRequest(ScopeRequest):
+    """Request model for searching several repositories."""
+
+    query: str = Field(..., description="Search query", min_length=1)
+    repos: Optional[List[str]] = Field(
+        default=None,
+        description="Repository URLs or paths to search "
+        "(default: every indexed repository)",
+    )
+    top_k: int = Field(
+        default=10, ge=1, le=100, description="Number of results to return"
+    )
+
+
+class CompactRequest(BaseModel):
+    """Request model for storage compaction."""
+
+    max_collections_mb: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Quota for all collections in MiB (default: from config)",
+    )
+    max_clones_mb: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Quota for all repository clones in MiB (default: from config)",
+    )
+
+
 class AnswerResponse(BaseModel):
     """Response model for answers."""
 
@@ -58,6 +313,15 @@ class AnswerResponse(BaseModel):
     repo: str
 
 
+class SearchResponse(BaseModel):
+    """Response model for federated search results."""
+
+    query: str
+    results: List[Dict[str, Any]]
+    searched: List[str]
+    skipped: Dict[str, str]
+
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -82,23 +346,36 @@ async def ask_question(request: QuestionRequest):
         # Generate collection name for this repository
         collection_name = get_collection_name(request.repo)
         logger.info(f"Using collection '{collection_name}' for repo: {request.repo}")
+        clone_path = get_repo_clone_path(request.repo)
+        record_access(config.vectorstore_persist_directory, collection_name, clone_path)
 
-        # Handle force_update: delete existing collection if it exists
-        if request.force_update:
+        # Validating, deleting, loading and indexing block, so they run in the
+        # threadpool and other requests keep being served meanwhile.
+        # A collection with a matching, complete manifest is used as is;
+        # anything else is rebuilt from scratch
+        validation = await run_in_threadpool(
+            validate_collection,
+            config.vectorstore_persist_directory,
+            collection_name,
+            expected_manifest(),
+        )
+        needs_index = request.force_update or validation["status"] != "ok"
+
+        if needs_index and validation["status"] != "missing":
             logger.info(
-                f"Force update requested, deleting collection " f"'{collection_name}'"
+                f"Rebuilding collection '{collection_name}' "
+                f"(status: {validation['status']}, "
+                f"force_update: {request.force_update})"
+            )
+            await run_in_threadpool(
+                delete_collection, config.vectorstore_persist_directory, collection_name
             )
-            delete_collection(config.vectorstore_persist_directory, collection_name)
-
-        # Check if collection already exists with documents
-        collection_has_data = collection_exists_and_has_documents(
-            config.vectorstore_persist_directory, collection_name
-        )
 
         # Create new RepoQA instance for each request
         logger.info(f"Initializing RepoQA for repo: {request.repo}")
         llm_model = request.llm_model or config.llm_model
-        repo_qa_instance = RepoQA(
+        repo_qa_instance = await run_in_threadpool(
+            RepoQA,
             persist_directory=config.vectorstore_persist_directory,
             embedding_model=config.embedding_model,
             collection_name=collection_name,
@@ -110,25 +387,60 @@ async def ask_question(request: QuestionRequest):
             repo_path=config.repository_clone_directory,
             ollama_base_url=config.ollama_base_url,
             temperature=config.llm_temperature,
+            projection_method=config.embedding_projection_method,
+            projection_dim=config.embedding_projection_dim,
+            projection_shared_path=config.embedding_projection_shared_path,
+            write_batch_size=config.vectorstore_write_batch_size,
+            vector_store_backend=config.vectorstore_backend,
+            vector_store_options=vector_store_options(),
+            retrieval_mode=config.retrieval_mode,
+            rrf_k=config.retrieval_rrf_k,
+            symbol_boost=config.retrieval_symbol_boost,
+            duplicate_bits=config.retrieval_duplicate_bits,
+            mmr_lambda=config.retrieval_mmr_lambda,
+            neighbor_chunks=config.retrieval_neighbor_chunks,
+            context_max_tokens=config.context_max_tokens,
+            context_tokenizer=config.context_tokenizer,
+            retrieval_k=config.retrieval_top_k,
+            rerank_model=config.rerank_model or None,
+            rerank_candidates=config.rerank_candidates,
+            rerank_budget_ms=config.rerank_budget_ms,
+            rerank_device=config.rerank_device,
+            answer_cache=load_answer_cache(),
+            llm_name=llm_model,
+            metadata_filter=request.metadata_filter(),
+            embedding_dispatcher=config.embedding_dispatcher_enabled,
+            dispatcher_max_batch_size=config.embedding_dispatcher_max_batch_size,
+            dispatcher_max_wait_ms=config.embedding_dispatcher_max_wait_ms,
         )
 
-        # Index repository if collection doesn't exist or force_update is True
-        if request.force_update or not collection_has_data:
+        if needs_index:
             logger.info(f"Indexing repository: {request.repo}")
-            result = repo_qa_instance.index_repository(
+            result = await run_in_threadpool(
+                repo_qa_instance.index_repository,
                 repo_path=request.repo,
                 clone_dir=config.repository_clone_directory,
             )
             logger.info(f"Indexing completed: {result}")
+
+            if config.vectorstore_max_disk_mb or config.repository_max_disk_mb:
+                try:
+                    evicted = await run_in_threadpool(
+                        enforce_disk_quotas, collection_name, clone_path
+                    )
+                    logger.info(f"Disk quota enforcement: {evicted}")
+                except Exception as e:
+                    logger.error(f"Error enforcing disk quotas: {e}")
         else:
             logger.info(
-                f"Collection '{collection_name}' already exists with data, "
-                "skipping indexing"
+                f"Collection '{collection_name}' matches the current "
+                "configuration, skipping indexing"
             )
 
-        # Ask question
+        # Ask question off the event loop, so concurrent questions overlap and
+        # their query encodes can share dispatcher batches
         logger.info(f"Processing question: {request.question}")
-        answer = repo_qa_instance.ask(request.question)
+        answer = await run_in_threadpool(repo_qa_instance.ask, request.question)
 
         return AnswerResponse(
             question=request.question,
@@ -141,6 +453,97 @@ async def ask_question(request: QuestionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/search", response_model=SearchResponse)
+async def search(request: SearchRequest):
+    """Search code across several indexed repositories at once.
+
+    The query is embedded once and every collection is searched in parallel;
+    collections that are not indexed or were built with a different
+    configuration are skipped.
+
+    Args:
+        request: Search request with the query, repositories and result count
+
+    Returns:
+        The best matches across all searched collections
+    """
+    # Opening, validating and searching the collections blocks (a shard can
+    # take up to its timeout), so all of it runs off the event loop; only the
+    # dispatcher encode is awaited here
+    try:
+        if request.repos:
+            collection_names = [get_collection_name(repo) for repo in request.repos]
+        else:
+            collection_names = await run_in_threadpool(
+                list_collections, config.vectorstore_persist_directory
+            )
+
+        retriever, skipped = await run_in_threadpool(
+            build_federated_retriever, collection_names
+        )
+        embedding_model = await run_in_threadpool(
+            SentenceTransformerEmbedding, model_name=config.embedding_model
+        )
+        if config.embedding_dispatcher_enabled:
+            query_embedding = await get_shared_dispatcher(
+                embedding_model,
+                config.embedding_dispatcher_max_batch_size,
+                config.embedding_dispatcher_max_wait_ms,
+            ).aencode(request.query)
+        else:
+            query_embedding = (
+                await run_in_threadpool(embedding_model.encode, request.query)
+            )[0]
+
+        found = await run_in_threadpool(
+            retriever.search,
+            query_embedding,
+            k=request.top_k,
+            metadata_filter=request.metadata_filter(),
+        )
+        skipped.update(found["failed"])
+        searched = [name for name in retriever.shards if name not in skipped]
+        for name in searched:
+            record_access(config.vectorstore_persist_directory, name)
+
+        return SearchResponse(
+            query=request.query,
+            results=found["results"],
+            searched=searched,
+            skipped=skipped,
+        )
+
+    except Exception as e:
+        logger.error(f"Error searching collections: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/admin/storage", dependencies=[Depends(require_admin)])
+async def storage_usage():
+    """Disk usage and last access of collections and repository clones."""
+    try:
+        return get_storage_usage(
+            config.vectorstore_persist_directory, config.repository_clone_directory
+        )
+    except Exception as e:
+        logger.error(f"Error getting storage usage: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/admin/compact", dependencies=[Depends(require_admin)])
+async def compact(request: Optional[CompactRequest] = None):
+    """Evict least recently used collections and clones beyond the quotas."""
+    request = request or CompactRequest()
+    try:
+        return enforce_disk_quotas(
+            max_collections_mb=request.max_collections_mb,
+            max_clones_mb=request.max_clones_mb,
+        )
+    except Exception as e:
+        logger.error(f"Error compacting storage: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/health")
 async def health_check():
     """Detailed health check endpoint."""
@@ -2,22 +2,38 @@
 # Copyright (c) 2025 Afif Al Mamun
 
 import argparse
+import json
 import os
 import sys
+import time
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 
 from loguru import logger
 
+from repoqa.embedding.dispatcher import get_shared_dispatcher
 from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
 from repoqa.indexing.git_indexer import GitRepoIndexer
 from repoqa.llm.llm_factory import get_llm
+from repoqa.storage.answer_cache import AnswerCache
+from repoqa.storage.collection_manager import get_collection_manifest
+from repoqa.util.lazy_import import LazyImport
 from repoqa.util.setup_util import setup
 
 setup()
 
-from repoqa.pipeline.agentic_rag import AgenticRAGPipeline  # noqa: E402
-from repoqa.pipeline.rag import RAGPipeline  # noqa: E402
+# Pipelines pull in LangChain (and through it transformers); defer them until
+# a RepoQA instance is actually built.
+AgenticRAGPipeline = LazyImport("repoqa.pipeline.agentic_rag", "AgenticRAGPipeline")
+RAGPipeline = LazyImport("repoqa.pipeline.rag", "RAGPipeline")
+
+# Pipelines report failures as answers starting with these; they are not cached
+FAILED_ANSWER_PREFIXES = (
+    "Error generating response:",
+    "Error: ",
+    "I couldn't generate a response",
+    "Repository path does not exist:",
+)
 
 
 class RepoQA:
@@ -34,6 +50,31 @@ class RepoQA:
         repo_path: str,
         persist_directory: str,
         temperature: float = 0.3,
+        projection_method: str = "none",
+        projection_dim: int = 256,
+        projection_shared_path: Optional[str] = None,
+        write_batch_size: int = 0,
+        vector_store_backend: str = "chroma",
+        vector_store_options: Optional[Dict[str, Any]] = None,
+        retrieval_mode: str = "vector",
+        rrf_k: int = 60,
+        symbol_boost: bool = True,
+        duplicate_bits: int = -1,
+        mmr_lambda: float = 1.0,
+        neighbor_chunks: int = 0,
+        context_max_tokens: int = 0,
+        context_tokenizer: Optional[str] = None,
+        retrieval_k: int = 5,
+        rerank_model: Optional[str] = None,
+        rerank_candidates: int = 20,
+        rerank_budget_ms: float = 0,
+        rerank_device: str = "cpu",
+        answer_cache: Optional[AnswerCache] = None,
+        llm_name: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        embedding_dispatcher: bool = False,
+        dispatcher_max_batch_size: int = 32,
+        dispatcher_max_wait_ms: float = 5.0,
     ):
         """Initialize RepoQA with customizable components.
 
@@ -47,11 +88,73 @@ class RepoQA:
             repo_path: Path to the repository for agentic operations.
             persist_directory: Directory to persist vector store data.
             temperature: Sampling temperature for LLM responses.
+            projection_method: Embedding dimensionality reduction, 'none',
+                'pca' or 'truncate'.
+            projection_dim: Target dimension of the embedding projection.
+            projection_shared_path: Optional pre-fitted projection shared by
+                all collections.
+            write_batch_size: Documents per vector store write while
+                indexing; 0 uses the ChromaDB client's maximum.
+            vector_store_backend: Store holding the collection's vectors,
+                'chroma', 'faiss', 'numpy' or 'quantized'.
+            vector_store_options: Backend-specific store settings, such as
+                ``index_type`` for FAISS.
+            retrieval_mode: 'vector', 'lexical' or 'hybrid' (BM25 and vector
+                results fused by reciprocal rank).
+            rrf_k: Rank offset for reciprocal rank fusion.
+            symbol_boost: Rank the definitions of identifiers named in a
+                question alongside the retrieved documents.
+            duplicate_bits: Drop retrieved documents whose SimHash differs
+                from a better one's in at most this many bits; negative
+                keeps near duplicates.
+            mmr_lambda: Maximal marginal relevance trade-off between
+                relevance (1) and diversity (0).
+            neighbor_chunks: Adjacent chunks on each side of a retrieved
+                document merged into it, so it comes with its surrounding
+                code.
+            context_max_tokens: Token budget for the retrieved context in
+                'rag' mode; 0 includes every document in full.
+            context_tokenizer: Hugging Face tokenizer used to count context
+                tokens; None uses a fast estimate.
+            retrieval_k: Number of documents passed to the LLM in 'rag'
+                mode.
+            rerank_model: Cross-encoder re-ranking the retrieved documents
+                in 'rag' mode; None disables re-ranking.
+            rerank_candidates: Number of documents retrieved for re-ranking.
+            rerank_budget_ms: Time allowed for re-ranking a question's
+                candidates; 0 scores every candidate.
+            rerank_device: Device the cross-encoder runs on.
+            answer_cache: Cache answering repeated and similar questions
+                about the same indexed commit without the pipeline; None
+                disables caching.
+            llm_name: Name of the LLM in answer cache keys; defaults to the
+                model's ``model`` attribute.
+            metadata_filter: Scope filter from ``scope_filter`` restricting
+                retrieval to matching chunks; None searches everything.
+            embedding_dispatcher: Encode queries through the process-wide
+                micro-batching dispatcher, so concurrent requests share
+                model calls.
+            dispatcher_max_batch_size: Maximum queries in one batch.
+            dispatcher_max_wait_ms: Time a query waits for others to join
+                its batch.
         """
         self.mode = mode
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+        self.answer_cache = answer_cache
+        self.llm_name = llm_name or getattr(llm_model, "model", None)
+        self.metadata_filter = metadata_filter or None
 
+        # The model itself is loaded on first encode (or by warmup())
+        self.embedding_model = SentenceTransformerEmbedding(model_name=embedding_model)
+        if embedding_dispatcher:
+            self.embedding_model = get_shared_dispatcher(
+                self.embedding_model,
+                dispatcher_max_batch_size,
+                dispatcher_max_wait_ms,
+            )
         repo_indexer = GitRepoIndexer(
-            SentenceTransformerEmbedding(model_name=embedding_model),
+            self.embedding_model,
             chunk_size=collection_chunk_size,
         )
 
@@ -66,6 +169,22 @@ class RepoQA:
                 temperature=temperature,
                 repo_path=repo_path,
                 repo_indexer=repo_indexer,
+                projection_method=projection_method,
+                projection_dim=projection_dim,
+                projection_shared_path=projection_shared_path,
+                write_batch_size=write_batch_size,
+                vector_store_backend=vector_store_backend,
+                vector_store_options=vector_store_options,
+                retrieval_mode=retrieval_mode,
+                rrf_k=rrf_k,
+                symbol_boost=symbol_boost,
+                duplicate_bits=duplicate_bits,
+                mmr_lambda=mmr_lambda,
+                neighbor_chunks=neighbor_chunks,
+                metadata_filter=metadata_filter,
+                embedding_dispatcher=embedding_dispatcher,
+                dispatcher_max_batch_size=dispatcher_max_batch_size,
+                dispatcher_max_wait_ms=dispatcher_max_wait_ms,
             )
         elif mode == "rag":
             logger.info("Initializing RAG pipeline...")
@@ -77,6 +196,29 @@ class RepoQA:
                 ollama_base_url=ollama_base_url,
                 temperature=temperature,
                 repo_indexer=repo_indexer,
+                projection_method=projection_method,
+                projection_dim=projection_dim,
+                projection_shared_path=projection_shared_path,
+                write_batch_size=write_batch_size,
+                vector_store_backend=vector_store_backend,
+                vector_store_options=vector_store_options,
+                retrieval_mode=retrieval_mode,
+                rrf_k=rrf_k,
+                symbol_boost=symbol_boost,
+                duplicate_bits=duplicate_bits,
+                mmr_lambda=mmr_lambda,
+                neighbor_chunks=neighbor_chunks,
+                context_max_tokens=context_max_tokens,
+                context_tokenizer=context_tokenizer,
+                retrieval_k=retrieval_k,
+                rerank_model=rerank_model,
+                rerank_candidates=rerank_candidates,
+                rerank_budget_ms=rerank_budget_ms,
+                rerank_device=rerank_device,
+                metadata_filter=metadata_filter,
+                embedding_dispatcher=embedding_dispatcher,
+                dispatcher_max_batch_size=dispatcher_max_batch_size,
+                dispatcher_max_wait_ms=dispatcher_max_wait_ms,
             )
         else:
             raise ValueError(f"Unsupported mode: {mode}")
@@ -97,13 +239,74 @@ class RepoQA:
         """
         return self.pipeline.index_repository(repo_path, clone_dir)
 
+    def warmup(self) -> None:
+        """Load the embedding model ahead of the first request."""
+        self.embedding_model.warmup()
+
+    def _indexed_commit(self) -> Optional[str]:
+        """Commit of the completely indexed collection, if known."""
+        try:
+            manifest = get_collection_manifest(
+                self.persist_directory, self.collection_name
+            )
+        except Exception as e:
+            logger.warning(f"Could not read the collection manifest: {e}")
+            return None
+        if not manifest or not manifest.get("complete"):
+            return None
+        return manifest.get("commit")
+
     def ask(self, query: str) -> str:
         """Answer a question about the repository.
 
+        With an answer cache, questions about a collection indexed at a
+        known commit are first looked up in the cache, and new answers are
+        stored in it. Repositories without a commit, such as local
+        directories that are not git repositories, are never cached.
+
         Args:
             query: Natural language query about the repository.
 
         Returns:
             Generated answer based on repository context.
         """
-        return self.pipeline.ask(query)
+        if self.answer_cache is None or not isinstance(self.llm_name, str):
+            return self.pipeline.ask(query)
+        commit = self._indexed_commit()
+        if not commit:
+            return self.pipeline.ask(query)
+
+        # Scoped questions are answered from other context, so cached apart
+        mode = self.mode
+        if self.metadata_filter:
+            mode += " " + json.dumps(self.metadata_filter, sort_keys=True)
+        key = (self.collection_name, commit, mode, self.llm_name)
+        embedding = []
+
+        def embed():
+            if not embedding:
+                embedding.append(self.embedding_model.encode(query)[0])
+            return embedding[0]
+
+        start = time.perf_counter()
+        try:
+            cached = self.answer_cache.lookup(*key, query, embed=embed)
+        except Exception as e:
+            logger.warning(f"Answer cache lookup failed: {e}")
+            cached = None
+        if cached is not None:
+            logger.info(
+                f"Answered from cache in {(time.perf_counter() - start) * 1000:.1f} ms"
+            )
+            return cached
+
+        answer = self.pipeline.ask(query)
+        if answer and not answer.startswith(FAILED_ANSWER_PREFIXES):
+            try:
+                similar = self.answer_cache.similarity_threshold < 1.0
+                self.answer_cache.store(
+                    *key, query, answer, embedding=embed() if similar else None
+                )
+            except Exception as e:
+                logger.warning(f"Could not cache the answer: {e}")
+        return answer
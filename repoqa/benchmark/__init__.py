@@ -0,0 +1,4 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Offline performance benchmarks for RepoQA components."""
@@ -0,0 +1,354 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Embedding throughput and latency benchmarks.
+
+Runs fully offline against a deterministic stub model or a local
+SentenceTransformer model and writes a JSON report that can be compared
+between releases::
+
+    python -m repoqa.benchmark.embedding --backends stub st:fp32 st:bf16 \\
+        --model ./models/all-MiniLM-L6-v2 --output bench_output.json
+"""
+
+import argparse
+import hashlib
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+import repoqa
+from repoqa.embedding.embedding_model import EmbeddingModel
+
+DEFAULT_BATCH_SIZES = [1, 8, 32]
+DEFAULT_SEQ_LENGTHS = [32, 256]
+PERCENTILES = [50, 90, 95, 99]
+
+_WORDS = [
+    "def",
+    "return",
+    "self",
+    "import",
+    "class",
+    "config",
+    "embedding",
+    "vector",
+    "store",
+    "query",
+    "index",
+    "chunk",
+    "if",
+    "else",
+    "for",
+    "in",
+    "None",
+    "True",
+    "raise",
+    "ValueError",
+]
+
+
+class StubEmbeddingModel(EmbeddingModel):
+    """Deterministic embedding model for offline benchmarks and tests.
+
+    Each text maps to a fixed unit vector derived from its hash, so results
+    are reproducible and no model weights are needed. A small amount of
+    per-character work keeps cost proportional to input length.
+    """
+
+    def __init__(self, dim: int = 384, model_name: str = "stub"):
+        """Initialize the stub model.
+
+        Args:
+            dim: Dimension of the produced embeddings.
+            model_name: Name reported for the model.
+        """
+        super().__init__(model_name)
+        self.dim = dim
+
+    @property
+    def identity(self) -> Tuple[Any, ...]:
+        """Model name and dimension."""
+        return (*super().identity, self.dim)
+
+    def _embed(self, text: str) -> List[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        rng = np.random.default_rng(int.from_bytes(digest[:8], "little"))
+        vector = rng.standard_normal(self.dim)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def encode(self, texts: Union[str, List[str]], **kwargs) -> List[List[float]]:
+        """Encode text(s) into deterministic embeddings."""
+        if isinstance(texts, str):
+            texts = [texts]
+        return [self._embed(text) for text in texts]
+
+    def encode_batch(
+        self, texts: List[str], batch_size: int = 32, **kwargs
+    ) -> List[List[float]]:
+        """Encode a batch of texts into deterministic embeddings."""
+        return self.encode(texts)
+
+    def get_embedding_dim(self) -> Optional[int]:
+        """Get the dimensionality of the embeddings."""
+        return self.dim
+
+
+def make_texts(count: int, seq_length: int, seed: int = 0) -> List[str]:
+    """Generate code-like texts of roughly ``seq_length`` words.
+
+    Args:
+        count: Number of texts to generate.
+        seq_length: Number of words per text.
+        seed: Random seed.
+
+    Returns:
+        List of generated texts.
+    """
+    rng = np.random.default_rng(seed)
+    return [
+        " ".join(rng.choice(_WORDS, size=seq_length).tolist()) for _ in range(count)
+    ]
+
+
+def latency_stats(samples_ms: Sequence[float]) -> Dict[str, float]:
+    """Summarize latency samples in milliseconds.
+
+    Args:
+        samples_ms: Latency samples.
+
+    Returns:
+        Mean, min, max and percentiles of the samples.
+    """
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    stats = {
+        "mean_ms": float(samples.mean()),
+        "min_ms": float(samples.min()),
+        "max_ms": float(samples.max()),
+    }
+    for p in PERCENTILES:
+        stats[f"p{p}_ms"] = float(np.percentile(samples, p))
+    return stats
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, if available."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
+
+
+def benchmark_encode_latency(
+    model: EmbeddingModel, queries: Sequence[str], warmup: int = 3
+) -> Dict[str, Any]:
+    """Measure single-query ``encode`` latency.
+
+    Args:
+        model: Model to benchmark.
+        queries: Queries encoded one at a time.
+        warmup: Number of untimed encodes run first.
+
+    Returns:
+        Latency statistics for the timed encodes.
+    """
+    for query in queries[:warmup]:
+        model.encode(query)
+
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        model.encode(query)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {"iterations": len(samples), **latency_stats(samples)}
+
+
+def benchmark_encode_batch(
+    model: EmbeddingModel, texts: List[str], batch_size: int
+) -> Dict[str, Any]:
+    """Measure ``encode_batch`` throughput.
+
+    Args:
+        model: Model to benchmark.
+        texts: Texts to encode.
+        batch_size: Batch size passed to the model.
+
+    Returns:
+        Elapsed time and chunks per second.
+    """
+    # One untimed batch so lazy loading and allocator warmup are excluded
+    model.encode_batch(
+        texts[:batch_size], batch_size=batch_size, show_progress_bar=False
+    )
+
+    start = time.perf_counter()
+    model.encode_batch(texts, batch_size=batch_size, show_progress_bar=False)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "batch_size": batch_size,
+        "num_texts": len(texts),
+        "elapsed_s": elapsed,
+        "chunks_per_sec": len(texts) / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def create_backend(spec: str, model_name: str) -> EmbeddingModel:
+    """Create an embedding model from a backend spec.
+
+    Specs are ``stub`` or ``st[:precision][:compile]``, for example
+    ``st:bf16`` or ``st:fp32:compile``.
+
+    Args:
+        spec: Backend spec.
+        model_name: Model name or local path for SentenceTransformer backends.
+
+    Returns:
+        Embedding model instance.
+    """
+    parts = spec.split(":")
+    if parts[0] == "stub":
+        return StubEmbeddingModel()
+    if parts[0] != "st":
+        raise ValueError(f"Unsupported backend: {spec}")
+
+    from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+    precision = parts[1] if len(parts) > 1 else "fp32"
+    compile = len(parts) > 2 and parts[2] == "compile"
+    return SentenceTransformerEmbedding(
+        model_name=model_name, precision=precision, compile=compile
+    )
+
+
+def run_embedding_benchmark(
+    backends: Dict[str, EmbeddingModel],
+    batch_sizes: Sequence[int] = DEFAULT_BATCH_SIZES,
+    seq_lengths: Sequence[int] = DEFAULT_SEQ_LENGTHS,
+    num_texts: int = 256,
+    latency_iterations: int = 50,
+) -> Dict[str, Any]:
+    """Benchmark each backend across batch sizes and sequence lengths.
+
+    Args:
+        backends: Models to benchmark keyed by backend name.
+        batch_sizes: Batch sizes for the throughput runs.
+        seq_lengths: Text lengths in words.
+        num_texts: Number of texts per throughput run.
+        latency_iterations: Number of timed single-query encodes.
+
+    Returns:
+        JSON-serializable benchmark report.
+    """
+    results = []
+    for name, model in backends.items():
+        model.warmup()
+        backend_result: Dict[str, Any] = {
+            "backend": name,
+            "model_name": model.model_name,
+            "embedding_dim": model.get_embedding_dim(),
+            "latency": {},
+            "throughput": [],
+        }
+
+        for seq_length in seq_lengths:
+            queries = make_texts(latency_iterations, seq_length, seed=seq_length)
+            backend_result["latency"][str(seq_length)] = benchmark_encode_latency(
+                model, queries
+            )
+
+            texts = make_texts(num_texts, seq_length, seed=seq_length + 1)
+            for batch_size in batch_sizes:
+                run = benchmark_encode_batch(model, texts, batch_size)
+                backend_result["throughput"].append(
+                    {"seq_length": seq_length, **run}
+                )
+
+        # Process-wide peak, so it is cumulative across backends
+        backend_result["peak_rss_mb"] = peak_rss_mb()
+        results.append(backend_result)
+
+    return {
+        "benchmark": "embedding",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "repoqa_version": repoqa.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "batch_sizes": list(batch_sizes),
+            "seq_lengths": list(seq_lengths),
+            "num_texts": num_texts,
+            "latency_iterations": latency_iterations,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark embedding latency and throughput"
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=["stub"],
+        help="Backends to run: 'stub' or 'st[:precision][:compile]'",
+    )
+    parser.add_argument(
+        "--model",
+        default=None,
+        help="SentenceTransformer model name or local path "
+        "(defaults to embedding.model from the config)",
+    )
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=DEFAULT_BATCH_SIZES
+    )
+    parser.add_argument(
+        "--seq-lengths",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SEQ_LENGTHS,
+        help="Text lengths in words",
+    )
+    parser.add_argument("--num-texts", type=int, default=256)
+    parser.add_argument("--latency-iterations", type=int, default=50)
+    parser.add_argument("--output", type=str, help="Write the JSON report here")
+
+    args = parser.parse_args(argv)
+
+    model_name = args.model
+    if model_name is None and any(b != "stub" for b in args.backends):
+        from repoqa.config import config
+
+        model_name = config.embedding_model
+
+    report = run_embedding_benchmark(
+        {spec: create_backend(spec, model_name) for spec in args.backends},
+        batch_sizes=args.batch_sizes,
+        seq_lengths=args.seq_lengths,
+        num_texts=args.num_texts,
+        latency_iterations=args.latency_iterations,
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"Wrote benchmark report to: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
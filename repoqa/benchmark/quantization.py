@@ -0,0 +1,215 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Recall and memory benchmarks for quantized vector search.
+
+Compares ``QuantizedVectorStore`` against exact search with
+``NumpyVectorStore`` for each quantization and re-rank factor, on
+synthetic clustered vectors or the vectors of an exported collection
+snapshot, and writes a JSON report::
+
+    python -m repoqa.benchmark.quantization --snapshot repo.tar.gz \\
+        --rerank-factors 0 4 10 --output quantization.json
+"""
+
+import argparse
+import json
+import platform
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+import repoqa
+from repoqa.benchmark.embedding import latency_stats
+from repoqa.storage.numpy_store import NumpyVectorStore
+from repoqa.storage.quantized_store import QUANTIZATIONS, QuantizedVectorStore
+
+DEFAULT_RERANK_FACTORS = [0, 4, 10]
+
+
+def make_vectors(
+    count: int, dim: int = 384, clusters: int = 64, seed: int = 0
+) -> np.ndarray:
+    """Generate clustered vectors resembling embeddings of related chunks.
+
+    Args:
+        count: Number of vectors.
+        dim: Vector dimension.
+        clusters: Number of clusters the vectors are drawn around.
+        seed: Random seed.
+
+    Returns:
+        Float32 ``(count, dim)`` matrix.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    labels = rng.integers(0, clusters, count)
+    vectors = centers[labels] + 0.5 * rng.standard_normal((count, dim))
+    return vectors.astype(np.float32)
+
+
+def make_queries(
+    vectors: np.ndarray, count: int, noise: float = 0.3, seed: int = 1
+) -> np.ndarray:
+    """Sample queries near stored vectors.
+
+    Args:
+        vectors: Stored vectors.
+        count: Number of queries.
+        noise: Noise added relative to each sampled vector's norm.
+        seed: Random seed.
+
+    Returns:
+        Float32 ``(count, dim)`` matrix.
+    """
+    rng = np.random.default_rng(seed)
+    sampled = np.asarray(vectors[rng.integers(0, len(vectors), count)], np.float32)
+    scale = noise * np.linalg.norm(sampled, axis=1, keepdims=True)
+    perturbation = rng.standard_normal(sampled.shape) / np.sqrt(sampled.shape[1])
+    return (sampled + scale * perturbation).astype(np.float32)
+
+
+def recall_at_k(
+    expected: Sequence[Sequence[int]], actual: Sequence[Sequence[int]]
+) -> float:
+    """Mean fraction of the expected results found, per query.
+
+    Args:
+        expected: Exact result rows per query.
+        actual: Returned result rows per query.
+
+    Returns:
+        Mean recall over the queries.
+    """
+    recalls = [
+        len(set(exp) & set(act)) / len(exp) for exp, act in zip(expected, actual) if exp
+    ]
+    return float(np.mean(recalls)) if recalls else 0.0
+
+
+def _timed_search(store, queries: np.ndarray, top_k: int):
+    rows, samples = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results = store.search(query, top_k=top_k)
+        samples.append((time.perf_counter() - start) * 1000)
+        rows.append([r["row"] for r in results])
+    return rows, latency_stats(samples)
+
+
+def run_quantization_benchmark(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    quantizations: Sequence[str] = QUANTIZATIONS,
+    rerank_factors: Sequence[int] = DEFAULT_RERANK_FACTORS,
+    top_k: int = 10,
+) -> Dict[str, Any]:
+    """Measure recall, latency and memory of each quantization setting.
+
+    Args:
+        vectors: Stored vectors.
+        queries: Query vectors.
+        quantizations: Quantizations to compare.
+        rerank_factors: Re-rank factors to compare; 0 ranks by codes only.
+        top_k: Results per query.
+
+    Returns:
+        JSON-serializable benchmark report.
+    """
+    metadata = [{"row": i, "content": ""} for i in range(len(vectors))]
+
+    exact = NumpyVectorStore()
+    exact.add(vectors, metadata)
+    expected, exact_latency = _timed_search(exact, queries, top_k)
+
+    results = []
+    for quantization in quantizations:
+        store = QuantizedVectorStore(quantization=quantization)
+        store.add(vectors, metadata)
+        for rerank_factor in rerank_factors:
+            store.rerank_factor = rerank_factor
+            actual, latency = _timed_search(store, queries, top_k)
+            report = store.memory_report()
+            results.append(
+                {
+                    "quantization": quantization,
+                    "rerank_factor": rerank_factor,
+                    "recall_at_k": recall_at_k(expected, actual),
+                    "latency": latency,
+                    "code_bytes": report["code_bytes"],
+                    "float32_bytes": report["float32_bytes"],
+                    "compression": report["compression"],
+                }
+            )
+
+    return {
+        "benchmark": "quantization",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "repoqa_version": repoqa.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "count": len(vectors),
+            "dim": int(vectors.shape[1]),
+            "num_queries": len(queries),
+            "top_k": top_k,
+        },
+        "exact": {"latency": exact_latency},
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark recall and memory of quantized vector search"
+    )
+    parser.add_argument(
+        "--snapshot",
+        default=None,
+        help="Use the vectors of a collection snapshot instead of synthetic ones",
+    )
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--num-queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument(
+        "--quantizations", nargs="+", choices=QUANTIZATIONS, default=QUANTIZATIONS
+    )
+    parser.add_argument(
+        "--rerank-factors", type=int, nargs="+", default=DEFAULT_RERANK_FACTORS
+    )
+    parser.add_argument("--output", type=str, help="Write the JSON report here")
+
+    args = parser.parse_args(argv)
+
+    if args.snapshot:
+        from repoqa.storage.snapshot import open_snapshot
+
+        with open_snapshot(args.snapshot) as snapshot:
+            vectors = np.array(snapshot.vectors, dtype=np.float32)
+    else:
+        vectors = make_vectors(args.count, args.dim)
+
+    report = run_quantization_benchmark(
+        vectors,
+        make_queries(vectors, args.num_queries),
+        quantizations=args.quantizations,
+        rerank_factors=args.rerank_factors,
+        top_k=args.top_k,
+    )
+    if args.snapshot:
+        report["parameters"]["snapshot"] = args.snapshot
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"Wrote benchmark report to: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
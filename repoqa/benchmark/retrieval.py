@@ -0,0 +1,529 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Retrieval quality and latency benchmarks on a labelled repository.
+
+Indexes a local repository once per chunking and projection setting, asks
+every question of a JSONL file under each retrieval configuration, and
+writes a JSON report of recall@k, mean reciprocal rank, latency
+percentiles and prompt token counts per configuration::
+
+    python -m repoqa.benchmark.retrieval --repo . --cases cases.jsonl \\
+        --configs configs.json --output retrieval.json
+
+Each line of the cases file holds a question and the files, or line
+ranges of files, that answer it, relative to the repository root::
+
+    {"question": "How are answers cached?",
+     "expected": ["repoqa/storage/answer_cache.py", "repoqa/app.py:219-268"]}
+
+The configurations file is a JSON list of objects with a ``name``, the
+``retriever`` to run, the number ``k`` of documents retrieved, the
+``chunk_size`` in lines, and any other ``RAGPipeline`` arguments such as
+``retrieval_mode``, ``neighbor_chunks``, ``context_max_tokens`` or
+``rerank_model``. Retrievers are ``code`` (``CodeRetriever`` over the
+indexed vectors and BM25 index), ``pipeline`` (the pipelines' shared
+retrieval, also behind the agent's semantic search) and ``rag`` (the RAG
+pipeline's retrieval, including re-ranking). Prompts are built with the
+RAG prompt and answered by a deterministic stub LLM, so no Ollama server
+is needed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import repoqa
+from repoqa.benchmark.embedding import latency_stats
+from repoqa.retrieval.packing import get_token_counter
+from repoqa.util.lazy_import import LazyImport
+
+# The pipelines pull in LangChain and ChromaDB; defer them to the first run
+Document = LazyImport("langchain_core.documents", "Document")
+FakeListLLM = LazyImport("langchain_core.language_models", "FakeListLLM")
+RAGPipeline = LazyImport("repoqa.pipeline.rag", "RAGPipeline")
+GitRepoIndexer = LazyImport("repoqa.indexing.git_indexer", "GitRepoIndexer")
+SentenceTransformerEmbedding = LazyImport(
+    "repoqa.embedding.sentence_transformer", "SentenceTransformerEmbedding"
+)
+
+RETRIEVERS = ("code", "pipeline", "rag")
+DEFAULT_CUTOFFS = [1, 3, 5, 10]
+DEFAULT_CHUNK_SIZE = 40
+DEFAULT_CONFIGURATIONS = [
+    {"name": "vector", "retriever": "pipeline", "retrieval_mode": "vector"},
+    {"name": "lexical", "retriever": "pipeline", "retrieval_mode": "lexical"},
+    {"name": "hybrid", "retriever": "pipeline", "retrieval_mode": "hybrid"},
+]
+STUB_ANSWER = "This is a stub answer."
+
+# Configuration keys that change the index rather than the retrieval
+_INDEX_KEYS = (
+    "chunk_size",
+    "projection_method",
+    "projection_dim",
+    "projection_shared_path",
+)
+_LINE_RANGE = re.compile(r"^(.+?):(\d+)-(\d+)$")
+
+Target = Tuple[str, Optional[int], Optional[int]]
+
+
+def parse_target(target: str) -> Target:
+    """Parse an expected ``path`` or ``path:start-end`` line range.
+
+    Args:
+        target: File path relative to the repository root, optionally with
+            a 1-based inclusive line range.
+
+    Returns:
+        ``(path, start, end)``, with None lines for a whole file.
+    """
+    match = _LINE_RANGE.match(target)
+    if match:
+        start, end = int(match.group(2)), int(match.group(3))
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid line range in expected target: {target}")
+        return _normalize_path(match.group(1)), start, end
+    return _normalize_path(target), None, None
+
+
+def _normalize_path(path: str) -> str:
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def load_cases(path: str) -> List[Dict[str, Any]]:
+    """Load benchmark questions and their expected targets from JSONL.
+
+    Args:
+        path: File with one ``{"question": ..., "expected": [...]}`` object
+            per line; blank lines are skipped.
+
+    Returns:
+        Cases with the ``question`` and its parsed ``targets``.
+    """
+    cases = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            case = json.loads(line)
+            question, expected = case.get("question"), case.get("expected")
+            if not question or not expected:
+                raise ValueError(
+                    f"Line {number} of {path} needs a question and expected targets"
+                )
+            if isinstance(expected, str):
+                expected = [expected]
+            cases.append(
+                {"question": question, "targets": [parse_target(t) for t in expected]}
+            )
+    return cases
+
+
+def matches(metadata: Dict[str, Any], target: Target, repo_path: str) -> bool:
+    """Check whether a retrieved chunk covers an expected target.
+
+    A chunk matches a file target when it comes from that file, and a line
+    range target when its lines overlap the range. Chunks indexed without
+    line numbers match any range of their file.
+
+    Args:
+        metadata: Chunk metadata with ``file_path`` and, if indexed,
+            ``start_line`` and ``end_line``.
+        target: Parsed expected target.
+        repo_path: Repository root the target is relative to.
+
+    Returns:
+        True when the chunk covers the target.
+    """
+    file_path = metadata.get("file_path")
+    if not file_path:
+        return False
+    relative = os.path.relpath(os.path.abspath(file_path), os.path.abspath(repo_path))
+    path, start, end = target
+    if _normalize_path(relative) != path:
+        return False
+    first, last = metadata.get("start_line"), metadata.get("end_line")
+    if start is None or first is None or last is None:
+        return True
+    return first <= end and start <= last
+
+
+def score_ranking(
+    ranked: Sequence[Dict[str, Any]],
+    targets: Sequence[Target],
+    repo_path: str,
+    cutoffs: Sequence[int] = DEFAULT_CUTOFFS,
+) -> Dict[str, Any]:
+    """Score one question's retrieved chunks against its expected targets.
+
+    Args:
+        ranked: Metadata of the retrieved chunks, best first.
+        targets: Expected targets.
+        repo_path: Repository root the targets are relative to.
+        cutoffs: Ranks at which recall is measured.
+
+    Returns:
+        ``recall_at_k`` per cutoff (fraction of the targets covered by the
+        top chunks), the ``rank`` of the first relevant chunk (None when
+        none is) and its ``reciprocal_rank``.
+    """
+    found: Dict[int, int] = {}
+    for rank, metadata in enumerate(ranked, 1):
+        for i, target in enumerate(targets):
+            if i not in found and matches(metadata, target, repo_path):
+                found[i] = rank
+    first = min(found.values()) if found else None
+    return {
+        "recall_at_k": {
+            str(cutoff): sum(rank <= cutoff for rank in found.values()) / len(targets)
+            for cutoff in cutoffs
+        },
+        "rank": first,
+        "reciprocal_rank": 1.0 / first if first else 0.0,
+    }
+
+
+def _token_stats(counts: Sequence[int]) -> Dict[str, float]:
+    values = np.asarray(counts, dtype=np.float64)
+    return {
+        "mean": float(values.mean()),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "max": float(values.max()),
+    }
+
+
+class RetrievalBenchmark:
+    """Runs retrieval configurations over one repository and question set.
+
+    Collections are built in a scratch persist directory, one per distinct
+    chunking and projection setting, and shared by the configurations that
+    use it.
+    """
+
+    def __init__(
+        self,
+        repo_path: str,
+        cases: Sequence[Dict[str, Any]],
+        embedding_model: str,
+        persist_directory: str,
+        cutoffs: Sequence[int] = DEFAULT_CUTOFFS,
+    ):
+        """Initialize the benchmark.
+
+        Args:
+            repo_path: Local repository to index.
+            cases: Questions and targets from ``load_cases``.
+            embedding_model: Name or local path of the embedding model.
+            persist_directory: Scratch directory for the collections.
+            cutoffs: Ranks at which recall is measured.
+        """
+        if not os.path.isdir(repo_path):
+            raise ValueError(f"Repository path is not a local directory: {repo_path}")
+        if not cases:
+            raise ValueError("At least one benchmark case is required")
+        self.repo_path = repo_path
+        self.cases = list(cases)
+        self.embedding_model = embedding_model
+        self.persist_directory = persist_directory
+        self.cutoffs = sorted(cutoffs)
+        self._embedder = None
+        self._indexes: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+    def _index(self, configuration: Dict[str, Any]) -> Dict[str, Any]:
+        key = tuple(configuration.get(name) for name in _INDEX_KEYS)
+        if key not in self._indexes:
+            if self._embedder is None:
+                self._embedder = SentenceTransformerEmbedding(
+                    model_name=self.embedding_model
+                )
+            indexer = GitRepoIndexer(
+                self._embedder,
+                chunk_size=configuration.get("chunk_size", DEFAULT_CHUNK_SIZE),
+            )
+            collection_name = f"benchmark_{len(self._indexes)}"
+            pipeline = self._pipeline(configuration, collection_name, indexer)
+            start = time.perf_counter()
+            result = pipeline.index_repository(self.repo_path)
+            self._indexes[key] = {
+                "collection_name": collection_name,
+                "documents": result["documents_added"],
+                "elapsed_s": time.perf_counter() - start,
+            }
+        return self._indexes[key]
+
+    def _pipeline(
+        self,
+        configuration: Dict[str, Any],
+        collection_name: str,
+        indexer: Any = None,
+    ) -> Any:
+        kwargs = {
+            key: value
+            for key, value in configuration.items()
+            if key not in ("name", "retriever", "k", "chunk_size")
+        }
+        return RAGPipeline(
+            llm_model=FakeListLLM(responses=[STUB_ANSWER]),
+            embedding_model=self.embedding_model,
+            persist_directory=self.persist_directory,
+            collection_name=collection_name,
+            ollama_base_url="",
+            temperature=0.0,
+            repo_indexer=indexer,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _code_retriever(pipeline: Any) -> Any:
+        from repoqa.retrieval.retriever import CodeRetriever
+        from repoqa.storage.numpy_store import NumpyVectorStore
+
+        records = pipeline.chroma_client.get_collection(pipeline.collection_name).get(
+            include=["embeddings", "documents", "metadatas"]
+        )
+        store = NumpyVectorStore()
+        store.add(
+            records["embeddings"],
+            [
+                {**metadata, "content": content}
+                for metadata, content in zip(
+                    records["metadatas"], records["documents"]
+                )
+            ],
+        )
+        return CodeRetriever(
+            store,
+            lexical_index=pipeline.lexical_index,
+            mode=pipeline.retrieval_mode,
+            rrf_k=pipeline.rrf_k,
+        )
+
+    def _retrieve_function(self, retriever: str, pipeline: Any, k: int):
+        if retriever == "rag":
+            pipeline.retrieval_k = k
+            return pipeline._safe_retriever
+        if retriever == "pipeline":
+            return lambda question: pipeline._retrieve_documents(question, k=k)
+
+        code_retriever = self._code_retriever(pipeline)
+
+        def retrieve(question):
+            results = code_retriever.retrieve(
+                pipeline.embeddings.embed_query(question), k=k, query=question
+            )
+            return [
+                Document(
+                    page_content=result["content"],
+                    metadata={
+                        key: value
+                        for key, value in result.items()
+                        if key not in ("content", "score", "bm25", "rrf")
+                    },
+                )
+                for result in results
+            ]
+
+        return retrieve
+
+    def run_configuration(self, configuration: Dict[str, Any]) -> Dict[str, Any]:
+        """Ask every question under one configuration.
+
+        Args:
+            configuration: Configuration as described in the module docs.
+
+        Returns:
+            Quality, latency and prompt size of the configuration.
+        """
+        retriever = configuration.get("retriever", "pipeline")
+        if retriever not in RETRIEVERS:
+            raise ValueError(
+                f"Unsupported retriever: {retriever}. "
+                f"Expected one of {list(RETRIEVERS)}"
+            )
+        k = configuration.get("k", max(self.cutoffs))
+        index = self._index(configuration)
+        pipeline = self._pipeline(configuration, index["collection_name"])
+        retrieve = self._retrieve_function(retriever, pipeline, k)
+        count_tokens = get_token_counter(configuration.get("context_tokenizer"))
+
+        # One untimed question so model loading is excluded from the timings
+        retrieve("warmup")
+
+        questions, reciprocal_ranks = [], []
+        retrieval_ms, answer_ms, prompt_tokens = [], [], []
+        for case in self.cases:
+            question = case["question"]
+            start = time.perf_counter()
+            docs = retrieve(question)
+            retrieved = time.perf_counter()
+            prompt = pipeline.prompt.invoke(
+                {"context": pipeline._format_docs(docs, question), "question": question}
+            )
+            pipeline.llm.invoke(prompt)
+            answered = time.perf_counter()
+
+            retrieval_ms.append((retrieved - start) * 1000)
+            answer_ms.append((answered - start) * 1000)
+            prompt_tokens.append(count_tokens(prompt.to_string()))
+            scores = score_ranking(
+                [doc.metadata for doc in docs],
+                case["targets"],
+                self.repo_path,
+                self.cutoffs,
+            )
+            reciprocal_ranks.append(scores["reciprocal_rank"])
+            questions.append(
+                {
+                    "question": question,
+                    "rank": scores["rank"],
+                    "recall_at_k": scores["recall_at_k"],
+                    "prompt_tokens": prompt_tokens[-1],
+                }
+            )
+
+        return {
+            "name": configuration.get("name", retriever),
+            "retriever": retriever,
+            "configuration": configuration,
+            "index": {
+                "documents": index["documents"],
+                "elapsed_s": index["elapsed_s"],
+            },
+            "recall_at_k": {
+                str(cutoff): float(
+                    np.mean([q["recall_at_k"][str(cutoff)] for q in questions])
+                )
+                for cutoff in self.cutoffs
+            },
+            "mrr": float(np.mean(reciprocal_ranks)),
+            "retrieval_latency": latency_stats(retrieval_ms),
+            "answer_latency": latency_stats(answer_ms),
+            "prompt_tokens": _token_stats(prompt_tokens),
+            "questions": questions,
+        }
+
+
+def run_retrieval_benchmark(
+    repo_path: str,
+    cases: Sequence[Dict[str, Any]],
+    configurations: Sequence[Dict[str, Any]] = DEFAULT_CONFIGURATIONS,
+    embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+    persist_directory: Optional[str] = None,
+    cutoffs: Sequence[int] = DEFAULT_CUTOFFS,
+) -> Dict[str, Any]:
+    """Measure retrieval quality and latency of each configuration.
+
+    Args:
+        repo_path: Local repository to index.
+        cases: Questions and targets from ``load_cases``.
+        configurations: Configurations to compare.
+        embedding_model: Name or local path of the embedding model.
+        persist_directory: Directory for the benchmark collections; a
+            temporary directory, removed afterwards, if None.
+        cutoffs: Ranks at which recall is measured.
+
+    Returns:
+        JSON-serializable benchmark report.
+    """
+    if persist_directory is None:
+        with tempfile.TemporaryDirectory() as directory:
+            return run_retrieval_benchmark(
+                repo_path, cases, configurations, embedding_model, directory, cutoffs
+            )
+
+    benchmark = RetrievalBenchmark(
+        repo_path, cases, embedding_model, persist_directory, cutoffs
+    )
+    results = [
+        benchmark.run_configuration(configuration) for configuration in configurations
+    ]
+
+    return {
+        "benchmark": "retrieval",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "repoqa_version": repoqa.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "repo_path": os.path.abspath(repo_path),
+            "num_questions": len(cases),
+            "embedding_model": embedding_model,
+            "cutoffs": list(benchmark.cutoffs),
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark retrieval quality and latency on labelled questions"
+    )
+    parser.add_argument("--repo", required=True, help="Local repository to index")
+    parser.add_argument(
+        "--cases", required=True, help="JSONL file of questions and expected files"
+    )
+    parser.add_argument(
+        "--configs",
+        default=None,
+        help="JSON list of configurations (defaults to vector, lexical and "
+        "hybrid retrieval)",
+    )
+    parser.add_argument(
+        "--model",
+        default=None,
+        help="Embedding model name or local path "
+        "(defaults to embedding.model from the config)",
+    )
+    parser.add_argument("--cutoffs", type=int, nargs="+", default=DEFAULT_CUTOFFS)
+    parser.add_argument(
+        "--persist-directory",
+        default=None,
+        help="Keep the benchmark collections here instead of a temporary directory",
+    )
+    parser.add_argument("--output", type=str, help="Write the JSON report here")
+
+    args = parser.parse_args(argv)
+
+    configurations = DEFAULT_CONFIGURATIONS
+    if args.configs:
+        with open(args.configs) as f:
+            configurations = json.load(f)
+
+    model_name = args.model
+    if model_name is None:
+        from repoqa.config import config
+
+        model_name = config.embedding_model
+
+    report = run_retrieval_benchmark(
+        args.repo,
+        load_cases(args.cases),
+        configurations,
+        embedding_model=model_name,
+        persist_directory=args.persist_directory,
+        cutoffs=args.cutoffs,
+    )
+    report["parameters"]["cases"] = args.cases
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"Wrote benchmark report to: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Command line tools for managing stored collections, clones and snapshots.
+
+::
+
+    python -m repoqa.cli storage
+    python -m repoqa.cli compact --max-collections-mb 2048 --max-clones-mb 4096
+    python -m repoqa.cli export <collection> snapshot.tar.gz
+    python -m repoqa.cli import snapshot.tar.gz [--collection NAME] [--overwrite]
+"""
+
+import argparse
+import json
+from typing import List, Optional
+
+from repoqa.storage.collection_manager import (
+    compact_storage,
+    export_collection,
+    get_storage_usage,
+    import_collection,
+)
+
+
+def main(argv: Optional[List[str]] = None):
+    from repoqa.config import config
+
+    parser = argparse.ArgumentParser(
+        description="Manage RepoQA collections and repository clones"
+    )
+    parser.add_argument(
+        "--persist-directory",
+        default=config.vectorstore_persist_directory,
+        help="Vector store directory (default: from config)",
+    )
+    parser.add_argument(
+        "--clone-directory",
+        default=config.repository_clone_directory,
+        help="Repository clone directory (default: from config)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser(
+        "storage", help="Show disk usage and last access of collections and clones"
+    )
+
+    compact = subparsers.add_parser(
+        "compact", help="Evict least recently used data beyond the disk quotas"
+    )
+    compact.add_argument(
+        "--max-collections-mb",
+        type=int,
+        default=config.vectorstore_max_disk_mb,
+        help="Quota for all collections in MiB, 0 disables (default: from config)",
+    )
+    compact.add_argument(
+        "--max-clones-mb",
+        type=int,
+        default=config.repository_max_disk_mb,
+        help="Quota for all clones in MiB, 0 disables (default: from config)",
+    )
+
+    export = subparsers.add_parser(
+        "export", help="Write a collection to a snapshot archive"
+    )
+    export.add_argument("collection", help="Name of the collection to export")
+    export.add_argument("output", help="Path of the .tar.gz archive to write")
+
+    import_ = subparsers.add_parser(
+        "import", help="Create a collection from a snapshot archive"
+    )
+    import_.add_argument("archive", help="Snapshot archive to import")
+    import_.add_argument(
+        "--collection",
+        default=None,
+        help="Name of the new collection (default: the exported name)",
+    )
+    import_.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Replace an existing collection of the same name",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "storage":
+        result = get_storage_usage(args.persist_directory, args.clone_directory)
+    elif args.command == "export":
+        result = export_collection(
+            args.persist_directory, args.collection, args.output
+        )
+    elif args.command == "import":
+        result = import_collection(
+            args.persist_directory,
+            args.archive,
+            collection_name=args.collection,
+            overwrite=args.overwrite,
+        )
+    else:
+        result = compact_storage(
+            args.persist_directory,
+            max_collection_bytes=args.max_collections_mb * 1024 * 1024,
+            clone_directory=args.clone_directory,
+            max_clone_bytes=args.max_clones_mb * 1024 * 1024,
+        )
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -144,6 +144,61 @@ class Config:
         """Get embedding model name."""
         return self.get("embedding.model")
 
+    @property
+    def embedding_warmup(self) -> bool:
+        """Get whether to load the embedding model at startup."""
+        return self.get("embedding.warmup", False)
+
+    @property
+    def embedding_precision(self) -> str:
+        """Get embedding inference precision ('fp32', 'fp16' or 'bf16')."""
+        return self.get("embedding.precision", "fp32")
+
+    @property
+    def embedding_num_threads(self) -> int:
+        """Get number of torch CPU threads for embedding (0 for default)."""
+        return self.get("embedding.num_threads", 0)
+
+    @property
+    def embedding_compile(self) -> bool:
+        """Get whether to run the embedding model through torch.compile."""
+        return self.get("embedding.compile", False)
+
+    @property
+    def embedding_dispatcher_enabled(self) -> bool:
+        """Get whether concurrent query encodes are micro-batched."""
+        return self.get("embedding.dispatcher.enabled", False)
+
+    @property
+    def embedding_dispatcher_max_batch_size(self) -> int:
+        """Get the maximum number of queries encoded in one batch."""
+        return self.get("embedding.dispatcher.max_batch_size", 32)
+
+    @property
+    def embedding_dispatcher_max_wait_ms(self) -> float:
+        """Get how long a query waits for others to join its batch."""
+        return self.get("embedding.dispatcher.max_wait_ms", 5)
+
+    @property
+    def embedding_projection_method(self) -> str:
+        """Get embedding projection method ('none', 'pca' or 'truncate')."""
+        return self.get("embedding.projection.method", "none")
+
+    @property
+    def embedding_projection_dim(self) -> int:
+        """Get target dimension of the embedding projection."""
+        return self.get("embedding.projection.dim", 256)
+
+    @property
+    def embedding_projection_shared_path(self) -> str:
+        """Get path of a projection shared by all collections."""
+        return self.get("embedding.projection.shared_path", "")
+
+    @property
+    def vectorstore_backend(self) -> str:
+        """Get vector store backend ('chroma', 'faiss', 'numpy' or 'quantized')."""
+        return self.get("vectorstore.backend", "chroma")
+
     @property
     def vectorstore_persist_directory(self) -> str:
         """Get vector store persist directory."""
@@ -159,11 +214,146 @@ class Config:
         """Get vector store chunk size."""
         return self.get("vectorstore.chunk_size")
 
+    @property
+    def vectorstore_write_batch_size(self) -> int:
+        """Get documents per vector store write (0 for the client maximum)."""
+        return self.get("vectorstore.write_batch_size", 0)
+
+    @property
+    def vectorstore_max_disk_mb(self) -> int:
+        """Get the disk quota for all collections in MiB (0 for no quota)."""
+        return self.get("vectorstore.max_disk_mb", 0)
+
+    @property
+    def faiss_index_type(self) -> str:
+        """Get FAISS index type ('auto', 'flat', 'hnsw' or 'ivfpq')."""
+        return self.get("vectorstore.faiss.index_type", "auto")
+
+    @property
+    def faiss_hnsw_threshold(self) -> int:
+        """Get collection size from which FAISS uses an HNSW index."""
+        return self.get("vectorstore.faiss.hnsw_threshold", 50000)
+
+    @property
+    def faiss_ivfpq_threshold(self) -> int:
+        """Get collection size from which FAISS uses an IVF-PQ index."""
+        return self.get("vectorstore.faiss.ivfpq_threshold", 1000000)
+
+    @property
+    def faiss_mmap(self) -> bool:
+        """Get whether to memory-map persisted FAISS indexes."""
+        return self.get("vectorstore.faiss.mmap", True)
+
+    @property
+    def quantized_quantization(self) -> str:
+        """Get quantized store code type ('int8' or 'binary')."""
+        return self.get("vectorstore.quantized.quantization", "int8")
+
+    @property
+    def quantized_rerank_factor(self) -> int:
+        """Get candidates re-ranked exactly per result (0 disables re-ranking)."""
+        return self.get("vectorstore.quantized.rerank_factor", 10)
+
+    @property
+    def retrieval_mode(self) -> str:
+        """Get retrieval mode ('vector', 'lexical' or 'hybrid')."""
+        return self.get("retrieval.mode", "hybrid")
+
+    @property
+    def retrieval_rrf_k(self) -> int:
+        """Get the rank offset for reciprocal rank fusion in hybrid retrieval."""
+        return self.get("retrieval.rrf_k", 60)
+
+    @property
+    def retrieval_symbol_boost(self) -> bool:
+        """Check whether definitions of identifiers in a question are boosted."""
+        return self.get("retrieval.symbol_boost", True)
+
+    @property
+    def retrieval_top_k(self) -> int:
+        """Get the number of chunks passed to the LLM in RAG mode."""
+        return self.get("retrieval.top_k", 5)
+
+    @property
+    def retrieval_duplicate_bits(self) -> int:
+        """Get the SimHash distance of near-duplicate chunks (-1 keeps them)."""
+        return self.get("retrieval.duplicate_bits", 6)
+
+    @property
+    def retrieval_mmr_lambda(self) -> float:
+        """Get the maximal marginal relevance trade-off (1.0 disables MMR)."""
+        return self.get("retrieval.mmr_lambda", 1.0)
+
+    @property
+    def retrieval_neighbor_chunks(self) -> int:
+        """Get the adjacent chunks merged into each retrieved chunk."""
+        return self.get("retrieval.neighbor_chunks", 0)
+
+    @property
+    def rerank_model(self) -> str:
+        """Get the cross-encoder re-ranking retrieved chunks ('' disables)."""
+        return self.get("rerank.model", "")
+
+    @property
+    def rerank_candidates(self) -> int:
+        """Get the number of chunks retrieved for re-ranking."""
+        return self.get("rerank.candidates", 20)
+
+    @property
+    def rerank_budget_ms(self) -> float:
+        """Get the time allowed for re-ranking (0 scores every candidate)."""
+        return self.get("rerank.budget_ms", 200)
+
+    @property
+    def rerank_device(self) -> str:
+        """Get the device the cross-encoder runs on."""
+        return self.get("rerank.device", "cpu")
+
+    @property
+    def context_max_tokens(self) -> int:
+        """Get the token budget for retrieved context (0 disables packing)."""
+        return self.get("context.max_tokens", 12000)
+
+    @property
+    def context_tokenizer(self) -> str:
+        """Get the tokenizer used to count context tokens ('' estimates)."""
+        return self.get("context.tokenizer", "")
+
+    @property
+    def answer_cache_enabled(self) -> bool:
+        """Check whether /ask reuses answers to repeated questions."""
+        return self.get("answer_cache.enabled", True)
+
+    @property
+    def answer_cache_similarity(self) -> float:
+        """Get the question similarity needed to reuse a cached answer."""
+        return self.get("answer_cache.similarity", 0.95)
+
+    @property
+    def answer_cache_max_entries(self) -> int:
+        """Get the maximum number of cached answers."""
+        return self.get("answer_cache.max_entries", 10000)
+
+    @property
+    def search_max_workers(self) -> int:
+        """Get the number of collections searched in parallel by /search."""
+        return self.get("search.max_workers", 8)
+
+    @property
+    def search_timeout_s(self) -> float:
+        """Get seconds /search waits for collections (0 waits for all)."""
+        return self.get("search.timeout_s", 30)
+
     @property
     def repository_clone_directory(self) -> str:
         """Get repository clone directory."""
         return self.get("repository.clone_directory")
 
+    @property
+    def repository_max_disk_mb(self) -> int:
+        """Get the disk quota for all repository clones in MiB (0 for no quota)."""
+        return self.get("repository.max_disk_mb", 0)
+
     @property
     def pipeline_mode(self) -> str:
         """Get pipeline mode."""
@@ -204,6 +394,11 @@ class Config:
         """Get API version."""
         return self.get("api.version")
 
+    @property
+    def api_admin_token(self) -> str:
+        """Get the bearer token for /admin endpoints (empty disables them)."""
+        return self.get("api.admin_token", "")
+
 
 # Global config instance
 config = Config()
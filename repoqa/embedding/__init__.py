@@ -1,4 +1,12 @@
+from repoqa.embedding.dispatcher import EmbeddingDispatcher
 from repoqa.embedding.embedding_model import EmbeddingModel
+from repoqa.embedding.projection import EmbeddingProjection, ProjectedEmbedding
 from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
 
-__all__ = ["EmbeddingModel", "SentenceTransformerEmbedding"]
+__all__ = [
+    "EmbeddingDispatcher",
+    "EmbeddingModel",
+    "EmbeddingProjection",
+    "ProjectedEmbedding",
+    "SentenceTransformerEmbedding",
+]
@@ -0,0 +1,252 @@
+"""Micro-batching dispatcher for concurrent query embedding."""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from repoqa.embedding.embedding_model import EmbeddingModel
+
+_STOP = object()
+
+# Dispatchers shared by every pipeline in the process, keyed by
+# (model identity, max_batch_size, max_wait_ms). The API builds a pipeline per
+# request, so only a shared queue can coalesce concurrent requests' queries.
+_SHARED_DISPATCHERS: Dict[Tuple[Any, ...], "EmbeddingDispatcher"] = {}
+_SHARED_DISPATCHERS_LOCK = threading.Lock()
+
+
+class EmbeddingDispatcher(EmbeddingModel):
+    """Coalesces concurrent encode requests into batched model calls.
+
+    Single-query encodes are the worst case for transformer throughput. The
+    dispatcher queues incoming texts and a background worker flushes them as
+    one batch once either ``max_batch_size`` texts are waiting or
+    ``max_wait_ms`` has elapsed since the first queued text. Each caller gets
+    a future resolving to its own embedding, so the dispatcher can be used
+    from threads (``encode``/``submit``) and coroutines (``aencode``).
+
+    It implements ``EmbeddingModel`` so it can replace the wrapped model
+    wherever single queries are encoded. ``encode_batch`` bypasses the queue
+    since callers already batch those texts.
+    """
+
+    def __init__(
+        self,
+        embedding_model: EmbeddingModel,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        """Initialize the dispatcher.
+
+        Args:
+            embedding_model: Model used to encode the collected batches.
+            max_batch_size: Maximum number of texts encoded in one call.
+            max_wait_ms: Maximum time to wait for a batch to fill up,
+                measured from the arrival of its first text.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+
+        super().__init__(embedding_model.model_name)
+        self.embedding_model = embedding_model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, text: str) -> Future:
+        """Queue a single text for encoding.
+
+        Args:
+            text: Text to encode.
+
+        Returns:
+            Future resolving to the embedding of ``text``.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("EmbeddingDispatcher is closed")
+            self._ensure_worker()
+            self._queue.put((text, future))
+        return future
+
+    async def aencode(self, text: str) -> List[float]:
+        """Encode a single text without blocking the event loop.
+
+        Args:
+            text: Text to encode.
+
+        Returns:
+            Embedding of ``text`` as a list of floats.
+        """
+        return await asyncio.wrap_future(self.submit(text))
+
+    def encode(self, texts: Union[str, List[str]], **kwargs) -> List[List[float]]:
+        """Encode text(s) through the batching queue.
+
+        Args:
+            texts: Single text string or list of texts to encode.
+            **kwargs: Unsupported; batched requests share one model call.
+
+        Returns:
+            List of embeddings as float lists.
+        """
+        if kwargs:
+            raise TypeError(
+                "EmbeddingDispatcher.encode does not accept encoding kwargs"
+            )
+
+        if isinstance(texts, str):
+            texts = [texts]
+
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def encode_batch(
+        self, texts: List[str], batch_size: int = 32, **kwargs
+    ) -> List[List[float]]:
+        """Encode an already batched list of texts with the wrapped model."""
+        return self.embedding_model.encode_batch(
+            texts, batch_size=batch_size, **kwargs
+        )
+
+    @property
+    def identity(self) -> Tuple[Any, ...]:
+        """Identity of the wrapped model, whose embeddings are returned."""
+        return self.embedding_model.identity
+
+    def warmup(self) -> None:
+        """Warm up the wrapped model."""
+        self.embedding_model.warmup()
+
+    def get_embedding_dim(self) -> Optional[int]:
+        """Get the dimensionality of the wrapped model's embeddings."""
+        return self.embedding_model.get_embedding_dim()
+
+    def close(self) -> None:
+        """Flush pending requests and stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            worker = self._worker
+            self._queue.put(_STOP)
+
+        if worker is not None:
+            worker.join()
+
+    def __enter__(self) -> "EmbeddingDispatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread on first use. Caller holds the lock."""
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run, name="embedding-dispatcher", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self) -> None:
+        """Worker loop collecting and encoding batches until stopped."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch: List[Tuple[str, Future]] = [item]
+            deadline = time.monotonic() + self.max_wait_ms / 1000.0
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._encode(batch)
+
+    def _encode(self, batch: List[Tuple[str, Future]]) -> None:
+        """Encode one batch and resolve its futures."""
+        batch = [(text, f) for text, f in batch if f.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        texts = [text for text, _ in batch]
+        try:
+            embeddings = self.embedding_model.encode(texts)
+            if len(embeddings) != len(texts):
+                raise ValueError(
+                    f"Expected {len(texts)} embeddings, got {len(embeddings)}"
+                )
+        except Exception as e:
+            logger.error(f"Batched encoding of {len(texts)} texts failed: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        logger.debug(f"Encoded micro-batch of {len(texts)} texts")
+        for (_, future), embedding in zip(batch, embeddings):
+            future.set_result(embedding)
+
+
+def get_shared_dispatcher(
+    embedding_model: EmbeddingModel,
+    max_batch_size: int = 32,
+    max_wait_ms: float = 5.0,
+) -> EmbeddingDispatcher:
+    """Get the process-wide dispatcher for a model and batching settings.
+
+    The first caller's ``embedding_model`` is wrapped; later callers whose
+    model has the same ``identity`` (name, device, precision, compile) and
+    the same batching settings share its queue and worker.
+
+    Args:
+        embedding_model: Model used to encode the collected batches.
+        max_batch_size: Maximum number of texts encoded in one call.
+        max_wait_ms: Maximum time to wait for a batch to fill up.
+
+    Returns:
+        Shared ``EmbeddingDispatcher``.
+    """
+    key = (*embedding_model.identity, max_batch_size, float(max_wait_ms))
+    with _SHARED_DISPATCHERS_LOCK:
+        dispatcher = _SHARED_DISPATCHERS.get(key)
+        if dispatcher is None:
+            dispatcher = EmbeddingDispatcher(
+                embedding_model,
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+            )
+            _SHARED_DISPATCHERS[key] = dispatcher
+    return dispatcher
+
+
+def close_shared_dispatchers() -> None:
+    """Close and drop all shared dispatchers."""
+    with _SHARED_DISPATCHERS_LOCK:
+        dispatchers = list(_SHARED_DISPATCHERS.values())
+        _SHARED_DISPATCHERS.clear()
+    for dispatcher in dispatchers:
+        dispatcher.close()
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Union
+from typing import Any, List, Optional, Tuple, Union
 
 
 class EmbeddingModel(ABC):
@@ -49,6 +49,22 @@ class EmbeddingModel(ABC):
         """
         raise NotImplementedError()
 
+    @property
+    def identity(self) -> Tuple[Any, ...]:
+        """Hashable key shared by models that produce the same embeddings.
+
+        The default is the class and model name; models with further
+        settings that change their output extend it.
+        """
+        return (type(self).__name__, self.model_name)
+
+    def warmup(self) -> None:
+        """Load model weights ahead of the first request.
+
+        Implementations that load lazily should override this; the default
+        is a no-op.
+        """
+
     @abstractmethod
     def get_embedding_dim(self) -> Optional[int]:
         """Get the dimensionality of the embeddings.
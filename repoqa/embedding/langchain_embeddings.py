@@ -0,0 +1,35 @@
+"""LangChain adapter for RepoQA embedding models."""
+
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from repoqa.embedding.embedding_model import EmbeddingModel
+
+
+class LangChainEmbeddings(Embeddings):
+    """Expose an ``EmbeddingModel`` through LangChain's ``Embeddings`` API.
+
+    Lets LangChain vector stores share the RepoQA embedding model (and its
+    lazy loading) instead of loading a separate HuggingFace copy.
+    """
+
+    def __init__(self, embedding_model: EmbeddingModel, batch_size: int = 32):
+        """Initialize the adapter.
+
+        Args:
+            embedding_model: Model used to compute embeddings.
+            batch_size: Batch size used when embedding documents.
+        """
+        self.embedding_model = embedding_model
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents."""
+        if not texts:
+            return []
+        return self.embedding_model.encode_batch(texts, batch_size=self.batch_size)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self.embedding_model.encode(text)[0]
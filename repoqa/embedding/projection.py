@@ -0,0 +1,275 @@
+"""Dimensionality reduction for stored and query embeddings."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from repoqa.embedding.embedding_model import EmbeddingModel
+
+PROJECTION_METHODS = ("pca", "truncate")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows, leaving all-zero rows untouched."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class EmbeddingProjection:
+    """Linear projection from full-dimension embeddings to a smaller space.
+
+    Two methods are supported:
+
+    - ``pca``: principal components fitted on a collection's embeddings.
+    - ``truncate``: keep the leading dimensions (Matryoshka-style), which
+      only preserves quality for models trained with nested dimensions.
+
+    Projected vectors are re-normalized so distances stay comparable with
+    the normalized embeddings produced by the embedding models.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        components: np.ndarray,
+        mean: Optional[np.ndarray] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """Initialize the projection.
+
+        Args:
+            method: Method used to build the projection.
+            components: Projection matrix of shape (output_dim, input_dim).
+            mean: Optional mean subtracted before projecting.
+            metadata: Extra information stored with the projection, such as
+                recall measured at fit time.
+        """
+        if method not in PROJECTION_METHODS:
+            raise ValueError(f"Unsupported projection method: {method}")
+
+        self.method = method
+        self.components = np.asarray(components, dtype=np.float32)
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float32)
+        self.metadata: Dict[str, Any] = dict(metadata or {})
+
+    @property
+    def input_dim(self) -> int:
+        """Dimension of the embeddings the projection accepts."""
+        return self.components.shape[1]
+
+    @property
+    def output_dim(self) -> int:
+        """Dimension of the projected embeddings."""
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(
+        cls, method: str, embeddings: Sequence[Sequence[float]], dim: int
+    ) -> "EmbeddingProjection":
+        """Build a projection for the given embeddings.
+
+        Args:
+            method: 'pca' or 'truncate'.
+            embeddings: Full-dimension embeddings to fit on.
+            dim: Target dimension. Capped at the input dimension.
+
+        Returns:
+            Fitted projection.
+        """
+        if method not in PROJECTION_METHODS:
+            raise ValueError(f"Unsupported projection method: {method}")
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) == 0:
+            raise ValueError("Cannot fit a projection on empty embeddings")
+
+        input_dim = matrix.shape[1]
+        dim = min(dim, input_dim)
+
+        if method == "truncate":
+            return cls(method, np.eye(input_dim, dtype=np.float32)[:dim])
+
+        # PCA via the eigendecomposition of the (input_dim x input_dim)
+        # covariance, which stays cheap however many chunks a repo has.
+        mean = matrix.mean(axis=0)
+        centered = (matrix - mean).astype(np.float64)
+        covariance = centered.T @ centered
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1][:dim]
+        components = eigenvectors[:, order].T
+
+        total = float(eigenvalues.sum())
+        explained = float(eigenvalues[order].sum() / total) if total > 0 else 1.0
+        return cls(
+            method,
+            components,
+            mean=mean,
+            metadata={"explained_variance": explained},
+        )
+
+    def transform(
+        self, embeddings: Union[Sequence[Sequence[float]], np.ndarray]
+    ) -> np.ndarray:
+        """Project embeddings into the reduced space.
+
+        Args:
+            embeddings: Embeddings of shape (n, input_dim).
+
+        Returns:
+            Normalized projected embeddings of shape (n, output_dim).
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        if matrix.shape[1] != self.input_dim:
+            raise ValueError(
+                f"Expected embeddings of dimension {self.input_dim}, "
+                f"got {matrix.shape[1]}"
+            )
+
+        if self.mean is not None:
+            matrix = matrix - self.mean
+        return _normalize(matrix @ self.components.T)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Persist the projection to an ``.npz`` file.
+
+        Args:
+            path: Destination file path.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {"components": self.components}
+        if self.mean is not None:
+            arrays["mean"] = self.mean
+        # np.savez appends .npz unless given an open file
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                method=np.array(self.method),
+                metadata=np.array(json.dumps(self.metadata)),
+                **arrays,
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "EmbeddingProjection":
+        """Load a projection saved with ``save``.
+
+        Args:
+            path: Path to the ``.npz`` file.
+
+        Returns:
+            Loaded projection.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                str(data["method"]),
+                data["components"],
+                mean=data["mean"] if "mean" in data.files else None,
+                metadata=json.loads(str(data["metadata"])),
+            )
+
+
+def recall_at_k(
+    full_embeddings: Sequence[Sequence[float]],
+    projected_embeddings: Sequence[Sequence[float]],
+    k: int = 10,
+    num_queries: int = 200,
+    seed: int = 0,
+) -> float:
+    """Measure how well reduced vectors preserve full-dimension neighbours.
+
+    A sample of the stored vectors is used as queries. For each one, the
+    top-k neighbours by cosine similarity are computed in both spaces and
+    the overlap is averaged.
+
+    Args:
+        full_embeddings: Original embeddings.
+        projected_embeddings: The same embeddings after projection.
+        k: Number of neighbours to compare.
+        num_queries: Maximum number of sampled queries.
+        seed: Seed for the query sample.
+
+    Returns:
+        Mean recall@k in [0, 1].
+    """
+    full = _normalize(np.asarray(full_embeddings, dtype=np.float32))
+    reduced = _normalize(np.asarray(projected_embeddings, dtype=np.float32))
+    if len(full) != len(reduced):
+        raise ValueError("Full and projected embeddings must have the same length")
+    if len(full) == 0:
+        return 1.0
+
+    k = min(k, len(full))
+    rng = np.random.default_rng(seed)
+    queries = rng.choice(len(full), size=min(num_queries, len(full)), replace=False)
+
+    full_top = np.argpartition(-(full[queries] @ full.T), k - 1, axis=1)[:, :k]
+    reduced_top = np.argpartition(-(reduced[queries] @ reduced.T), k - 1, axis=1)[
+        :, :k
+    ]
+
+    hits = [
+        len(set(expected) & set(actual))
+        for expected, actual in zip(full_top, reduced_top)
+    ]
+    return float(np.mean(hits) / k)
+
+
+class ProjectedEmbedding(EmbeddingModel):
+    """Embedding model that applies an optional projection to its outputs.
+
+    With no projection set it passes embeddings through unchanged, so
+    pipelines can always wrap their model and install a projection once one
+    has been fitted or loaded for the collection.
+    """
+
+    def __init__(
+        self,
+        embedding_model: EmbeddingModel,
+        projection: Optional[EmbeddingProjection] = None,
+    ):
+        """Initialize the wrapper.
+
+        Args:
+            embedding_model: Model producing full-dimension embeddings.
+            projection: Projection applied to every embedding, if any.
+        """
+        super().__init__(embedding_model.model_name)
+        self.embedding_model = embedding_model
+        self.projection = projection
+
+    @property
+    def identity(self) -> Tuple[Any, ...]:
+        """Unique per instance, since its projection can be swapped at any time."""
+        return (*super().identity, id(self))
+
+    def _project(self, embeddings: List[List[float]]) -> List[List[float]]:
+        if self.projection is None or not embeddings:
+            return embeddings
+        return self.projection.transform(embeddings).tolist()
+
+    def encode(self, texts: Union[str, List[str]], **kwargs) -> List[List[float]]:
+        """Encode text(s) and project the embeddings."""
+        return self._project(self.embedding_model.encode(texts, **kwargs))
+
+    def encode_batch(
+        self, texts: List[str], batch_size: int = 32, **kwargs
+    ) -> List[List[float]]:
+        """Encode a batch of texts and project the embeddings."""
+        return self._project(
+            self.embedding_model.encode_batch(texts, batch_size=batch_size, **kwargs)
+        )
+
+    def warmup(self) -> None:
+        """Warm up the wrapped model."""
+        self.embedding_model.warmup()
+
+    def get_embedding_dim(self) -> Optional[int]:
+        """Get the dimensionality of the (projected) embeddings."""
+        if self.projection is not None:
+            return self.projection.output_dim
+        return self.embedding_model.get_embedding_dim()
@@ -1,12 +1,30 @@
 """Sentence Transformer based embedding model implementation."""
 
-from typing import List, Optional, Union
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import torch
 from loguru import logger
-from sentence_transformers import SentenceTransformer
 
-from repoqa.embedding import EmbeddingModel
+from repoqa.embedding.embedding_model import EmbeddingModel
+from repoqa.util.lazy_import import LazyImport
+
+torch = LazyImport("torch")
+SentenceTransformer = LazyImport("sentence_transformers", "SentenceTransformer")
+
+# Supported inference precisions mapped to torch dtype names
+PRECISIONS = {"fp32": "float32", "fp16": "float16", "bf16": "bfloat16"}
+
+# Loaded models shared by every SentenceTransformerEmbedding in the process,
+# keyed by (model_name, device, precision, compile). The API builds a pipeline
+# per request, so without this each request would reload the weights.
+_MODEL_CACHE: Dict[Tuple[str, str, str, bool], Any] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def clear_model_cache() -> None:
+    """Drop all cached SentenceTransformer models."""
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
 
 
 class SentenceTransformerEmbedding(EmbeddingModel):
@@ -15,9 +33,24 @@ class SentenceTransformerEmbedding(EmbeddingModel):
     This implementation uses the SentenceTransformers library which provides
     state-of-the-art text embeddings. By default, it uses the 'all-MiniLM-L6-v2'
     model which is optimized for semantic similarity tasks.
+
+    The model is loaded on first use (or by ``warmup``) rather than in the
+    constructor, and loaded models are shared across instances.
+
+    Inference options (precision, CPU thread count, ``torch.compile``) default
+    to the ``embedding`` section of the configuration. Each optimization is
+    checked with a probe encode after it is applied and rolled back if the
+    device cannot run it, so unsupported settings degrade to plain fp32.
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2", device: str = None):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        device: str = None,
+        precision: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        compile: Optional[bool] = None,
+    ):
         """Initialize the Sentence Transformer model.
 
         Args:
@@ -25,18 +58,117 @@ class SentenceTransformerEmbedding(EmbeddingModel):
                       Defaults to 'all-MiniLM-L6-v2'.
             device: Device to run the model on ('cpu', 'cuda', etc.).
                    If None, automatically selects available device.
+            precision: Inference precision, one of 'fp32', 'fp16' or 'bf16'.
+                   If None, uses ``embedding.precision`` from the config.
+            num_threads: Number of intra-op CPU threads for torch. If None,
+                   uses ``embedding.num_threads``; 0 keeps torch's default.
+            compile: Whether to wrap the transformer in ``torch.compile``.
+                   If None, uses ``embedding.compile``.
         """
         super().__init__(model_name)
 
-        if device is None:
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-
-        self.device = device
-        logger.debug(
-            f"Loading SentenceTransformer model '{model_name}' on device '{device}'"
-        )
-        self.model = SentenceTransformer(model_name, device=device)
-        logger.info(f"Model '{model_name}' loaded successfully.")
+        if precision is None or num_threads is None or compile is None:
+            from repoqa.config import config
+
+            if precision is None:
+                precision = config.embedding_precision
+            if num_threads is None:
+                num_threads = config.embedding_num_threads
+            if compile is None:
+                compile = config.embedding_compile
+
+        if precision not in PRECISIONS:
+            raise ValueError(
+                f"Unsupported precision: {precision}. "
+                f"Expected one of {sorted(PRECISIONS)}"
+            )
+
+        self._device = device
+        self.precision = precision
+        self.num_threads = num_threads
+        self.compile = compile
+        self._model = None
+
+    @property
+    def identity(self) -> Tuple[Any, ...]:
+        """Model name, requested device, precision and ``torch.compile``."""
+        return (*super().identity, self._device, self.precision, bool(self.compile))
+
+    @property
+    def device(self) -> str:
+        """Device the model runs on, resolved on first access."""
+        if self._device is None:
+            self._device = "cuda" if torch.cuda.is_available() else "cpu"
+        return self._device
+
+    @property
+    def model(self) -> Any:
+        """Underlying SentenceTransformer, loaded on first access."""
+        if self._model is None:
+            self._model = self._load_model()
+        return self._model
+
+    def _load_model(self) -> Any:
+        """Load the model or reuse an already loaded instance."""
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+
+        key = (self.model_name, self.device, self.precision, bool(self.compile))
+        with _MODEL_CACHE_LOCK:
+            model = _MODEL_CACHE.get(key)
+            if model is None:
+                logger.debug(
+                    f"Loading SentenceTransformer model '{self.model_name}' "
+                    f"on device '{self.device}'"
+                )
+                model = SentenceTransformer(self.model_name, device=self.device)
+                self._apply_precision(model)
+                if self.compile:
+                    self._apply_compile(model)
+                _MODEL_CACHE[key] = model
+                logger.info(f"Model '{self.model_name}' loaded successfully.")
+        return model
+
+    def _apply_precision(self, model: Any) -> None:
+        """Cast the model to the configured precision, falling back to fp32."""
+        precision = self.precision
+        if precision == "fp32":
+            return
+
+        if precision == "fp16" and self.device == "cpu":
+            # Half precision kernels are slow or missing on most CPUs
+            logger.warning("fp16 is not supported on CPU, using fp32 instead")
+            return
+
+        try:
+            model.to(dtype=getattr(torch, PRECISIONS[precision]))
+            self._probe(model)
+            logger.info(f"Running '{self.model_name}' in {precision}")
+        except Exception as e:
+            logger.warning(f"{precision} inference failed ({e}), using fp32 instead")
+            model.to(dtype=torch.float32)
+
+    def _apply_compile(self, model: Any) -> None:
+        """Wrap the transformer in torch.compile, keeping eager mode on failure."""
+        module = model._first_module()
+        eager_model = module.auto_model
+        try:
+            module.auto_model = torch.compile(eager_model)
+            # Compilation happens on the first call, so probe to surface errors
+            self._probe(model)
+            logger.info(f"Compiled '{self.model_name}' with torch.compile")
+        except Exception as e:
+            logger.warning(f"torch.compile failed ({e}), using eager mode instead")
+            module.auto_model = eager_model
+
+    @staticmethod
+    def _probe(model: Any) -> None:
+        """Run a tiny encode to check that the model still works."""
+        model.encode("probe", convert_to_tensor=False)
+
+    def warmup(self) -> None:
+        """Load the model and run one encode so first requests are fast."""
+        self.model.encode("warmup", convert_to_tensor=False)
 
     def encode(self, texts: Union[str, List[str]], **kwargs) -> List[List[float]]:
         """Encode text(s) into embeddings.
@@ -71,12 +203,12 @@ class SentenceTransformerEmbedding(EmbeddingModel):
         Returns:
             List of embeddings as float lists.
         """
+        kwargs.setdefault("show_progress_bar", True)
         embeddings = self.model.encode(
             texts,
             batch_size=batch_size,
             convert_to_tensor=False,
             normalize_embeddings=True,
-            show_progress_bar=True,
             **kwargs,
         )
         return embeddings.tolist()
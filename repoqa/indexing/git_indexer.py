@@ -5,6 +5,7 @@ import os
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from fnmatch import fnmatch
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
@@ -14,6 +15,31 @@ from tqdm import tqdm
 
 from repoqa.embedding.embedding_model import EmbeddingModel
 from repoqa.indexing.indexer import RepoIndexer
+from repoqa.indexing.lexical import BM25Index
+from repoqa.indexing.scope import SCOPE_FIELDS, file_metadata
+from repoqa.indexing.simhash import simhash, to_hex
+from repoqa.indexing.symbols import SymbolTable
+from repoqa.indexing.trigram import TrigramIndex
+
+
+def is_git_url(repo_path: str) -> bool:
+    """Check whether a repository path is a remote git URL."""
+    git_prefixes = ("git@", "https://", "git://")
+    return any(repo_path.startswith(prefix) for prefix in git_prefixes)
+
+
+def get_clone_path(repo_url: str, target_dir: str) -> str:
+    """Get the directory a remote repository is cloned into.
+
+    Args:
+        repo_url: Remote repository URL.
+        target_dir: Directory holding clones.
+
+    Returns:
+        Path of the clone inside ``target_dir``.
+    """
+    repo_name = repo_url.split("/")[-1].replace(".git", "")
+    return os.path.join(target_dir, repo_name)
 
 
 @dataclass
@@ -22,6 +48,16 @@ class CodeChunk:
 
     content: str
     file_path: str
+    simhash: Optional[str] = None
+    # Position of the chunk in its file, with 1-based inclusive line numbers
+    chunk_index: Optional[int] = None
+    start_line: Optional[int] = None
+    end_line: Optional[int] = None
+    # Scope metadata derived from the file's path in the repository
+    language: Optional[str] = None
+    directory: Optional[str] = None
+    extension: Optional[str] = None
+    is_test: Optional[bool] = None
 
 
 class GitRepoIndexer(RepoIndexer):
@@ -48,10 +84,16 @@ class GitRepoIndexer(RepoIndexer):
         embedding_model: EmbeddingModel,
         chunk_size: int = 1024,
         batch_size: int = 32,
+        build_lexical_index: bool = True,
+        build_trigram_index: bool = True,
+        build_symbol_table: bool = True,
     ):
         super().__init__(embedding_model)
         self.chunk_size = chunk_size
         self.batch_size = batch_size
+        self.build_lexical_index = build_lexical_index
+        self.build_trigram_index = build_trigram_index
+        self.build_symbol_table = build_symbol_table
 
     def _should_ignore(self, path: str) -> bool:
         """Check if a path should be ignored.
@@ -75,8 +117,20 @@ class GitRepoIndexer(RepoIndexer):
 
         return False
 
-    def _chunk_file(self, file_path: str) -> List[CodeChunk]:
-        """Split a file into simple text chunks."""
+    def _chunk_file(
+        self, file_path: str, repo_path: Optional[str] = None
+    ) -> List[CodeChunk]:
+        """Split a file into simple text chunks.
+
+        Args:
+            file_path: Path of the file.
+            repo_path: Repository root; when given, the chunks carry the
+                scope metadata of the file's path relative to it.
+        """
+        scope = {}
+        if repo_path is not None:
+            scope = file_metadata(os.path.relpath(file_path, repo_path))
+
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 lines = f.readlines()
@@ -88,7 +142,17 @@ class GitRepoIndexer(RepoIndexer):
         while start < len(lines):
             end = min(start + self.chunk_size, len(lines))
             chunk_text = "".join(lines[start:end])
-            chunks.append(CodeChunk(content=chunk_text, file_path=file_path))
+            chunks.append(
+                CodeChunk(
+                    content=chunk_text,
+                    file_path=file_path,
+                    simhash=to_hex(simhash(chunk_text)),
+                    chunk_index=len(chunks),
+                    start_line=start + 1,
+                    end_line=end,
+                    **scope,
+                )
+            )
             start = end
 
         return chunks
@@ -104,13 +168,11 @@ class GitRepoIndexer(RepoIndexer):
         return code_files
 
     def _is_git_url(self, repo_path: str) -> bool:
-        git_prefixes = ("git@", "https://", "git://")
-        return any(repo_path.startswith(prefix) for prefix in git_prefixes)
+        return is_git_url(repo_path)
 
     def _clone_repository(self, repo_url: str, target_dir: str) -> str:
         try:
-            repo_name = repo_url.split("/")[-1].replace(".git", "")
-            clone_path = os.path.join(target_dir, repo_name)
+            clone_path = get_clone_path(repo_url, target_dir)
             if os.path.exists(clone_path):
                 repo = git.Repo(clone_path)
                 repo.remotes.origin.pull()
@@ -140,7 +202,10 @@ class GitRepoIndexer(RepoIndexer):
             with ThreadPoolExecutor() as executor:
                 chunk_lists = list(
                     tqdm(
-                        executor.map(self._chunk_file, code_files),
+                        executor.map(
+                            partial(self._chunk_file, repo_path=repo_path),
+                            code_files,
+                        ),
                         total=len(code_files),
                         desc="Chunking files",
                     )
@@ -152,6 +217,38 @@ class GitRepoIndexer(RepoIndexer):
                 texts, batch_size=self.batch_size
             )
 
+            # Keyed like the pipelines' documents: stripped content, file path
+            lexical_index = None
+            if self.build_lexical_index:
+                lexical_index = BM25Index.build(
+                    [
+                        {
+                            "content": text.strip(),
+                            "file_path": chunk.file_path,
+                            "simhash": chunk.simhash,
+                            "chunk_index": chunk.chunk_index,
+                            "start_line": chunk.start_line,
+                            "end_line": chunk.end_line,
+                            **{key: getattr(chunk, key) for key in SCOPE_FIELDS},
+                        }
+                        for text, chunk in zip(texts, chunks)
+                        if text.strip()
+                    ]
+                )
+
+            # A file's chunks are consecutive and together hold its full text
+            parts: Dict[str, List[str]] = {}
+            for chunk in chunks:
+                parts.setdefault(chunk.file_path, []).append(chunk.content)
+            files = [(path, "".join(texts)) for path, texts in parts.items()]
+
+            trigram_index = None
+            if self.build_trigram_index:
+                trigram_index = TrigramIndex.build(files)
+            symbol_table = None
+            if self.build_symbol_table:
+                symbol_table = SymbolTable.build(files)
+
             try:
                 repo = git.Repo(repo_path)
                 repo_info = {
@@ -165,6 +262,9 @@ class GitRepoIndexer(RepoIndexer):
             return {
                 "chunks": chunks,
                 "embeddings": embeddings,
+                "lexical_index": lexical_index,
+                "trigram_index": trigram_index,
+                "symbol_table": symbol_table,
                 "file_count": len(code_files),
                 "repo_info": repo_info,
                 "repo_path": repo_path,  # Return the actual repo path used
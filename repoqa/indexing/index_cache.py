@@ -0,0 +1,70 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Process-wide cache of loaded search indexes.
+
+Every pipeline loads its collection's lexical index, trigram index and
+symbol table. The loaded indexes are read-only, so one copy per directory is
+shared by all pipelines of the process and only reloaded once the files in
+the directory change.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+
+Index = TypeVar("Index")
+
+# Loaded index per (index class, absolute directory), with the name, mtime
+# and size of the files it was loaded from
+_INDEXES: Dict[Tuple[type, str], Tuple[Tuple[Any, ...], Any]] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _stamp(directory: str) -> Tuple[Any, ...]:
+    """Name, mtime and size of the files in a directory."""
+    stamp = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                stat = entry.stat()
+                stamp.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(stamp))
+
+
+def load_index(index_class: Type[Index], directory: str) -> Optional[Index]:
+    """Get the index saved in a directory, loading it once per version.
+
+    Args:
+        index_class: Class with ``exists`` and ``load`` methods, such as
+            ``BM25Index``, ``TrigramIndex`` or ``SymbolTable``.
+        directory: Directory the index was saved to.
+
+    Returns:
+        The shared loaded index, or None if the directory holds none.
+    """
+    key = (index_class, os.path.abspath(directory))
+    try:
+        stamp = _stamp(directory) if index_class.exists(directory) else None
+    except FileNotFoundError:
+        stamp = None
+    if stamp is None:
+        with _INDEXES_LOCK:
+            _INDEXES.pop(key, None)
+        return None
+
+    with _INDEXES_LOCK:
+        cached = _INDEXES.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    index = index_class.load(directory)
+    with _INDEXES_LOCK:
+        _INDEXES[key] = (stamp, index)
+    return index
+
+
+def clear_index_cache() -> None:
+    """Drop all cached indexes."""
+    with _INDEXES_LOCK:
+        _INDEXES.clear()
@@ -0,0 +1,274 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""BM25 inverted index over code-aware tokens."""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from repoqa.storage.document_table import DocumentTable
+
+INDEX_FILE = "lexical.json"
+OFFSETS_FILE = "term_offsets.npy"
+DOCS_FILE = "postings_docs.npy"
+FREQS_FILE = "postings_freqs.npy"
+LENGTHS_FILE = "doc_lengths.npy"
+
+_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+# Acronyms, capitalized or lowercase words and digit runs within a word
+_SUBWORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def get_lexical_directory(persist_directory: str, collection_name: str) -> str:
+    """Get the directory holding a collection's lexical index.
+
+    Args:
+        persist_directory: Root directory of the vector store.
+        collection_name: Name of the collection.
+
+    Returns:
+        Path of the index directory.
+    """
+    return os.path.join(persist_directory, "lexical", collection_name)
+
+
+def tokenize_code(text: str) -> List[str]:
+    """Split text into lowercase, code-aware search tokens.
+
+    Each identifier yields itself and, when it is compound, its
+    snake_case and camelCase parts, so ``getCollectionName`` matches
+    queries for ``getcollectionname``, ``collection`` or ``name``.
+
+    Args:
+        text: Code or natural language text.
+
+    Returns:
+        Tokens in order of appearance, with repeats.
+    """
+    tokens = []
+    for word in _WORD.findall(text):
+        parts = [
+            part.lower()
+            for piece in word.split("_")
+            for part in _SUBWORD.findall(piece)
+        ]
+        if len(word) > 1:
+            tokens.append(word.lower())
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if len(part) > 1)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 index over the chunks of a repository.
+
+    Postings are stored per term as sorted arrays of chunk rows and term
+    frequencies, laid out contiguously with an offsets array, and the
+    chunk content and metadata live in a ``DocumentTable``. Loaded indexes
+    memory-map the postings, so a query only pages in the postings of its
+    own terms.
+    """
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        offsets: np.ndarray,
+        docs: np.ndarray,
+        freqs: np.ndarray,
+        lengths: np.ndarray,
+        table: DocumentTable,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        """Initialize the index from its arrays; see ``build`` and ``load``.
+
+        Args:
+            vocabulary: Term ids keyed by term.
+            offsets: Start of each term's postings, plus the total count.
+            docs: Chunk rows of all postings.
+            freqs: Term frequencies of all postings.
+            lengths: Token count of each chunk.
+            table: Content and metadata of each chunk.
+            k1: Term frequency saturation.
+            b: Document length normalization.
+        """
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.docs = docs
+        self.freqs = freqs
+        self.lengths = lengths
+        self.table = table
+        self.k1 = k1
+        self.b = b
+
+        average = float(lengths.mean()) if len(lengths) else 0.0
+        self._norms = k1 * (1 - b + b * lengths / (average or 1.0))
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    @classmethod
+    def build(
+        cls, rows: Sequence[Dict[str, Any]], k1: float = 1.2, b: float = 0.75
+    ) -> "BM25Index":
+        """Index chunks by their content and file path.
+
+        Args:
+            rows: Chunk metadata dictionaries with a ``content`` key.
+            k1: Term frequency saturation.
+            b: Document length normalization.
+
+        Returns:
+            Built index.
+        """
+        vocabulary: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        freqs: List[int] = []
+        lengths = np.zeros(len(rows), dtype=np.float32)
+
+        for row, metadata in enumerate(rows):
+            text = f"{metadata.get('file_path') or ''}\n{metadata.get('content') or ''}"
+            counts = Counter(tokenize_code(text))
+            lengths[row] = sum(counts.values())
+            for term, count in counts.items():
+                term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+                doc_ids.append(row)
+                freqs.append(count)
+
+        term_array = np.asarray(term_ids, dtype=np.int64)
+        # Stable sort keeps each term's postings in row order
+        order = np.argsort(term_array, kind="stable")
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_array, minlength=len(vocabulary)), out=offsets[1:])
+
+        table = DocumentTable()
+        table.append(rows)
+        return cls(
+            vocabulary,
+            offsets,
+            np.asarray(doc_ids, dtype=np.int32)[order],
+            np.asarray(freqs, dtype=np.float32)[order],
+            lengths,
+            table,
+            k1=k1,
+            b=b,
+        )
+
+    def scores(
+        self, query: str, metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> np.ndarray:
+        """Compute the BM25 score of every chunk for a query.
+
+        Args:
+            query: Query text.
+            metadata_filter: ChromaDB-style filter; other chunks score 0.
+
+        Returns:
+            One score per chunk, 0 for chunks sharing no term with the query.
+        """
+        scores = np.zeros(len(self), dtype=np.float32)
+        count = len(self)
+        for term in dict.fromkeys(tokenize_code(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            docs, freqs = self.docs[start:end], self.freqs[start:end]
+            frequency = end - start
+            idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            scores[docs] += idf * freqs * (self.k1 + 1) / (freqs + self._norms[docs])
+
+        if metadata_filter:
+            scores[~self.table.match(metadata_filter)] = 0.0
+        return scores
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search chunks by keyword relevance.
+
+        Args:
+            query: Query text.
+            top_k: Maximum number of results.
+            metadata_filter: ChromaDB-style metadata filter.
+
+        Returns:
+            Chunk metadata with ``content`` and its ``bm25`` score (higher
+            is more relevant), best first. Chunks sharing no term with the
+            query are never returned.
+        """
+        if top_k <= 0 or len(self) == 0:
+            return []
+
+        scores = self.scores(query, metadata_filter)
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > top_k:
+            matched = matched[np.argpartition(-scores[matched], top_k - 1)[:top_k]]
+        ranked = matched[np.argsort(-scores[matched], kind="stable")]
+        return [
+            {**self.table.row(int(row)), "bm25": float(scores[row])} for row in ranked
+        ]
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        """Check whether a saved index exists in a directory."""
+        return os.path.exists(os.path.join(directory, INDEX_FILE))
+
+    def save(self, directory: str) -> None:
+        """Persist the index, writing its metadata file last.
+
+        Args:
+            directory: Destination directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name, array in (
+            (OFFSETS_FILE, self.offsets),
+            (DOCS_FILE, self.docs),
+            (FREQS_FILE, self.freqs),
+            (LENGTHS_FILE, self.lengths),
+        ):
+            np.save(os.path.join(directory, name), array)
+        self.table.save(directory)
+
+        terms = sorted(self.vocabulary, key=self.vocabulary.__getitem__)
+        path = os.path.join(directory, INDEX_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"k1": self.k1, "b": self.b, "terms": terms}, f)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, directory: str) -> "BM25Index":
+        """Load an index saved with ``save``, memory-mapping the postings.
+
+        Args:
+            directory: Index directory.
+
+        Returns:
+            Loaded index.
+        """
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            info = json.load(f)
+
+        def array(name: str) -> np.ndarray:
+            return np.load(os.path.join(directory, name), mmap_mode="r")
+
+        return cls(
+            {term: i for i, term in enumerate(info["terms"])},
+            array(OFFSETS_FILE),
+            array(DOCS_FILE),
+            array(FREQS_FILE),
+            np.load(os.path.join(directory, LENGTHS_FILE)),
+            DocumentTable.load(directory),
+            k1=info["k1"],
+            b=info["b"],
+        )
@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Path-derived chunk metadata and the scope filters built on it."""
+
+import os
+import re
+from pathlib import PurePath
+from typing import Any, Dict, List, Optional, Sequence
+
+from repoqa.indexing.symbols import detect_language
+
+# Chunk metadata fields a scope filter can restrict
+SCOPE_FIELDS = ("language", "directory", "extension", "is_test")
+
+# Languages of files without symbol extraction, on top of symbols.LANGUAGES
+DOCUMENT_LANGUAGES = {
+    ".md": "markdown",
+    ".rst": "restructuredtext",
+    ".txt": "text",
+    ".json": "json",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".toml": "toml",
+    ".ini": "ini",
+    ".cfg": "ini",
+    ".sh": "shell",
+    ".bash": "shell",
+    ".sql": "sql",
+    ".html": "html",
+    ".css": "css",
+    ".scss": "css",
+    ".xml": "xml",
+}
+
+_TEST_DIRECTORIES = {"test", "tests", "testing", "__tests__", "spec", "specs"}
+# test_x.py, x_test.go, x.test.ts, x.spec.js, XTest.java, XTests.cs, conftest.py
+_TEST_STEM = re.compile(
+    r"^(tests?|test_.+|.+_tests?|.+[.-](test|spec)|.+Tests?|conftest)$"
+)
+
+
+def detect_file_language(file_path: str) -> Optional[str]:
+    """Get the language of a source or documentation file from its extension."""
+    extension = os.path.splitext(file_path)[1].lower()
+    return detect_language(file_path) or DOCUMENT_LANGUAGES.get(extension)
+
+
+def is_test_path(relative_path: str) -> bool:
+    """Check whether a repository file holds tests, by its directories or name.
+
+    Args:
+        relative_path: Path of the file relative to the repository root.
+
+    Returns:
+        True for files in a test directory or named like a test module.
+    """
+    path = PurePath(relative_path)
+    if any(part.lower() in _TEST_DIRECTORIES for part in path.parts[:-1]):
+        return True
+    return bool(_TEST_STEM.match(path.stem))
+
+
+def file_metadata(relative_path: str) -> Dict[str, Any]:
+    """Derive the scope metadata of a repository file from its path.
+
+    Args:
+        relative_path: Path of the file relative to the repository root.
+
+    Returns:
+        ``language`` and ``extension`` when known, the top-level
+        ``directory`` for files below the root, and ``is_test``.
+    """
+    path = PurePath(relative_path)
+    metadata = {
+        "language": detect_file_language(relative_path),
+        "directory": path.parts[0] if len(path.parts) > 1 else None,
+        "extension": path.suffix.lower() or None,
+        "is_test": is_test_path(relative_path),
+    }
+    return {key: value for key, value in metadata.items() if value is not None}
+
+
+def _condition(field: str, values: List[Any]) -> Dict[str, Any]:
+    if len(values) == 1:
+        return {field: values[0]}
+    return {field: {"$in": values}}
+
+
+def scope_filter(
+    languages: Optional[Sequence[str]] = None,
+    directories: Optional[Sequence[str]] = None,
+    extensions: Optional[Sequence[str]] = None,
+    tests: Optional[bool] = None,
+) -> Optional[Dict[str, Any]]:
+    """Build a metadata filter restricting retrieval to part of a repository.
+
+    Each given argument must match; within one, any value may.
+
+    Args:
+        languages: Languages, e.g. ``python`` or ``typescript``.
+        directories: Top-level directories of the repository.
+        extensions: File extensions, with or without the leading dot.
+        tests: True to search only test files, False to leave them out.
+
+    Returns:
+        ChromaDB-style ``where`` filter, or None when nothing is restricted.
+
+    Raises:
+        ValueError: If a directory is not a top-level directory.
+    """
+    conditions = []
+    if languages:
+        conditions.append(_condition("language", [v.lower() for v in languages]))
+    if directories:
+        names = []
+        for directory in directories:
+            parts = PurePath(directory.strip("/")).parts
+            if len(parts) != 1 or parts[0] in (".", ".."):
+                raise ValueError(
+                    f"Directory filters match top-level directories, got '{directory}'"
+                )
+            names.append(parts[0])
+        conditions.append(_condition("directory", names))
+    if extensions:
+        conditions.append(
+            _condition(
+                "extension", ["." + v.lower().lstrip(".") for v in extensions]
+            )
+        )
+    if tests is not None:
+        conditions.append({"is_test": tests})
+
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
+def combine_filters(*filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Require every given metadata filter, skipping None."""
+    given = [f for f in filters if f]
+    if not given:
+        return None
+    if len(given) == 1:
+        return given[0]
+    return {"$and": given}
@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""SimHash fingerprints for finding near-duplicate chunks."""
+
+import hashlib
+import re
+from collections import Counter
+
+import numpy as np
+
+BITS = 64
+SHINGLE_SIZE = 3
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def simhash(text: str) -> int:
+    """Compute the 64-bit SimHash fingerprint of text.
+
+    Features are overlapping runs of three tokens (words and symbols), so
+    whitespace and formatting do not matter, while reordered code does.
+    Each bit of the fingerprint is the sign of the frequency-weighted sum of
+    that bit over the feature hashes, so texts sharing most features get
+    fingerprints differing in few bits.
+
+    Args:
+        text: Code or prose.
+
+    Returns:
+        Fingerprint, 0 for text without tokens.
+    """
+    tokens = _TOKEN.findall(text)
+    if not tokens:
+        return 0
+    size = min(SHINGLE_SIZE, len(tokens))
+    counts = Counter(
+        " ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)
+    )
+
+    digests = b"".join(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        for feature in counts
+    )
+    bits = np.unpackbits(
+        np.frombuffer(digests, dtype=np.uint8).reshape(len(counts), 8),
+        axis=1,
+        bitorder="little",
+    )
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    totals = weights @ (2 * bits.astype(np.int64) - 1)
+    packed = np.packbits(totals > 0, bitorder="little")
+    return int.from_bytes(packed.tobytes(), "little")
+
+
+def to_hex(fingerprint: int) -> str:
+    """Format a fingerprint for metadata stores without unsigned 64-bit ints."""
+    return f"{fingerprint:016x}"
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count the bits in which two fingerprints differ."""
+    return bin(a ^ b).count("1")
@@ -0,0 +1,576 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Symbol table of definitions and references, stored in SQLite."""
+
+import ast
+import os
+import re
+import sqlite3
+from contextlib import closing
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+DATABASE_FILE = "symbols.sqlite3"
+SIGNATURE_LENGTH = 200
+
+LANGUAGES = {
+    ".py": "python",
+    ".pyi": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".go": "go",
+    ".java": "java",
+    ".kt": "kotlin",
+    ".scala": "scala",
+    ".cs": "csharp",
+    ".swift": "swift",
+    ".php": "php",
+    ".c": "c",
+    ".h": "c",
+    ".cc": "cpp",
+    ".cpp": "cpp",
+    ".cxx": "cpp",
+    ".hh": "cpp",
+    ".hpp": "cpp",
+    ".rs": "rust",
+    ".rb": "ruby",
+}
+
+_SCHEMA = """
+CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT NOT NULL);
+CREATE TABLE definitions (
+    name TEXT NOT NULL,
+    qualified_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    language TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    signature TEXT NOT NULL
+);
+CREATE TABLE symbol_references (
+    name TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    kind TEXT NOT NULL
+);
+"""
+_INDEXES = """
+CREATE INDEX definitions_name ON definitions (name);
+CREATE INDEX definitions_qualified_name ON definitions (qualified_name);
+CREATE INDEX symbol_references_name ON symbol_references (name);
+"""
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_QUERY_SYMBOL = re.compile(
+    r"`(?P<quoted>[A-Za-z_][\w.]*)`|(?P<word>[A-Za-z_][\w]*(?:\.[A-Za-z_]\w*)*)"
+    r"(?P<call>\s*\()?"
+)
+
+_MODIFIERS = (
+    r"(?:(?:public|private|protected|internal|static|final|abstract|sealed|"
+    r"synchronized|override|virtual|async|native|open|inline|suspend)\s+)"
+)
+_CLASS = (
+    r"^\s*(?:[\w@]+(?:\([^)]*\))?\s+)*(?:class|interface|enum|record|struct|"
+    r"object|trait)\s+(?P<name>\w+)"
+)
+_BRACE_RULES = {
+    "javascript": [
+        ("class", r"^\s*(?:export\s+)?(?:default\s+)?class\s+(?P<name>\w+)"),
+        (
+            "function",
+            r"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*"
+            r"(?P<name>\w+)",
+        ),
+        (
+            "function",
+            r"^\s*(?:export\s+)?(?:const|let|var)\s+(?P<name>\w+)\s*=\s*"
+            r"(?:async\s+)?(?:function\b|\([^)]*\)\s*=>|\w+\s*=>)",
+        ),
+        (
+            "method",
+            r"^\s+(?:(?:static|async|get|set|public|private|protected|readonly)\s+)*"
+            r"(?P<name>\w+)\s*\([^)]*\)\s*(?::\s*[^{]+)?\{",
+        ),
+    ],
+    "go": [
+        ("method", r"^func\s+\([^)]*\)\s*(?P<name>\w+)"),
+        ("function", r"^func\s+(?P<name>\w+)"),
+        ("type", r"^type\s+(?P<name>\w+)\s+(?:struct|interface)\b"),
+    ],
+    "java": [
+        ("class", _CLASS),
+        (
+            "method",
+            rf"^\s*{_MODIFIERS}+(?:<[^>]*>\s*)?[\w<>\[\],.?]+\s+(?P<name>\w+)\s*\(",
+        ),
+    ],
+    "kotlin": [
+        ("class", _CLASS),
+        ("function", r"^\s*(?:\w+\s+)*fun\s+(?:<[^>]*>\s*)?(?:\w+\.)?(?P<name>\w+)"),
+    ],
+    "scala": [
+        ("class", _CLASS),
+        ("function", r"^\s*(?:\w+\s+)*def\s+(?P<name>\w+)"),
+    ],
+    "swift": [
+        ("class", _CLASS),
+        ("function", r"^\s*(?:[\w@]+\s+)*func\s+(?P<name>\w+)"),
+    ],
+    "php": [
+        ("class", _CLASS),
+        ("function", r"^\s*(?:\w+\s+)*function\s+&?(?P<name>\w+)"),
+    ],
+    "c": [
+        (
+            "type",
+            r"^\s*(?:typedef\s+)?(?:struct|enum|union)\s+(?P<name>\w+)\s*(?:\{|$)",
+        ),
+        ("macro", r"^\s*#\s*define\s+(?P<name>\w+)"),
+        (
+            "function",
+            r"^(?:[\w*&<>,]+\s+)+[*&]*(?:\w+::)*(?P<name>~?\w+)\s*\([^;]*$",
+        ),
+    ],
+    "rust": [
+        (
+            "function",
+            r'^\s*(?:pub(?:\([^)]*\))?\s+)?(?:const\s+)?(?:async\s+)?(?:unsafe\s+)?'
+            r'(?:extern\s+"[^"]*"\s+)?fn\s+(?P<name>\w+)',
+        ),
+        (
+            "type",
+            r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:struct|enum|trait|union|type)\s+"
+            r"(?P<name>\w+)",
+        ),
+        ("macro", r"^\s*macro_rules!\s*(?P<name>\w+)"),
+    ],
+}
+_BRACE_RULES["typescript"] = _BRACE_RULES["javascript"] + [
+    (
+        "type",
+        r"^\s*(?:export\s+)?(?:declare\s+)?(?:interface|type|enum)\s+"
+        r"(?P<name>\w+)",
+    )
+]
+_BRACE_RULES["csharp"] = _BRACE_RULES["java"]
+_BRACE_RULES["cpp"] = [("class", r"^\s*(?:template\s*<.*>\s*)?class\s+(?P<name>\w+)")]
+_BRACE_RULES["cpp"] += _BRACE_RULES["c"]
+_LINE_RULES = {
+    "python": [
+        ("function", r"^\s*(?:async\s+)?def\s+(?P<name>\w+)"),
+        ("class", r"^\s*class\s+(?P<name>\w+)"),
+    ],
+    "ruby": [
+        ("method", r"^\s*def\s+(?:self\.)?(?P<name>[\w?!=]+)"),
+        ("class", r"^\s*(?:class|module)\s+(?:\w+::)*(?P<name>\w+)"),
+    ],
+}
+_RULES = {
+    language: [(kind, re.compile(pattern)) for kind, pattern in rules]
+    for language, rules in {**_BRACE_RULES, **_LINE_RULES}.items()
+}
+# Control-flow keywords the method heuristics would mistake for names
+_KEYWORDS = set(
+    "if for while switch catch return function else new sizeof do try with "
+    "elif until unless".split()
+)
+
+Definition = Dict[str, Any]
+
+
+def get_symbol_directory(persist_directory: str, collection_name: str) -> str:
+    """Get the directory holding a collection's symbol table.
+
+    Args:
+        persist_directory: Root directory of the vector store.
+        collection_name: Name of the collection.
+
+    Returns:
+        Path of the symbol table directory.
+    """
+    return os.path.join(persist_directory, "symbols", collection_name)
+
+
+def detect_language(file_path: str) -> Optional[str]:
+    """Get the language of a source file from its extension, if supported."""
+    return LANGUAGES.get(os.path.splitext(file_path)[1].lower())
+
+
+def query_symbols(query: str) -> List[str]:
+    """Find the words of a question that look like code identifiers.
+
+    Backquoted names, names followed by ``(``, dotted names and names with
+    an underscore or inner capital letter are kept; plain words are not,
+    so ordinary English does not match symbols that happen to share it.
+
+    Args:
+        query: Natural language question.
+
+    Returns:
+        Distinct identifiers in order of appearance, dotted names reduced to
+        their last component and unquoted names of one or two characters
+        dropped.
+    """
+    symbols: Dict[str, None] = {}
+    for match in _QUERY_SYMBOL.finditer(query):
+        word = match.group("quoted") or match.group("word")
+        if not (
+            match.group("quoted")
+            or match.group("call")
+            or "." in word
+            or "_" in word
+            or any(c.isupper() for c in word[1:])
+        ):
+            continue
+        name = word.rsplit(".", 1)[-1]
+        if match.group("quoted") or len(name.strip("_")) > 2:
+            symbols[name] = None
+    return list(symbols)
+
+
+def _definition(
+    name: str,
+    kind: str,
+    language: str,
+    start: int,
+    end: int,
+    signature: str,
+    qualified_name: Optional[str] = None,
+) -> Definition:
+    return {
+        "name": name,
+        "qualified_name": qualified_name or name,
+        "kind": kind,
+        "language": language,
+        "start_line": start,
+        "end_line": max(start, end),
+        "signature": signature.strip()[:SIGNATURE_LENGTH],
+    }
+
+
+class _PythonSymbols(ast.NodeVisitor):
+    """Collects definitions and references of a Python module."""
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self.scope: List[Tuple[str, str]] = []
+        self.definitions: List[Definition] = []
+        self.references: List[Tuple[str, int, str]] = []
+
+    def _define(self, node: ast.AST, name: str, kind: str) -> None:
+        decorators = getattr(node, "decorator_list", [])
+        start = min([d.lineno for d in decorators] + [node.lineno])
+        self.definitions.append(
+            _definition(
+                name,
+                kind,
+                "python",
+                start,
+                getattr(node, "end_lineno", None) or node.lineno,
+                self.lines[node.lineno - 1],
+                ".".join([n for n, _ in self.scope] + [name]),
+            )
+        )
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._define(node, node.name, "class")
+        self.scope.append((node.name, "class"))
+        self.generic_visit(node)
+        self.scope.pop()
+
+    def visit_FunctionDef(self, node) -> None:
+        in_class = bool(self.scope) and self.scope[-1][1] == "class"
+        self._define(node, node.name, "method" if in_class else "function")
+        self.scope.append((node.name, "function"))
+        self.generic_visit(node)
+        self.scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        if not self.scope:
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self._define(target, target.id, "variable")
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if not self.scope and isinstance(node.target, ast.Name):
+            self._define(node.target, node.target.id, "variable")
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if isinstance(func, ast.Name):
+            self.references.append((func.id, node.lineno, "call"))
+        elif isinstance(func, ast.Attribute):
+            self.references.append((func.attr, func.lineno, "call"))
+            self.visit(func.value)
+        else:
+            self.visit(func)
+        for child in [*node.args, *node.keywords]:
+            self.visit(child)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self.references.append((node.id, node.lineno, "reference"))
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self.references.append((node.attr, node.lineno, "reference"))
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        for alias in node.names:
+            self.references.append((alias.name, node.lineno, "import"))
+
+
+def _block_end(lines: List[str], start: int) -> int:
+    """Find the last line of a brace-delimited block starting at a line."""
+    depth, opened = 0, False
+    for index in range(start, min(len(lines), start + 5000)):
+        line = lines[index].split("//", 1)[0]
+        for char in line:
+            if char == "{":
+                depth, opened = depth + 1, True
+            elif char == "}":
+                depth -= 1
+        if opened and depth <= 0:
+            return index + 1
+        if not opened and line.rstrip().endswith(";"):
+            return index + 1
+    return start + 1
+
+
+def _heuristic_definitions(text: str, language: str) -> List[Definition]:
+    lines = text.splitlines()
+    rules = _RULES[language]
+    definitions = []
+    for index, line in enumerate(lines):
+        for kind, pattern in rules:
+            match = pattern.match(line)
+            if not match or match.group("name") in _KEYWORDS:
+                continue
+            end = index + 1
+            if language in _BRACE_RULES and kind != "macro":
+                end = _block_end(lines, index)
+            definitions.append(
+                _definition(match.group("name"), kind, language, index + 1, end, line)
+            )
+            break
+    return definitions
+
+
+def extract_symbols(
+    file_path: str, text: str
+) -> Tuple[List[Definition], List[Tuple[str, int, str]]]:
+    """Extract the definitions and references of a source file.
+
+    Python files are parsed with ``ast``; other languages, and Python files
+    that do not parse, use ctags-like per-line patterns, with brace
+    matching for the end line of block-structured languages. Their
+    references are collected later against the names defined anywhere.
+
+    Args:
+        file_path: Path of the file, used to detect its language.
+        text: File content.
+
+    Returns:
+        Definitions with name, qualified name, kind, language, line range
+        and signature, and ``(name, line, kind)`` references.
+    """
+    language = detect_language(file_path)
+    if language is None:
+        return [], []
+    if language == "python":
+        try:
+            tree = ast.parse(text)
+        except (SyntaxError, ValueError):
+            return _heuristic_definitions(text, language), []
+        visitor = _PythonSymbols(text.splitlines())
+        visitor.visit(tree)
+        return visitor.definitions, visitor.references
+    return _heuristic_definitions(text, language), []
+
+
+def _identifier_references(text: str) -> Iterator[Tuple[str, int, str]]:
+    for number, line in enumerate(text.splitlines(), 1):
+        for match in _IDENTIFIER.finditer(line):
+            following = line[match.end() :].lstrip()[:1]
+            kind = "call" if following == "(" else "reference"
+            yield match.group(), number, kind
+
+
+class SymbolTable:
+    """Definitions and references of a repository's symbols.
+
+    Rows live in SQLite with files stored once and indexes on symbol names,
+    so lookups are a single indexed query. References are limited to names
+    defined in the repository, which keeps the table small and drops calls
+    into the standard library and dependencies.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        """Initialize the table from a database; see ``build`` and ``load``.
+
+        Args:
+            connection: SQLite connection with the symbol schema.
+        """
+        self.connection = connection
+
+    @classmethod
+    def build(cls, files: Sequence[Tuple[str, str]]) -> "SymbolTable":
+        """Extract the symbols of files into an in-memory table.
+
+        Args:
+            files: ``(file_path, text)`` pairs.
+
+        Returns:
+            Built symbol table.
+        """
+        definitions: List[Tuple[Any, ...]] = []
+        parsed_references: List[Tuple[str, int, int, str]] = []
+        heuristic_files: List[int] = []
+        for file_id, (file_path, text) in enumerate(files):
+            language = detect_language(file_path)
+            found, references = extract_symbols(file_path, text)
+            definitions.extend(
+                (
+                    d["name"],
+                    d["qualified_name"],
+                    d["kind"],
+                    d["language"],
+                    file_id,
+                    d["start_line"],
+                    d["end_line"],
+                    d["signature"],
+                )
+                for d in found
+            )
+            if language == "python":
+                parsed_references.extend(
+                    (name, file_id, line, kind) for name, line, kind in references
+                )
+            elif language is not None:
+                heuristic_files.append(file_id)
+
+        defined: Set[str] = {row[0] for row in definitions}
+        definition_lines = {(row[0], row[4], row[5]) for row in definitions}
+        references = [row for row in parsed_references if row[0] in defined]
+        for file_id in heuristic_files:
+            references.extend(
+                (name, file_id, line, kind)
+                for name, line, kind in _identifier_references(files[file_id][1])
+                if name in defined and (name, file_id, line) not in definition_lines
+            )
+
+        connection = sqlite3.connect(":memory:", check_same_thread=False)
+        connection.executescript(_SCHEMA)
+        connection.executemany(
+            "INSERT INTO files VALUES (?, ?)",
+            ((i, file_path) for i, (file_path, _) in enumerate(files)),
+        )
+        connection.executemany(
+            "INSERT INTO definitions VALUES (?, ?, ?, ?, ?, ?, ?, ?)", definitions
+        )
+        connection.executemany(
+            "INSERT INTO symbol_references VALUES (?, ?, ?, ?)", references
+        )
+        connection.executescript(_INDEXES)
+        connection.commit()
+        return cls(connection)
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM definitions").fetchone()[0]
+
+    def find_definitions(self, name: str, limit: int = 20) -> List[Definition]:
+        """Find where a symbol is defined.
+
+        Args:
+            name: Symbol name, or a qualified name such as ``Class.method``.
+            limit: Maximum number of definitions.
+
+        Returns:
+            Definitions with ``file_path``, line range, kind and signature,
+            classes and functions before variables.
+        """
+        column = "qualified_name" if "." in name else "name"
+        rows = self.connection.execute(
+            "SELECT d.name, d.qualified_name, d.kind, d.language, f.path, "
+            "d.start_line, d.end_line, d.signature FROM definitions d "
+            f"JOIN files f ON f.id = d.file_id WHERE d.{column} = ? "
+            "ORDER BY d.kind = 'variable', f.path, d.start_line LIMIT ?",
+            (name, limit),
+        ).fetchall()
+        keys = (
+            "name",
+            "qualified_name",
+            "kind",
+            "language",
+            "file_path",
+            "start_line",
+            "end_line",
+            "signature",
+        )
+        return [dict(zip(keys, row)) for row in rows]
+
+    def find_references(self, name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Find where a symbol is used.
+
+        Args:
+            name: Symbol name; for qualified names only the last part is
+                matched.
+            limit: Maximum number of references.
+
+        Returns:
+            References with ``file_path``, ``line`` and ``kind`` ('call',
+            'reference' or 'import'), calls first.
+        """
+        rows = self.connection.execute(
+            "SELECT f.path, r.line, r.kind FROM symbol_references r "
+            "JOIN files f ON f.id = r.file_id WHERE r.name = ? "
+            "ORDER BY r.kind != 'call', f.path, r.line LIMIT ?",
+            (name.rsplit(".", 1)[-1], limit),
+        ).fetchall()
+        return [
+            {"file_path": path, "line": line, "kind": kind} for path, line, kind in rows
+        ]
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        """Check whether a saved symbol table exists in a directory."""
+        return os.path.exists(os.path.join(directory, DATABASE_FILE))
+
+    def save(self, directory: str) -> None:
+        """Persist the table, replacing any earlier database atomically.
+
+        Args:
+            directory: Destination directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, DATABASE_FILE)
+        with closing(sqlite3.connect(path + ".tmp")) as target:
+            self.connection.backup(target)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, directory: str) -> "SymbolTable":
+        """Open a saved symbol table read-only.
+
+        Args:
+            directory: Symbol table directory.
+
+        Returns:
+            Loaded symbol table.
+        """
+        path = os.path.join(directory, DATABASE_FILE)
+        connection = sqlite3.connect(
+            f"file:{path}?mode=ro", uri=True, check_same_thread=False
+        )
+        return cls(connection)
@@ -0,0 +1,361 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Trigram index for regex and substring search over repository files."""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:  # Python 3.11+
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+INDEX_FILE = "trigram.json"
+KEYS_FILE = "trigram_keys.npy"
+OFFSETS_FILE = "trigram_offsets.npy"
+POSTINGS_FILE = "trigram_postings.npy"
+CONTENT_FILE = "content.npy"
+CONTENT_OFFSETS_FILE = "content_offsets.npy"
+
+_REPEATS = tuple(
+    getattr(sre_parse, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_parse, name)
+)
+_GROUPS = tuple(
+    getattr(sre_parse, name)
+    for name in ("SUBPATTERN", "ATOMIC_GROUP")
+    if hasattr(sre_parse, name)
+)
+
+# A query plan is a trigram key, an ("and" | "or", plans) pair, or None for
+# "every file"
+Plan = Union[None, int, Tuple[str, List[Any]]]
+
+
+def get_trigram_directory(persist_directory: str, collection_name: str) -> str:
+    """Get the directory holding a collection's trigram index.
+
+    Args:
+        persist_directory: Root directory of the vector store.
+        collection_name: Name of the collection.
+
+    Returns:
+        Path of the index directory.
+    """
+    return os.path.join(persist_directory, "trigram", collection_name)
+
+
+def trigram_keys(data: bytes) -> np.ndarray:
+    """Get the distinct trigrams of ASCII-lowercased bytes as integer keys.
+
+    Args:
+        data: Bytes to split, usually UTF-8 encoded text.
+
+    Returns:
+        Sorted unique ``uint32`` keys, one per trigram.
+    """
+    values = np.frombuffer(data.lower(), dtype=np.uint8).astype(np.uint32)
+    if len(values) < 3:
+        return np.zeros(0, dtype=np.uint32)
+    return np.unique(values[:-2] << 16 | values[1:-1] << 8 | values[2:])
+
+
+def _literal_plan(run: bytearray) -> List[Plan]:
+    return [int(key) for key in trigram_keys(bytes(run))]
+
+
+def _combine(op: str, plans: List[Plan]) -> Plan:
+    if op == "and":
+        plans = [plan for plan in plans if plan is not None]
+    elif any(plan is None for plan in plans):
+        return None
+    if not plans:
+        return None
+    return plans[0] if len(plans) == 1 else (op, plans)
+
+
+def plan_query(pattern: str, flags: int = 0) -> Plan:
+    """Derive the trigrams a file must contain to match a regex.
+
+    Runs of ASCII literals contribute all of their trigrams; alternations
+    require one of their branches, and groups or repeats of at least one
+    occurrence require their content. Anything else (classes, wildcards,
+    optional parts) requires nothing, so the plan never excludes a file
+    the regex could match.
+
+    Args:
+        pattern: Regular expression.
+        flags: ``re`` flags the pattern is compiled with.
+
+    Returns:
+        Query plan for ``TrigramIndex.candidates``.
+
+    Raises:
+        re.error: If the pattern is not a valid regular expression.
+    """
+    return _plan(sre_parse.parse(pattern, flags))
+
+
+def _plan(parsed) -> Plan:
+    plans: List[Plan] = []
+    run = bytearray()
+    for op, av in parsed:
+        if op == sre_parse.LITERAL and av < 128:
+            run.append(av)
+            continue
+        plans.extend(_literal_plan(run))
+        run = bytearray()
+
+        if op in _GROUPS:
+            # SUBPATTERN carries (group, add_flags, del_flags, pattern)
+            plans.append(_plan(av[-1] if op == sre_parse.SUBPATTERN else av))
+        elif op == sre_parse.BRANCH:
+            plans.append(_combine("or", [_plan(branch) for branch in av[1]]))
+        elif op in _REPEATS and av[0] >= 1:
+            plans.append(_plan(av[2]))
+    plans.extend(_literal_plan(run))
+    return _combine("and", plans)
+
+
+class TrigramIndex:
+    """Inverted index from byte trigrams to the files containing them.
+
+    Like codesearch and Zoekt, a regex is first reduced to the trigrams any
+    match must contain, the posting lists of those trigrams narrow the
+    files down to a few candidates, and only the candidates are matched
+    with the regex itself. Trigrams are taken over ASCII-lowercased bytes,
+    so one index serves case-sensitive and case-insensitive queries.
+
+    Postings are file ids in the smallest unsigned integer type that fits,
+    laid out contiguously per trigram with an offsets array, and the file
+    contents are stored alongside them, so searches never touch the
+    repository. Loaded indexes memory-map both.
+    """
+
+    def __init__(
+        self,
+        file_paths: List[str],
+        keys: np.ndarray,
+        offsets: np.ndarray,
+        postings: np.ndarray,
+        content: np.ndarray,
+        content_offsets: np.ndarray,
+    ):
+        """Initialize the index from its arrays; see ``build`` and ``load``.
+
+        Args:
+            file_paths: Path of each file.
+            keys: Sorted trigram keys.
+            offsets: Start of each trigram's postings, plus the total count.
+            postings: File ids of all postings.
+            content: UTF-8 contents of all files, concatenated.
+            content_offsets: Start of each file's content, plus the total.
+        """
+        self.file_paths = file_paths
+        self.keys = keys
+        self.offsets = offsets
+        self.postings = postings
+        self.content = content
+        self.content_offsets = content_offsets
+
+    def __len__(self) -> int:
+        return len(self.file_paths)
+
+    @classmethod
+    def build(cls, files: Sequence[Tuple[str, str]]) -> "TrigramIndex":
+        """Index the contents of files.
+
+        Args:
+            files: ``(file_path, text)`` pairs.
+
+        Returns:
+            Built index.
+        """
+        encoded = [text.encode("utf-8") for _, text in files]
+        per_file = [trigram_keys(data) for data in encoded]
+        id_dtype = np.uint16 if len(files) <= np.iinfo(np.uint16).max else np.uint32
+
+        if per_file:
+            all_keys = np.concatenate(per_file)
+            file_ids = np.repeat(
+                np.arange(len(files), dtype=id_dtype), [len(k) for k in per_file]
+            )
+        else:
+            all_keys = np.zeros(0, dtype=np.uint32)
+            file_ids = np.zeros(0, dtype=id_dtype)
+
+        # Stable sort keeps each trigram's postings in file order
+        order = np.argsort(all_keys, kind="stable")
+        keys, counts = np.unique(all_keys[order], return_counts=True)
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        content_offsets = np.zeros(len(files) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=content_offsets[1:])
+        content = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        return cls(
+            [file_path for file_path, _ in files],
+            keys.astype(np.uint32),
+            offsets,
+            file_ids[order],
+            content,
+            content_offsets,
+        )
+
+    def _postings(self, key: int) -> np.ndarray:
+        i = int(np.searchsorted(self.keys, key))
+        if i == len(self.keys) or self.keys[i] != key:
+            return self.postings[:0]
+        return self.postings[self.offsets[i] : self.offsets[i + 1]]
+
+    def candidates(self, plan: Plan) -> np.ndarray:
+        """Get the files that satisfy a query plan.
+
+        Args:
+            plan: Plan from ``plan_query``.
+
+        Returns:
+            Sorted file ids.
+        """
+        if plan is None:
+            return np.arange(len(self))
+        if not isinstance(plan, tuple):
+            return np.asarray(self._postings(plan))
+
+        op, plans = plan
+        if op == "or":
+            return np.unique(np.concatenate([self.candidates(p) for p in plans]))
+
+        # Intersect the shortest posting lists first
+        sets = sorted((self.candidates(p) for p in plans), key=len)
+        result = sets[0]
+        for ids in sets[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, ids, assume_unique=True)
+        return result
+
+    def text(self, file_id: int) -> str:
+        """Get the stored content of a file."""
+        start, end = self.content_offsets[file_id], self.content_offsets[file_id + 1]
+        return self.content[start:end].tobytes().decode("utf-8")
+
+    def search(
+        self,
+        pattern: str,
+        max_results: int = 50,
+        ignore_case: bool = False,
+        path_pattern: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Find the lines of indexed files matching a regular expression.
+
+        Patterns are matched per file in multiline mode, so ``^`` and ``$``
+        anchor at line boundaries as in grep.
+
+        Args:
+            pattern: Python regular expression.
+            max_results: Maximum number of matching lines.
+            ignore_case: Match case-insensitively.
+            path_pattern: Optional regex a file path must contain.
+
+        Returns:
+            ``file_path``, 1-based ``line`` and ``text`` of each matching
+            line, in file order.
+
+        Raises:
+            ValueError: If a pattern is not a valid regular expression.
+        """
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        try:
+            regex = re.compile(pattern, flags)
+            path_regex = re.compile(path_pattern) if path_pattern else None
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression: {e}") from e
+
+        results: List[Dict[str, Any]] = []
+        if max_results <= 0:
+            return results
+
+        for file_id in self.candidates(plan_query(pattern, flags)):
+            file_path = self.file_paths[file_id]
+            if path_regex is not None and not path_regex.search(file_path):
+                continue
+            text = self.text(int(file_id))
+
+            position, line, last_line = 0, 1, 0
+            for match in regex.finditer(text):
+                line += text.count("\n", position, match.start())
+                position = match.start()
+                if line == last_line:
+                    continue
+                last_line = line
+                start = text.rfind("\n", 0, position) + 1
+                end = text.find("\n", position)
+                results.append(
+                    {
+                        "file_path": file_path,
+                        "line": line,
+                        "text": text[start : end if end != -1 else len(text)],
+                    }
+                )
+                if len(results) >= max_results:
+                    return results
+        return results
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        """Check whether a saved index exists in a directory."""
+        return os.path.exists(os.path.join(directory, INDEX_FILE))
+
+    def save(self, directory: str) -> None:
+        """Persist the index, writing its metadata file last.
+
+        Args:
+            directory: Destination directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name, array in (
+            (KEYS_FILE, self.keys),
+            (OFFSETS_FILE, self.offsets),
+            (POSTINGS_FILE, self.postings),
+            (CONTENT_FILE, self.content),
+            (CONTENT_OFFSETS_FILE, self.content_offsets),
+        ):
+            np.save(os.path.join(directory, name), array)
+
+        path = os.path.join(directory, INDEX_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"files": self.file_paths}, f)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, directory: str) -> "TrigramIndex":
+        """Load an index saved with ``save``, memory-mapping its arrays.
+
+        Args:
+            directory: Index directory.
+
+        Returns:
+            Loaded index.
+        """
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            info = json.load(f)
+
+        def array(name: str) -> np.ndarray:
+            return np.load(os.path.join(directory, name), mmap_mode="r")
+
+        return cls(
+            info["files"],
+            np.load(os.path.join(directory, KEYS_FILE)),
+            array(OFFSETS_FILE),
+            array(POSTINGS_FILE),
+            array(CONTENT_FILE),
+            np.load(os.path.join(directory, CONTENT_OFFSETS_FILE)),
+        )
@@ -1,9 +1,12 @@
 from typing import Any, Dict, Optional
 
 import requests
-from langchain_ollama import OllamaLLM
 from loguru import logger
 
+from repoqa.util.lazy_import import LazyImport
+
+OllamaLLM = LazyImport("langchain_ollama", "OllamaLLM")
+
 
 def get_llm(
     model_name: str,
@@ -1,20 +1,30 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Afif Al Mamun
 
+import re
+from itertools import islice
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain_chroma import Chroma
 from langchain_core.prompts import PromptTemplate
 from langchain_core.tools import Tool
-from langchain_huggingface import HuggingFaceEmbeddings
 from loguru import logger
 
 from repoqa.embedding import SentenceTransformerEmbedding
-from repoqa.indexing.git_indexer import GitRepoIndexer
+from repoqa.embedding.dispatcher import get_shared_dispatcher
+from repoqa.embedding.langchain_embeddings import LangChainEmbeddings
+from repoqa.embedding.projection import ProjectedEmbedding
 from repoqa.pipeline.pipeline import Pipeline
 from repoqa.pipeline.prompts import REACT_AGENT_PROMPT
+from repoqa.storage.collection_manager import get_chroma_client
+from repoqa.util.lazy_import import LazyImport
+
+AgentExecutor = LazyImport("langchain.agents", "AgentExecutor")
+create_react_agent = LazyImport("langchain.agents", "create_react_agent")
+Chroma = LazyImport("langchain_chroma", "Chroma")
+
+# read_file input naming a line range, e.g. 'src/main.py:10-40'
+LINE_RANGE = re.compile(r"^(.+?):(\d+)-(\d+)$")
 
 
 class AgenticRAGPipeline(Pipeline):
@@ -30,6 +40,22 @@ class AgenticRAGPipeline(Pipeline):
         temperature: float,
         repo_path: str,
         repo_indexer: Any,
+        projection_method: str = "none",
+        projection_dim: int = 256,
+        projection_shared_path: Optional[str] = None,
+        write_batch_size: int = 0,
+        vector_store_backend: str = "chroma",
+        vector_store_options: Optional[Dict[str, Any]] = None,
+        retrieval_mode: str = "vector",
+        rrf_k: int = 60,
+        symbol_boost: bool = True,
+        duplicate_bits: int = -1,
+        mmr_lambda: float = 1.0,
+        neighbor_chunks: int = 0,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        embedding_dispatcher: bool = False,
+        dispatcher_max_batch_size: int = 32,
+        dispatcher_max_wait_ms: float = 5.0,
     ):
         """Initialize the hybrid RAG-Agent pipeline.
 
@@ -41,6 +67,38 @@ class AgenticRAGPipeline(Pipeline):
             ollama_base_url: Base URL for Ollama server.
             temperature: Sampling temperature.
             repo_path: Path to the repository to explore.
+            projection_method: Embedding projection, 'none', 'pca' or
+                'truncate'.
+            projection_dim: Target dimension of the embedding projection.
+            projection_shared_path: Optional pre-fitted projection shared by
+                all collections.
+            write_batch_size: Documents per vector store write while
+                indexing; 0 uses the ChromaDB client's maximum.
+            vector_store_backend: Store holding the collection's vectors,
+                'chroma', 'faiss', 'numpy' or 'quantized'.
+            vector_store_options: Backend-specific store settings, such as
+                ``index_type`` for FAISS.
+            retrieval_mode: 'vector', 'lexical' or 'hybrid' (BM25 and vector
+                results fused by reciprocal rank).
+            rrf_k: Rank offset for reciprocal rank fusion.
+            symbol_boost: Rank the definitions of identifiers named in a
+                question alongside the retrieved documents.
+            duplicate_bits: Drop retrieved documents whose SimHash differs
+                from a better one's in at most this many bits; negative
+                keeps near duplicates.
+            mmr_lambda: Maximal marginal relevance trade-off between
+                relevance (1) and diversity (0).
+            neighbor_chunks: Adjacent chunks on each side of a retrieved
+                document merged into it, so it comes with its surrounding
+                code.
+            metadata_filter: Scope filter restricting the semantic searches
+                to matching chunks, e.g. one top-level directory.
+            embedding_dispatcher: Encode queries through the process-wide
+                micro-batching dispatcher, so concurrent requests share
+                model calls.
+            dispatcher_max_batch_size: Maximum queries in one batch.
+            dispatcher_max_wait_ms: Time a query waits for others to join
+                its batch.
         """
         self.llm = llm_model
         self.embedding_model_name = embedding_model
@@ -50,12 +108,34 @@ class AgenticRAGPipeline(Pipeline):
         self.temperature = temperature
         self.repo_path = Path(repo_path)
 
-        # Initialize embeddings and vector store for RAG
-        self.embeddings = HuggingFaceEmbeddings(model_name=embedding_model)
+        # Initialize embeddings and vector store for RAG. The embedding
+        # model is loaded lazily on the first query.
+        query_model = SentenceTransformerEmbedding(model_name=embedding_model)
+        if embedding_dispatcher:
+            query_model = get_shared_dispatcher(
+                query_model, dispatcher_max_batch_size, dispatcher_max_wait_ms
+            )
+        self.embedding_model_obj = ProjectedEmbedding(query_model)
+        self._configure_projection(
+            projection_method, projection_dim, projection_shared_path
+        )
+        self.embeddings = LangChainEmbeddings(self.embedding_model_obj)
+        self.write_batch_size = write_batch_size
+        self.chroma_client = get_chroma_client(persist_directory)
         self.vectorstore = Chroma(
+            client=self.chroma_client,
             collection_name=collection_name,
             embedding_function=self.embeddings,
-            persist_directory=persist_directory,
+        )
+        self._configure_vector_store(vector_store_backend, vector_store_options)
+        self._configure_retrieval(
+            retrieval_mode,
+            rrf_k,
+            symbol_boost,
+            duplicate_bits,
+            mmr_lambda,
+            neighbor_chunks,
+            metadata_filter,
         )
         self.indexer = repo_indexer
 
@@ -74,7 +154,7 @@ class AgenticRAGPipeline(Pipeline):
         def semantic_search(query: str, k: int = 5) -> str:
             """Search for relevant code using semantic similarity."""
             try:
-                docs = self.vectorstore.similarity_search(query, k=k)
+                docs = self._retrieve_documents(query, k=k)
                 if not docs:
                     return f"No relevant documents found for: {query}"
 
@@ -85,7 +165,12 @@ class AgenticRAGPipeline(Pipeline):
                     if file_path != "unknown":
                         self.accessed_files.add(file_path)
                     content = doc.page_content.strip()
-                    result = f"Result {i} from {file_path}:\n" f"```\n{content}\n```"
+                    location = file_path
+                    start = doc.metadata.get("start_line")
+                    end = doc.metadata.get("end_line")
+                    if start is not None and end is not None:
+                        location += f" (lines {start}-{end})"
+                    result = f"Result {i} from {location}:\n```\n{content}\n```"
                     results.append(result)
 
                 return f"Semantic search results for '{query}':\n\n" + "\n\n".join(
@@ -98,7 +183,12 @@ class AgenticRAGPipeline(Pipeline):
         def similarity_search_with_score(query: str, k: int = 3) -> str:
             """Search with similarity scores to show relevance."""
             try:
-                result = self.vectorstore.similarity_search_with_score(query, k=k)
+                if self.metadata_filter is None:
+                    result = self.vectorstore.similarity_search_with_score(query, k=k)
+                else:
+                    result = self.vectorstore.similarity_search_with_score(
+                        query, k=k, filter=self.metadata_filter
+                    )
                 if not result:
                     return f"No relevant documents found for: {query}"
 
@@ -122,6 +212,85 @@ class AgenticRAGPipeline(Pipeline):
             except Exception as e:
                 return f"Scored search failed: {e}"
 
+        def display_path(file_path: str) -> str:
+            try:
+                return str(Path(file_path).relative_to(self.repo_path))
+            except ValueError:
+                return file_path
+
+        def grep_code(pattern: str, max_results: int = 30) -> str:
+            """Find lines matching a regular expression with the trigram index."""
+            try:
+                clean_pattern = pattern.strip().strip("`")
+                if not clean_pattern:
+                    return "Error: Pattern cannot be empty"
+
+                matches = self.grep_code(clean_pattern, max_results=max_results)
+                if not matches:
+                    return f"No matches found for: {clean_pattern}"
+
+                results = []
+                for match in matches:
+                    file_path = match["file_path"]
+                    self.accessed_files.add(file_path)
+                    results.append(
+                        f"{display_path(file_path)}:{match['line']}: "
+                        f"{match['text'].strip()[:200]}"
+                    )
+
+                header = f"Matches for '{clean_pattern}'"
+                if len(matches) == max_results:
+                    header += f" (first {max_results})"
+                return f"{header}:\n" + "\n".join(results)
+
+            except Exception as e:
+                return f"Code search failed: {e}"
+
+        def find_definition(name: str) -> str:
+            """Look up where a symbol is defined in the symbol table."""
+            try:
+                clean_name = name.strip().strip("`").rstrip("()")
+                if not clean_name:
+                    return "Error: Symbol name cannot be empty"
+
+                definitions = self.find_definitions(clean_name)
+                if not definitions:
+                    return f"No definition found for: {clean_name}"
+
+                results = []
+                for definition in definitions:
+                    self.accessed_files.add(definition["file_path"])
+                    results.append(
+                        f"{definition['kind']} {definition['qualified_name']} at "
+                        f"{display_path(definition['file_path'])}:"
+                        f"{definition['start_line']}-{definition['end_line']}\n"
+                        f"    {definition['signature']}"
+                    )
+                return f"Definitions of '{clean_name}':\n" + "\n".join(results)
+
+            except Exception as e:
+                return f"Definition lookup failed: {e}"
+
+        def find_references(name: str) -> str:
+            """Look up where a symbol is used in the symbol table."""
+            try:
+                clean_name = name.strip().strip("`").rstrip("()")
+                if not clean_name:
+                    return "Error: Symbol name cannot be empty"
+
+                references = self.find_references(clean_name)
+                if not references:
+                    return f"No references found for: {clean_name}"
+
+                results = [
+                    f"{display_path(ref['file_path'])}:{ref['line']} ({ref['kind']})"
+                    for ref in references
+                ]
+                return f"References to '{clean_name}':\n" + "\n".join(results)
+
+            except Exception as e:
+                return f"Reference lookup failed: {e}"
+
         def list_directory(path: str = "") -> str:
             """List files and directories in the given path.
 
@@ -173,10 +342,12 @@ class AgenticRAGPipeline(Pipeline):
                 return f"Error listing directory: {e}"
 
         def read_file(file_path: str) -> str:
-            """Read the content of a file.
+            """Read the content of a file, or a range of its lines.
 
             Args:
-                file_path: Relative path to the file from repository root.
+                file_path: Relative path to the file from repository root,
+                    optionally followed by a line range as in
+                    'src/main.py:10-40'.
 
             Returns:
                 String containing the file content.
@@ -187,6 +358,12 @@ class AgenticRAGPipeline(Pipeline):
                 if not clean_path:
                     return "Error: File path cannot be empty"
 
+                lines = None
+                match = LINE_RANGE.match(clean_path)
+                if match:
+                    clean_path = match.group(1)
+                    lines = (max(int(match.group(2)), 1), int(match.group(3)))
+
                 target_file = self.repo_path / clean_path
 
                 if not target_file.exists():
@@ -198,15 +375,25 @@ class AgenticRAGPipeline(Pipeline):
                 if not target_file.is_file():
                     return f"Path is not a file: {clean_path}"
 
-                # Check file size (limit to 100KB)
-                if target_file.stat().st_size > 100000:
-                    return f"File too large (>100KB): {clean_path}"
+                # Check file size (limit to 100KB) unless reading a range
+                if lines is None and target_file.stat().st_size > 100000:
+                    return (
+                        f"File too large (>100KB): {clean_path}; "
+                        f"read a line range such as {clean_path}:1-200"
+                    )
 
                 # Track accessed file
                 self.accessed_files.add(clean_path)
 
                 with open(target_file, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
+                    if lines is None:
+                        content = f.read()
+                    else:
+                        start, end = lines
+                        content = "".join(
+                            islice(f, start - 1, max(end, start - 1))
+                        ).rstrip("\n")
+                        clean_path = f"{clean_path}:{start}-{end}"
 
                 return f"Content of {clean_path}:\n```\n{content}\n```"
 
@@ -233,6 +420,35 @@ class AgenticRAGPipeline(Pipeline):
                 ),
                 func=similarity_search_with_score,
             ),
+            Tool(
+                name="grep_code",
+                description=(
+                    "Find exact code with a regular expression, like grep. "
+                    "Input should be a Python regex such as 'def load_config' "
+                    "or 'class \\w+Error'; prefix it with (?i) to ignore "
+                    "case. Returns matching lines as path:line: text."
+                ),
+                func=grep_code,
+            ),
+            Tool(
+                name="find_definition",
+                description=(
+                    "Find where a function, class, method or constant is "
+                    "defined, with its file, line range and signature. "
+                    "Input should be the symbol name, optionally qualified. "
+                    "Example: 'load_config' or 'Config.load'"
+                ),
+                func=find_definition,
+            ),
+            Tool(
+                name="find_references",
+                description=(
+                    "Find where a symbol is called, referenced or imported. "
+                    "Input should be the symbol name. Returns file:line "
+                    "locations, calls first."
+                ),
+                func=find_references,
+            ),
             Tool(
                 name="list_directory",
                 description=(
@@ -248,7 +464,9 @@ class AgenticRAGPipeline(Pipeline):
                 description=(
                     "Read the content of a file in the repository. "
                     "Input should be the relative path to the file from "
-                    "repository root. Example: 'LICENSE' or 'src/main.py'"
+                    "repository root, optionally with a line range to read "
+                    "only those lines. Example: 'LICENSE', 'src/main.py' "
+                    "or 'src/main.py:10-40'"
                 ),
                 func=read_file,
             ),
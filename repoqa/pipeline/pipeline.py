@@ -1,20 +1,646 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Afif Al Mamun
 
+import os
+import shutil
+import time
+import uuid
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from langchain_core.documents import Document
 from loguru import logger
 
+from repoqa.embedding.projection import EmbeddingProjection, recall_at_k
+from repoqa.indexing.index_cache import load_index
+from repoqa.indexing.lexical import BM25Index, get_lexical_directory
+from repoqa.indexing.scope import SCOPE_FIELDS, combine_filters
+from repoqa.indexing.symbols import SymbolTable, get_symbol_directory, query_symbols
+from repoqa.indexing.trigram import TrigramIndex, get_trigram_directory
+from repoqa.retrieval.diversity import diversify
+from repoqa.retrieval.retriever import RETRIEVAL_MODES, reciprocal_rank_fusion
+from repoqa.storage.batching import batch_ranges, get_write_batch_size
+from repoqa.storage.collection_manager import (
+    get_projection_path,
+    write_collection_manifest,
+)
+from repoqa.storage.langchain_store import LangChainVectorStore
+from repoqa.storage.manifest import (
+    build_manifest,
+    describe_projection,
+    describe_vector_store,
+)
+from repoqa.storage.store_factory import VECTOR_STORE_BACKENDS, get_vector_store
+
+# Optional chunk attributes copied into document metadata at indexing
+CHUNK_METADATA_FIELDS = (
+    "simhash",
+    "chunk_index",
+    "start_line",
+    "end_line",
+    *SCOPE_FIELDS,
+)
+
 
 class Pipeline(ABC):
     """Base class for RAG pipelines with shared indexing logic."""
 
     indexer: Any
     vectorstore: Any
+    chroma_client: Any
+    embeddings: Any
     repo_path: Optional[Path]
+    embedding_model_obj: Any
+    persist_directory: str
+    collection_name: str
+
+    projection_method: str = "none"
+    projection_dim: int = 256
+    projection_shared_path: Optional[str] = None
+    write_batch_size: int = 0
+    vector_store_backend: str = "chroma"
+    vector_store_options: Optional[Dict[str, Any]] = None
+    retrieval_mode: str = "vector"
+    rrf_k: int = 60
+    lexical_index: Optional[BM25Index] = None
+    trigram_index: Optional[TrigramIndex] = None
+    symbol_table: Optional[SymbolTable] = None
+    symbol_boost: bool = True
+    duplicate_bits: int = -1
+    mmr_lambda: float = 1.0
+    # Candidates retrieved per requested document when diversifying
+    diversity_fetch_factor: int = 2
+    neighbor_chunks: int = 0
+    metadata_filter: Optional[Dict[str, Any]] = None
+
+    def _configure_projection(
+        self,
+        method: str = "none",
+        dim: int = 256,
+        shared_path: Optional[str] = None,
+    ) -> None:
+        """Install the collection's embedding projection, if one exists.
+
+        Expects ``self.embedding_model_obj`` to be a ``ProjectedEmbedding``.
+        A shared projection takes precedence over a per-collection one; a
+        per-collection projection is fitted on the next indexing run.
+
+        Args:
+            method: 'none', 'pca' or 'truncate'.
+            dim: Target dimension for newly fitted projections.
+            shared_path: Optional pre-fitted projection used for every
+                collection instead of fitting one per collection.
+        """
+        self.projection_method = method
+        self.projection_dim = dim
+        self.projection_shared_path = shared_path or None
+
+        if self.projection_shared_path:
+            path = self.projection_shared_path
+        elif method != "none":
+            path = get_projection_path(self.persist_directory, self.collection_name)
+        else:
+            return
+
+        if os.path.exists(path):
+            self.embedding_model_obj.projection = EmbeddingProjection.load(path)
+            logger.info(
+                f"Using {self.embedding_model_obj.projection.output_dim}-dim "
+                f"projection from {path}"
+            )
+        elif self.projection_shared_path:
+            logger.warning(f"Shared projection not found: {path}")
+
+    def _configure_vector_store(
+        self, backend: str = "chroma", options: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Serve vector search from the configured backend.
+
+        Expects ``self.vectorstore`` to be the pipeline's LangChain Chroma
+        store, which keeps the collection and its manifest whatever the
+        backend. With another backend, documents are written to and
+        searched in the ``get_vector_store`` store instead.
+
+        Args:
+            backend: 'chroma', 'faiss', 'numpy' or 'quantized'.
+            options: Backend-specific settings passed to the store, such as
+                ``index_type`` for FAISS.
+        """
+        if backend not in VECTOR_STORE_BACKENDS:
+            raise ValueError(
+                f"Unsupported vector store backend: {backend}. "
+                f"Expected one of {list(VECTOR_STORE_BACKENDS)}"
+            )
+        self.vector_store_backend = backend
+        self.vector_store_options = options or None
+        if backend == "chroma":
+            return
+
+        store = get_vector_store(
+            self.collection_name, self.persist_directory, backend, **(options or {})
+        )
+        self.vectorstore = LangChainVectorStore(store, self.embeddings)
+        logger.info(f"Using {backend} vector store for '{self.collection_name}'")
+
+    def _configure_retrieval(
+        self,
+        mode: str = "vector",
+        rrf_k: int = 60,
+        symbol_boost: bool = True,
+        duplicate_bits: int = -1,
+        mmr_lambda: float = 1.0,
+        neighbor_chunks: int = 0,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Set the retrieval mode and load the collection's search indexes.
+
+        The trigram index and symbol table are loaded in every mode, for
+        ``grep_code`` and the symbol lookups. Loaded indexes are shared by
+        the pipelines of the process through ``load_index``.
+
+        Args:
+            mode: 'vector', 'lexical' or 'hybrid'. Lexical and hybrid modes
+                fall back to vector search until a lexical index is built.
+            rrf_k: Rank offset for reciprocal rank fusion.
+            symbol_boost: Rank the definitions of identifiers named in a
+                query alongside the retrieved documents.
+            duplicate_bits: Drop documents whose SimHash differs from a
+                better one's in at most this many bits; negative keeps
+                near duplicates.
+            mmr_lambda: Maximal marginal relevance trade-off between
+                relevance (1) and diversity (0).
+            neighbor_chunks: Adjacent chunks on each side of a retrieved
+                document merged into it.
+            metadata_filter: ChromaDB-style filter, e.g. from
+                ``scope_filter``, restricting every search to the matching
+                chunks.
+        """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(
+                f"Unsupported retrieval mode: {mode}. "
+                f"Expected one of {list(RETRIEVAL_MODES)}"
+            )
+        if not 0.0 <= mmr_lambda <= 1.0:
+            raise ValueError(f"mmr_lambda must be between 0 and 1, got {mmr_lambda}")
+        self.retrieval_mode = mode
+        self.rrf_k = rrf_k
+        self.symbol_boost = symbol_boost
+        self.duplicate_bits = duplicate_bits
+        self.mmr_lambda = mmr_lambda
+        self.neighbor_chunks = neighbor_chunks
+        self.metadata_filter = metadata_filter or None
+
+        # Loaded once per process and reused until the index files change
+        if mode != "vector":
+            self.lexical_index = load_index(
+                BM25Index,
+                get_lexical_directory(self.persist_directory, self.collection_name),
+            )
+            if self.lexical_index is not None:
+                logger.info(
+                    f"Using lexical index of {len(self.lexical_index)} chunks "
+                    f"for {mode} retrieval"
+                )
+
+        self.trigram_index = load_index(
+            TrigramIndex,
+            get_trigram_directory(self.persist_directory, self.collection_name),
+        )
+        self.symbol_table = load_index(
+            SymbolTable,
+            get_symbol_directory(self.persist_directory, self.collection_name),
+        )
+
+    def _save_lexical_index(self, index: Optional[BM25Index]) -> None:
+        """Persist the indexer's lexical index, dropping any earlier one."""
+        directory = get_lexical_directory(self.persist_directory, self.collection_name)
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        if index is not None:
+            index.save(directory)
+        self.lexical_index = index
+
+    def _save_trigram_index(self, index: Optional[TrigramIndex]) -> None:
+        """Persist the indexer's trigram index, dropping any earlier one."""
+        directory = get_trigram_directory(self.persist_directory, self.collection_name)
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        if index is not None:
+            index.save(directory)
+        self.trigram_index = index
+
+    def _save_symbol_table(self, table: Optional[SymbolTable]) -> None:
+        """Persist the indexer's symbol table, dropping any earlier one."""
+        directory = get_symbol_directory(self.persist_directory, self.collection_name)
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        if table is not None:
+            table.save(directory)
+        self.symbol_table = table
+
+    def _require_symbol_table(self) -> SymbolTable:
+        if self.symbol_table is None:
+            raise ValueError(
+                f"No symbol table for collection '{self.collection_name}'; "
+                "re-index the repository to enable symbol lookups"
+            )
+        return self.symbol_table
+
+    def find_definitions(self, name: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Find where a symbol is defined; see ``SymbolTable.find_definitions``.
+
+        Raises:
+            ValueError: If no symbol table was built for the collection.
+        """
+        return self._require_symbol_table().find_definitions(name, limit=limit)
+
+    def find_references(self, name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Find where a symbol is used; see ``SymbolTable.find_references``.
+
+        Raises:
+            ValueError: If no symbol table was built for the collection.
+        """
+        return self._require_symbol_table().find_references(name, limit=limit)
+
+    def grep_code(
+        self, pattern: str, max_results: int = 50, ignore_case: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Find lines of the indexed files matching a regular expression.
+
+        Args:
+            pattern: Python regular expression.
+            max_results: Maximum number of matching lines.
+            ignore_case: Match case-insensitively.
+
+        Returns:
+            ``file_path``, ``line`` and ``text`` of each matching line.
+
+        Raises:
+            ValueError: If no trigram index was built for the collection,
+                or the pattern is invalid.
+        """
+        if self.trigram_index is None:
+            raise ValueError(
+                f"No trigram index for collection '{self.collection_name}'; "
+                "re-index the repository to enable code search"
+            )
+        return self.trigram_index.search(
+            pattern, max_results=max_results, ignore_case=ignore_case
+        )
+
+    def _retrieve_documents(self, query: str, k: int = 5) -> List[Any]:
+        """Retrieve documents for a query with the configured retrieval mode.
+
+        Args:
+            query: Query text.
+            k: Number of documents to retrieve.
+
+        Returns:
+            LangChain documents, best first.
+        """
+        diversifying = self.duplicate_bits >= 0 or self.mmr_lambda < 1.0
+        fetch_k = k * self.diversity_fetch_factor if diversifying else k
+
+        rankings = []
+        if self.retrieval_mode != "lexical" or self.lexical_index is None:
+            rankings.append(self._vector_documents(query, fetch_k))
+        if self.retrieval_mode != "vector" and self.lexical_index is not None:
+            rankings.append(
+                self._lexical_documents(query, fetch_k, self.metadata_filter)
+            )
+
+        symbols = self._symbol_documents(query, k)
+        if symbols:
+            rankings.insert(0, symbols)
+        if len(rankings) == 1:
+            documents = rankings[0]
+        else:
+            fused = reciprocal_rank_fusion(
+                rankings,
+                key=lambda doc: (
+                    doc.metadata.get("file_path"),
+                    (doc.page_content or "").strip(),
+                ),
+                k=self.rrf_k,
+            )
+            documents = [doc for doc, _ in fused]
+
+        if diversifying:
+            documents = diversify(documents, k, self.duplicate_bits, self.mmr_lambda)
+        else:
+            documents = documents[:k]
+        return self._expand_neighbors(documents)
+
+    def _expand_neighbors(self, documents: List[Any]) -> List[Any]:
+        """Merge each document with the adjacent chunks of its file.
+
+        Neighbours are looked up by ``file_path`` and ``chunk_index`` in the
+        vector store metadata, one query per file. A chunk already merged
+        into a better document is not repeated. Documents indexed without
+        chunk positions are returned as they are.
+
+        Args:
+            documents: LangChain documents, best first.
+
+        Returns:
+            Documents spanning their neighbours, with their line ranges.
+        """
+        n = self.neighbor_chunks
+        wanted: Dict[str, Set[int]] = {}
+        for doc in documents:
+            index = doc.metadata.get("chunk_index")
+            if n > 0 and index is not None:
+                wanted.setdefault(doc.metadata.get("file_path"), set()).update(
+                    i for i in range(index - n, index + n + 1) if i >= 0
+                )
+        if not wanted:
+            return documents
+
+        chunks: Dict[Tuple[str, int], Tuple[str, Dict[str, Any]]] = {}
+        try:
+            for file_path, indexes in wanted.items():
+                found = self.vectorstore.get(
+                    where={
+                        "$and": [
+                            {"file_path": file_path},
+                            {"chunk_index": {"$in": sorted(indexes)}},
+                        ]
+                    }
+                )
+                for content, metadata in zip(found["documents"], found["metadatas"]):
+                    chunks[(file_path, metadata["chunk_index"])] = (content, metadata)
+        except Exception as e:
+            logger.warning(f"Neighbour lookup failed, keeping chunks as is: {e}")
+            return documents
+
+        used: Set[Tuple[str, int]] = set()
+        expanded = []
+        for doc in documents:
+            file_path = doc.metadata.get("file_path")
+            index = doc.metadata.get("chunk_index")
+            if index is None:
+                expanded.append(doc)
+                continue
+            if (file_path, index) in used:
+                continue
+            chunks[(file_path, index)] = (doc.page_content, doc.metadata)
+
+            run = [index]
+            for step in (-1, 1):
+                i = index + step
+                while (
+                    abs(i - index) <= n
+                    and (file_path, i) in chunks
+                    and (file_path, i) not in used
+                ):
+                    run.append(i)
+                    i += step
+            run.sort()
+            used.update((file_path, i) for i in run)
+
+            metadata = dict(doc.metadata)
+            for key, position in (("start_line", run[0]), ("end_line", run[-1])):
+                value = chunks[(file_path, position)][1].get(key)
+                if value is not None:
+                    metadata[key] = value
+            content = "\n".join(chunks[(file_path, i)][0] for i in run)
+            expanded.append(Document(page_content=content, metadata=metadata))
+        return expanded
+
+    def _vector_documents(
+        self,
+        query: str,
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        metadata_filter = combine_filters(self.metadata_filter, metadata_filter)
+        if metadata_filter is None:
+            return self.vectorstore.similarity_search(query, k=k)
+        return self.vectorstore.similarity_search(query, k=k, filter=metadata_filter)
+
+    def _lexical_documents(
+        self,
+        query: str,
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        documents = []
+        for row in self.lexical_index.search(
+            query, top_k=k, metadata_filter=metadata_filter
+        ):
+            content = row.pop("content")
+            row.pop("bm25")
+            documents.append(Document(page_content=content, metadata=row))
+        return documents
+
+    def _symbol_documents(self, query: str, k: int, limit: int = 3) -> List[Any]:
+        """Get the chunks defining the identifiers named in a query.
+
+        Each definition's chunk is looked up by its signature within the
+        definition's file, through the lexical index when one is loaded.
+
+        Args:
+            query: Query text.
+            k: Number of documents being retrieved.
+            limit: Maximum number of definitions to look up.
+
+        Returns:
+            LangChain documents, one per definition found.
+        """
+        if not self.symbol_boost or self.symbol_table is None:
+            return []
+
+        definitions = [
+            definition
+            for name in query_symbols(query)
+            for definition in self.symbol_table.find_definitions(name, limit=limit)
+        ][: min(k, limit)]
+
+        documents = []
+        for definition in definitions:
+            where = {"file_path": definition["file_path"]}
+            if self.lexical_index is not None:
+                found = self._lexical_documents(
+                    definition["signature"],
+                    1,
+                    combine_filters(where, self.metadata_filter),
+                )
+            else:
+                found = self._vector_documents(definition["signature"], 1, where)
+            documents.extend(found)
+        return documents
+
+    def _fit_projection(
+        self, embeddings: Optional[List[List[float]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Fit and persist a per-collection projection before documents are added.
+
+        Args:
+            embeddings: Full-dimension chunk embeddings from the indexer.
+
+        Returns:
+            Projection report with recall@10 against full-dimension vectors,
+            or None when no projection was fitted.
+        """
+        if (
+            self.projection_method == "none"
+            or self.projection_shared_path
+            or not embeddings
+        ):
+            return None
+
+        projection = EmbeddingProjection.fit(
+            self.projection_method, embeddings, self.projection_dim
+        )
+        recall = recall_at_k(embeddings, projection.transform(embeddings), k=10)
+        projection.metadata["recall_at_10"] = recall
+        projection.save(
+            get_projection_path(self.persist_directory, self.collection_name)
+        )
+        self.embedding_model_obj.projection = projection
+
+        logger.info(
+            f"Fitted {projection.method} projection "
+            f"{projection.input_dim} -> {projection.output_dim} dims "
+            f"(recall@10 vs full: {recall:.3f})"
+        )
+        return {
+            "method": projection.method,
+            "input_dim": projection.input_dim,
+            "output_dim": projection.output_dim,
+            **projection.metadata,
+        }
+
+    def _reusable_embeddings(
+        self, embeddings: Optional[List[List[float]]], kept: List[int]
+    ) -> Optional[List[List[float]]]:
+        """Reuse the indexer's chunk embeddings for the documents, if possible.
+
+        The indexer has already embedded every chunk. When it used the same
+        model as the pipeline, those vectors (after the collection's
+        projection) are what the vector store would compute again.
+
+        Args:
+            embeddings: Full-dimension embeddings of all chunks.
+            kept: Indices of the chunks that became documents.
+
+        Returns:
+            Embeddings of the kept chunks, or None if they must be recomputed.
+        """
+        indexer_model = getattr(
+            getattr(self.indexer, "embedding_model", None), "model_name", None
+        )
+        if not embeddings or indexer_model != self.embedding_model_obj.model_name:
+            return None
+
+        selected = [embeddings[i] for i in kept]
+        projection = getattr(self.embedding_model_obj, "projection", None)
+        if projection is not None:
+            return projection.transform(selected).tolist()
+        return selected
+
+    def _collection_manifest(self, **fields: Any) -> Dict[str, Any]:
+        """Build the manifest describing how this pipeline indexes documents.
+
+        Args:
+            **fields: Extra manifest fields, see ``build_manifest``.
+
+        Returns:
+            Manifest for the pipeline's collection.
+        """
+        return build_manifest(
+            embedding_model=self.embedding_model_obj.model_name,
+            chunker=type(self.indexer).__name__,
+            chunk_size=getattr(self.indexer, "chunk_size", None),
+            projection=describe_projection(
+                self.projection_method,
+                self.projection_dim,
+                self.projection_shared_path,
+            ),
+            vector_store=describe_vector_store(
+                self.vector_store_backend, self.vector_store_options
+            ),
+            **fields,
+        )
+
+    def _write_manifest(self, **fields: Any) -> None:
+        """Store the collection manifest in the collection metadata."""
+        write_collection_manifest(
+            self.chroma_client,
+            self.persist_directory,
+            self.collection_name,
+            self._collection_manifest(**fields),
+        )
+
+    def _add_documents(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: Optional[List[List[float]]] = None,
+    ) -> Optional[int]:
+        """Write documents to the collection in bounded batches.
+
+        Batches follow ``self.write_batch_size`` capped at the client's
+        ``get_max_batch_size()``, so large repositories neither exceed
+        ChromaDB's limit nor build one huge payload. Without precomputed
+        embeddings the next batch is embedded while the current one is
+        written. Documents go to the Chroma collection, or to the
+        configured backend's store.
+
+        Args:
+            texts: Document contents.
+            metadatas: Document metadata.
+            embeddings: Precomputed embeddings; computed per batch if None.
+
+        Returns:
+            Dimension of the written vectors.
+        """
+        collection = None
+        if self.vector_store_backend == "chroma":
+            collection = self.chroma_client.get_collection(name=self.collection_name)
+        batch_size = get_write_batch_size(self.chroma_client, self.write_batch_size)
+        ranges = list(batch_ranges(len(texts), batch_size))
+
+        def embed(start: int, end: int) -> List[List[float]]:
+            if embeddings is not None:
+                return embeddings[start:end]
+            embed_start = time.perf_counter()
+            batch = self.embeddings.embed_documents(texts[start:end])
+            logger.debug(
+                f"Embedded {end - start} documents in "
+                f"{(time.perf_counter() - embed_start) * 1000:.1f} ms"
+            )
+            return batch
+
+        dim = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(embed, *ranges[0])
+            for batch_number, (start, end) in enumerate(ranges, 1):
+                batch_embeddings = pending.result()
+                dim = dim or len(batch_embeddings[0])
+                if batch_number < len(ranges):
+                    pending = executor.submit(embed, *ranges[batch_number])
+
+                write_start = time.perf_counter()
+                if collection is None:
+                    self.vectorstore.add_embeddings(
+                        texts[start:end], batch_embeddings, metadatas[start:end]
+                    )
+                else:
+                    collection.add(
+                        ids=[str(uuid.uuid4()) for _ in range(start, end)],
+                        embeddings=batch_embeddings,
+                        documents=texts[start:end],
+                        metadatas=metadatas[start:end],
+                    )
+                logger.info(
+                    f"Wrote batch {batch_number}/{len(ranges)} "
+                    f"({end - start} documents) in "
+                    f"{(time.perf_counter() - write_start) * 1000:.1f} ms"
+                )
+        return dim
 
     def index_repository(
         self,
@@ -64,12 +690,17 @@ class Pipeline(ABC):
             else:
                 logger.info(f"Repository indexed at: {self.repo_path}")
 
-        # Convert chunks to LangChain documents
-        documents = []
+        # Fit the projection first so the documents added below are reduced
+        projection_report = self._fit_projection(result.get("embeddings"))
+
+        # Collect the non-empty chunks as documents
+        texts: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        kept: List[int] = []
         chunks = result.get("chunks", [])
         logger.info(f"Processing {len(chunks)} chunks...")
 
-        for chunk in chunks:
+        for i, chunk in enumerate(chunks):
             # Validate chunk structure
             if not hasattr(chunk, "content") or not hasattr(chunk, "file_path"):
                 continue
@@ -78,29 +709,47 @@ class Pipeline(ABC):
             if not content or not isinstance(content, str) or not content.strip():
                 continue
 
-            try:
-                doc = Document(
-                    page_content=content.strip(),
-                    metadata={"file_path": chunk.file_path or "unknown"},
-                )
-                documents.append(doc)
-            except Exception as e:
-                logger.error(f"Error creating document: {e}")
-                continue
+            texts.append(content.strip())
+            metadata = {"file_path": chunk.file_path or "unknown"}
+            for key in CHUNK_METADATA_FIELDS:
+                value = getattr(chunk, key, None)
+                if value is not None:
+                    metadata[key] = value
+            metadatas.append(metadata)
+            kept.append(i)
+
+        # Mark the collection incomplete until every document is written
+        commit = result.get("repo_info", {}).get("commit_hash")
+        self._write_manifest(commit=commit, complete=False)
 
         # Add documents to vector store
-        if documents:
-            self.vectorstore.add_documents(documents)
-            logger.info(f"Added {len(documents)} documents to vector store")
+        dim = None
+        if texts:
+            embeddings = self._reusable_embeddings(result.get("embeddings"), kept)
+            dim = self._add_documents(texts, metadatas, embeddings)
+            logger.info(f"Added {len(texts)} documents to vector store")
+        self._save_lexical_index(result.get("lexical_index"))
+        self._save_trigram_index(result.get("trigram_index"))
+        self._save_symbol_table(result.get("symbol_table"))
 
-        return {
+        self._write_manifest(
+            embedding_dim=dim,
+            commit=commit,
+            complete=True,
+            document_count=len(texts),
+        )
+
+        response = {
             "status": "success",
-            "documents_added": len(documents),
+            "documents_added": len(texts),
             "chunks_processed": len(chunks),
             "repo_path": str(getattr(self, "repo_path", repo_path)),
             "rag_enabled": True,
             "file_exploration_enabled": hasattr(self, "repo_path"),
         }
+        if projection_report:
+            response["projection"] = projection_report
+        return response
 
     @abstractmethod
     def ask(self, query: str) -> str:
@@ -1,18 +1,25 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Afif Al Mamun
 import re
-from typing import Any
+from typing import Any, Dict, Optional
 
-from langchain_chroma import Chroma
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnablePassthrough
-from langchain_huggingface import HuggingFaceEmbeddings
 from loguru import logger
 
 from repoqa.embedding import SentenceTransformerEmbedding
+from repoqa.embedding.dispatcher import get_shared_dispatcher
+from repoqa.embedding.langchain_embeddings import LangChainEmbeddings
+from repoqa.embedding.projection import ProjectedEmbedding
 from repoqa.pipeline.pipeline import Pipeline
 from repoqa.pipeline.prompts import BASIC_RAG_PROMPT
+from repoqa.retrieval.packing import ContextPacker, get_token_counter
+from repoqa.retrieval.reranker import CrossEncoderReranker
+from repoqa.storage.collection_manager import get_chroma_client
+from repoqa.util.lazy_import import LazyImport
+
+Chroma = LazyImport("langchain_chroma", "Chroma")
 
 
 class RAGPipeline(Pipeline):
@@ -27,6 +34,29 @@ class RAGPipeline(Pipeline):
         ollama_base_url: str,
         temperature: float,
         repo_indexer: Any,
+        projection_method: str = "none",
+        projection_dim: int = 256,
+        projection_shared_path: Optional[str] = None,
+        write_batch_size: int = 0,
+        vector_store_backend: str = "chroma",
+        vector_store_options: Optional[Dict[str, Any]] = None,
+        retrieval_mode: str = "vector",
+        rrf_k: int = 60,
+        symbol_boost: bool = True,
+        duplicate_bits: int = -1,
+        mmr_lambda: float = 1.0,
+        neighbor_chunks: int = 0,
+        context_max_tokens: int = 0,
+        context_tokenizer: Optional[str] = None,
+        retrieval_k: int = 5,
+        rerank_model: Optional[str] = None,
+        rerank_candidates: int = 20,
+        rerank_budget_ms: float = 0,
+        rerank_device: str = "cpu",
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        embedding_dispatcher: bool = False,
+        dispatcher_max_batch_size: int = 32,
+        dispatcher_max_wait_ms: float = 5.0,
     ):
         """Initialize the RAG pipeline.
 
@@ -37,6 +67,51 @@ class RAGPipeline(Pipeline):
             collection_name: Name of the vector store collection.
             ollama_base_url: Base URL for Ollama server.
             temperature: Sampling temperature.
+            projection_method: Embedding projection, 'none', 'pca' or
+                'truncate'.
+            projection_dim: Target dimension of the embedding projection.
+            projection_shared_path: Optional pre-fitted projection shared by
+                all collections.
+            write_batch_size: Documents per vector store write while
+                indexing; 0 uses the ChromaDB client's maximum.
+            vector_store_backend: Store holding the collection's vectors,
+                'chroma', 'faiss', 'numpy' or 'quantized'.
+            vector_store_options: Backend-specific store settings, such as
+                ``index_type`` for FAISS.
+            retrieval_mode: 'vector', 'lexical' or 'hybrid' (BM25 and vector
+                results fused by reciprocal rank).
+            rrf_k: Rank offset for reciprocal rank fusion.
+            symbol_boost: Rank the definitions of identifiers named in a
+                question alongside the retrieved documents.
+            duplicate_bits: Drop retrieved documents whose SimHash differs
+                from a better one's in at most this many bits; negative
+                keeps near duplicates.
+            mmr_lambda: Maximal marginal relevance trade-off between
+                relevance (1) and diversity (0).
+            neighbor_chunks: Adjacent chunks on each side of a retrieved
+                document merged into it, so it comes with its surrounding
+                code.
+            context_max_tokens: Token budget for the retrieved context;
+                documents are deduplicated and trimmed to fit. 0 includes
+                every document in full.
+            context_tokenizer: Hugging Face tokenizer used to count context
+                tokens; None uses a fast estimate.
+            retrieval_k: Number of documents passed to the LLM.
+            rerank_model: Cross-encoder re-ranking the retrieved documents
+                before the best ``retrieval_k`` are kept; None disables
+                re-ranking.
+            rerank_candidates: Number of documents retrieved for re-ranking.
+            rerank_budget_ms: Time allowed for re-ranking a question's
+                candidates; 0 scores every candidate.
+            rerank_device: Device the cross-encoder runs on.
+            metadata_filter: Scope filter restricting retrieval to matching
+                chunks, e.g. one top-level directory.
+            embedding_dispatcher: Encode queries through the process-wide
+                micro-batching dispatcher, so concurrent requests share
+                model calls.
+            dispatcher_max_batch_size: Maximum queries in one batch.
+            dispatcher_max_wait_ms: Time a query waits for others to join
+                its batch.
         """
         self.embedding_model_name = embedding_model
         self.persist_directory = persist_directory
@@ -44,13 +119,50 @@ class RAGPipeline(Pipeline):
         self.ollama_base_url = ollama_base_url
         self.temperature = temperature
         self.llm = llm_model
-        self.embeddings = HuggingFaceEmbeddings(model_name=embedding_model)
+
+        # Embedding model is loaded lazily on the first query
+        query_model = SentenceTransformerEmbedding(model_name=embedding_model)
+        if embedding_dispatcher:
+            query_model = get_shared_dispatcher(
+                query_model, dispatcher_max_batch_size, dispatcher_max_wait_ms
+            )
+        self.embedding_model_obj = ProjectedEmbedding(query_model)
+        self._configure_projection(
+            projection_method, projection_dim, projection_shared_path
+        )
+        self.embeddings = LangChainEmbeddings(self.embedding_model_obj)
+        self.write_batch_size = write_batch_size
+        self.chroma_client = get_chroma_client(persist_directory)
         self.vectorstore = Chroma(
+            client=self.chroma_client,
             collection_name=collection_name,
             embedding_function=self.embeddings,
-            persist_directory=persist_directory,
+        )
+        self._configure_vector_store(vector_store_backend, vector_store_options)
+        self._configure_retrieval(
+            retrieval_mode,
+            rrf_k,
+            symbol_boost,
+            duplicate_bits,
+            mmr_lambda,
+            neighbor_chunks,
+            metadata_filter,
         )
 
+        self.retrieval_k = retrieval_k
+        self.rerank_candidates = rerank_candidates
+        self.reranker = None
+        if rerank_model:
+            self.reranker = CrossEncoderReranker(
+                rerank_model, device=rerank_device, budget_ms=rerank_budget_ms
+            )
+
+        self.context_packer = None
+        if context_max_tokens > 0:
+            self.context_packer = ContextPacker(
+                context_max_tokens, count_tokens=get_token_counter(context_tokenizer)
+            )
+
         # Create prompt template
         self.prompt = PromptTemplate.from_template(BASIC_RAG_PROMPT)
 
@@ -64,9 +176,6 @@ class RAGPipeline(Pipeline):
         )
 
         # Initialize indexer for repository processing
-        self.embedding_model_obj = SentenceTransformerEmbedding(
-            model_name=embedding_model
-        )
         self.indexer = repo_indexer
 
         # Track source files for attribution
@@ -78,10 +187,12 @@ class RAGPipeline(Pipeline):
             # Clear previous source files
             self.source_files = []
 
-            # Use LangChain's built-in similarity search
-            docs = self.vectorstore.similarity_search(query, k=5)
+            k = self.retrieval_k
+            if self.reranker is not None:
+                k = max(k, self.rerank_candidates)
+            docs = self._retrieve_documents(query, k=k)
 
-            # Filter out invalid documents and track sources
+            # Filter out invalid documents
             valid_docs = []
             for i, doc in enumerate(docs):
                 if (
@@ -91,14 +202,15 @@ class RAGPipeline(Pipeline):
                 ):
                     logger.debug(f"Skipping invalid document {i}")
                     continue
+                valid_docs.append(doc)
+            valid_docs = self._rerank(query, valid_docs)[: self.retrieval_k]
 
-                # Track source file
+            # Track source files
+            for doc in valid_docs:
                 file_path = doc.metadata.get("file_path", "unknown")
                 if file_path != "unknown" and file_path not in self.source_files:
                     self.source_files.append(file_path)
 
-                valid_docs.append(doc)
-
             logger.info(f"Retrieved {len(valid_docs)} valid documents")
             logger.info(f"Source files: {self.source_files}")
             return valid_docs
@@ -107,9 +219,25 @@ class RAGPipeline(Pipeline):
             logger.error(f"Safe retrieval failed: {e}")
             return []
 
-    def _format_docs(self, docs):
-        """Format retrieved documents."""
-        formatted = []
+    def _rerank(self, query, docs):
+        """Re-rank documents with the cross-encoder, if one is configured."""
+        if self.reranker is None or not docs:
+            return docs
+        try:
+            return self.reranker.rerank(query, docs)
+        except Exception as e:
+            logger.warning(f"Re-ranking failed, keeping retrieval order: {e}")
+            return docs
+
+    def _format_docs(self, docs, query: str = ""):
+        """Format retrieved documents, packed into the token budget if set.
+
+        Args:
+            docs: Retrieved documents, best first.
+            query: Question, used to pick the lines kept in trimmed
+                documents.
+        """
+        chunks = []
         for i, doc in enumerate(docs, 1):
             # Safety check for document content
             if doc.page_content is None:
@@ -125,13 +253,24 @@ class RAGPipeline(Pipeline):
                 continue
 
             file_path = doc.metadata.get("file_path", "unknown")
-            content = doc.page_content.strip()
-            formatted.append(
-                (
-                    f"File {i}: {file_path}\n"  # header
-                    f"```\n{content}\n```\n"  # fenced block
-                )
+            chunks.append((file_path, doc.page_content.strip()))
+
+        if self.context_packer is not None:
+            packed = self.context_packer.pack(chunks, query)
+            logger.info(
+                f"Packed {len(packed)} of {len(chunks)} documents into "
+                f"{sum(chunk.tokens for chunk in packed)} tokens "
+                f"({sum(chunk.trimmed for chunk in packed)} trimmed)"
+            )
+            chunks = [(chunk.file_path, chunk.content) for chunk in packed]
+
+        formatted = [
+            (
+                f"File {i}: {file_path}\n"  # header
+                f"```\n{content}\n```\n"  # fenced block
             )
+            for i, (file_path, content) in enumerate(chunks, 1)
+        ]
 
         if not formatted:
             return "No valid documents found for context."
@@ -140,7 +279,7 @@ class RAGPipeline(Pipeline):
 
     def _retrieve_and_format(self, query):
         docs = self._safe_retriever(query)
-        return self._format_docs(docs)
+        return self._format_docs(docs, query)
 
     def _clean_response(self, response: str) -> str:
         """Clean and format the generated response.
@@ -0,0 +1,84 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Near-duplicate suppression and maximal marginal relevance for retrieval."""
+
+from typing import Any, List, Sequence
+
+from repoqa.indexing.simhash import BITS, hamming_distance, simhash
+
+
+def fingerprint(document: Any) -> int:
+    """Get a document's SimHash, from its metadata when stored at indexing."""
+    value = document.metadata.get("simhash")
+    if value:
+        return int(value, 16)
+    return simhash(document.page_content or "")
+
+
+def similarity(a: int, b: int) -> float:
+    """Estimate the similarity of two fingerprinted texts.
+
+    Unrelated texts differ in about half of the bits, so that maps to 0 and
+    identical fingerprints to 1.
+    """
+    return max(0.0, 1.0 - 2.0 * hamming_distance(a, b) / BITS)
+
+
+def diversify(
+    documents: Sequence[Any],
+    k: int,
+    duplicate_bits: int = 6,
+    mmr_lambda: float = 1.0,
+) -> List[Any]:
+    """Select k documents, skipping near duplicates and favouring diversity.
+
+    A document whose fingerprint differs from an earlier one's in at most
+    ``duplicate_bits`` bits is dropped. The rest are selected by maximal
+    marginal relevance: each pick maximizes ``mmr_lambda`` times its
+    relevance minus ``1 - mmr_lambda`` times its similarity to the documents
+    already picked. Documents carry no scores, so relevance falls linearly
+    with retrieval rank.
+
+    Args:
+        documents: LangChain documents, best first.
+        k: Number of documents to select.
+        duplicate_bits: Largest fingerprint distance of near duplicates;
+            negative keeps them.
+        mmr_lambda: Relevance weight between 0 and 1; 1 keeps the
+            retrieval order.
+
+    Returns:
+        Selected documents, in order of selection.
+    """
+    kept, fingerprints = [], []
+    for document in documents:
+        value = fingerprint(document)
+        if any(
+            hamming_distance(value, other) <= duplicate_bits for other in fingerprints
+        ):
+            continue
+        kept.append(document)
+        fingerprints.append(value)
+
+    if mmr_lambda >= 1.0 or len(kept) <= 1:
+        return kept[:k]
+
+    relevance = [1.0 - rank / len(kept) for rank in range(len(kept))]
+    redundancy = [0.0] * len(kept)
+    remaining = list(range(len(kept)))
+    selected: List[int] = []
+    while remaining and len(selected) < k:
+        best = max(
+            remaining,
+            key=lambda i: (
+                mmr_lambda * relevance[i] - (1 - mmr_lambda) * redundancy[i]
+            ),
+        )
+        remaining.remove(best)
+        selected.append(best)
+        for i in remaining:
+            redundancy[i] = max(
+                redundancy[i], similarity(fingerprints[i], fingerprints[best])
+            )
+    return [kept[i] for i in selected]
@@ -0,0 +1,165 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+import heapq
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from loguru import logger
+
+from repoqa.embedding.projection import EmbeddingProjection
+from repoqa.storage.vector_store import VectorStore
+
+# Search pools shared by every FederatedRetriever in the process, keyed by
+# size, so concurrent requests together never run more searches than that.
+_EXECUTORS: Dict[int, ThreadPoolExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def get_search_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Get the shared thread pool for federated searches of a given size.
+
+    Args:
+        max_workers: Maximum number of collections searched at once.
+
+    Returns:
+        Shared thread pool.
+    """
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(max_workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="repoqa-search"
+            )
+            _EXECUTORS[max_workers] = executor
+        return executor
+
+
+def shutdown_search_executors() -> None:
+    """Shut down and drop all shared search pools."""
+    with _EXECUTORS_LOCK:
+        for executor in _EXECUTORS.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _EXECUTORS.clear()
+
+
+class FederatedRetriever:
+    """Searches several collections in parallel and merges their results.
+
+    The query is embedded once by the caller. Each collection (shard) is
+    searched for its own top ``k`` on a bounded thread pool, with the query
+    passed through the collection's projection if it has one, and the
+    results are merged into a single top ``k`` by score. Scores are compared
+    directly, so all shards must use the same distance function, which
+    collections built by the pipelines do.
+
+    Shards run concurrently, so latency follows the slowest shard rather
+    than the number of shards. Shards that fail are skipped, and with a
+    ``timeout_s`` shards that have not answered in time are dropped from
+    the merge.
+    """
+
+    def __init__(
+        self,
+        shards: Mapping[str, VectorStore],
+        projections: Optional[Mapping[str, EmbeddingProjection]] = None,
+        max_workers: int = 8,
+        timeout_s: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """Initialize the federated retriever.
+
+        Args:
+            shards: Vector stores keyed by collection name.
+            projections: Query projections keyed by collection name, for
+                collections storing projected vectors.
+            max_workers: Size of the shared pool, if no executor is given.
+            timeout_s: Seconds to wait for all shards; None waits for all.
+            executor: Executor to search shards on.
+        """
+        self.shards = dict(shards)
+        self.projections = dict(projections or {})
+        self.timeout_s = timeout_s
+        self.executor = executor or get_search_executor(max_workers)
+
+    def _search_shard(
+        self,
+        name: str,
+        query_embedding: Sequence[float],
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        projection = self.projections.get(name)
+        if projection is not None:
+            query_embedding = projection.transform([query_embedding])[0].tolist()
+        results = self.shards[name].search(
+            query_embedding, top_k=k, metadata_filter=metadata_filter
+        )
+        return [{**result, "collection": name} for result in results]
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Search every shard and merge the results.
+
+        Args:
+            query_embedding: Query embedding from the collections' model,
+                before any projection.
+            k: Number of results to return overall.
+            metadata_filter: Filter applied within each shard.
+
+        Returns:
+            ``results``: the top ``k`` results by score, each with a
+            ``collection`` key; ``failed``: reasons keyed by the names of
+            shards that errored or timed out.
+        """
+        futures = {
+            self.executor.submit(
+                self._search_shard, name, query_embedding, k, metadata_filter
+            ): name
+            for name in self.shards
+        }
+        done, pending = wait(futures, timeout=self.timeout_s)
+
+        failed: Dict[str, str] = {}
+        for future in pending:
+            future.cancel()
+            failed[futures[future]] = "timeout"
+
+        merged: List[Dict[str, Any]] = []
+        for future in done:
+            name = futures[future]
+            try:
+                merged.extend(future.result())
+            except Exception as e:
+                logger.warning(f"Search of collection '{name}' failed: {e}")
+                failed[name] = str(e)
+
+        if failed:
+            logger.warning(f"Skipped {len(failed)} of {len(futures)} collections")
+        return {
+            "results": heapq.nsmallest(k, merged, key=lambda r: r["score"]),
+            "failed": failed,
+        }
+
+    def retrieve(
+        self,
+        query_embedding: Sequence[float],
+        k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Retrieve the top ``k`` snippets across all shards.
+
+        Args:
+            query_embedding: Query embedding vector.
+            k: Number of snippets to retrieve.
+            metadata_filter: Filter applied within each shard.
+
+        Returns:
+            Snippets with metadata and their ``collection``, best first.
+        """
+        return self.search(query_embedding, k, metadata_filter)["results"]
@@ -0,0 +1,180 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Token-budgeted packing of retrieved chunks into an LLM context."""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from loguru import logger
+
+from repoqa.indexing.lexical import tokenize_code
+from repoqa.util.lazy_import import LazyImport
+
+AutoTokenizer = LazyImport("transformers", "AutoTokenizer")
+
+# Word pieces of up to four characters, single symbols and line breaks
+# approximate BPE tokenizers on code
+_ESTIMATE = re.compile(r"\w{1,4}|[^\w\s]|\n")
+# Header and code fence around each chunk, on top of its file path
+HEADER_TOKENS = 8
+ELISION = "..."
+
+TokenCounter = Callable[[str], int]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text without a tokenizer.
+
+    Args:
+        text: Code or prose.
+
+    Returns:
+        Approximate number of tokens.
+    """
+    return len(_ESTIMATE.findall(text))
+
+
+def get_token_counter(tokenizer: Optional[str] = None) -> TokenCounter:
+    """Get a token counting function.
+
+    Args:
+        tokenizer: Hugging Face tokenizer matching the LLM, e.g.
+            'Qwen/Qwen2.5-Coder-7B-Instruct'; None uses ``estimate_tokens``.
+
+    Returns:
+        Function counting the tokens of a text. Falls back to the estimator
+        when the tokenizer cannot be loaded.
+    """
+    if not tokenizer:
+        return estimate_tokens
+    try:
+        loaded = AutoTokenizer.from_pretrained(tokenizer)
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer '{tokenizer}', estimating: {e}")
+        return estimate_tokens
+    return lambda text: len(loaded.encode(text, add_special_tokens=False))
+
+
+@dataclass
+class ContextChunk:
+    """A chunk selected for the context, possibly trimmed."""
+
+    file_path: str
+    content: str
+    tokens: int
+    trimmed: bool = False
+
+
+class ContextPacker:
+    """Selects and trims retrieved chunks to fit a token budget.
+
+    Chunks are taken greedily in retrieval order, best first. A chunk whose
+    lines were mostly included already from the same file is dropped as a
+    duplicate. A chunk that does not fit is trimmed to the window of lines
+    around its line sharing the most terms with the question, with elided
+    lines marked by ``...``, and smaller chunks further down may still fill
+    the remaining budget.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        count_tokens: Optional[TokenCounter] = None,
+        overlap_threshold: float = 0.8,
+        min_chunk_tokens: int = 32,
+    ):
+        """Initialize the packer.
+
+        Args:
+            max_tokens: Token budget for all chunks and their headers.
+            count_tokens: Token counting function; defaults to
+                ``estimate_tokens``.
+            overlap_threshold: Fraction of a chunk's lines already included
+                from its file above which the chunk is dropped.
+            min_chunk_tokens: Smallest trimmed chunk worth including.
+        """
+        self.max_tokens = max_tokens
+        self.count_tokens = count_tokens or estimate_tokens
+        self.overlap_threshold = overlap_threshold
+        self.min_chunk_tokens = min_chunk_tokens
+
+    def _trim(
+        self, lines: List[str], query_terms: Set[str], budget: int
+    ) -> Optional[Tuple[str, int]]:
+        """Trim lines to the most relevant window fitting a budget."""
+        costs = [self.count_tokens(line + "\n") for line in lines]
+        marker = self.count_tokens(ELISION + "\n")
+        scores = [len(query_terms.intersection(tokenize_code(line))) for line in lines]
+        best = max(range(len(lines)), key=lambda i: (scores[i], -i))
+
+        start, end = best, best + 1
+        used = costs[best] + 2 * marker
+        if used > budget:
+            return None
+        # Grow downwards first, since definitions precede their bodies
+        while True:
+            grown = False
+            for candidate in (end, start - 1):
+                if 0 <= candidate < len(lines) and used + costs[candidate] <= budget:
+                    used += costs[candidate]
+                    start, end = min(start, candidate), max(end, candidate + 1)
+                    grown = True
+            if not grown:
+                break
+
+        window = lines[start:end]
+        if start > 0:
+            window.insert(0, ELISION)
+        if end < len(lines):
+            window.append(ELISION)
+        return "\n".join(window), used
+
+    def pack(
+        self, chunks: Sequence[Tuple[str, str]], query: str = ""
+    ) -> List[ContextChunk]:
+        """Select chunks for the context within the token budget.
+
+        Args:
+            chunks: ``(file_path, content)`` pairs, best first.
+            query: Question used to pick the lines kept in trimmed chunks.
+
+        Returns:
+            Selected chunks in retrieval order.
+        """
+        query_terms = set(tokenize_code(query))
+        included: Dict[str, Set[str]] = {}
+        packed: List[ContextChunk] = []
+        remaining = self.max_tokens
+
+        for file_path, content in chunks:
+            content = content.strip()
+            lines = content.splitlines()
+            distinct = {line.strip() for line in lines if line.strip()}
+            if not distinct:
+                continue
+            seen = included.setdefault(file_path, set())
+            if len(distinct & seen) / len(distinct) >= self.overlap_threshold:
+                logger.debug(f"Skipping chunk of {file_path} overlapping earlier ones")
+                continue
+
+            budget = remaining - HEADER_TOKENS - self.count_tokens(file_path)
+            tokens = self.count_tokens(content)
+            trimmed = False
+            if tokens > budget:
+                if budget < self.min_chunk_tokens:
+                    continue
+                result = self._trim(lines, query_terms, budget)
+                if result is None:
+                    continue
+                content, tokens = result
+                trimmed = True
+
+            packed.append(ContextChunk(file_path, content, tokens, trimmed))
+            seen.update(
+                line.strip() for line in content.splitlines() if line != ELISION
+            )
+            remaining = budget - tokens
+
+        return packed
@@ -0,0 +1,195 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Cross-encoder re-ranking of retrieved chunks."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from repoqa.util.lazy_import import LazyImport
+
+CrossEncoder = LazyImport("sentence_transformers", "CrossEncoder")
+
+# Loaded models and their measured milliseconds per scored pair, shared by
+# every reranker in the process. The API builds a pipeline per request, so
+# without this each request would reload the weights and recalibrate.
+_MODEL_CACHE: Dict[Tuple[str, str, int], Any] = {}
+_PAIR_MS: Dict[Tuple[str, str, int], float] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+# Scores keyed by (model_name, query, chunk id), least recently used first
+_SCORE_CACHE: "OrderedDict[Tuple[str, str, str], float]" = OrderedDict()
+_SCORE_CACHE_LOCK = threading.Lock()
+
+
+def clear_reranker_cache() -> None:
+    """Drop all cached cross-encoder models, latencies and scores."""
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+        _PAIR_MS.clear()
+    with _SCORE_CACHE_LOCK:
+        _SCORE_CACHE.clear()
+
+
+def chunk_id(document: Any) -> str:
+    """Get a stable id of a document from its file path and content.
+
+    Content-based ids are shared by the vector and lexical results for the
+    same chunk, and survive re-indexing while the chunk is unchanged.
+    """
+    file_path = document.metadata.get("file_path", "")
+    data = f"{file_path}\0{document.page_content}".encode("utf-8")
+    return hashlib.sha1(data).hexdigest()
+
+
+class CrossEncoderReranker:
+    """Re-ranks retrieved documents with a cross-encoder.
+
+    A cross-encoder reads the query and a chunk together, so it judges
+    relevance far better than comparing their separate embeddings, at the
+    cost of one forward pass per candidate. All uncached (query, chunk)
+    pairs are scored in a single batch. With a latency budget, only as many
+    candidates as the measured time per pair allows are scored, best
+    retrieved first; the others rank below them in retrieval order.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        device: str = "cpu",
+        budget_ms: float = 0,
+        max_length: int = 512,
+        cache_size: int = 4096,
+    ):
+        """Initialize the reranker; the model is loaded on first use.
+
+        Args:
+            model_name: Name or path of the cross-encoder.
+            device: Device to run the model on.
+            budget_ms: Time allowed for scoring a query's candidates;
+                0 scores every candidate.
+            max_length: Maximum tokens of a (query, chunk) pair; longer
+                chunks are truncated.
+            cache_size: Maximum number of scores kept across queries.
+        """
+        self.model_name = model_name
+        self.device = device
+        self.budget_ms = budget_ms
+        self.max_length = max_length
+        self.cache_size = cache_size
+        self._key = (model_name, device, max_length)
+        self._model = None
+
+    @property
+    def model(self) -> Any:
+        """Underlying CrossEncoder, loaded on first access."""
+        if self._model is None:
+            with _MODEL_CACHE_LOCK:
+                model = _MODEL_CACHE.get(self._key)
+                if model is None:
+                    logger.debug(f"Loading cross-encoder '{self.model_name}'")
+                    model = CrossEncoder(
+                        self.model_name,
+                        device=self.device,
+                        max_length=self.max_length,
+                    )
+                    _MODEL_CACHE[self._key] = model
+                self._model = model
+        return self._model
+
+    def warmup(self) -> None:
+        """Load the model and measure its latency so first queries are fast."""
+        self._predict([("warmup", "warmup")])
+
+    def _predict(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Score pairs in one forward pass, recording the time per pair."""
+        model = self.model
+        start = time.perf_counter()
+        scores = model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+        elapsed = (time.perf_counter() - start) * 1000
+        with _MODEL_CACHE_LOCK:
+            _PAIR_MS[self._key] = elapsed / len(pairs)
+        logger.debug(f"Scored {len(pairs)} pairs in {elapsed:.1f} ms")
+        return [float(score) for score in scores]
+
+    def _capacity(self) -> Optional[int]:
+        """Number of pairs that can be scored within the budget, if limited."""
+        if self.budget_ms <= 0:
+            return None
+        with _MODEL_CACHE_LOCK:
+            pair_ms = _PAIR_MS.get(self._key)
+        if pair_ms is None:
+            return None
+        return max(1, int(self.budget_ms / pair_ms))
+
+    def score(self, query: str, documents: Sequence[Any]) -> List[Optional[float]]:
+        """Score documents against a query.
+
+        Args:
+            query: Query text.
+            documents: LangChain documents, best retrieved first.
+
+        Returns:
+            Relevance score of each document, or None for documents left
+            unscored by the latency budget.
+        """
+        ids = [chunk_id(document) for document in documents]
+        scores: List[Optional[float]] = [None] * len(documents)
+        missing = []
+        with _SCORE_CACHE_LOCK:
+            for i, id_ in enumerate(ids):
+                key = (self.model_name, query, id_)
+                if key in _SCORE_CACHE:
+                    _SCORE_CACHE.move_to_end(key)
+                    scores[i] = _SCORE_CACHE[key]
+                else:
+                    missing.append(i)
+
+        capacity = self._capacity()
+        if capacity is not None and len(missing) > capacity:
+            logger.debug(
+                f"Scoring {capacity} of {len(missing)} uncached candidates "
+                f"within {self.budget_ms} ms"
+            )
+            missing = missing[:capacity]
+        if not missing:
+            return scores
+
+        predicted = self._predict(
+            [(query, documents[i].page_content) for i in missing]
+        )
+        with _SCORE_CACHE_LOCK:
+            for i, score in zip(missing, predicted):
+                scores[i] = score
+                _SCORE_CACHE[(self.model_name, query, ids[i])] = score
+            while len(_SCORE_CACHE) > self.cache_size:
+                _SCORE_CACHE.popitem(last=False)
+        return scores
+
+    def rerank(
+        self, query: str, documents: Sequence[Any], top_k: Optional[int] = None
+    ) -> List[Any]:
+        """Order documents by cross-encoder relevance.
+
+        Args:
+            query: Query text.
+            documents: LangChain documents, best retrieved first.
+            top_k: Number of documents to keep; None keeps all.
+
+        Returns:
+            Scored documents by descending score, then unscored documents
+            in retrieval order.
+        """
+        if not documents:
+            return []
+        scores = self.score(query, documents)
+        order = sorted(
+            range(len(documents)),
+            key=lambda i: (scores[i] is None, -(scores[i] or 0.0), i),
+        )
+        return [documents[i] for i in order[:top_k]]
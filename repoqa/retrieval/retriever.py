@@ -1,32 +1,196 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Afif Al Mamun
 
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
 
+from repoqa.indexing.lexical import BM25Index
+from repoqa.indexing.trigram import TrigramIndex
 from repoqa.storage.vector_store import VectorStore
 
+RETRIEVAL_MODES = ("vector", "lexical", "hybrid")
+
+
+def document_key(result: Dict[str, Any]) -> Tuple[Any, str]:
+    """Identify a retrieved chunk by its file path and stripped content."""
+    return result.get("file_path"), (result.get("content") or "").strip()
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Any]],
+    key: Callable[[Any], Hashable],
+    k: int = 60,
+) -> List[Tuple[Any, float]]:
+    """Fuse several rankings with reciprocal rank fusion.
+
+    Each item scores ``sum(1 / (k + rank))`` over the rankings it appears
+    in, with ranks starting at 1, so items ranked well by several
+    retrievers rise to the top without comparing their raw scores.
+
+    Args:
+        rankings: Ranked item lists, best first.
+        key: Function identifying the same item across rankings.
+        k: Rank offset damping the weight of the top ranks.
+
+    Returns:
+        ``(item, score)`` pairs, best first, keeping the first occurrence
+        of each item.
+    """
+    fused: Dict[Hashable, List[Any]] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, 1):
+            entry = fused.setdefault(key(item), [item, 0.0])
+            entry[1] += 1.0 / (k + rank)
+    return sorted(
+        ((item, score) for item, score in fused.values()),
+        key=lambda pair: pair[1],
+        reverse=True,
+    )
+
 
 class CodeRetriever:
-    """Retrieves relevant code snippets based on queries."""
+    """Retrieves relevant code snippets based on queries.
 
-    def __init__(self, vector_store: VectorStore):
+    In ``vector`` mode snippets are ranked by embedding similarity. With a
+    lexical index, ``lexical`` mode ranks them by BM25 over code tokens and
+    ``hybrid`` mode fuses both rankings with reciprocal rank fusion, so
+    exact identifiers in the query are found even when their embeddings
+    are not close. Without a lexical index or query text, every mode falls
+    back to vector search. With a trigram index, ``grep`` finds the lines
+    matching a regular expression.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        lexical_index: Optional[BM25Index] = None,
+        mode: str = "vector",
+        rrf_k: int = 60,
+        trigram_index: Optional[TrigramIndex] = None,
+    ):
         """Initialize the code retriever.
 
         Args:
             vector_store: Vector store containing indexed repository data.
+            lexical_index: BM25 index over the same chunks, if built.
+            mode: 'vector', 'lexical' or 'hybrid'.
+            rrf_k: Rank offset for reciprocal rank fusion.
+            trigram_index: Trigram index over the repository files, if built.
         """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(
+                f"Unsupported retrieval mode: {mode}. "
+                f"Expected one of {list(RETRIEVAL_MODES)}"
+            )
         self.vector_store = vector_store
+        self.lexical_index = lexical_index
+        self.mode = mode
+        self.rrf_k = rrf_k
+        self.trigram_index = trigram_index
+
+    def _uses_lexical(self, query: Optional[str]) -> bool:
+        return self.mode != "vector" and self.lexical_index is not None and bool(query)
+
+    def _fuse(
+        self, vector: List[Dict[str, Any]], lexical: List[Dict[str, Any]], k: int
+    ) -> List[Dict[str, Any]]:
+        if self.mode == "lexical":
+            return lexical
+        merged: Dict[Hashable, Dict[str, Any]] = {}
+        for result in [*vector, *lexical]:
+            merged.setdefault(document_key(result), {}).update(result)
+        fused = reciprocal_rank_fusion([vector, lexical], document_key, self.rrf_k)
+        return [
+            {**merged[document_key(result)], "rrf": score}
+            for result, score in fused[:k]
+        ]
 
     def retrieve(
-        self, query_embedding: List[float], k: int = 5
+        self,
+        query_embedding: Optional[List[float]],
+        k: int = 5,
+        query: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """Retrieve relevant code snippets for a query.
 
         Args:
             query_embedding: Query embedding vector.
             k: Number of snippets to retrieve.
+            query: Query text for lexical and hybrid retrieval.
+
+        Returns:
+            List of relevant code snippets with metadata. Hybrid results
+            carry their fused ``rrf`` score, and the vector ``score`` and
+            lexical ``bm25`` score of the retrievers that found them.
+        """
+        if not self._uses_lexical(query):
+            return self.vector_store.search(query_embedding, top_k=k)
+
+        lexical = self.lexical_index.search(query, top_k=k)
+        vector = []
+        if self.mode == "hybrid":
+            vector = self.vector_store.search(query_embedding, top_k=k)
+        return self._fuse(vector, lexical, k)
+
+    def retrieve_batch(
+        self,
+        query_embeddings: List[List[float]],
+        k: int = 5,
+        queries: Optional[List[str]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Retrieve relevant code snippets for several queries at once.
+
+        Each query is retrieved as ``retrieve`` would: queries without text
+        use vector search even in lexical and hybrid modes. The vector
+        searches of all queries that need one share a single store call.
+
+        Args:
+            query_embeddings: Query embedding vectors.
+            k: Number of snippets to retrieve per query.
+            queries: Query texts for lexical and hybrid retrieval.
+
+        Returns:
+            One list of snippets with metadata per query, in query order.
+        """
+        queries = queries or [None] * len(query_embeddings)
+        lexical = [self._uses_lexical(query) for query in queries]
+        if not any(lexical):
+            return self.vector_store.search_batch(query_embeddings, top_k=k)
+
+        rows = [
+            i for i, uses in enumerate(lexical) if not uses or self.mode == "hybrid"
+        ]
+        vectors: Dict[int, List[Dict[str, Any]]] = {}
+        if rows:
+            found = self.vector_store.search_batch(
+                [query_embeddings[i] for i in rows], top_k=k
+            )
+            vectors = dict(zip(rows, found))
+
+        results = []
+        for i, (query, uses) in enumerate(zip(queries, lexical)):
+            if uses:
+                matches = self.lexical_index.search(query, top_k=k)
+                results.append(self._fuse(vectors.get(i, []), matches, k))
+            else:
+                results.append(vectors[i])
+        return results
+
+    def grep(
+        self, pattern: str, max_results: int = 50, ignore_case: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Find lines matching a regular expression with the trigram index.
+
+        Args:
+            pattern: Python regular expression.
+            max_results: Maximum number of matching lines.
+            ignore_case: Match case-insensitively.
 
         Returns:
-            List of relevant code snippets with metadata.
+            ``file_path``, ``line`` and ``text`` of each matching line, or
+            an empty list without a trigram index.
         """
-        return self.vector_store.search(query_embedding, top_k=k)
+        if self.trigram_index is None:
+            return []
+        return self.trigram_index.search(
+            pattern, max_results=max_results, ignore_case=ignore_case
+        )
@@ -1,8 +1,36 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Afif Al Mamun
 
-from repoqa.storage.chroma_store import ChromaVectorStore
-from repoqa.storage.langchain_chroma import LangChainChromaStore
+import importlib
+
+from repoqa.storage.store_factory import get_vector_store
 from repoqa.storage.vector_store import VectorStore
 
-__all__ = ["ChromaVectorStore", "LangChainChromaStore", "VectorStore"]
+# Concrete stores import chromadb/LangChain/FAISS; resolve them on first access so
+# importing repoqa.storage.collection_manager stays cheap.
+_LAZY_EXPORTS = {
+    "ChromaVectorStore": "repoqa.storage.chroma_store",
+    "FaissVectorStore": "repoqa.storage.faiss_store",
+    "LangChainChromaStore": "repoqa.storage.langchain_chroma",
+    "LangChainVectorStore": "repoqa.storage.langchain_store",
+    "NumpyVectorStore": "repoqa.storage.numpy_store",
+    "QuantizedVectorStore": "repoqa.storage.quantized_store",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "ChromaVectorStore",
+    "FaissVectorStore",
+    "LangChainChromaStore",
+    "LangChainVectorStore",
+    "NumpyVectorStore",
+    "QuantizedVectorStore",
+    "VectorStore",
+    "get_vector_store",
+]
@@ -0,0 +1,225 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Cache of generated answers, reused for repeated and similar questions."""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from repoqa.indexing.symbols import query_symbols
+
+ANSWER_CACHE_FILE = "answer_cache.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    collection TEXT NOT NULL,
+    commit_hash TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    model TEXT NOT NULL,
+    query TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    embedding BLOB,
+    answer TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_key
+    ON answers (collection, commit_hash, mode, model, normalized);
+"""
+
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a question for exact lookups.
+
+    Case, runs of whitespace and trailing punctuation are ignored, so
+    "What does X do?" and "what does  x do" share an entry.
+    """
+    return _SPACE.sub(" ", query).strip().rstrip("?!. ").lower()
+
+
+class AnswerCache:
+    """Answers keyed by collection, indexed commit, mode and LLM.
+
+    A question is looked up by its normalized text first, then by the
+    cosine similarity of its embedding to the cached questions of the same
+    key that name the same code identifiers, so "what does parse_config do"
+    never reuses the answer about ``parse_args``. Answers for other commits
+    of a collection are dropped when an answer for a new commit is stored,
+    so re-indexing a moved branch invalidates them. Entries live in SQLite,
+    shared by every request and worker process.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        similarity_threshold: float = 0.95,
+        max_entries: int = 10000,
+    ):
+        """Initialize the cache; the database is opened on first use.
+
+        Args:
+            path: Path of the SQLite database.
+            similarity_threshold: Smallest cosine similarity between
+                question embeddings to reuse an answer; 1 or more only
+                reuses answers to the same normalized question.
+            max_entries: Maximum number of answers kept; the oldest are
+                dropped first.
+        """
+        self.path = path
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """SQLite connection, opened and initialized on first access."""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=30, check_same_thread=False
+            )
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def lookup(
+        self,
+        collection: str,
+        commit: str,
+        mode: str,
+        model: str,
+        query: str,
+        embed: Optional[Callable[[], Sequence[float]]] = None,
+    ) -> Optional[str]:
+        """Find a cached answer to a question.
+
+        Args:
+            collection: Collection the question is about.
+            commit: Commit the collection was indexed at.
+            mode: Pipeline mode, 'rag' or 'agent'.
+            model: Name of the LLM.
+            query: Question.
+            embed: Returns the normalized embedding of the question; only
+                called when no answer matches the question's text.
+
+        Returns:
+            Cached answer, or None.
+        """
+        key = (collection, commit, mode, model)
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT answer FROM answers WHERE collection = ? AND "
+                "commit_hash = ? AND mode = ? AND model = ? AND normalized = ? "
+                "ORDER BY id DESC LIMIT 1",
+                (*key, normalize_query(query)),
+            ).fetchone()
+            if row is not None:
+                return row[0]
+            if embed is None or self.similarity_threshold >= 1.0:
+                return None
+            rows = self.connection.execute(
+                "SELECT query, embedding, answer FROM answers WHERE "
+                "collection = ? AND commit_hash = ? AND mode = ? AND model = ? "
+                "AND embedding IS NOT NULL",
+                key,
+            ).fetchall()
+        # Embeddings barely tell identifiers apart, so they must match exactly
+        symbols = set(query_symbols(query))
+        rows = [row for row in rows if set(query_symbols(row[0])) == symbols]
+        if not rows:
+            return None
+
+        query_embedding = np.asarray(embed(), dtype=np.float32)
+        rows = [
+            (np.frombuffer(blob, dtype=np.float32), answer)
+            for _, blob, answer in rows
+            if len(blob) == query_embedding.nbytes
+        ]
+        if not rows:
+            return None
+        similarities = np.stack([vector for vector, _ in rows]) @ query_embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        return rows[best][1]
+
+    def store(
+        self,
+        collection: str,
+        commit: str,
+        mode: str,
+        model: str,
+        query: str,
+        answer: str,
+        embedding: Optional[Sequence[float]] = None,
+    ) -> None:
+        """Cache an answer, dropping the collection's answers for other commits.
+
+        Args:
+            collection: Collection the question is about.
+            commit: Commit the collection was indexed at.
+            mode: Pipeline mode, 'rag' or 'agent'.
+            model: Name of the LLM.
+            query: Question.
+            answer: Generated answer.
+            embedding: Normalized embedding of the question, for similarity
+                lookups.
+        """
+        blob = None
+        if embedding is not None:
+            blob = np.asarray(embedding, dtype=np.float32).tobytes()
+        with self._lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM answers WHERE collection = ? AND commit_hash != ?",
+                (collection, commit),
+            )
+            self.connection.execute(
+                "INSERT INTO answers (collection, commit_hash, mode, model, query, "
+                "normalized, embedding, answer, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    collection,
+                    commit,
+                    mode,
+                    model,
+                    query,
+                    normalize_query(query),
+                    blob,
+                    answer,
+                    time.time(),
+                ),
+            )
+            self.connection.execute(
+                "DELETE FROM answers WHERE id <= "
+                "(SELECT id FROM answers ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def invalidate(self, collection: str) -> int:
+        """Drop every cached answer about a collection.
+
+        Args:
+            collection: Name of the collection.
+
+        Returns:
+            Number of answers dropped.
+        """
+        if self._connection is None and not os.path.exists(self.path):
+            return 0
+        with self._lock, self.connection:
+            return self.connection.execute(
+                "DELETE FROM answers WHERE collection = ?", (collection,)
+            ).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
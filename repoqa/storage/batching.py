@@ -0,0 +1,42 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Helpers for splitting vector store writes into bounded batches."""
+
+from typing import Any, Iterator, Tuple
+
+# Used when the client cannot report a maximum (older ChromaDB releases)
+DEFAULT_WRITE_BATCH_SIZE = 1000
+
+
+def get_write_batch_size(client: Any, batch_size: int = 0) -> int:
+    """Get the number of records to send per write.
+
+    Args:
+        client: ChromaDB client, queried with ``get_max_batch_size()``.
+        batch_size: Requested batch size; 0 uses the client's maximum.
+
+    Returns:
+        Requested batch size capped at the client's maximum.
+    """
+    try:
+        max_batch_size = client.get_max_batch_size()
+    except Exception:
+        max_batch_size = None
+    if not isinstance(max_batch_size, int) or max_batch_size <= 0:
+        max_batch_size = None
+
+    if batch_size <= 0:
+        return max_batch_size or DEFAULT_WRITE_BATCH_SIZE
+    return min(batch_size, max_batch_size) if max_batch_size else batch_size
+
+
+def batch_ranges(total: int, batch_size: int) -> Iterator[Tuple[int, int]]:
+    """Yield ``(start, end)`` slices covering ``total`` items.
+
+    Args:
+        total: Number of items.
+        batch_size: Maximum number of items per slice.
+    """
+    for start in range(0, total, batch_size):
+        yield start, min(start + batch_size, total)
@@ -1,12 +1,18 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Afif Al Mamun
 
+import time
 import uuid
 from typing import Any, Dict, List, Optional, Sequence
 
-import chromadb
+from loguru import logger
 
+from repoqa.storage.batching import batch_ranges, get_write_batch_size
+from repoqa.storage.collection_manager import get_chroma_client
 from repoqa.storage.vector_store import VectorStore
+from repoqa.util.lazy_import import LazyImport
+
+chromadb = LazyImport("chromadb")
 
 
 class ChromaVectorStore(VectorStore):
@@ -16,9 +22,19 @@ class ChromaVectorStore(VectorStore):
         self,
         collection_name: str = "repo_index",
         persist_directory: Optional[str] = None,
+        batch_size: int = 0,
     ):
+        """Initialize the store.
+
+        Args:
+            collection_name: Name of the collection.
+            persist_directory: Directory to persist the database. If None,
+                an in-memory client is used.
+            batch_size: Records per write; 0 uses the client's maximum.
+        """
+        self.batch_size = batch_size
         self.client = (
-            chromadb.PersistentClient(path=persist_directory)
+            get_chroma_client(persist_directory)
             if persist_directory
             else chromadb.Client()
         )
@@ -31,7 +47,18 @@ class ChromaVectorStore(VectorStore):
             raise ValueError("Embeddings and metadata must have the same length")
 
         ids = [str(uuid.uuid4()) for _ in embeddings]
-        self.collection.add(embeddings=embeddings, metadatas=metadata, ids=ids)
+        batch_size = get_write_batch_size(self.client, self.batch_size)
+        for start, end in batch_ranges(len(ids), batch_size):
+            write_start = time.perf_counter()
+            self.collection.add(
+                embeddings=embeddings[start:end],
+                metadatas=metadata[start:end],
+                ids=ids[start:end],
+            )
+            logger.debug(
+                f"Wrote {end - start} embeddings in "
+                f"{(time.perf_counter() - write_start) * 1000:.1f} ms"
+            )
 
     def search(
         self,
@@ -51,9 +78,27 @@ class ChromaVectorStore(VectorStore):
         ):
             query_embedding = query_embedding[0]
 
+        return self.search_batch([query_embedding], top_k, metadata_filter)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several embeddings with one multi-query round-trip.
+
+        Content is read from the stored documents, as written by the
+        pipelines, falling back to a ``content`` metadata key as written by
+        ``add``.
+        """
+        if len(query_embeddings) == 0:
+            return []
+
         query_args = {
-            "query_embeddings": [query_embedding],
+            "query_embeddings": list(query_embeddings),
             "n_results": top_k,
+            "include": ["documents", "metadatas", "distances"],
         }
         if metadata_filter:
             query_args["where"] = metadata_filter
@@ -61,6 +106,28 @@ class ChromaVectorStore(VectorStore):
         results = self.collection.query(**query_args)
 
         return [
-            {**md, "score": dist, "content": md.get("content", "")}
-            for md, dist in zip(results["metadatas"][0], results["distances"][0])
+            [
+                {**_row(doc, md), "score": dist}
+                for doc, md, dist in zip(documents, metadatas, distances)
+            ]
+            for documents, metadatas, distances in zip(
+                results["documents"], results["metadatas"], results["distances"]
+            )
         ]
+
+    def get(
+        self, metadata_filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the stored documents matching a metadata filter."""
+        found = self.collection.get(
+            where=metadata_filter, limit=limit, include=["documents", "metadatas"]
+        )
+        return [
+            _row(doc, md) for doc, md in zip(found["documents"], found["metadatas"])
+        ]
+
+
+def _row(document: Optional[str], metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    metadata = metadata or {}
+    content = document if document is not None else metadata.get("content", "")
+    return {**metadata, "content": content}
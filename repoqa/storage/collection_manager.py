@@ -4,11 +4,56 @@
 """Collection management utilities for ChromaDB."""
 
 import hashlib
+import os
 import re
+import shutil
+import sqlite3
+import threading
+import uuid
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
 
+import numpy as np
 from loguru import logger
 
+from repoqa.indexing.lexical import get_lexical_directory
+from repoqa.indexing.symbols import get_symbol_directory
+from repoqa.indexing.trigram import get_trigram_directory
+from repoqa.storage.answer_cache import ANSWER_CACHE_FILE, AnswerCache
+from repoqa.storage.batching import batch_ranges, get_write_batch_size
+from repoqa.storage.faiss_store import get_faiss_directory
+from repoqa.storage.manifest import (
+    COMPATIBILITY_FIELDS,
+    manifest_mismatches,
+    merge_manifest,
+    read_manifest,
+)
+from repoqa.storage.numpy_store import get_numpy_directory
+from repoqa.storage.quantized_store import get_quantized_directory
+from repoqa.storage.snapshot import open_snapshot, write_snapshot
+from repoqa.storage.usage import ACCESS_LOG_FILE, AccessLog, path_size
+
+# ChromaDB's SQLite database inside a persist directory
+CHROMA_DB_FILE = "chroma.sqlite3"
+
+# Shared PersistentClient per absolute persist directory
+_CLIENTS: Dict[str, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# Compatibility fields and version stamp of collections whose manifest
+# already passed validation, keyed by (absolute persist directory, name)
+_VALIDATED: Dict[Tuple[str, str], Tuple[Dict[str, Any], Tuple[Any, Any]]] = {}
+_VALIDATED_LOCK = threading.Lock()
+
+# Shared access log per absolute persist directory
+_ACCESS_LOGS: Dict[str, AccessLog] = {}
+_ACCESS_LOGS_LOCK = threading.Lock()
+
+# Shared answer cache per absolute persist directory
+_ANSWER_CACHES: Dict[str, AnswerCache] = {}
+_ANSWER_CACHES_LOCK = threading.Lock()
+
 
 def get_collection_name(repo_url: str) -> str:
     """Generate a unique collection name from repository URL.
@@ -60,6 +105,115 @@ def get_collection_name(repo_url: str) -> str:
     return collection
 
 
+def get_chroma_client(persist_directory: str) -> Any:
+    """Get the process-wide ChromaDB client for a persist directory.
+
+    Opening a ``PersistentClient`` reads the SQLite store, so one client per
+    directory is created on first use and shared by the collection helpers
+    and the pipelines.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+
+    Returns:
+        Cached ``chromadb.PersistentClient``.
+    """
+    key = os.path.abspath(persist_directory)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            import chromadb
+
+            client = chromadb.PersistentClient(path=persist_directory)
+            _CLIENTS[key] = client
+    return client
+
+
+def clear_client_cache() -> None:
+    """Drop all cached ChromaDB clients."""
+    with _CLIENTS_LOCK:
+        _CLIENTS.clear()
+
+
+def _validation_key(persist_directory: str, collection_name: str) -> Tuple[str, str]:
+    return os.path.abspath(persist_directory), collection_name
+
+
+def forget_validated_collection(persist_directory: str, collection_name: str) -> None:
+    """Drop a collection's cached validation result.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+        collection_name: Name of the collection.
+    """
+    with _VALIDATED_LOCK:
+        _VALIDATED.pop(_validation_key(persist_directory, collection_name), None)
+
+
+def clear_validation_cache() -> None:
+    """Drop all cached collection validation results."""
+    with _VALIDATED_LOCK:
+        _VALIDATED.clear()
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Check whether a ChromaDB error means the collection is missing."""
+    # NotFoundError in chromadb>=1.0, ValueError in older releases
+    return "does not exist" in str(error)
+
+
+def _get_collection(client: Any, collection_name: str) -> Optional[Any]:
+    """Get a collection by name, or None if it does not exist."""
+    try:
+        return client.get_collection(name=collection_name)
+    except Exception as e:
+        if _is_not_found(e):
+            return None
+        raise
+
+
+def get_projection_path(persist_directory: str, collection_name: str) -> str:
+    """Get the path of a collection's embedding projection file.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+        collection_name: Name of the collection.
+
+    Returns:
+        Path of the ``.npz`` projection stored alongside the collection.
+    """
+    return os.path.join(persist_directory, "projections", f"{collection_name}.npz")
+
+
+def _remove_projection(persist_directory: str, collection_name: str) -> None:
+    """Remove a collection's projection file if there is one."""
+    path = get_projection_path(persist_directory, collection_name)
+    if os.path.exists(path):
+        os.remove(path)
+        logger.info(f"Removed projection for collection '{collection_name}'")
+
+
+# Per-collection directories outside ChromaDB: the search indexes and the
+# FAISS/NumPy/quantized stores, by the name they are archived under
+_STORE_DIRECTORIES: Dict[str, Callable[[str, str], str]] = {
+    "lexical": get_lexical_directory,
+    "trigram": get_trigram_directory,
+    "symbols": get_symbol_directory,
+    "faiss": get_faiss_directory,
+    "numpy": get_numpy_directory,
+    "quantized": get_quantized_directory,
+}
+
+
+def _remove_store_directories(persist_directory: str, collection_name: str) -> None:
+    """Remove a collection's search indexes and FAISS/NumPy/quantized stores."""
+    for get_directory in _STORE_DIRECTORIES.values():
+        path = get_directory(persist_directory, collection_name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+            logger.info(f"Removed {path} for collection '{collection_name}'")
+
+
 def collection_exists_and_has_documents(
     persist_directory: str, collection_name: str
 ) -> bool:
@@ -73,20 +227,13 @@ def collection_exists_and_has_documents(
         True if collection exists and has documents, False otherwise.
     """
     try:
-        import chromadb
+        client = get_chroma_client(persist_directory)
 
-        client = chromadb.PersistentClient(path=persist_directory)
-
-        # Get list of collections
-        collections = client.list_collections()
-        collection_names = [col.name for col in collections]
-
-        if collection_name not in collection_names:
+        collection = _get_collection(client, collection_name)
+        if collection is None:
             logger.info(f"Collection '{collection_name}' does not exist")
             return False
 
-        # Get the collection and check if it has documents
-        collection = client.get_collection(name=collection_name)
         count = collection.count()
 
         logger.info(f"Collection '{collection_name}' has {count} documents")
@@ -97,6 +244,116 @@ def collection_exists_and_has_documents(
         return False
 
 
+def get_collection_manifest(
+    persist_directory: str, collection_name: str
+) -> Optional[Dict[str, Any]]:
+    """Get the manifest stored with a collection.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+        collection_name: Name of the collection.
+
+    Returns:
+        Manifest dictionary, or None if the collection or manifest is missing.
+    """
+    client = get_chroma_client(persist_directory)
+    collection = _get_collection(client, collection_name)
+    if collection is None:
+        return None
+    return read_manifest(collection.metadata)
+
+
+def write_collection_manifest(
+    client: Any,
+    persist_directory: str,
+    collection_name: str,
+    manifest: Dict[str, Any],
+) -> None:
+    """Store a manifest in a collection's metadata.
+
+    Args:
+        client: ChromaDB client holding the collection.
+        persist_directory: Directory where ChromaDB persists data.
+        collection_name: Name of the collection.
+        manifest: Manifest from ``build_manifest``.
+    """
+    collection = client.get_collection(name=collection_name)
+    collection.modify(metadata=merge_manifest(collection.metadata, manifest))
+    forget_validated_collection(persist_directory, collection_name)
+
+
+def validate_collection(
+    persist_directory: str, collection_name: str, expected: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Check whether a collection can serve queries for the current config.
+
+    A collection whose manifest matched ``expected`` before is re-checked
+    with a single metadata lookup: it is reported as valid if its id and
+    manifest timestamp are unchanged. Other processes deleting, evicting or
+    rebuilding it change both, so their changes are noticed.
+
+    Statuses:
+        ``ok``: complete and built with a compatible configuration.
+        ``missing``: the collection does not exist or is empty.
+        ``unversioned``: it has documents but no manifest, so its
+        configuration is unknown.
+        ``incomplete``: indexing did not finish.
+        ``stale``: built with an incompatible configuration; the
+        ``mismatches`` entry lists the differing fields.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+        collection_name: Name of the collection.
+        expected: Manifest for the current configuration.
+
+    Returns:
+        Dictionary with ``status`` and ``mismatches``.
+    """
+    key = _validation_key(persist_directory, collection_name)
+    fields = {k: v for k, v in expected.items() if k in COMPATIBILITY_FIELDS}
+    with _VALIDATED_LOCK:
+        cached = _VALIDATED.pop(key, None)
+
+    try:
+        client = get_chroma_client(persist_directory)
+        collection = _get_collection(client, collection_name)
+    except Exception as e:
+        logger.error(f"Error validating collection: {e}")
+        return {"status": "missing", "mismatches": []}
+
+    if collection is None:
+        logger.info(f"Collection '{collection_name}' does not exist")
+        return {"status": "missing", "mismatches": []}
+
+    manifest = read_manifest(collection.metadata)
+    stamp = (collection.id, (manifest or {}).get("updated_at"))
+    if cached == (fields, stamp):
+        with _VALIDATED_LOCK:
+            _VALIDATED[key] = cached
+        return {"status": "ok", "mismatches": []}
+
+    if manifest is None:
+        status = "unversioned" if collection.count() > 0 else "missing"
+        logger.info(f"Collection '{collection_name}' has no manifest ({status})")
+        return {"status": status, "mismatches": []}
+
+    mismatches = manifest_mismatches(manifest, expected)
+    if mismatches:
+        logger.info(
+            f"Collection '{collection_name}' was built with a different "
+            f"configuration: {', '.join(mismatches)}"
+        )
+        return {"status": "stale", "mismatches": mismatches}
+
+    if not manifest.get("complete"):
+        logger.info(f"Collection '{collection_name}' was not fully indexed")
+        return {"status": "incomplete", "mismatches": []}
+
+    with _VALIDATED_LOCK:
+        _VALIDATED[key] = (fields, stamp)
+    return {"status": "ok", "mismatches": []}
+
+
 def delete_collection(persist_directory: str, collection_name: str) -> bool:
     """Delete a collection from ChromaDB.
 
@@ -107,21 +364,26 @@ def delete_collection(persist_directory: str, collection_name: str) -> bool:
     Returns:
         True if collection was deleted successfully, False otherwise.
     """
-    try:
-        import chromadb
-
-        client = chromadb.PersistentClient(path=persist_directory)
-
-        # Check if collection exists
-        collections = client.list_collections()
-        collection_names = [col.name for col in collections]
+    from repoqa.config import config
 
-        if collection_name not in collection_names:
+    try:
+        client = get_chroma_client(persist_directory)
+        forget_validated_collection(persist_directory, collection_name)
+
+        # Files derived from the old vectors must not outlive them
+        _remove_projection(persist_directory, collection_name)
+        _remove_store_directories(persist_directory, collection_name)
+        if config.answer_cache_enabled:
+            get_answer_cache(persist_directory).invalidate(collection_name)
+
+        try:
+            client.delete_collection(name=collection_name)
+        except Exception as e:
+            if not _is_not_found(e):
+                raise
             logger.info(f"Collection '{collection_name}' does not exist")
             return True  # Nothing to delete, consider it success
 
-        # Delete the collection
-        client.delete_collection(name=collection_name)
         logger.info(f"Successfully deleted collection '{collection_name}'")
         return True
 
@@ -140,9 +402,7 @@ def list_collections(persist_directory: str) -> list[str]:
         List of collection names.
     """
     try:
-        import chromadb
-
-        client = chromadb.PersistentClient(path=persist_directory)
+        client = get_chroma_client(persist_directory)
         collections = client.list_collections()
         collection_names = [col.name for col in collections]
 
@@ -165,27 +425,485 @@ def get_collection_info(persist_directory: str, collection_name: str) -> dict:
         Dictionary with collection information.
     """
     try:
-        import chromadb
-
-        client = chromadb.PersistentClient(path=persist_directory)
-
-        # Check if collection exists
-        collections = client.list_collections()
-        collection_names = [col.name for col in collections]
+        client = get_chroma_client(persist_directory)
 
-        if collection_name not in collection_names:
+        collection = _get_collection(client, collection_name)
+        if collection is None:
             return {"exists": False, "name": collection_name}
 
-        # Get collection info
-        collection = client.get_collection(name=collection_name)
         count = collection.count()
 
-        return {
+        info = {
             "exists": True,
             "name": collection_name,
             "document_count": count,
         }
+        manifest = read_manifest(collection.metadata)
+        if manifest:
+            info["manifest"] = manifest
+        return info
 
     except Exception as e:
         logger.error(f"Error getting collection info: {e}")
         return {"exists": False, "name": collection_name, "error": str(e)}
+
+
+def get_access_log(persist_directory: str) -> AccessLog:
+    """Get the process-wide access log stored in a persist directory.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+
+    Returns:
+        Cached ``AccessLog``.
+    """
+    key = os.path.abspath(persist_directory)
+    with _ACCESS_LOGS_LOCK:
+        log = _ACCESS_LOGS.get(key)
+        if log is None:
+            log = AccessLog(os.path.join(persist_directory, ACCESS_LOG_FILE))
+            _ACCESS_LOGS[key] = log
+    return log
+
+
+def clear_access_log_cache() -> None:
+    """Drop all cached access logs."""
+    with _ACCESS_LOGS_LOCK:
+        _ACCESS_LOGS.clear()
+
+
+def get_answer_cache(
+    persist_directory: str,
+    similarity_threshold: Optional[float] = None,
+    max_entries: Optional[int] = None,
+) -> AnswerCache:
+    """Get the process-wide answer cache stored in a persist directory.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+        similarity_threshold: Question similarity needed to reuse an
+            answer; None keeps the current setting.
+        max_entries: Maximum number of cached answers; None keeps the
+            current setting.
+
+    Returns:
+        Cached ``AnswerCache``.
+    """
+    key = os.path.abspath(persist_directory)
+    with _ANSWER_CACHES_LOCK:
+        cache = _ANSWER_CACHES.get(key)
+        if cache is None:
+            cache = AnswerCache(os.path.join(persist_directory, ANSWER_CACHE_FILE))
+            _ANSWER_CACHES[key] = cache
+    if similarity_threshold is not None:
+        cache.similarity_threshold = similarity_threshold
+    if max_entries is not None:
+        cache.max_entries = max_entries
+    return cache
+
+
+def clear_answer_caches() -> None:
+    """Drop all cached answer cache handles."""
+    with _ANSWER_CACHES_LOCK:
+        _ANSWER_CACHES.clear()
+
+
+def record_access(
+    persist_directory: str, collection_name: str, clone_path: Optional[str] = None
+) -> None:
+    """Record that a collection, and optionally its clone, was used.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+        collection_name: Name of the collection.
+        clone_path: Clone directory of the repository, if it has one.
+    """
+    log = get_access_log(persist_directory)
+    log.touch("collections", collection_name)
+    if clone_path:
+        log.touch("clones", os.path.abspath(clone_path))
+
+
+def _vector_segments(persist_directory: str) -> Optional[Dict[str, str]]:
+    """Map vector segment ids to collection ids from ChromaDB's SQLite file.
+
+    Returns:
+        Segment id to collection id, or None if the database can't be read.
+    """
+    db_path = os.path.join(persist_directory, CHROMA_DB_FILE)
+    if not os.path.exists(db_path):
+        return None
+    try:
+        with closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as db:
+            rows = db.execute(
+                "SELECT id, collection FROM segments WHERE scope = 'VECTOR'"
+            ).fetchall()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not read ChromaDB segments: {e}")
+        return None
+    return dict(rows)
+
+
+def get_storage_usage(
+    persist_directory: str, clone_directory: Optional[str] = None
+) -> Dict[str, Any]:
+    """Report the disk usage and last access of collections and clones.
+
+    A collection's size is its vector segment directories, its share of
+    ChromaDB's SQLite file in proportion to its document count, and its
+    projection and FAISS/NumPy files. ``last_access`` is None for data that
+    has not been accessed since access tracking started.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+        clone_directory: Directory holding repository clones, if any.
+
+    Returns:
+        Dictionary with ``collections`` and ``clones`` entries and their
+        total sizes in bytes.
+    """
+    client = get_chroma_client(persist_directory)
+    log = get_access_log(persist_directory)
+
+    collections = [(c, c.count()) for c in client.list_collections()]
+    total_documents = sum(count for _, count in collections)
+    sqlite_size = path_size(os.path.join(persist_directory, CHROMA_DB_FILE))
+    segments = _vector_segments(persist_directory) or {}
+
+    collection_entries = []
+    for collection, count in collections:
+        name = collection.name
+        size = sum(
+            path_size(os.path.join(persist_directory, segment))
+            for segment, owner in segments.items()
+            if owner == str(collection.id)
+        )
+        if total_documents:
+            size += sqlite_size * count // total_documents
+        size += path_size(get_projection_path(persist_directory, name))
+        size += path_size(get_faiss_directory(persist_directory, name))
+        size += path_size(get_numpy_directory(persist_directory, name))
+        size += path_size(get_quantized_directory(persist_directory, name))
+        size += path_size(get_lexical_directory(persist_directory, name))
+        size += path_size(get_trigram_directory(persist_directory, name))
+        size += path_size(get_symbol_directory(persist_directory, name))
+        collection_entries.append(
+            {
+                "name": name,
+                "document_count": count,
+                "size_bytes": size,
+                "last_access": log.last_access("collections", name),
+            }
+        )
+
+    clone_entries = []
+    if clone_directory and os.path.isdir(clone_directory):
+        for name in sorted(os.listdir(clone_directory)):
+            path = os.path.abspath(os.path.join(clone_directory, name))
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            clone_entries.append(
+                {
+                    "path": path,
+                    "size_bytes": path_size(path),
+                    "last_access": log.last_access("clones", path),
+                }
+            )
+
+    return {
+        "collections": collection_entries,
+        "collections_bytes": sum(e["size_bytes"] for e in collection_entries),
+        "clones": clone_entries,
+        "clones_bytes": sum(e["size_bytes"] for e in clone_entries),
+    }
+
+
+def _evict_lru(
+    entries: List[Dict[str, Any]],
+    max_bytes: int,
+    protected: Iterable[str],
+    key: str,
+    evict: Callable[[str], bool],
+) -> List[Dict[str, Any]]:
+    """Evict least recently used entries until their total fits ``max_bytes``."""
+    protected = set(protected)
+    total = sum(entry["size_bytes"] for entry in entries)
+    evicted = []
+    for entry in sorted(entries, key=lambda e: e["last_access"] or 0.0):
+        if total <= max_bytes:
+            break
+        if entry[key] in protected:
+            continue
+        if evict(entry[key]):
+            total -= entry["size_bytes"]
+            evicted.append(entry)
+    return evicted
+
+
+def _remove_orphan_segments(persist_directory: str) -> None:
+    """Remove vector segment directories of collections that were deleted.
+
+    ChromaDB leaves a deleted collection's segment directory on disk, so
+    without this deleting collections frees no space.
+    """
+    segments = _vector_segments(persist_directory)
+    if segments is None:
+        return
+
+    for name in os.listdir(persist_directory):
+        path = os.path.join(persist_directory, name)
+        try:
+            uuid.UUID(name)
+        except ValueError:
+            continue
+        if os.path.isdir(path) and name not in segments:
+            shutil.rmtree(path, ignore_errors=True)
+            logger.info(f"Removed orphaned segment directory {path}")
+
+
+def compact_storage(
+    persist_directory: str,
+    max_collection_bytes: int = 0,
+    clone_directory: Optional[str] = None,
+    max_clone_bytes: int = 0,
+    protected_collections: Iterable[str] = (),
+    protected_clones: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """Evict least recently used collections and clones beyond disk quotas.
+
+    Collections are deleted with ``delete_collection`` and clones removed
+    from disk; both are rebuilt by the next request that needs them.
+    Segment directories left behind by deleted collections are swept as
+    well.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+        max_collection_bytes: Quota for all collections; 0 disables it.
+        clone_directory: Directory holding repository clones, if any.
+        max_clone_bytes: Quota for all clones; 0 disables it.
+        protected_collections: Collection names never evicted, e.g. the one
+            serving the current request.
+        protected_clones: Clone paths never evicted.
+
+    Returns:
+        Names of evicted collections, paths of evicted clones and the number
+        of bytes freed on disk. Space inside ChromaDB's SQLite file is
+        reused by later writes rather than returned to the filesystem.
+    """
+    usage = get_storage_usage(persist_directory, clone_directory)
+    log = get_access_log(persist_directory)
+
+    def disk_usage() -> int:
+        return path_size(persist_directory) + (
+            path_size(clone_directory) if clone_directory else 0
+        )
+
+    before = disk_usage()
+
+    def evict_collection(name: str) -> bool:
+        if not delete_collection(persist_directory, name):
+            return False
+        log.forget("collections", name)
+        return True
+
+    def evict_clone(path: str) -> bool:
+        try:
+            shutil.rmtree(path)
+        except OSError as e:
+            logger.error(f"Error removing clone {path}: {e}")
+            return False
+        log.forget("clones", path)
+        logger.info(f"Removed clone {path}")
+        return True
+
+    evicted_collections: List[Dict[str, Any]] = []
+    if max_collection_bytes > 0:
+        evicted_collections = _evict_lru(
+            usage["collections"],
+            max_collection_bytes,
+            protected_collections,
+            "name",
+            evict_collection,
+        )
+
+    evicted_clones: List[Dict[str, Any]] = []
+    if max_clone_bytes > 0:
+        evicted_clones = _evict_lru(
+            usage["clones"],
+            max_clone_bytes,
+            [os.path.abspath(path) for path in protected_clones],
+            "path",
+            evict_clone,
+        )
+
+    _remove_orphan_segments(persist_directory)
+    return {
+        "evicted_collections": [e["name"] for e in evicted_collections],
+        "evicted_clones": [e["path"] for e in evicted_clones],
+        "freed_bytes": max(0, before - disk_usage()),
+    }
+
+
+def _distance_function(collection: Any) -> Optional[str]:
+    """Get a collection's HNSW distance function, if it can be determined."""
+    configuration = getattr(collection, "configuration", None)
+    if isinstance(configuration, dict):
+        space = (configuration.get("hnsw") or {}).get("space")
+        if space:
+            return str(space)
+    return (collection.metadata or {}).get("hnsw:space")
+
+
+def export_collection(
+    persist_directory: str, collection_name: str, output_path: str
+) -> Dict[str, Any]:
+    """Export a collection to a snapshot archive.
+
+    The archive holds the stored vectors, documents, metadata, manifest,
+    projection and the lexical, trigram, symbol and FAISS/NumPy/quantized
+    store directories, so ``import_collection`` can recreate the collection
+    on another machine without embedding or parsing anything.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+        collection_name: Name of the collection to export.
+        output_path: Path of the ``.tar.gz`` archive to write.
+
+    Returns:
+        Snapshot info with the archive path and size.
+
+    Raises:
+        ValueError: If the collection does not exist or was not fully indexed.
+    """
+    client = get_chroma_client(persist_directory)
+    collection = _get_collection(client, collection_name)
+    if collection is None:
+        raise ValueError(f"Collection '{collection_name}' does not exist")
+
+    manifest = read_manifest(collection.metadata)
+    if manifest is not None and not manifest.get("complete"):
+        raise ValueError(f"Collection '{collection_name}' was not fully indexed")
+    if manifest is None:
+        logger.warning(
+            f"Collection '{collection_name}' has no manifest; its import will "
+            "be rebuilt on first use"
+        )
+
+    count = collection.count()
+    page_size = get_write_batch_size(client)
+
+    def pages():
+        for start, end in batch_ranges(count, page_size):
+            page = collection.get(
+                limit=end - start,
+                offset=start,
+                include=["embeddings", "documents", "metadatas"],
+            )
+            yield (
+                page["ids"],
+                page["embeddings"],
+                page["documents"],
+                page["metadatas"],
+            )
+
+    space = _distance_function(collection)
+    projection_path = get_projection_path(persist_directory, collection_name)
+    index_directories = {}
+    for index, get_directory in _STORE_DIRECTORIES.items():
+        directory = get_directory(persist_directory, collection_name)
+        if os.path.isdir(directory):
+            index_directories[index] = directory
+    info = write_snapshot(
+        output_path,
+        collection_name,
+        count,
+        pages(),
+        manifest=manifest,
+        settings={"hnsw:space": space} if space else {},
+        projection_path=projection_path if os.path.exists(projection_path) else None,
+        index_directories=index_directories,
+    )
+    logger.info(f"Exported {count} documents of '{collection_name}' to {output_path}")
+    return {**info, "path": output_path, "size_bytes": path_size(output_path)}
+
+
+def import_collection(
+    persist_directory: str,
+    archive_path: str,
+    collection_name: Optional[str] = None,
+    overwrite: bool = False,
+    batch_size: int = 0,
+) -> Dict[str, Any]:
+    """Create a collection from a snapshot archive without re-embedding.
+
+    The manifest is written as incomplete before the first batch and
+    restored from the snapshot after the last one, so an interrupted import
+    is rebuilt instead of being served.
+
+    Args:
+        persist_directory: Directory where ChromaDB persists data.
+        archive_path: Archive written by ``export_collection``.
+        collection_name: Name of the new collection; defaults to the
+            exported collection's name.
+        overwrite: Replace an existing collection of the same name.
+        batch_size: Documents per write; 0 uses the client's maximum.
+
+    Returns:
+        Snapshot info with the name of the imported collection.
+
+    Raises:
+        ValueError: If the archive is invalid or the collection exists and
+            ``overwrite`` is False.
+    """
+    client = get_chroma_client(persist_directory)
+
+    with open_snapshot(archive_path) as snapshot:
+        info = snapshot.info
+        name = collection_name or info["collection_name"]
+
+        if _get_collection(client, name) is not None:
+            if not overwrite:
+                raise ValueError(f"Collection '{name}' already exists")
+            delete_collection(persist_directory, name)
+
+        collection = client.get_or_create_collection(
+            name=name, metadata=info.get("settings") or None
+        )
+
+        manifest = info.get("manifest")
+        if manifest:
+            write_collection_manifest(
+                client, persist_directory, name, {**manifest, "complete": False}
+            )
+
+        ranges = batch_ranges(
+            len(snapshot.ids), get_write_batch_size(client, batch_size)
+        )
+        for start, end in ranges:
+            collection.add(
+                ids=snapshot.ids[start:end],
+                embeddings=np.asarray(snapshot.vectors[start:end]),
+                documents=[snapshot.table.content(i) for i in range(start, end)],
+                metadatas=[snapshot.metadata(i) for i in range(start, end)],
+            )
+
+        # Query embeddings must be projected exactly like the stored ones
+        if snapshot.projection_path:
+            projection_path = get_projection_path(persist_directory, name)
+            os.makedirs(os.path.dirname(projection_path), exist_ok=True)
+            shutil.copyfile(snapshot.projection_path, projection_path)
+        else:
+            _remove_projection(persist_directory, name)
+
+        # Grep, definition lookup and non-Chroma backends read these
+        _remove_store_directories(persist_directory, name)
+        for index, directory in snapshot.index_directories.items():
+            if index in _STORE_DIRECTORIES:
+                target = _STORE_DIRECTORIES[index](persist_directory, name)
+                shutil.copytree(directory, target)
+
+        if manifest:
+            write_collection_manifest(client, persist_directory, name, manifest)
+
+    logger.info(f"Imported {info['count']} documents into '{name}'")
+    return {**info, "collection_name": name}
@@ -0,0 +1,219 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Compact on-disk side table for chunk content and metadata."""
+
+import json
+import operator
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+CONTENT_FILE = "content.bin"
+OFFSETS_FILE = "offsets.npy"
+METADATA_FILE = "metadata.json"
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+}
+
+
+class DocumentTable:
+    """Row-addressed store for the content and metadata of indexed chunks.
+
+    Row ``i`` holds the chunk stored under id ``i`` in a vector index.
+    Content is kept as one UTF-8 blob plus an offsets array, both of which
+    are memory-mapped when loaded, so only the rows that are actually
+    returned by a search are paged in. Metadata is stored column-wise as
+    JSON, which keeps repeated keys out of the file and lets metadata
+    filters run over a whole column at once.
+
+    Filters use the same ``where`` syntax as ChromaDB: ``{"key": value}``,
+    the operators ``$eq``, ``$ne``, ``$in``, ``$nin``, ``$gt``, ``$gte``,
+    ``$lt``, ``$lte`` and the combinators ``$and`` / ``$or``.
+    """
+
+    def __init__(self):
+        self._blob: Any = b""
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._pending: List[bytes] = []
+        self._columns: Dict[str, List[Any]] = {}
+        self._column_cache: Dict[str, np.ndarray] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """Append rows, reading chunk text from their ``content`` key.
+
+        Args:
+            rows: Metadata dictionaries, one per row.
+        """
+        for row in rows:
+            content = row.get("content") or ""
+            self._pending.append(str(content).encode("utf-8"))
+            for key in row.keys() - self._columns.keys() - {"content"}:
+                self._columns[key] = [None] * self._size
+            for key, values in self._columns.items():
+                values.append(row.get(key))
+            self._size += 1
+        self._column_cache.clear()
+
+    def content(self, row: int) -> str:
+        """Get the content of a row."""
+        persisted = len(self._offsets) - 1
+        if row < persisted:
+            start, end = self._offsets[row], self._offsets[row + 1]
+            return bytes(self._blob[start:end]).decode("utf-8")
+        return self._pending[row - persisted].decode("utf-8")
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """Get the metadata of a row together with its ``content``."""
+        metadata = {
+            key: values[row]
+            for key, values in self._columns.items()
+            if values[row] is not None
+        }
+        metadata["content"] = self.content(row)
+        return metadata
+
+    def match(self, where: Dict[str, Any]) -> np.ndarray:
+        """Evaluate a metadata filter.
+
+        Args:
+            where: ChromaDB-style filter.
+
+        Returns:
+            Boolean mask with one entry per row.
+        """
+        mask = np.ones(self._size, dtype=bool)
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self.match(clause)
+            elif key == "$or":
+                any_mask = np.zeros(self._size, dtype=bool)
+                for clause in condition:
+                    any_mask |= self.match(clause)
+                mask &= any_mask
+            elif isinstance(condition, dict):
+                for op, value in condition.items():
+                    mask &= self._match_field(key, op, value)
+            else:
+                mask &= self._match_field(key, "$eq", condition)
+        return mask
+
+    def find(
+        self, where: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the rows matching a metadata filter, in row order.
+
+        Args:
+            where: ChromaDB-style filter.
+            limit: Maximum number of rows; None returns every match.
+
+        Returns:
+            Metadata of each matching row together with its ``content``.
+        """
+        rows = np.flatnonzero(self.match(where))[:limit]
+        return [self.row(int(i)) for i in rows]
+
+    def _column(self, key: str) -> np.ndarray:
+        if key not in self._column_cache:
+            column = np.empty(self._size, dtype=object)
+            column[:] = self._columns.get(key, [None] * self._size)
+            self._column_cache[key] = column
+        return self._column_cache[key]
+
+    def _match_field(self, key: str, op: str, value: Any) -> np.ndarray:
+        column = self._column(key)
+        if op == "$eq":
+            return np.asarray(column == value, dtype=bool)
+        if op == "$ne":
+            return np.asarray(column != value, dtype=bool)
+        if op in ("$in", "$nin"):
+            allowed = set(value)
+            mask = np.fromiter(
+                (v in allowed for v in column), dtype=bool, count=self._size
+            )
+            return mask if op == "$in" else ~mask
+        if op in _COMPARISONS:
+            compare = _COMPARISONS[op]
+            return np.fromiter(
+                (v is not None and compare(v, value) for v in column),
+                dtype=bool,
+                count=self._size,
+            )
+        raise ValueError(f"Unsupported filter operator: {op}")
+
+    def save(self, directory: str) -> None:
+        """Write the table to ``directory``, replacing any previous files.
+
+        Args:
+            directory: Destination directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        persisted = len(self._offsets) - 1
+        lengths = [len(content) for content in self._pending]
+        offsets = np.concatenate(
+            [self._offsets, self._offsets[-1] + np.cumsum(lengths, dtype=np.int64)]
+        ).astype(np.int64)
+
+        content_path = os.path.join(directory, CONTENT_FILE)
+        with open(content_path + ".tmp", "wb") as f:
+            if persisted:
+                f.write(bytes(self._blob[: self._offsets[-1]]))
+            for content in self._pending:
+                f.write(content)
+        with open(os.path.join(directory, OFFSETS_FILE + ".tmp"), "wb") as f:
+            np.save(f, offsets)
+        with open(os.path.join(directory, METADATA_FILE + ".tmp"), "w") as f:
+            json.dump({"size": self._size, "columns": self._columns}, f)
+
+        # Drop the old mappings before replacing the files they point to
+        self._blob = b""
+        for name in (CONTENT_FILE, OFFSETS_FILE, METADATA_FILE):
+            path = os.path.join(directory, name)
+            os.replace(path + ".tmp", path)
+
+        self._load_content(directory)
+        self._pending = []
+
+    @classmethod
+    def load(cls, directory: str) -> "DocumentTable":
+        """Load a table written by ``save``.
+
+        Args:
+            directory: Directory containing the table files.
+
+        Returns:
+            Loaded table with memory-mapped content.
+        """
+        table = cls()
+        with open(os.path.join(directory, METADATA_FILE)) as f:
+            data = json.load(f)
+        table._size = data["size"]
+        table._columns = data["columns"]
+        table._load_content(directory)
+        return table
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        """Check whether a saved table exists in ``directory``."""
+        return os.path.exists(os.path.join(directory, METADATA_FILE))
+
+    def _load_content(self, directory: str) -> None:
+        self._offsets = np.load(os.path.join(directory, OFFSETS_FILE), mmap_mode="r")
+        content_path = os.path.join(directory, CONTENT_FILE)
+        # np.memmap cannot map empty files
+        self._blob = (
+            np.memmap(content_path, dtype=np.uint8, mode="r")
+            if os.path.getsize(content_path)
+            else b""
+        )
@@ -0,0 +1,297 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+import json
+import math
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from repoqa.storage.document_table import DocumentTable
+from repoqa.storage.vector_store import VectorStore
+from repoqa.util.lazy_import import LazyImport
+
+faiss = LazyImport("faiss")
+
+INDEX_TYPES = ("auto", "flat", "hnsw", "ivfpq")
+INDEX_FILE = "index.faiss"
+STORE_FILE = "store.json"
+
+# Index types ordered from exact and cheapest to build to most compact
+_INDEX_RANK = {"flat": 0, "hnsw": 1, "ivfpq": 2}
+
+
+def get_faiss_directory(persist_directory: str, collection_name: str) -> str:
+    """Get the directory holding a collection's FAISS index and side table.
+
+    Args:
+        persist_directory: Root directory of the vector store.
+        collection_name: Name of the collection.
+
+    Returns:
+        Path of the collection directory.
+    """
+    return os.path.join(persist_directory, "faiss", collection_name)
+
+
+class FaissVectorStore(VectorStore):
+    """FAISS vector store with a memory-mapped content and metadata table.
+
+    Embeddings are L2-normalized and searched by inner product, so results
+    are ranked by cosine similarity; the returned ``score`` is the cosine
+    distance (lower is closer), matching ``ChromaVectorStore``.
+
+    With ``index_type="auto"`` the index is picked from the collection size:
+    an exact flat index for small collections, HNSW above
+    ``hnsw_threshold`` vectors and IVF-PQ above ``ivfpq_threshold``. A flat
+    or HNSW index is rebuilt into the larger type when adds grow the
+    collection past a threshold.
+
+    When ``persist_directory`` is set, the index and side table are written
+    after every ``add`` and reloaded on construction. With ``mmap`` enabled
+    the index is opened memory-mapped, so resident memory is bounded by the
+    pages searches touch rather than the collection size.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "repo_index",
+        persist_directory: Optional[str] = None,
+        index_type: str = "auto",
+        hnsw_threshold: int = 50_000,
+        ivfpq_threshold: int = 1_000_000,
+        hnsw_m: int = 32,
+        hnsw_ef_search: int = 64,
+        nprobe: int = 16,
+        mmap: bool = True,
+    ):
+        """Initialize the store, loading a persisted index if one exists.
+
+        Args:
+            collection_name: Name of the collection.
+            persist_directory: Root directory for persisted collections.
+                If None, the store lives in memory only.
+            index_type: 'auto', 'flat', 'hnsw' or 'ivfpq'.
+            hnsw_threshold: Collection size from which 'auto' uses HNSW.
+            ivfpq_threshold: Collection size from which 'auto' uses IVF-PQ.
+            hnsw_m: Number of neighbours per HNSW graph node.
+            hnsw_ef_search: HNSW search breadth; raised to ``top_k`` if lower.
+            nprobe: Number of IVF lists scanned per query.
+            mmap: Whether to memory-map persisted indexes when loading.
+        """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(
+                f"Unsupported index type: {index_type}. "
+                f"Expected one of {list(INDEX_TYPES)}"
+            )
+
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+        self.index_type = index_type
+        self.hnsw_threshold = hnsw_threshold
+        self.ivfpq_threshold = ivfpq_threshold
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_search = hnsw_ef_search
+        self.nprobe = nprobe
+        self.mmap = mmap
+
+        self.index = None
+        self.built_index_type: Optional[str] = None
+        self.table = DocumentTable()
+        self._mmapped = False
+        self._lock = threading.Lock()
+
+        if self.directory and DocumentTable.exists(self.directory):
+            self._load()
+
+    @property
+    def directory(self) -> Optional[str]:
+        """Directory of the persisted collection, if persistent."""
+        if self.persist_directory is None:
+            return None
+        return get_faiss_directory(self.persist_directory, self.collection_name)
+
+    def count(self) -> int:
+        """Number of stored vectors."""
+        return len(self.table)
+
+    def add(
+        self, embeddings: Sequence[Sequence[float]], metadata: Sequence[Dict[str, Any]]
+    ) -> None:
+        if len(embeddings) != len(metadata):
+            raise ValueError("Embeddings and metadata must have the same length")
+        if len(embeddings) == 0:
+            return
+
+        vectors = self._prepare(embeddings)
+        with self._lock:
+            total = self.count() + len(vectors)
+            target = self._select_index_type(total)
+
+            if self.index is None:
+                self.index = self._build_index(target, vectors)
+            elif _INDEX_RANK[target] > _INDEX_RANK[self.built_index_type]:
+                logger.info(
+                    f"Rebuilding '{self.collection_name}' as {target} "
+                    f"for {total} vectors"
+                )
+                existing = self._writable_index().reconstruct_n(0, self.count())
+                self.index = self._build_index(
+                    target, np.concatenate([existing, vectors])
+                )
+            else:
+                self._writable_index().add(vectors)
+
+            self.table.append(metadata)
+            if self.directory:
+                self._save()
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search for similar embeddings and return metadata + chunk content."""
+        # [:1] also flattens [[...]] queries
+        query = self._prepare(query_embedding)[:1]
+        return self.search_batch(query, top_k, metadata_filter)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several embeddings with a single index call."""
+        if len(query_embeddings) == 0:
+            return []
+        if self.index is None or top_k <= 0:
+            return [[] for _ in query_embeddings]
+
+        queries = self._prepare(query_embeddings)
+
+        selector = None
+        if metadata_filter:
+            rows = np.flatnonzero(self.table.match(metadata_filter))
+            if len(rows) == 0:
+                return [[] for _ in range(len(queries))]
+            selector = faiss.IDSelectorBatch(rows.astype(np.int64))
+
+        similarities, ids = self.index.search(
+            queries, top_k, params=self._search_params(top_k, selector)
+        )
+
+        return [
+            [
+                {**self.table.row(int(i)), "score": float(1.0 - similarity)}
+                for similarity, i in zip(row_similarities, row_ids)
+                if i >= 0
+            ]
+            for row_similarities, row_ids in zip(similarities, ids)
+        ]
+
+    def get(
+        self, metadata_filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the stored documents matching a metadata filter."""
+        return self.table.find(metadata_filter, limit)
+
+    def _select_index_type(self, total: int) -> str:
+        if self.index_type != "auto":
+            return self.index_type
+        if total >= self.ivfpq_threshold:
+            return "ivfpq"
+        if total >= self.hnsw_threshold:
+            return "hnsw"
+        return "flat"
+
+    def _build_index(self, index_type: str, vectors: np.ndarray) -> Any:
+        dim = vectors.shape[1]
+        if index_type == "flat":
+            index = faiss.IndexFlatIP(dim)
+        elif index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = self._build_ivfpq(vectors)
+
+        index.add(vectors)
+        self.built_index_type = index_type
+        logger.info(
+            f"Built {index_type} index for '{self.collection_name}' "
+            f"with {len(vectors)} vectors"
+        )
+        return index
+
+    @staticmethod
+    def _build_ivfpq(vectors: np.ndarray) -> Any:
+        count, dim = vectors.shape
+        # ~4*sqrt(n) lists, keeping enough training points per centroid
+        nlist = max(1, min(int(4 * math.sqrt(count)), count // 39))
+        # Sub-quantizers must divide the dimension; aim for 4-8 dims each
+        m = next(m for m in range(min(64, max(1, dim // 4)), 0, -1) if dim % m == 0)
+        nbits = max(1, min(8, int(math.log2(count))))
+
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(
+            quantizer, dim, nlist, m, nbits, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(vectors)
+        return index
+
+    def _search_params(self, top_k: int, selector: Any) -> Any:
+        if self.built_index_type == "hnsw":
+            return faiss.SearchParametersHNSW(
+                efSearch=max(self.hnsw_ef_search, top_k), sel=selector
+            )
+        if self.built_index_type == "ivfpq":
+            return faiss.SearchParametersIVF(nprobe=self.nprobe, sel=selector)
+        return faiss.SearchParameters(sel=selector)
+
+    @staticmethod
+    def _prepare(embeddings: Any) -> np.ndarray:
+        vectors = np.array(embeddings, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        vectors = np.ascontiguousarray(vectors)
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    def _writable_index(self) -> Any:
+        """Reload a memory-mapped index into memory before modifying it."""
+        if self._mmapped:
+            self.index = faiss.read_index(os.path.join(self.directory, INDEX_FILE))
+            self._mmapped = False
+        return self.index
+
+    def _save(self) -> None:
+        directory = self.directory
+        os.makedirs(directory, exist_ok=True)
+
+        index_path = os.path.join(directory, INDEX_FILE)
+        faiss.write_index(self.index, index_path + ".tmp")
+        os.replace(index_path + ".tmp", index_path)
+        self.table.save(directory)
+
+        with open(os.path.join(directory, STORE_FILE), "w") as f:
+            json.dump(
+                {"index_type": self.built_index_type, "count": self.count()}, f
+            )
+
+    def _load(self) -> None:
+        directory = self.directory
+        with open(os.path.join(directory, STORE_FILE)) as f:
+            info = json.load(f)
+
+        flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if self.mmap else 0
+        self.index = faiss.read_index(os.path.join(directory, INDEX_FILE), flags)
+        self._mmapped = bool(self.mmap)
+        self.built_index_type = info["index_type"]
+        self.table = DocumentTable.load(directory)
+        logger.info(
+            f"Loaded {self.built_index_type} index for '{self.collection_name}' "
+            f"with {self.count()} vectors"
+        )
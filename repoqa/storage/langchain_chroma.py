@@ -3,12 +3,16 @@
 
 from typing import Any, Dict, List, Optional, Sequence
 
-import torch
-from langchain_chroma import Chroma
 from langchain_core.documents import Document
-from langchain_huggingface import HuggingFaceEmbeddings
 
+from repoqa.embedding.langchain_embeddings import LangChainEmbeddings
+from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+from repoqa.storage.collection_manager import get_chroma_client
 from repoqa.storage.vector_store import VectorStore
+from repoqa.util.lazy_import import LazyImport
+
+Chroma = LazyImport("langchain_chroma", "Chroma")
+chromadb = LazyImport("chromadb")
 
 
 class LangChainChromaStore(VectorStore):
@@ -30,16 +34,22 @@ class LangChainChromaStore(VectorStore):
         self.collection_name = collection_name
         self.persist_directory = persist_directory
 
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=embedding_model_name, model_kwargs={"device": device}
+        self.embeddings = LangChainEmbeddings(
+            SentenceTransformerEmbedding(model_name=embedding_model_name)
         )
 
+        self.client = (
+            get_chroma_client(persist_directory)
+            if persist_directory
+            else chromadb.Client()
+        )
         self.vectorstore = Chroma(
             collection_name=collection_name,
             embedding_function=self.embeddings,
-            persist_directory=persist_directory,
+            client=self.client,
         )
+        # Raw collection for vector queries, created by Chroma above
+        self.collection = self.client.get_collection(name=collection_name)
 
     def add(
         self,
@@ -61,6 +71,83 @@ class LangChainChromaStore(VectorStore):
         # Add documents (LangChain will handle embeddings)
         self.vectorstore.add_documents(documents)
 
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search for similar documents using a query embedding.
+
+        Args:
+            query_embedding: Embedding vector to search with.
+            top_k: Number of results to return.
+            metadata_filter: Optional metadata filter conditions.
+
+        Returns:
+            List of matching documents with metadata, content and distance.
+        """
+        return self.search_batch([query_embedding], top_k, metadata_filter)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several embeddings with one multi-query round-trip.
+
+        Args:
+            query_embeddings: Embedding vectors to search with.
+            top_k: Number of results to return per query.
+            metadata_filter: Optional metadata filter conditions.
+
+        Returns:
+            One result list per query, in query order.
+        """
+        if len(query_embeddings) == 0:
+            return []
+
+        query_args = {
+            "query_embeddings": list(query_embeddings),
+            "n_results": top_k,
+            "include": ["documents", "metadatas", "distances"],
+        }
+        if metadata_filter:
+            query_args["where"] = metadata_filter
+
+        results = self.collection.query(**query_args)
+
+        return [
+            [
+                {**(md or {}), "content": doc or "", "score": dist}
+                for doc, md, dist in zip(documents, metadatas, distances)
+            ]
+            for documents, metadatas, distances in zip(
+                results["documents"], results["metadatas"], results["distances"]
+            )
+        ]
+
+    def get(
+        self, metadata_filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the stored documents matching a metadata filter.
+
+        Args:
+            metadata_filter: ChromaDB ``where`` filter.
+            limit: Maximum number of documents; None returns every match.
+
+        Returns:
+            List of matching documents with metadata and content.
+        """
+        found = self.collection.get(
+            where=metadata_filter, limit=limit, include=["documents", "metadatas"]
+        )
+        return [
+            {**(md or {}), "content": doc or ""}
+            for doc, md in zip(found["documents"], found["metadatas"])
+        ]
+
     def query(self, embedding: Sequence[float], k: int = 5) -> List[Dict[str, Any]]:
         """Query the vector store using embedding.
 
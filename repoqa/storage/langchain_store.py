@@ -0,0 +1,146 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""LangChain interface to the RepoQA vector stores."""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore as LangChainVectorStoreBase
+
+from repoqa.storage.store_factory import get_vector_store
+from repoqa.storage.vector_store import VectorStore
+
+
+class LangChainVectorStore(LangChainVectorStoreBase):
+    """LangChain vector store backed by a RepoQA ``VectorStore``.
+
+    Gives the pipelines the parts of ``langchain_chroma.Chroma`` they use
+    on top of any backend from ``get_vector_store``: similarity search with
+    and without scores, ``get(where=...)`` metadata lookups and writes.
+    Queries are embedded with ``embedding``. Scores are the store's cosine
+    distances, lower is closer, as with Chroma.
+    """
+
+    def __init__(self, store: VectorStore, embedding: Embeddings):
+        """Wrap a vector store.
+
+        Args:
+            store: Store holding the vectors, content and metadata.
+            embedding: Embedding function for queries and added texts.
+        """
+        self.store = store
+        self._embedding = embedding
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Embed and add texts.
+
+        The stores address documents by position, so no ids are returned.
+        """
+        texts = list(texts)
+        self.add_embeddings(texts, self._embedding.embed_documents(texts), metadatas)
+        return []
+
+    def add_embeddings(
+        self,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """Add texts with precomputed embeddings.
+
+        Args:
+            texts: Document contents.
+            embeddings: One embedding per text.
+            metadatas: Document metadata; None stores none.
+        """
+        metadatas = metadatas or [{} for _ in texts]
+        rows = [{**md, "content": text} for text, md in zip(texts, metadatas)]
+        self.store.add(embeddings, rows)
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        """Search by query text, returning documents with cosine distances."""
+        embedding = self._embedding.embed_query(query)
+        results = self.store.search(embedding, top_k=k, metadata_filter=filter)
+        scores = [float(row.pop("score")) for row in results]
+        return [(_document(row), score) for row, score in zip(results, scores)]
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        results = self.store.search(embedding, top_k=k, metadata_filter=filter)
+        for row in results:
+            row.pop("score", None)
+        return [_document(row) for row in results]
+
+    def get(
+        self,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Dict[str, List[Any]]:
+        """Get documents by metadata, in the shape of ``Chroma.get``.
+
+        Args:
+            where: ChromaDB-style filter; None matches every document.
+            limit: Maximum number of documents.
+
+        Returns:
+            ``documents`` and ``metadatas`` lists of the matches.
+        """
+        rows = self.store.get(where or {}, limit=limit)
+        documents = [row.pop("content", "") for row in rows]
+        return {"documents": documents, "metadatas": rows}
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        collection_name: str = "repo_index",
+        persist_directory: Optional[str] = None,
+        backend: str = "numpy",
+        **kwargs: Any,
+    ) -> "LangChainVectorStore":
+        """Create a store with ``get_vector_store`` and add texts to it."""
+        store = cls(
+            get_vector_store(collection_name, persist_directory, backend, **kwargs),
+            embedding,
+        )
+        store.add_texts(texts, metadatas)
+        return store
+
+
+def _document(row: Dict[str, Any]) -> Document:
+    content = row.pop("content", "")
+    return Document(page_content=content or "", metadata=row)
@@ -0,0 +1,186 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Collection manifests recording how a collection was built.
+
+A manifest is stored in the ChromaDB collection metadata under ``repoqa_``
+prefixed keys. It records the embedding model, vector dimension, chunker,
+projection and vector store backend that produced the vectors, the
+indexed commit, and whether indexing ran to completion, so an existing
+collection can be checked against the current configuration before it is
+queried. With a backend other than Chroma, the ChromaDB collection holds
+only the manifest.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+MANIFEST_VERSION = 1
+MANIFEST_PREFIX = "repoqa_"
+
+# Fields that must match for stored vectors to be usable by the current
+# configuration; the commit and counts are informational.
+COMPATIBILITY_FIELDS = (
+    "manifest_version",
+    "embedding_model",
+    "embedding_dim",
+    "chunker",
+    "chunk_size",
+    "projection",
+    "vector_store",
+)
+
+# Values of compatibility fields in manifests written before the field
+# existed
+MANIFEST_DEFAULTS = {"vector_store": "chroma"}
+
+
+def describe_projection(
+    method: str = "none", dim: int = 256, shared_path: Optional[str] = None
+) -> str:
+    """Describe an embedding projection setting as a manifest value.
+
+    Args:
+        method: 'none', 'pca' or 'truncate'.
+        dim: Target dimension of the projection.
+        shared_path: Optional pre-fitted projection shared by all collections.
+
+    Returns:
+        'none', 'shared:<path>' or '<method>:<dim>'.
+    """
+    if shared_path:
+        return f"shared:{shared_path}"
+    if method == "none":
+        return "none"
+    return f"{method}:{dim}"
+
+
+def describe_vector_store(
+    backend: str = "chroma", options: Optional[Dict[str, Any]] = None
+) -> str:
+    """Describe a vector store setting as a manifest value.
+
+    The quantized store cannot reopen codes of another quantization, so the
+    quantization is part of its value.
+
+    Args:
+        backend: Backend name, see ``get_vector_store``.
+        options: Backend-specific settings passed to the store.
+
+    Returns:
+        The backend name, or 'quantized:<quantization>'.
+    """
+    if backend == "quantized":
+        return f"quantized:{(options or {}).get('quantization', 'int8')}"
+    return backend
+
+
+def build_manifest(
+    embedding_model: str,
+    chunker: str,
+    chunk_size: Optional[int],
+    projection: str = "none",
+    embedding_dim: Optional[int] = None,
+    commit: Optional[str] = None,
+    complete: bool = False,
+    document_count: int = 0,
+    vector_store: str = "chroma",
+) -> Dict[str, Any]:
+    """Build a collection manifest.
+
+    Args:
+        embedding_model: Name of the embedding model.
+        chunker: Name of the chunking strategy.
+        chunk_size: Chunk size used by the chunker.
+        projection: Projection description from ``describe_projection``.
+        embedding_dim: Dimension of the stored vectors, if known.
+        commit: Indexed commit hash, if the repository is a git checkout.
+        complete: Whether every document has been written.
+        document_count: Number of documents written.
+        vector_store: Vector store description from ``describe_vector_store``.
+
+    Returns:
+        Manifest dictionary; fields that are None are omitted.
+    """
+    manifest = {
+        "manifest_version": MANIFEST_VERSION,
+        "embedding_model": embedding_model,
+        "embedding_dim": embedding_dim,
+        "chunker": chunker,
+        "chunk_size": chunk_size,
+        "projection": projection,
+        "vector_store": vector_store,
+        "commit": commit,
+        "complete": complete,
+        "document_count": document_count,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    # ChromaDB metadata values cannot be None
+    return {key: value for key, value in manifest.items() if value is not None}
+
+
+def read_manifest(metadata: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Extract a manifest from collection metadata.
+
+    Args:
+        metadata: Collection metadata, possibly None.
+
+    Returns:
+        Manifest dictionary, or None if the collection has no manifest.
+    """
+    manifest = {
+        key[len(MANIFEST_PREFIX) :]: value
+        for key, value in (metadata or {}).items()
+        if key.startswith(MANIFEST_PREFIX)
+    }
+    return manifest or None
+
+
+def merge_manifest(
+    metadata: Optional[Dict[str, Any]], manifest: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Merge a manifest into collection metadata for ``collection.modify``.
+
+    ``modify`` replaces the whole metadata and rejects ``hnsw:`` settings,
+    so other keys are kept, earlier manifest keys and index settings are
+    dropped.
+
+    Args:
+        metadata: Current collection metadata, possibly None.
+        manifest: Manifest to store.
+
+    Returns:
+        New collection metadata.
+    """
+    merged = {
+        key: value
+        for key, value in (metadata or {}).items()
+        if not key.startswith((MANIFEST_PREFIX, "hnsw:"))
+    }
+    merged.update({MANIFEST_PREFIX + key: value for key, value in manifest.items()})
+    return merged
+
+
+def manifest_mismatches(
+    stored: Dict[str, Any], expected: Dict[str, Any]
+) -> List[str]:
+    """List compatibility fields whose stored value differs from the expected one.
+
+    Fields missing from ``expected`` are not compared, so callers that do
+    not know a value (for example the vector dimension before the model is
+    loaded) can leave it out. Fields missing from ``stored`` take their
+    value from ``MANIFEST_DEFAULTS``.
+
+    Args:
+        stored: Manifest read from the collection.
+        expected: Manifest for the current configuration.
+
+    Returns:
+        Names of the mismatching fields.
+    """
+    return [
+        field
+        for field in COMPATIBILITY_FIELDS
+        if field in expected
+        and stored.get(field, MANIFEST_DEFAULTS.get(field)) != expected[field]
+    ]
@@ -0,0 +1,193 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from repoqa.storage.document_table import DocumentTable
+from repoqa.storage.vector_store import VectorStore
+
+VECTORS_FILE = "vectors.npy"
+
+
+def get_numpy_directory(persist_directory: str, collection_name: str) -> str:
+    """Get the directory holding a collection's vector matrix and side table.
+
+    Args:
+        persist_directory: Root directory of the vector store.
+        collection_name: Name of the collection.
+
+    Returns:
+        Path of the collection directory.
+    """
+    return os.path.join(persist_directory, "numpy", collection_name)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class NumpyVectorStore(VectorStore):
+    """Exact brute-force vector store over a memory-mapped float32 matrix.
+
+    Normalized embeddings are kept as one contiguous ``(n, dim)`` matrix in
+    an ``.npy`` file, and content and metadata live in a ``DocumentTable``.
+    A search is a single matrix-vector product followed by
+    ``argpartition``, which for collections up to tens of thousands of
+    chunks is faster than an approximate index and always exact.
+
+    Persisted matrices are opened read-only with ``mmap_mode="r"``, so
+    several worker processes serving the same collection share one copy in
+    the page cache. The returned ``score`` is the cosine distance (lower is
+    closer), matching ``ChromaVectorStore``.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "repo_index",
+        persist_directory: Optional[str] = None,
+    ):
+        """Initialize the store, loading a persisted matrix if one exists.
+
+        Args:
+            collection_name: Name of the collection.
+            persist_directory: Root directory for persisted collections.
+                If None, the store lives in memory only.
+        """
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+
+        self.vectors: Optional[np.ndarray] = None
+        self.table = DocumentTable()
+        self._lock = threading.Lock()
+
+        if self.directory and DocumentTable.exists(self.directory):
+            self.vectors = np.load(
+                os.path.join(self.directory, VECTORS_FILE), mmap_mode="r"
+            )
+            self.table = DocumentTable.load(self.directory)
+            logger.info(
+                f"Loaded {self.count()} vectors for '{self.collection_name}'"
+            )
+
+    @property
+    def directory(self) -> Optional[str]:
+        """Directory of the persisted collection, if persistent."""
+        if self.persist_directory is None:
+            return None
+        return get_numpy_directory(self.persist_directory, self.collection_name)
+
+    def count(self) -> int:
+        """Number of stored vectors."""
+        return len(self.table)
+
+    def add(
+        self, embeddings: Sequence[Sequence[float]], metadata: Sequence[Dict[str, Any]]
+    ) -> None:
+        if len(embeddings) != len(metadata):
+            raise ValueError("Embeddings and metadata must have the same length")
+        if len(embeddings) == 0:
+            return
+
+        new = _normalize(np.asarray(embeddings, dtype=np.float32))
+        with self._lock:
+            if self.vectors is not None and new.shape[1] != self.vectors.shape[1]:
+                raise ValueError(
+                    f"Expected embeddings of dimension {self.vectors.shape[1]}, "
+                    f"got {new.shape[1]}"
+                )
+
+            self.table.append(metadata)
+            if self.directory:
+                self.vectors = self._write(new)
+                self.table.save(self.directory)
+            elif self.vectors is None:
+                self.vectors = new
+            else:
+                self.vectors = np.concatenate([self.vectors, new])
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search for similar embeddings and return metadata + chunk content."""
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        return self.search_batch(query, top_k, metadata_filter)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several embeddings with one matrix product."""
+        if len(query_embeddings) == 0:
+            return []
+
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        queries = _normalize(queries.reshape(len(queries), -1))
+        if self.vectors is None or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        candidates = np.arange(len(self.vectors))
+        if metadata_filter:
+            candidates = np.flatnonzero(self.table.match(metadata_filter))
+        k = min(top_k, len(candidates))
+        if k == 0:
+            return [[] for _ in range(len(queries))]
+
+        vectors = self.vectors if not metadata_filter else self.vectors[candidates]
+        similarities = queries @ vectors.T
+
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        top_similarities = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_similarities, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_similarities = np.take_along_axis(top_similarities, order, axis=1)
+
+        return [
+            [
+                {
+                    **self.table.row(int(candidates[i])),
+                    "score": float(1.0 - similarity),
+                }
+                for i, similarity in zip(row_top, row_similarities)
+            ]
+            for row_top, row_similarities in zip(top, top_similarities)
+        ]
+
+    def get(
+        self, metadata_filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the stored documents matching a metadata filter."""
+        return self.table.find(metadata_filter, limit)
+
+    def _write(self, new: np.ndarray) -> np.ndarray:
+        """Write existing and new vectors to a fresh ``.npy`` file."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, VECTORS_FILE)
+        existing = 0 if self.vectors is None else len(self.vectors)
+
+        out = np.lib.format.open_memmap(
+            path + ".tmp",
+            mode="w+",
+            dtype=np.float32,
+            shape=(existing + len(new), new.shape[1]),
+        )
+        if existing:
+            out[:existing] = self.vectors
+        out[existing:] = new
+        out.flush()
+        del out
+
+        self.vectors = None
+        os.replace(path + ".tmp", path)
+        return np.load(path, mmap_mode="r")
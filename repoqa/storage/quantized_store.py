@@ -0,0 +1,409 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from repoqa.storage.document_table import DocumentTable
+from repoqa.storage.vector_store import VectorStore
+
+QUANTIZATIONS = ("int8", "binary")
+CODES_FILE = "codes.npy"
+VECTORS_FILE = "vectors.npy"
+STORE_FILE = "store.json"
+
+# Rows scored per block in the coarse pass, bounding temporary memory
+_BLOCK_ROWS = 65_536
+
+# Vectors needed before code ranges are fitted to the data, and the most
+# vectors sampled for a fit
+_FIT_MIN_ROWS = 32
+_FIT_MAX_ROWS = 100_000
+
+# Set bits per byte, for numpy releases without np.bitwise_count
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def get_quantized_directory(persist_directory: str, collection_name: str) -> str:
+    """Get the directory holding a collection's codes, vectors and side table.
+
+    Args:
+        persist_directory: Root directory of the vector store.
+        collection_name: Name of the collection.
+
+    Returns:
+        Path of the collection directory.
+    """
+    return os.path.join(persist_directory, "quantized", collection_name)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _POPCOUNT[values]
+
+
+class QuantizedVectorStore(VectorStore):
+    """Vector store searching compact codes, then re-ranking exactly.
+
+    Normalized embeddings are stored twice: as compact codes kept in memory
+    and as float32 vectors. A search scores every code to pick
+    ``rerank_factor * top_k`` candidates, then re-ranks only those with
+    exact cosine similarity against the float vectors.
+
+    ``quantization="int8"`` stores one byte per dimension (4x smaller than
+    float32) using per-dimension scales; candidates are scored by the dot
+    product of the float query with the codes. ``quantization="binary"``
+    stores one bit per dimension (32x smaller): whether each component is
+    above its mean. Candidates are ranked by Hamming distance, computed
+    with XOR and popcount over packed bytes.
+
+    Scales and means are fitted on the stored vectors and refitted, with
+    every code re-encoded from the float vectors, each time the collection
+    doubles in size. Below ``_FIT_MIN_ROWS`` vectors the statistics are
+    unreliable (a single vector is never above its own mean), so codes use
+    the fixed ranges of unit vectors instead: a scale of 1 and sign bits.
+
+    When persistent, the float vectors are memory-mapped read-only, so only
+    the rows of re-ranked candidates are read from disk and resident memory
+    is dominated by the codes. With ``rerank_factor=0`` the re-rank is
+    skipped and scores are estimated from the codes alone. The returned
+    ``score`` is the cosine distance (lower is closer), matching the other
+    stores.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "repo_index",
+        persist_directory: Optional[str] = None,
+        quantization: str = "int8",
+        rerank_factor: int = 10,
+    ):
+        """Initialize the store, loading persisted codes if they exist.
+
+        Args:
+            collection_name: Name of the collection.
+            persist_directory: Root directory for persisted collections.
+                If None, the store lives in memory only.
+            quantization: 'int8' or 'binary'.
+            rerank_factor: Candidates re-ranked exactly per result; 0
+                disables the exact re-rank.
+        """
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(
+                f"Unsupported quantization: {quantization}. "
+                f"Expected one of {list(QUANTIZATIONS)}"
+            )
+
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+        self.quantization = quantization
+        self.rerank_factor = rerank_factor
+
+        self.codes: Optional[np.ndarray] = None
+        self.vectors: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+        self.thresholds: Optional[np.ndarray] = None
+        # Vectors the scales or thresholds were fitted on; 0 for unit ranges
+        self.fitted_rows = 0
+        self.dim: Optional[int] = None
+        self.table = DocumentTable()
+        self._lock = threading.Lock()
+
+        if self.directory and DocumentTable.exists(self.directory):
+            self._load()
+
+    @property
+    def directory(self) -> Optional[str]:
+        """Directory of the persisted collection, if persistent."""
+        if self.persist_directory is None:
+            return None
+        return get_quantized_directory(self.persist_directory, self.collection_name)
+
+    def count(self) -> int:
+        """Number of stored vectors."""
+        return len(self.table)
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Compare the size of the codes with full float32 vectors.
+
+        Returns:
+            Vector count, code and float32 sizes in bytes, the compression
+            ratio, and the bytes resident in memory (the codes, plus the
+            float vectors for in-memory stores).
+        """
+        count = self.count()
+        code_bytes = 0 if self.codes is None else int(self.codes.nbytes)
+        float_bytes = count * (self.dim or 0) * 4
+        return {
+            "quantization": self.quantization,
+            "count": count,
+            "dim": self.dim,
+            "code_bytes": code_bytes,
+            "float32_bytes": float_bytes,
+            "compression": float_bytes / code_bytes if code_bytes else None,
+            "resident_bytes": code_bytes + (0 if self.directory else float_bytes),
+        }
+
+    def add(
+        self, embeddings: Sequence[Sequence[float]], metadata: Sequence[Dict[str, Any]]
+    ) -> None:
+        if len(embeddings) != len(metadata):
+            raise ValueError("Embeddings and metadata must have the same length")
+        if len(embeddings) == 0:
+            return
+
+        new = _normalize(np.asarray(embeddings, dtype=np.float32))
+        with self._lock:
+            if self.dim is not None and new.shape[1] != self.dim:
+                raise ValueError(
+                    f"Expected embeddings of dimension {self.dim}, "
+                    f"got {new.shape[1]}"
+                )
+            if self.dim is None:
+                self.dim = new.shape[1]
+
+            existing_codes = self.codes
+            total = self.count() + len(new)
+            if (self.scales is None and self.thresholds is None) or (
+                total >= _FIT_MIN_ROWS and total >= 2 * self.fitted_rows
+            ):
+                self._fit(new)
+                existing_codes = self._reencode()
+
+            new_codes = self._encode(new)
+            self.table.append(metadata)
+            if self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+                self.vectors = np.load(
+                    self._write(VECTORS_FILE, self.vectors, new), mmap_mode="r"
+                )
+                self.codes = np.load(
+                    self._write(CODES_FILE, existing_codes, new_codes)
+                )
+                self.table.save(self.directory)
+                self._save_info()
+            elif existing_codes is None:
+                self.vectors, self.codes = new, new_codes
+            else:
+                self.vectors = np.concatenate([self.vectors, new])
+                self.codes = np.concatenate([existing_codes, new_codes])
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search for similar embeddings and return metadata + chunk content."""
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        return self.search_batch(query, top_k, metadata_filter)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several embeddings with one coarse pass over the codes."""
+        if len(query_embeddings) == 0:
+            return []
+
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        queries = _normalize(queries.reshape(len(queries), -1))
+        if self.codes is None or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        rows = None
+        if metadata_filter:
+            rows = np.flatnonzero(self.table.match(metadata_filter))
+        total = self.count() if rows is None else len(rows)
+        k = min(top_k, total)
+        if k == 0:
+            return [[] for _ in range(len(queries))]
+
+        coarse = self._coarse_similarities(queries, rows)
+        shortlist = k if self.rerank_factor <= 0 else k * self.rerank_factor
+        shortlist = min(shortlist, total)
+        top = np.argpartition(-coarse, shortlist - 1, axis=1)[:, :shortlist]
+
+        results = []
+        for query, query_coarse, query_top in zip(queries, coarse, top):
+            candidates = query_top if rows is None else rows[query_top]
+            if self.rerank_factor > 0:
+                # Sorted reads keep memory-mapped access mostly sequential
+                order = np.argsort(candidates)
+                candidates = candidates[order]
+                similarities = self.vectors[candidates] @ query
+            else:
+                # Estimates can overshoot slightly; keep distances in [0, 2]
+                similarities = np.clip(query_coarse[query_top], -1.0, 1.0)
+
+            best = np.argsort(-similarities)[:k]
+            results.append(
+                [
+                    {
+                        **self.table.row(int(candidates[i])),
+                        "score": float(1.0 - similarities[i]),
+                    }
+                    for i in best
+                ]
+            )
+        return results
+
+    def get(
+        self, metadata_filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the stored documents matching a metadata filter."""
+        return self.table.find(metadata_filter, limit)
+
+    def _fit(self, new: np.ndarray) -> None:
+        """Fit code ranges on the stored vectors together with ``new``."""
+        existing = 0 if self.vectors is None else len(self.vectors)
+        total = existing + len(new)
+        if total < _FIT_MIN_ROWS:
+            self.fitted_rows = 0
+            sample = None
+        else:
+            self.fitted_rows = total
+            rows = np.linspace(0, total - 1, min(total, _FIT_MAX_ROWS)).astype(int)
+            old, added = rows[rows < existing], rows[rows >= existing] - existing
+            parts = [new[added]] if existing == 0 else [self.vectors[old], new[added]]
+            sample = np.concatenate(parts)
+
+        if self.quantization == "int8":
+            # Vectors outside the fitted ranges are clipped until the next fit
+            self.scales = (
+                np.ones(self.dim, dtype=np.float32)
+                if sample is None
+                else np.maximum(np.abs(sample).max(axis=0), 1e-6)
+            )
+        else:
+            # Sign bits around the mean separate off-centre clusters
+            self.thresholds = (
+                np.zeros(self.dim, dtype=np.float32)
+                if sample is None
+                else sample.mean(axis=0)
+            )
+
+    def _reencode(self) -> Optional[np.ndarray]:
+        """Encode the stored vectors again with the current code ranges."""
+        if self.vectors is None:
+            return None
+        return np.concatenate(
+            [
+                self._encode(np.asarray(self.vectors[start : start + _BLOCK_ROWS]))
+                for start in range(0, len(self.vectors), _BLOCK_ROWS)
+            ]
+        )
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        if self.quantization == "binary":
+            return np.packbits(vectors > self.thresholds, axis=1)
+        codes = np.rint(vectors / self.scales * 127)
+        return np.clip(codes, -127, 127).astype(np.int8)
+
+    def _coarse_similarities(
+        self, queries: np.ndarray, rows: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """Estimate cosine similarities of every query with every code.
+
+        Args:
+            queries: Normalized ``(q, dim)`` queries.
+            rows: Rows to score, or None for all rows.
+
+        Returns:
+            ``(q, len(rows))`` estimated similarities.
+        """
+        total = self.count() if rows is None else len(rows)
+        scores = np.empty((len(queries), total), dtype=np.float32)
+
+        if self.quantization == "int8":
+            # Asymmetric: only the stored side is quantized
+            weights = (queries * (self.scales / 127)).T.astype(np.float32)
+        else:
+            query_codes = self._encode(queries)
+
+        for start in range(0, total, _BLOCK_ROWS):
+            end = min(start + _BLOCK_ROWS, total)
+            selected = slice(start, end) if rows is None else rows[start:end]
+            block = self.codes[selected]
+            if self.quantization == "int8":
+                scores[:, start:end] = (block.astype(np.float32) @ weights).T
+            else:
+                for i, query_code in enumerate(query_codes):
+                    hamming = _popcount(block ^ query_code).sum(axis=1, dtype=np.int32)
+                    # Angle between sign vectors approximates the true angle
+                    scores[i, start:end] = np.cos(np.pi * hamming / self.dim)
+        return scores
+
+    def _write(
+        self, name: str, existing: Optional[np.ndarray], new: np.ndarray
+    ) -> str:
+        """Write existing and new rows to a fresh ``.npy`` file, returning its path."""
+        path = os.path.join(self.directory, name)
+        rows = 0 if existing is None else len(existing)
+
+        out = np.lib.format.open_memmap(
+            path + ".tmp",
+            mode="w+",
+            dtype=new.dtype,
+            shape=(rows + len(new), new.shape[1]),
+        )
+        if rows:
+            out[:rows] = existing
+        out[rows:] = new
+        out.flush()
+        del out
+
+        os.replace(path + ".tmp", path)
+        return path
+
+    def _save_info(self) -> None:
+        info = {
+            "quantization": self.quantization,
+            "dim": self.dim,
+            "fitted_rows": self.fitted_rows,
+            "scales": None if self.scales is None else self.scales.tolist(),
+            "thresholds": (
+                None if self.thresholds is None else self.thresholds.tolist()
+            ),
+        }
+        with open(os.path.join(self.directory, STORE_FILE), "w") as f:
+            json.dump(info, f)
+
+    def _load(self) -> None:
+        directory = self.directory
+        with open(os.path.join(directory, STORE_FILE)) as f:
+            info = json.load(f)
+        if info["quantization"] != self.quantization:
+            raise ValueError(
+                f"Collection '{self.collection_name}' was stored with "
+                f"{info['quantization']} quantization, not {self.quantization}"
+            )
+
+        self.dim = info["dim"]
+        if info["scales"] is not None:
+            self.scales = np.asarray(info["scales"], dtype=np.float32)
+        if info["thresholds"] is not None:
+            self.thresholds = np.asarray(info["thresholds"], dtype=np.float32)
+        # Codes are scanned by every search, so they are read into memory
+        self.codes = np.load(os.path.join(directory, CODES_FILE))
+        self.fitted_rows = info.get("fitted_rows", len(self.codes))
+        self.vectors = np.load(os.path.join(directory, VECTORS_FILE), mmap_mode="r")
+        self.table = DocumentTable.load(directory)
+        logger.info(
+            f"Loaded {self.count()} {self.quantization} codes "
+            f"for '{self.collection_name}'"
+        )
@@ -0,0 +1,267 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Portable snapshot archives of indexed collections.
+
+A snapshot is a gzip-compressed tar archive holding everything needed to
+recreate a collection without embedding anything:
+
+``snapshot.json``
+    Format name and version, collection name, document count, vector
+    dimension, collection manifest and collection settings.
+``ids.json``
+    Document ids, in row order.
+``vectors.npy``
+    Float32 ``(count, dim)`` vector matrix.
+``content.bin``, ``offsets.npy``, ``metadata.json``
+    Document content and metadata as a ``DocumentTable``.
+``projection.npz``
+    The collection's embedding projection, if it has one.
+``indexes/<name>/``
+    Files of the collection's other on-disk indexes, such as the lexical,
+    trigram and symbol indexes or a FAISS store, one directory per index.
+"""
+
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from repoqa.storage.document_table import (
+    CONTENT_FILE,
+    METADATA_FILE,
+    OFFSETS_FILE,
+    DocumentTable,
+)
+
+SNAPSHOT_FORMAT = "repoqa-snapshot"
+SNAPSHOT_VERSION = 2
+
+SNAPSHOT_FILE = "snapshot.json"
+IDS_FILE = "ids.json"
+VECTORS_FILE = "vectors.npy"
+PROJECTION_FILE = "projection.npz"
+INDEXES_DIR = "indexes"
+
+_REQUIRED_FILES = (
+    SNAPSHOT_FILE,
+    IDS_FILE,
+    VECTORS_FILE,
+    CONTENT_FILE,
+    OFFSETS_FILE,
+    METADATA_FILE,
+)
+
+# One page of documents: ids, embeddings, documents and metadatas
+Page = Tuple[
+    Sequence[str], Any, Sequence[Optional[str]], Sequence[Optional[Dict[str, Any]]]
+]
+
+
+@dataclass
+class Snapshot:
+    """Contents of an opened snapshot archive.
+
+    ``vectors`` and the table content are memory-mapped from a temporary
+    directory that only lives as long as the ``open_snapshot`` context.
+    """
+
+    info: Dict[str, Any]
+    ids: List[str]
+    vectors: np.ndarray
+    table: DocumentTable
+    projection_path: Optional[str] = None
+    index_directories: Dict[str, str] = field(default_factory=dict)
+
+    def metadata(self, row: int) -> Optional[Dict[str, Any]]:
+        """Get a row's metadata without its content, or None if it has none."""
+        metadata = self.table.row(row)
+        metadata.pop("content")
+        return metadata or None
+
+
+def write_snapshot(
+    path: str,
+    collection_name: str,
+    count: int,
+    pages: Iterable[Page],
+    manifest: Optional[Dict[str, Any]] = None,
+    settings: Optional[Dict[str, Any]] = None,
+    projection_path: Optional[str] = None,
+    index_directories: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Write a snapshot archive from pages of documents.
+
+    Vectors are streamed into a memory-mapped file, so only one page of
+    embeddings is held in memory at a time.
+
+    Args:
+        path: Destination archive path.
+        collection_name: Name of the exported collection.
+        count: Total number of documents in ``pages``.
+        pages: ``(ids, embeddings, documents, metadatas)`` tuples.
+        manifest: Collection manifest.
+        settings: Collection settings to restore on import, such as the
+            distance function.
+        projection_path: Projection file to include, if any.
+        index_directories: Index name to directory of the collection's
+            other on-disk indexes to include.
+
+    Returns:
+        The snapshot info written to ``snapshot.json``.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        ids: List[str] = []
+        table = DocumentTable()
+        vectors = None
+
+        for page_ids, embeddings, documents, metadatas in pages:
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            if vectors is None:
+                vectors = np.lib.format.open_memmap(
+                    os.path.join(workdir, VECTORS_FILE),
+                    mode="w+",
+                    dtype=np.float32,
+                    shape=(count, embeddings.shape[1]),
+                )
+            vectors[len(ids) : len(ids) + len(page_ids)] = embeddings
+            table.append(
+                [
+                    {**(metadata or {}), "content": document}
+                    for document, metadata in zip(documents, metadatas)
+                ]
+            )
+            ids.extend(page_ids)
+
+        if len(ids) != count:
+            raise ValueError(f"Expected {count} documents, got {len(ids)}")
+
+        dim = 0
+        if vectors is None:
+            np.save(os.path.join(workdir, VECTORS_FILE), np.zeros((0, 0), np.float32))
+        else:
+            dim = int(vectors.shape[1])
+            vectors.flush()
+            del vectors
+
+        table.save(workdir)
+        with open(os.path.join(workdir, IDS_FILE), "w") as f:
+            json.dump(ids, f)
+
+        info = {
+            "format": SNAPSHOT_FORMAT,
+            "version": SNAPSHOT_VERSION,
+            "collection_name": collection_name,
+            "count": count,
+            "dim": dim,
+            "manifest": manifest,
+            "settings": settings or {},
+            "indexes": sorted(index_directories or {}),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with open(os.path.join(workdir, SNAPSHOT_FILE), "w") as f:
+            json.dump(info, f)
+
+        names = list(_REQUIRED_FILES)
+        if projection_path:
+            shutil.copyfile(projection_path, os.path.join(workdir, PROJECTION_FILE))
+            names.append(PROJECTION_FILE)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with tarfile.open(path + ".tmp", "w:gz") as archive:
+            for name in names:
+                archive.add(os.path.join(workdir, name), arcname=name)
+            for index, directory in sorted((index_directories or {}).items()):
+                archive.add(directory, arcname=f"{INDEXES_DIR}/{index}")
+        os.replace(path + ".tmp", path)
+
+    return info
+
+
+@contextmanager
+def open_snapshot(path: str) -> Iterator[Snapshot]:
+    """Open a snapshot archive written by ``write_snapshot``.
+
+    Only the known snapshot files and regular files under ``indexes/`` are
+    extracted, into a temporary directory removed when the context exits.
+
+    Args:
+        path: Archive path.
+
+    Yields:
+        The opened snapshot.
+
+    Raises:
+        ValueError: If the archive is not a snapshot or has an unsupported
+            version.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        with tarfile.open(path, "r:gz") as archive:
+            members = set(archive.getnames())
+            missing = [name for name in _REQUIRED_FILES if name not in members]
+            if missing:
+                raise ValueError(
+                    f"{path} is not a snapshot archive, missing {', '.join(missing)}"
+                )
+            for name in (*_REQUIRED_FILES, PROJECTION_FILE):
+                if name not in members:
+                    continue
+                with archive.extractfile(name) as src, open(
+                    os.path.join(workdir, name), "wb"
+                ) as dst:
+                    shutil.copyfileobj(src, dst)
+            for member in archive.getmembers():
+                if not (member.isfile() and _is_index_file(member.name)):
+                    continue
+                target = os.path.join(workdir, *member.name.split("/"))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with archive.extractfile(member) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+
+        with open(os.path.join(workdir, SNAPSHOT_FILE)) as f:
+            info = json.load(f)
+        if info.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a snapshot archive")
+        if info.get("version", 0) > SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Snapshot version {info['version']} is newer than the supported "
+                f"version {SNAPSHOT_VERSION}"
+            )
+
+        with open(os.path.join(workdir, IDS_FILE)) as f:
+            ids = json.load(f)
+
+        projection_path = os.path.join(workdir, PROJECTION_FILE)
+        indexes_path = os.path.join(workdir, INDEXES_DIR)
+        yield Snapshot(
+            info=info,
+            ids=ids,
+            vectors=np.load(os.path.join(workdir, VECTORS_FILE), mmap_mode="r"),
+            table=DocumentTable.load(workdir),
+            projection_path=(
+                projection_path if os.path.exists(projection_path) else None
+            ),
+            index_directories={
+                name: os.path.join(indexes_path, name)
+                for name in info.get("indexes", [])
+                if os.path.isdir(os.path.join(indexes_path, name))
+            },
+        )
+
+
+def _is_index_file(name: str) -> bool:
+    """Check that an archive member lies inside ``indexes/<name>/``."""
+    parts = name.split("/")
+    return (
+        len(parts) > 2
+        and parts[0] == INDEXES_DIR
+        and not os.path.isabs(name)
+        and all(part not in ("", ".", "..") for part in parts)
+    )
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+from typing import Any, Optional
+
+from repoqa.storage.vector_store import VectorStore
+
+VECTOR_STORE_BACKENDS = ("chroma", "faiss", "numpy", "quantized")
+
+
+def get_vector_store(
+    collection_name: str,
+    persist_directory: Optional[str] = None,
+    backend: str = "chroma",
+    **options: Any,
+) -> VectorStore:
+    """Factory function to get a vector store by backend name.
+
+    The pipelines and ``/search`` open collections for the configured
+    ``vectorstore.backend`` through this factory.
+
+    Args:
+        collection_name: Name of the collection.
+        persist_directory: Directory where the store persists data.
+        backend: 'chroma', 'faiss', 'numpy' or 'quantized'.
+        **options: Backend-specific settings passed to the store, such as
+            ``index_type`` for FAISS.
+
+    Returns:
+        Vector store instance.
+    """
+    if backend == "chroma":
+        from repoqa.storage.chroma_store import ChromaVectorStore
+
+        return ChromaVectorStore(
+            collection_name=collection_name, persist_directory=persist_directory
+        )
+
+    if backend == "faiss":
+        from repoqa.storage.faiss_store import FaissVectorStore
+
+        return FaissVectorStore(
+            collection_name=collection_name,
+            persist_directory=persist_directory,
+            **options,
+        )
+
+    if backend == "numpy":
+        from repoqa.storage.numpy_store import NumpyVectorStore
+
+        return NumpyVectorStore(
+            collection_name=collection_name,
+            persist_directory=persist_directory,
+            **options,
+        )
+
+    if backend == "quantized":
+        from repoqa.storage.quantized_store import QuantizedVectorStore
+
+        return QuantizedVectorStore(
+            collection_name=collection_name,
+            persist_directory=persist_directory,
+            **options,
+        )
+
+    raise ValueError(
+        f"Unsupported vector store backend: {backend}. "
+        f"Expected one of {list(VECTOR_STORE_BACKENDS)}"
+    )
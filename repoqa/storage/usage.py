@@ -0,0 +1,118 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Disk usage and last-access tracking for collections and clones."""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+ACCESS_LOG_FILE = "access_log.json"
+
+# Accesses closer together than this are not written to disk again
+ACCESS_RESOLUTION_S = 60.0
+
+KINDS = ("collections", "clones")
+
+
+def path_size(path: str) -> int:
+    """Get the total size in bytes of a file or directory tree.
+
+    Args:
+        path: File or directory path.
+
+    Returns:
+        Size in bytes, 0 if the path does not exist.
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:  # Removed while walking
+                pass
+    return total
+
+
+class AccessLog:
+    """Last-access times of collections and clone directories.
+
+    Times are kept in memory and persisted as JSON. A repeated access is
+    only written once ``ACCESS_RESOLUTION_S`` has passed, so recording an
+    access on every request costs a dictionary lookup. On save the file is
+    re-read and merged, keeping the latest time per key, so several worker
+    processes can share one log.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the log, loading existing entries.
+
+        Args:
+            path: Path of the JSON file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, float]] = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, float]]:
+        entries: Dict[str, Dict[str, float]] = {kind: {} for kind in KINDS}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return entries
+        for kind in KINDS:
+            entries[kind].update(data.get(kind, {}))
+        return entries
+
+    def _save(self, removed: Optional[Tuple[str, str]] = None) -> None:
+        on_disk = self._read()
+        for kind in KINDS:
+            for key, timestamp in on_disk[kind].items():
+                if timestamp > self._entries[kind].get(key, 0.0):
+                    self._entries[kind][key] = timestamp
+        if removed:
+            self._entries[removed[0]].pop(removed[1], None)
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            # Access times only order evictions; losing one is harmless
+            logger.warning(f"Could not write access log {self.path}: {e}")
+
+    def touch(self, kind: str, key: str, now: Optional[float] = None) -> None:
+        """Record an access.
+
+        Args:
+            kind: 'collections' or 'clones'.
+            key: Collection name or clone path.
+            now: Access time; defaults to the current time.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            previous = self._entries[kind].get(key)
+            if previous is not None and now - previous < ACCESS_RESOLUTION_S:
+                return
+            self._entries[kind][key] = now
+            self._save()
+
+    def forget(self, kind: str, key: str) -> None:
+        """Remove an entry, e.g. after its data was evicted."""
+        with self._lock:
+            self._save(removed=(kind, key))
+
+    def last_access(self, kind: str, key: str) -> Optional[float]:
+        """Get the last recorded access time, or None if never recorded."""
+        with self._lock:
+            return self._entries[kind].get(key)
@@ -36,3 +36,45 @@ class VectorStore(ABC):
         Returns:
             List of dictionaries containing similar documents with metadata
         """
+
+    def get(
+        self, metadata_filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the stored documents matching a metadata filter.
+
+        Used for lookups by position, such as the neighbours of a chunk.
+
+        Args:
+            metadata_filter: ChromaDB-style ``where`` filter
+            limit: Maximum number of documents; None returns every match
+
+        Returns:
+            List of dictionaries with the metadata and content of each match
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support metadata lookups"
+        )
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several query embeddings at once.
+
+        The default runs ``search`` once per query; stores that can answer
+        many queries in a single call override it.
+
+        Args:
+            query_embeddings: Embedding vectors to search with
+            top_k: Number of results to return per query
+            metadata_filter: Optional metadata filter conditions
+
+        Returns:
+            One result list per query, in query order
+        """
+        return [
+            self.search(query, top_k=top_k, metadata_filter=metadata_filter)
+            for query in query_embeddings
+        ]
@@ -0,0 +1,65 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Deferred imports for heavy optional dependencies."""
+
+import importlib
+import threading
+from typing import Any, Optional
+
+
+class LazyImport:
+    """Proxy that imports a module (or one of its attributes) on first use.
+
+    Importing torch, sentence_transformers or langchain integrations costs
+    seconds. Binding them through a ``LazyImport`` at module level keeps the
+    familiar ``torch.cuda`` / ``Chroma(...)`` call sites while moving the
+    import cost to the first attribute access or call.
+
+    Example:
+        torch = LazyImport("torch")
+        Chroma = LazyImport("langchain_chroma", "Chroma")
+    """
+
+    def __init__(self, module_name: str, attr_name: Optional[str] = None):
+        """Initialize the proxy.
+
+        Args:
+            module_name: Fully qualified module to import.
+            attr_name: Optional attribute of the module to resolve instead of
+                the module itself.
+        """
+        self._module_name = module_name
+        self._attr_name = attr_name
+        self._target: Any = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Any:
+        """Import and cache the proxied object."""
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    module = importlib.import_module(self._module_name)
+                    self._target = (
+                        getattr(module, self._attr_name)
+                        if self._attr_name
+                        else module
+                    )
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        # Guard proxy internals so copy/pickle of a half-built proxy
+        # does not recurse into _load().
+        if name in ("_module_name", "_attr_name", "_target", "_lock"):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        target = self._module_name
+        if self._attr_name:
+            target = f"{target}.{self._attr_name}"
+        state = "loaded" if self._target is not None else "not loaded"
+        return f"<LazyImport {target} ({state})>"
@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Tests for the embedding benchmark suite."""
+
+import json
+
+import pytest
+
+from repoqa.benchmark.embedding import (
+    StubEmbeddingModel,
+    create_backend,
+    latency_stats,
+    main,
+    make_texts,
+    run_embedding_benchmark,
+)
+
+
+class TestStubEmbeddingModel:
+    """Test suite for StubEmbeddingModel."""
+
+    def test_deterministic(self):
+        """Test that the same text always maps to the same vector."""
+        model = StubEmbeddingModel(dim=8)
+
+        assert model.encode("abc") == model.encode("abc")
+        assert model.encode("abc") != model.encode("abd")
+
+    def test_dimensions(self):
+        """Test embedding shapes and dimension reporting."""
+        model = StubEmbeddingModel(dim=16)
+
+        result = model.encode_batch(["a", "b", "c"], batch_size=2)
+
+        assert len(result) == 3
+        assert all(len(v) == 16 for v in result)
+        assert model.get_embedding_dim() == 16
+
+
+class TestBenchmarkHelpers:
+    """Test suite for benchmark helper functions."""
+
+    def test_make_texts(self):
+        """Test generated text count and length."""
+        texts = make_texts(5, 12, seed=1)
+
+        assert len(texts) == 5
+        assert all(len(t.split()) == 12 for t in texts)
+        assert texts == make_texts(5, 12, seed=1)
+
+    def test_latency_stats(self):
+        """Test percentile summary of latency samples."""
+        stats = latency_stats([1.0, 2.0, 3.0, 4.0])
+
+        assert stats["min_ms"] == 1.0
+        assert stats["max_ms"] == 4.0
+        assert stats["mean_ms"] == 2.5
+        assert {"p50_ms", "p90_ms", "p95_ms", "p99_ms"} <= stats.keys()
+
+    def test_create_backend(self):
+        """Test parsing backend specs."""
+        assert isinstance(create_backend("stub", "ignored"), StubEmbeddingModel)
+
+        backend = create_backend("st:bf16:compile", "some-model")
+        assert backend.model_name == "some-model"
+        assert backend.precision == "bf16"
+        assert backend.compile is True
+
+        with pytest.raises(ValueError):
+            create_backend("onnx", "some-model")
+
+
+class TestRunEmbeddingBenchmark:
+    """Test suite for run_embedding_benchmark."""
+
+    def test_report_structure(self):
+        """Test that the report covers every backend, length and batch size."""
+        report = run_embedding_benchmark(
+            {"stub": StubEmbeddingModel(dim=8)},
+            batch_sizes=[1, 4],
+            seq_lengths=[4, 16],
+            num_texts=8,
+            latency_iterations=5,
+        )
+
+        assert report["benchmark"] == "embedding"
+        result = report["results"][0]
+        assert result["backend"] == "stub"
+        assert result["embedding_dim"] == 8
+        assert set(result["latency"]) == {"4", "16"}
+        assert result["latency"]["4"]["iterations"] == 5
+        assert len(result["throughput"]) == 4
+        assert all(run["chunks_per_sec"] > 0 for run in result["throughput"])
+        # Report must round-trip through JSON
+        assert json.loads(json.dumps(report)) == report
+
+    def test_real_model_on_cpu(self, tiny_sentence_transformer_path):
+        """Test benchmarking a small local SentenceTransformer model."""
+        backend = create_backend("st:fp32", tiny_sentence_transformer_path)
+        backend._device = "cpu"
+
+        report = run_embedding_benchmark(
+            {"st:fp32": backend},
+            batch_sizes=[4],
+            seq_lengths=[8],
+            num_texts=8,
+            latency_iterations=3,
+        )
+
+        assert report["results"][0]["embedding_dim"] == 32
+
+    def test_main_writes_json(self, tmp_path):
+        """Test the command line entry point."""
+        output = tmp_path / "bench.json"
+
+        main(
+            [
+                "--backends",
+                "stub",
+                "--batch-sizes",
+                "2",
+                "--seq-lengths",
+                "4",
+                "--num-texts",
+                "4",
+                "--latency-iterations",
+                "2",
+                "--output",
+                str(output),
+            ]
+        )
+
+        report = json.loads(output.read_text())
+        assert report["parameters"]["batch_sizes"] == [2]
+        assert report["results"][0]["backend"] == "stub"
@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Tests for the quantization benchmark."""
+
+import json
+
+import numpy as np
+
+from repoqa.benchmark.quantization import (
+    main,
+    make_queries,
+    make_vectors,
+    recall_at_k,
+    run_quantization_benchmark,
+)
+from repoqa.storage.snapshot import write_snapshot
+
+
+class TestQuantizationHelpers:
+    """Test suite for quantization benchmark helpers."""
+
+    def test_make_vectors(self):
+        """Test generated vector shape and determinism."""
+        vectors = make_vectors(20, dim=8, clusters=4)
+
+        assert vectors.shape == (20, 8)
+        assert vectors.dtype == np.float32
+        np.testing.assert_array_equal(vectors, make_vectors(20, dim=8, clusters=4))
+
+    def test_make_queries(self):
+        """Test that queries are sampled near the stored vectors."""
+        vectors = make_vectors(20, dim=8)
+
+        assert make_queries(vectors, 5).shape == (5, 8)
+
+    def test_recall_at_k(self):
+        """Test mean recall over queries."""
+        assert recall_at_k([[1, 2], [3, 4]], [[2, 1], [3, 5]]) == 0.75
+        assert recall_at_k([], []) == 0.0
+
+
+class TestRunQuantizationBenchmark:
+    """Test suite for run_quantization_benchmark."""
+
+    def test_report_structure(self):
+        """Test that the report covers every quantization and re-rank factor."""
+        vectors = make_vectors(200, dim=16, clusters=4)
+
+        report = run_quantization_benchmark(
+            vectors, make_queries(vectors, 5), rerank_factors=[0, 20], top_k=5
+        )
+
+        assert report["benchmark"] == "quantization"
+        assert report["parameters"] == {
+            "count": 200,
+            "dim": 16,
+            "num_queries": 5,
+            "top_k": 5,
+        }
+        assert "mean_ms" in report["exact"]["latency"]
+        settings = [(r["quantization"], r["rerank_factor"]) for r in report["results"]]
+        assert settings == [("int8", 0), ("int8", 20), ("binary", 0), ("binary", 20)]
+        for result in report["results"]:
+            assert 0.0 <= result["recall_at_k"] <= 1.0
+            assert result["float32_bytes"] == 200 * 16 * 4
+        assert report["results"][1]["recall_at_k"] == 1.0
+
+    def test_main_writes_report(self, tmp_path, capsys):
+        """Test the command-line entry point on synthetic vectors."""
+        output = tmp_path / "report.json"
+
+        main(
+            [
+                "--count",
+                "100",
+                "--dim",
+                "8",
+                "--num-queries",
+                "3",
+                "--quantizations",
+                "binary",
+                "--rerank-factors",
+                "5",
+                "--output",
+                str(output),
+            ]
+        )
+
+        report = json.loads(output.read_text())
+        assert [r["quantization"] for r in report["results"]] == ["binary"]
+        assert "Wrote benchmark report" in capsys.readouterr().out
+
+    def test_main_with_snapshot(self, tmp_path, capsys):
+        """Test benchmarking the vectors of a collection snapshot."""
+        vectors = make_vectors(30, dim=8)
+        archive = str(tmp_path / "repo.tar.gz")
+        write_snapshot(
+            archive,
+            "repo",
+            30,
+            [([str(i) for i in range(30)], vectors, [""] * 30, [None] * 30)],
+        )
+
+        main(["--snapshot", archive, "--num-queries", "2", "--top-k", "3"])
+
+        report = json.loads(capsys.readouterr().out)
+        assert report["parameters"]["count"] == 30
+        assert report["parameters"]["snapshot"] == archive
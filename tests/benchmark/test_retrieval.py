@@ -0,0 +1,219 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Tests for the retrieval benchmark."""
+
+import json
+from unittest.mock import Mock, patch
+
+import chromadb
+import pytest
+
+from repoqa.benchmark.embedding import StubEmbeddingModel
+from repoqa.benchmark.retrieval import (
+    load_cases,
+    main,
+    matches,
+    parse_target,
+    run_retrieval_benchmark,
+    score_ranking,
+)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Small repository whose files use distinct identifiers."""
+    root = tmp_path / "repo"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "cache.py").write_text(
+        "".join(f"def cache_entry_{i}():\n    return {i}\n" for i in range(10))
+    )
+    (root / "pkg" / "parser.py").write_text(
+        "def parse_tokens(text):\n    return text.split()\n"
+    )
+    (root / "README.md").write_text("# Demo\n\nA demo repository.\n")
+    return root
+
+
+@pytest.fixture
+def cases_file(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    path.write_text(
+        json.dumps({"question": "parse_tokens", "expected": ["pkg/parser.py"]})
+        + "\n\n"
+        + json.dumps({"question": "cache_entry_7", "expected": ["pkg/cache.py:15-16"]})
+        + "\n"
+    )
+    return path
+
+
+class FakeCollection:
+    """In-memory stand-in for a ChromaDB collection."""
+
+    def __init__(self):
+        self.metadata = None
+        self.records = {"embeddings": [], "documents": [], "metadatas": []}
+
+    def add(self, ids, embeddings, documents, metadatas):
+        self.records["embeddings"].extend(embeddings)
+        self.records["documents"].extend(documents)
+        self.records["metadatas"].extend(metadatas)
+
+    def get(self, include=None):
+        return self.records
+
+    def modify(self, metadata):
+        self.metadata = metadata
+
+
+@pytest.fixture
+def stub_backends():
+    """Stub the embedding model and ChromaDB so no weights or database are used.
+
+    Questions are answered with lexical retrieval, since stub embeddings
+    carry no meaning.
+    """
+    collections = {}
+    client = Mock()
+    client.get_max_batch_size.return_value = 100
+    client.get_or_create_collection.side_effect = lambda name, **kwargs: (
+        collections.setdefault(name, FakeCollection())
+    )
+    client.get_collection.side_effect = lambda name: collections[name]
+    chromadb.PersistentClient.return_value = client
+
+    def chroma(client, collection_name, **kwargs):
+        client.get_or_create_collection(collection_name)
+        return Mock()
+
+    with patch(
+        "repoqa.benchmark.retrieval.SentenceTransformerEmbedding", StubEmbeddingModel
+    ), patch(
+        "repoqa.pipeline.rag.SentenceTransformerEmbedding", StubEmbeddingModel
+    ), patch("repoqa.pipeline.rag.Chroma", Mock(side_effect=chroma)):
+        yield
+
+
+class TestRetrievalHelpers:
+    """Test suite for retrieval benchmark helpers."""
+
+    def test_parse_target(self):
+        """Test whole-file and line range targets."""
+        assert parse_target("./pkg/a.py") == ("pkg/a.py", None, None)
+        assert parse_target("pkg/a.py:3-7") == ("pkg/a.py", 3, 7)
+        with pytest.raises(ValueError):
+            parse_target("pkg/a.py:7-3")
+
+    def test_load_cases(self, cases_file, tmp_path):
+        """Test that cases are parsed and incomplete ones rejected."""
+        cases = load_cases(str(cases_file))
+
+        assert [case["question"] for case in cases] == ["parse_tokens", "cache_entry_7"]
+        assert cases[1]["targets"] == [("pkg/cache.py", 15, 16)]
+
+        bad = tmp_path / "bad.jsonl"
+        bad.write_text(json.dumps({"question": "no targets"}) + "\n")
+        with pytest.raises(ValueError, match="Line 1"):
+            load_cases(str(bad))
+
+    def test_matches(self, tmp_path):
+        """Test matching by repository-relative path and overlapping lines."""
+        chunk = {"file_path": str(tmp_path / "pkg/a.py"), "start_line": 10}
+        chunk["end_line"] = 20
+
+        assert matches(chunk, ("pkg/a.py", None, None), str(tmp_path))
+        assert matches(chunk, ("pkg/a.py", 20, 30), str(tmp_path))
+        assert not matches(chunk, ("pkg/a.py", 21, 30), str(tmp_path))
+        assert not matches(chunk, ("a.py", None, None), str(tmp_path))
+        # Chunks without line numbers match any range of their file
+        assert matches({"file_path": "pkg/a.py"}, ("pkg/a.py", 1, 2), ".")
+
+    def test_score_ranking(self):
+        """Test recall at each cutoff and the first relevant rank."""
+        ranked = [{"file_path": "c.py"}, {"file_path": "a.py"}, {"file_path": "b.py"}]
+        targets = [("a.py", None, None), ("b.py", None, None)]
+
+        scores = score_ranking(ranked, targets, ".", cutoffs=[1, 2, 3])
+
+        assert scores["recall_at_k"] == {"1": 0.0, "2": 0.5, "3": 1.0}
+        assert scores["rank"] == 2
+        assert scores["reciprocal_rank"] == 0.5
+        assert score_ranking([], targets, ".")["reciprocal_rank"] == 0.0
+
+
+class TestRunRetrievalBenchmark:
+    """Test suite for run_retrieval_benchmark."""
+
+    def test_report_structure(self, repo, cases_file, stub_backends):
+        """Test that every configuration and retriever is measured."""
+        configurations = [
+            {"name": "code", "retriever": "code", "retrieval_mode": "lexical"},
+            {"name": "pipeline", "retrieval_mode": "lexical", "k": 3},
+            {
+                "name": "rag",
+                "retriever": "rag",
+                "retrieval_mode": "lexical",
+                "chunk_size": 4,
+                "context_max_tokens": 30,
+            },
+        ]
+
+        report = run_retrieval_benchmark(
+            str(repo),
+            load_cases(str(cases_file)),
+            configurations,
+            embedding_model="stub",
+            cutoffs=[1, 5],
+        )
+
+        assert report["benchmark"] == "retrieval"
+        assert report["parameters"]["num_questions"] == 2
+        assert [r["name"] for r in report["results"]] == ["code", "pipeline", "rag"]
+        for result in report["results"]:
+            assert result["recall_at_k"]["1"] == 1.0
+            assert result["mrr"] == 1.0
+            assert result["retrieval_latency"]["p50_ms"] >= 0
+            assert result["answer_latency"]["p95_ms"] >= 0
+            assert result["prompt_tokens"]["max"] > 0
+            assert len(result["questions"]) == 2
+
+        code, pipeline, rag = report["results"]
+        # Configurations share an index unless they chunk differently
+        assert code["index"] == pipeline["index"]
+        assert rag["index"]["documents"] > pipeline["index"]["documents"]
+        assert rag["prompt_tokens"]["max"] < pipeline["prompt_tokens"]["max"]
+
+    def test_unsupported_retriever(self, repo, cases_file, stub_backends):
+        """Test that unknown retrievers are rejected."""
+        with pytest.raises(ValueError, match="Unsupported retriever"):
+            run_retrieval_benchmark(
+                str(repo),
+                load_cases(str(cases_file)),
+                [{"retriever": "unknown"}],
+                embedding_model="stub",
+            )
+
+    def test_main_writes_report(self, repo, cases_file, stub_backends, tmp_path):
+        """Test JSON output from the command line."""
+        configs = tmp_path / "configs.json"
+        configs.write_text(json.dumps([{"name": "bm25", "retrieval_mode": "lexical"}]))
+        output = tmp_path / "report.json"
+
+        main(
+            [
+                "--repo",
+                str(repo),
+                "--cases",
+                str(cases_file),
+                "--configs",
+                str(configs),
+                "--model",
+                "stub",
+                "--output",
+                str(output),
+            ]
+        )
+
+        report = json.loads(output.read_text())
+        assert report["parameters"]["cases"] == str(cases_file)
+        assert report["results"][0]["name"] == "bm25"
@@ -26,11 +26,29 @@ sys.modules["chromadb.api"] = chromadb_mock.api
 
 @pytest.fixture(autouse=True)
 def reset_chromadb_mock():
-    """Reset chromadb mock between tests."""
+    """Reset chromadb mock, cached clients and validations between tests."""
+    from repoqa.indexing.index_cache import clear_index_cache
+    from repoqa.storage.collection_manager import (
+        clear_access_log_cache,
+        clear_answer_caches,
+        clear_client_cache,
+        clear_validation_cache,
+    )
+
     # Reset the mock completely
+    clear_client_cache()
+    clear_validation_cache()
+    clear_access_log_cache()
+    clear_answer_caches()
+    clear_index_cache()
     chromadb_mock.PersistentClient.reset_mock()
     chromadb_mock.PersistentClient.return_value = None
     yield
+    clear_client_cache()
+    clear_validation_cache()
+    clear_access_log_cache()
+    clear_answer_caches()
+    clear_index_cache()
     chromadb_mock.PersistentClient.reset_mock()
     chromadb_mock.PersistentClient.return_value = None
 
@@ -95,6 +113,34 @@ def mock_embedding_model():
     return mock
 
 
+@pytest.fixture(scope="session")
+def tiny_sentence_transformer_path(tmp_path_factory):
+    """Build a tiny randomly initialised SentenceTransformer model offline.
+
+    Lets tests exercise real torch inference on CPU without downloading a
+    pretrained model.
+    """
+    from transformers import BertConfig, BertModel, BertTokenizer
+
+    model_dir = tmp_path_factory.mktemp("tiny_sentence_transformer")
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    vocab += list("abcdefghijklmnopqrstuvwxyz0123456789_.()")
+    (model_dir / "vocab.txt").write_text("\n".join(vocab))
+
+    BertTokenizer(str(model_dir / "vocab.txt")).save_pretrained(str(model_dir))
+    BertModel(
+        BertConfig(
+            vocab_size=len(vocab),
+            hidden_size=32,
+            num_hidden_layers=2,
+            num_attention_heads=2,
+            intermediate_size=64,
+            max_position_embeddings=256,
+        )
+    ).save_pretrained(str(model_dir))
+    return str(model_dir)
+
+
 @pytest.fixture
 def mock_sentence_transformer():
     """Mock SentenceTransformer model."""
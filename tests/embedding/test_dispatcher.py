@@ -0,0 +1,194 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the micro-batching embedding dispatcher."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from repoqa.embedding.dispatcher import (
+    EmbeddingDispatcher,
+    close_shared_dispatchers,
+    get_shared_dispatcher,
+)
+from repoqa.embedding.embedding_model import EmbeddingModel
+
+
+class RecordingEmbedding(EmbeddingModel):
+    """Deterministic embedding model that records every encode call."""
+
+    def __init__(self):
+        super().__init__("recording-model")
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def encode(self, texts, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        with self._lock:
+            self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def encode_batch(self, texts, batch_size=32, **kwargs):
+        return self.encode(texts)
+
+    def get_embedding_dim(self):
+        return 2
+
+
+class TestEmbeddingDispatcher:
+    """Test suite for EmbeddingDispatcher."""
+
+    def test_single_encode(self):
+        """Test encoding a single text through the queue."""
+        model = RecordingEmbedding()
+        with EmbeddingDispatcher(model, max_wait_ms=1) as dispatcher:
+            result = dispatcher.encode("abc")
+
+        assert result == [[3.0, 1.0]]
+        assert model.calls == [["abc"]]
+
+    def test_concurrent_requests_are_batched(self):
+        """Test that concurrent requests share one model call."""
+        model = RecordingEmbedding()
+        texts = ["a" * i for i in range(1, 9)]
+
+        with EmbeddingDispatcher(
+            model, max_batch_size=len(texts), max_wait_ms=1000
+        ) as dispatcher:
+            with ThreadPoolExecutor(max_workers=len(texts)) as pool:
+                results = list(pool.map(dispatcher.encode, texts))
+
+        assert [r[0][0] for r in results] == [float(len(t)) for t in texts]
+        assert len(model.calls) == 1
+        assert sorted(model.calls[0]) == sorted(texts)
+
+    def test_max_batch_size_splits_batches(self):
+        """Test that batches never exceed max_batch_size."""
+        model = RecordingEmbedding()
+
+        with EmbeddingDispatcher(model, max_batch_size=2, max_wait_ms=50) as d:
+            futures = [d.submit(str(i)) for i in range(5)]
+            results = [f.result(timeout=5) for f in futures]
+
+        assert len(results) == 5
+        assert all(len(call) <= 2 for call in model.calls)
+        assert sum(len(call) for call in model.calls) == 5
+
+    def test_encode_list_keeps_order(self):
+        """Test that encoding a list returns embeddings in input order."""
+        model = RecordingEmbedding()
+        with EmbeddingDispatcher(model, max_wait_ms=10) as dispatcher:
+            result = dispatcher.encode(["a", "bbb", "cc"])
+
+        assert result == [[1.0, 1.0], [3.0, 1.0], [2.0, 1.0]]
+
+    def test_aencode(self):
+        """Test encoding from async callers."""
+        model = RecordingEmbedding()
+
+        async def run(dispatcher):
+            return await asyncio.gather(
+                dispatcher.aencode("ab"), dispatcher.aencode("abcd")
+            )
+
+        with EmbeddingDispatcher(model, max_wait_ms=100) as dispatcher:
+            results = asyncio.run(run(dispatcher))
+
+        assert results == [[2.0, 1.0], [4.0, 1.0]]
+        assert len(model.calls) == 1
+
+    def test_errors_propagate_to_all_futures(self):
+        """Test that a failing batch fails every waiting request."""
+        model = Mock()
+        model.model_name = "failing-model"
+        model.encode.side_effect = RuntimeError("boom")
+
+        with EmbeddingDispatcher(model, max_wait_ms=50) as dispatcher:
+            futures = [dispatcher.submit("a"), dispatcher.submit("b")]
+            for future in futures:
+                with pytest.raises(RuntimeError, match="boom"):
+                    future.result(timeout=5)
+
+    def test_encode_batch_bypasses_queue(self):
+        """Test that encode_batch delegates directly to the model."""
+        model = Mock()
+        model.model_name = "test-model"
+        model.encode_batch.return_value = [[0.1], [0.2]]
+        model.get_embedding_dim.return_value = 1
+
+        dispatcher = EmbeddingDispatcher(model)
+        result = dispatcher.encode_batch(["a", "b"], batch_size=8)
+
+        assert result == [[0.1], [0.2]]
+        model.encode_batch.assert_called_once_with(["a", "b"], batch_size=8)
+        assert dispatcher.get_embedding_dim() == 1
+        assert dispatcher._worker is None
+
+    def test_submit_after_close_raises(self):
+        """Test that a closed dispatcher rejects new requests."""
+        dispatcher = EmbeddingDispatcher(RecordingEmbedding())
+        dispatcher.close()
+
+        with pytest.raises(RuntimeError):
+            dispatcher.submit("text")
+
+    def test_invalid_arguments(self):
+        """Test validation of batching parameters."""
+        with pytest.raises(ValueError):
+            EmbeddingDispatcher(RecordingEmbedding(), max_batch_size=0)
+        with pytest.raises(ValueError):
+            EmbeddingDispatcher(RecordingEmbedding(), max_wait_ms=-1)
+
+    def test_shared_dispatchers(self):
+        """Test that pipelines with the same model share one queue."""
+        try:
+            first = get_shared_dispatcher(RecordingEmbedding(), max_wait_ms=1)
+            second = get_shared_dispatcher(RecordingEmbedding(), max_wait_ms=1)
+            other = get_shared_dispatcher(RecordingEmbedding(), max_wait_ms=2)
+
+            assert first is second
+            assert other is not first
+            assert first.encode("abc") == [[3.0, 1.0]]
+        finally:
+            close_shared_dispatchers()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            first.submit("a")
+        assert get_shared_dispatcher(RecordingEmbedding()) is not first
+        close_shared_dispatchers()
+
+    def test_shared_dispatchers_per_model_identity(self):
+        """Test that models differing in precision or compile get their own."""
+        from repoqa.embedding.projection import ProjectedEmbedding
+        from repoqa.embedding.sentence_transformer import (
+            SentenceTransformerEmbedding,
+        )
+
+        def model(precision="fp32", compile=False):
+            return SentenceTransformerEmbedding(
+                "model",
+                device="cpu",
+                precision=precision,
+                num_threads=0,
+                compile=compile,
+            )
+
+        try:
+            fp32 = get_shared_dispatcher(model())
+            fp16 = get_shared_dispatcher(model(precision="fp16"))
+            compiled = get_shared_dispatcher(model(compile=True))
+
+            assert get_shared_dispatcher(model()) is fp32
+            assert len({id(fp32), id(fp16), id(compiled)}) == 3
+            # A projection changes the embeddings, so projected models never
+            # share with each other or with the plain model
+            projected = get_shared_dispatcher(ProjectedEmbedding(model()))
+            assert projected is not fp32
+            assert get_shared_dispatcher(ProjectedEmbedding(model())) is not projected
+        finally:
+            close_shared_dispatchers()
@@ -0,0 +1,40 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the LangChain embeddings adapter."""
+
+from unittest.mock import Mock
+
+from repoqa.embedding.langchain_embeddings import LangChainEmbeddings
+
+
+class TestLangChainEmbeddings:
+    """Test suite for LangChainEmbeddings."""
+
+    def test_embed_documents(self):
+        """Test that documents are embedded with encode_batch."""
+        model = Mock()
+        model.encode_batch.return_value = [[0.1], [0.2]]
+
+        embeddings = LangChainEmbeddings(model, batch_size=16)
+        result = embeddings.embed_documents(["a", "b"])
+
+        assert result == [[0.1], [0.2]]
+        model.encode_batch.assert_called_once_with(["a", "b"], batch_size=16)
+
+    def test_embed_documents_empty(self):
+        """Test that embedding no documents skips the model."""
+        model = Mock()
+
+        assert LangChainEmbeddings(model).embed_documents([]) == []
+        model.encode_batch.assert_not_called()
+
+    def test_embed_query(self):
+        """Test that a query is embedded with encode."""
+        model = Mock()
+        model.encode.return_value = [[0.3, 0.4]]
+
+        result = LangChainEmbeddings(model).embed_query("query")
+
+        assert result == [0.3, 0.4]
+        model.encode.assert_called_once_with("query")
@@ -0,0 +1,151 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for embedding dimensionality reduction."""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from repoqa.embedding.projection import (
+    EmbeddingProjection,
+    ProjectedEmbedding,
+    recall_at_k,
+)
+
+
+@pytest.fixture
+def embeddings():
+    """Normalized embeddings with most variance in a few directions."""
+    rng = np.random.default_rng(42)
+    latent = rng.normal(size=(200, 8))
+    mixing = rng.normal(size=(8, 64))
+    noise = rng.normal(scale=0.01, size=(200, 64))
+    vectors = latent @ mixing + noise
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestEmbeddingProjection:
+    """Test suite for EmbeddingProjection."""
+
+    def test_fit_pca(self, embeddings):
+        """Test fitting a PCA projection."""
+        projection = EmbeddingProjection.fit("pca", embeddings, dim=16)
+
+        assert projection.input_dim == 64
+        assert projection.output_dim == 16
+        assert projection.metadata["explained_variance"] > 0.99
+
+    def test_transform_normalizes(self, embeddings):
+        """Test that projected vectors are unit length."""
+        projection = EmbeddingProjection.fit("pca", embeddings, dim=16)
+
+        projected = projection.transform(embeddings)
+
+        assert projected.shape == (200, 16)
+        np.testing.assert_allclose(np.linalg.norm(projected, axis=1), 1.0, rtol=1e-5)
+
+    def test_transform_single_vector(self, embeddings):
+        """Test projecting a single 1-D vector."""
+        projection = EmbeddingProjection.fit("pca", embeddings, dim=16)
+
+        assert projection.transform(embeddings[0]).shape == (1, 16)
+
+    def test_transform_dimension_mismatch(self, embeddings):
+        """Test that vectors of the wrong dimension are rejected."""
+        projection = EmbeddingProjection.fit("pca", embeddings, dim=16)
+
+        with pytest.raises(ValueError, match="dimension"):
+            projection.transform([[0.1] * 32])
+
+    def test_fit_truncate(self, embeddings):
+        """Test Matryoshka-style truncation keeps leading dimensions."""
+        projection = EmbeddingProjection.fit("truncate", embeddings, dim=4)
+
+        projected = projection.transform(embeddings[:1])
+        expected = embeddings[0, :4] / np.linalg.norm(embeddings[0, :4])
+
+        np.testing.assert_allclose(projected[0], expected, rtol=1e-5)
+        assert projection.mean is None
+
+    def test_dim_capped_at_input(self, embeddings):
+        """Test that the target dimension never exceeds the input."""
+        projection = EmbeddingProjection.fit("pca", embeddings, dim=1000)
+
+        assert projection.output_dim == 64
+
+    def test_invalid_method(self, embeddings):
+        """Test that unknown methods are rejected."""
+        with pytest.raises(ValueError):
+            EmbeddingProjection.fit("umap", embeddings, dim=16)
+
+    def test_fit_empty(self):
+        """Test that fitting on no embeddings fails."""
+        with pytest.raises(ValueError):
+            EmbeddingProjection.fit("pca", [], dim=16)
+
+    def test_save_and_load(self, embeddings, tmp_path):
+        """Test persisting and reloading a projection."""
+        projection = EmbeddingProjection.fit("pca", embeddings, dim=16)
+        projection.metadata["recall_at_10"] = 0.9
+        path = tmp_path / "projections" / "collection.npz"
+
+        projection.save(path)
+        loaded = EmbeddingProjection.load(path)
+
+        assert path.exists()
+        assert loaded.method == "pca"
+        assert loaded.metadata["recall_at_10"] == 0.9
+        np.testing.assert_allclose(
+            loaded.transform(embeddings), projection.transform(embeddings)
+        )
+
+
+class TestRecallAtK:
+    """Test suite for recall_at_k."""
+
+    def test_identity_has_full_recall(self, embeddings):
+        """Test that unchanged vectors have perfect recall."""
+        assert recall_at_k(embeddings, embeddings, k=10) == 1.0
+
+    def test_pca_preserves_neighbours(self, embeddings):
+        """Test that PCA on low-rank data keeps most neighbours."""
+        projection = EmbeddingProjection.fit("pca", embeddings, dim=8)
+
+        recall = recall_at_k(embeddings, projection.transform(embeddings), k=10)
+
+        assert recall > 0.9
+
+    def test_length_mismatch(self, embeddings):
+        """Test that mismatched inputs are rejected."""
+        with pytest.raises(ValueError):
+            recall_at_k(embeddings, embeddings[:10])
+
+
+class TestProjectedEmbedding:
+    """Test suite for ProjectedEmbedding."""
+
+    def test_passthrough_without_projection(self):
+        """Test that embeddings are unchanged without a projection."""
+        model = Mock()
+        model.encode.return_value = [[0.1, 0.2]]
+        model.get_embedding_dim.return_value = 2
+
+        wrapped = ProjectedEmbedding(model)
+
+        assert wrapped.encode("query") == [[0.1, 0.2]]
+        assert wrapped.get_embedding_dim() == 2
+
+    def test_projects_queries_and_batches(self, embeddings):
+        """Test that encode and encode_batch both apply the projection."""
+        projection = EmbeddingProjection.fit("pca", embeddings, dim=16)
+        model = Mock()
+        model.encode.return_value = embeddings[:1].tolist()
+        model.encode_batch.return_value = embeddings[:3].tolist()
+
+        wrapped = ProjectedEmbedding(model, projection)
+
+        assert len(wrapped.encode("query")[0]) == 16
+        assert np.asarray(wrapped.encode_batch(["a", "b", "c"])).shape == (3, 16)
+        assert wrapped.get_embedding_dim() == 16
@@ -9,6 +9,16 @@ import pytest
 import torch
 
 
+@pytest.fixture(autouse=True)
+def clear_model_cache():
+    """Ensure each test loads its own mocked model."""
+    from repoqa.embedding.sentence_transformer import clear_model_cache
+
+    clear_model_cache()
+    yield
+    clear_model_cache()
+
+
 class TestSentenceTransformerEmbedding:
     """Test suite for SentenceTransformerEmbedding."""
 
@@ -24,7 +34,40 @@ class TestSentenceTransformerEmbedding:
 
         assert embedding.model_name == "test-model"
         assert embedding.device == "cpu"
+        # Model is loaded lazily on first use
+        mock_st.assert_not_called()
+
+        assert embedding.model is mock_model
+        mock_st.assert_called_once_with("test-model", device="cpu")
+
+    @patch("repoqa.embedding.sentence_transformer.SentenceTransformer")
+    def test_model_shared_across_instances(self, mock_st):
+        """Test that instances with the same model and device share weights."""
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        mock_st.return_value = MagicMock()
+
+        first = SentenceTransformerEmbedding(model_name="test-model", device="cpu")
+        second = SentenceTransformerEmbedding(model_name="test-model", device="cpu")
+        other = SentenceTransformerEmbedding(model_name="other-model", device="cpu")
+
+        assert first.model is second.model
+        other.model
+        assert mock_st.call_count == 2
+
+    @patch("repoqa.embedding.sentence_transformer.SentenceTransformer")
+    def test_warmup_loads_model(self, mock_st):
+        """Test that warmup loads the model and runs one encode."""
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        mock_model = MagicMock()
+        mock_st.return_value = mock_model
+
+        embedding = SentenceTransformerEmbedding(model_name="test-model", device="cpu")
+        embedding.warmup()
+
         mock_st.assert_called_once_with("test-model", device="cpu")
+        mock_model.encode.assert_called_once()
 
     @patch("repoqa.embedding.sentence_transformer.SentenceTransformer")
     @patch("repoqa.embedding.sentence_transformer.torch")
@@ -166,3 +209,145 @@ class TestSentenceTransformerEmbedding:
             show_progress_bar=False,
             device="cpu",
         )
+
+
+class TestInferenceControls:
+    """Test suite for precision, threading and compile controls."""
+
+    def test_invalid_precision(self):
+        """Test that unknown precisions are rejected."""
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        with pytest.raises(ValueError, match="Unsupported precision"):
+            SentenceTransformerEmbedding(model_name="test-model", precision="int4")
+
+    def test_defaults_from_config(self):
+        """Test that unset options fall back to the embedding config."""
+        from repoqa.config import config
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        embedding = SentenceTransformerEmbedding(model_name="test-model")
+
+        assert embedding.precision == config.embedding_precision
+        assert embedding.num_threads == config.embedding_num_threads
+        assert embedding.compile == config.embedding_compile
+
+    @patch("repoqa.embedding.sentence_transformer.SentenceTransformer")
+    @patch("repoqa.embedding.sentence_transformer.torch")
+    def test_num_threads(self, mock_torch, mock_st):
+        """Test that num_threads configures torch intra-op threads."""
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        mock_st.return_value = MagicMock()
+        embedding = SentenceTransformerEmbedding(
+            model_name="test-model", device="cpu", precision="fp32", num_threads=3
+        )
+        embedding.model
+
+        mock_torch.set_num_threads.assert_called_once_with(3)
+
+    @patch("repoqa.embedding.sentence_transformer.SentenceTransformer")
+    def test_bf16_cast(self, mock_st):
+        """Test that bf16 casts the model weights."""
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        mock_model = MagicMock()
+        mock_st.return_value = mock_model
+        embedding = SentenceTransformerEmbedding(
+            model_name="test-model", device="cpu", precision="bf16"
+        )
+        embedding.model
+
+        mock_model.to.assert_called_once_with(dtype=torch.bfloat16)
+
+    @patch("repoqa.embedding.sentence_transformer.SentenceTransformer")
+    def test_fp16_on_cpu_falls_back(self, mock_st):
+        """Test that fp16 is not applied on CPU."""
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        mock_model = MagicMock()
+        mock_st.return_value = mock_model
+        embedding = SentenceTransformerEmbedding(
+            model_name="test-model", device="cpu", precision="fp16"
+        )
+        embedding.model
+
+        mock_model.to.assert_not_called()
+
+    @patch("repoqa.embedding.sentence_transformer.SentenceTransformer")
+    def test_precision_probe_failure_reverts(self, mock_st):
+        """Test that a failing reduced-precision probe restores fp32."""
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        mock_model = MagicMock()
+        mock_model.encode.side_effect = RuntimeError("unsupported dtype")
+        mock_st.return_value = mock_model
+        embedding = SentenceTransformerEmbedding(
+            model_name="test-model", device="cuda", precision="fp16"
+        )
+        embedding.model
+
+        assert mock_model.to.call_args_list[-1].kwargs == {"dtype": torch.float32}
+
+    @patch("repoqa.embedding.sentence_transformer.SentenceTransformer")
+    @patch("repoqa.embedding.sentence_transformer.torch")
+    def test_compile_failure_keeps_eager_model(self, mock_torch, mock_st):
+        """Test that a failing torch.compile keeps the eager module."""
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        mock_model = MagicMock()
+        eager = mock_model._first_module.return_value.auto_model
+        mock_st.return_value = mock_model
+        mock_torch.compile.side_effect = RuntimeError("no compiler")
+
+        embedding = SentenceTransformerEmbedding(
+            model_name="test-model", device="cpu", precision="fp32", compile=True
+        )
+        embedding.model
+
+        assert mock_model._first_module.return_value.auto_model is eager
+
+    def test_bf16_on_cpu_real_model(self, tiny_sentence_transformer_path):
+        """Test bf16 inference on CPU against fp32 with a real model."""
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        texts = ["def add(a, b)", "import os"]
+        fp32 = SentenceTransformerEmbedding(
+            tiny_sentence_transformer_path, device="cpu", precision="fp32"
+        ).encode(texts)
+        bf16 = SentenceTransformerEmbedding(
+            tiny_sentence_transformer_path, device="cpu", precision="bf16"
+        ).encode(texts)
+
+        assert len(bf16) == 2
+        assert all(isinstance(v, float) for v in bf16[0])
+        for a, b in zip(fp32, bf16):
+            assert max(abs(x - y) for x, y in zip(a, b)) < 0.05
+
+    def test_fp16_on_cpu_real_model(self, tiny_sentence_transformer_path):
+        """Test that fp16 on CPU keeps fp32 weights with a real model."""
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        embedding = SentenceTransformerEmbedding(
+            tiny_sentence_transformer_path, device="cpu", precision="fp16"
+        )
+        embedding.encode("x")
+
+        assert next(embedding.model.parameters()).dtype == torch.float32
+
+    @pytest.mark.slow
+    def test_compile_on_cpu_real_model(self, tiny_sentence_transformer_path):
+        """Test that compile on CPU either compiles or falls back cleanly."""
+        from repoqa.embedding.sentence_transformer import SentenceTransformerEmbedding
+
+        embedding = SentenceTransformerEmbedding(
+            tiny_sentence_transformer_path,
+            device="cpu",
+            precision="fp32",
+            compile=True,
+        )
+
+        result = embedding.encode(["def main()"])
+
+        assert len(result) == 1
+        assert len(result[0]) == 32
@@ -178,6 +178,126 @@ class TestGitRepoIndexer:
         assert result["file_count"] > 0
         assert len(result["chunks"]) > 0
 
+    def test_index_repository_builds_lexical_index(
+        self, mock_embedding_model, sample_repo_structure
+    ):
+        """Test that indexing builds a BM25 index over the chunks."""
+        from repoqa.indexing.git_indexer import GitRepoIndexer
+        from repoqa.indexing.simhash import simhash, to_hex
+
+        mock_embedding_model.encode_batch.return_value = [[0.1] * 384] * 10
+
+        indexer = GitRepoIndexer(embedding_model=mock_embedding_model)
+        result = indexer.index_repository(repo_path=str(sample_repo_structure))
+
+        results = result["lexical_index"].search("subtract", top_k=1)
+        assert results[0]["file_path"].endswith("utils.py")
+
+        # Chunks and lexical rows carry the chunk's SimHash
+        file_path = results[0]["file_path"]
+        chunk = next(c for c in result["chunks"] if c.file_path == file_path)
+        assert chunk.simhash == to_hex(simhash(chunk.content))
+        assert results[0]["simhash"] == chunk.simhash
+
+        indexer = GitRepoIndexer(
+            embedding_model=mock_embedding_model, build_lexical_index=False
+        )
+        result = indexer.index_repository(repo_path=str(sample_repo_structure))
+        assert result["lexical_index"] is None
+
+    def test_chunk_positions(self, mock_embedding_model, sample_repo_structure):
+        """Test that chunks record their ordinal and line range in the file."""
+        from repoqa.indexing.git_indexer import GitRepoIndexer
+
+        indexer = GitRepoIndexer(embedding_model=mock_embedding_model, chunk_size=2)
+        chunks = indexer._chunk_file(str(sample_repo_structure / "src" / "utils.py"))
+
+        assert [
+            (chunk.chunk_index, chunk.start_line, chunk.end_line) for chunk in chunks
+        ] == [(0, 1, 2), (1, 3, 4), (2, 5, 5)]
+        assert chunks[1].content == "\ndef subtract(a, b):\n"
+
+    def test_chunk_scope_metadata(self, mock_embedding_model, sample_repo_structure):
+        """Test that chunks carry the scope metadata of their file's path."""
+        from repoqa.indexing.git_indexer import GitRepoIndexer
+
+        mock_embedding_model.encode_batch.return_value = [[0.1] * 384] * 10
+
+        indexer = GitRepoIndexer(embedding_model=mock_embedding_model)
+        result = indexer.index_repository(repo_path=str(sample_repo_structure))
+
+        scopes = {
+            Path(chunk.file_path).relative_to(sample_repo_structure).as_posix(): (
+                chunk.language,
+                chunk.directory,
+                chunk.extension,
+                chunk.is_test,
+            )
+            for chunk in result["chunks"]
+        }
+        assert scopes["src/utils.py"] == ("python", "src", ".py", False)
+        assert scopes["tests/test_utils.py"] == ("python", "tests", ".py", True)
+        assert scopes["README.md"] == ("markdown", None, ".md", False)
+
+        # The lexical index can filter by the same fields
+        rows = result["lexical_index"].search(
+            "def", top_k=10, metadata_filter={"is_test": True}
+        )
+        assert {row["file_path"] for row in rows} == {
+            str(sample_repo_structure / "tests" / "test_utils.py")
+        }
+
+    def test_index_repository_builds_trigram_index(
+        self, mock_embedding_model, sample_repo_structure
+    ):
+        """Test that indexing builds a trigram index over whole files."""
+        from repoqa.indexing.git_indexer import GitRepoIndexer
+
+        mock_embedding_model.encode_batch.return_value = [[0.1] * 384] * 10
+
+        # One-line chunks, so each file's text is rebuilt from several chunks
+        indexer = GitRepoIndexer(embedding_model=mock_embedding_model, chunk_size=1)
+        result = indexer.index_repository(repo_path=str(sample_repo_structure))
+
+        trigram_index = result["trigram_index"]
+        assert len(trigram_index) == result["file_count"]
+        matches = trigram_index.search(r"def \w+\(a, b\)")
+        assert [m["file_path"].endswith("utils.py") for m in matches] == [True, True]
+        utils = next(
+            path for path in trigram_index.file_paths if path.endswith("utils.py")
+        )
+        with open(utils) as f:
+            assert trigram_index.text(trigram_index.file_paths.index(utils)) == (
+                f.read()
+            )
+
+        indexer = GitRepoIndexer(
+            embedding_model=mock_embedding_model, build_trigram_index=False
+        )
+        result = indexer.index_repository(repo_path=str(sample_repo_structure))
+        assert result["trigram_index"] is None
+
+    def test_index_repository_builds_symbol_table(
+        self, mock_embedding_model, sample_repo_structure
+    ):
+        """Test that indexing extracts the definitions of the code files."""
+        from repoqa.indexing.git_indexer import GitRepoIndexer
+
+        mock_embedding_model.encode_batch.return_value = [[0.1] * 384] * 10
+
+        indexer = GitRepoIndexer(embedding_model=mock_embedding_model)
+        result = indexer.index_repository(repo_path=str(sample_repo_structure))
+
+        (definition,) = result["symbol_table"].find_definitions("subtract")
+        assert definition["file_path"].endswith("utils.py")
+        assert (definition["start_line"], definition["end_line"]) == (4, 5)
+
+        indexer = GitRepoIndexer(
+            embedding_model=mock_embedding_model, build_symbol_table=False
+        )
+        result = indexer.index_repository(repo_path=str(sample_repo_structure))
+        assert result["symbol_table"] is None
+
     @patch("repoqa.indexing.git_indexer.git.Repo")
     def test_index_repository_with_git_info(
         self, mock_repo_class, mock_embedding_model, sample_repo_structure
@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the shared index cache."""
+
+import os
+import shutil
+
+import pytest
+
+from repoqa.indexing.index_cache import clear_index_cache, load_index
+from repoqa.indexing.symbols import SymbolTable
+
+
+class FakeIndex:
+    """Index holding the text of one file, counting its loads."""
+
+    loads = 0
+
+    def __init__(self, text):
+        self.text = text
+
+    @staticmethod
+    def exists(directory):
+        return os.path.exists(os.path.join(directory, "index.txt"))
+
+    @classmethod
+    def load(cls, directory):
+        cls.loads += 1
+        with open(os.path.join(directory, "index.txt")) as f:
+            return cls(f.read())
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    """Start every test with an empty cache and load count."""
+    clear_index_cache()
+    FakeIndex.loads = 0
+    yield
+    clear_index_cache()
+
+
+def write_index(directory, text):
+    """Save a fake index holding text."""
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "index.txt").write_text(text)
+
+
+class TestIndexCache:
+    """Test suite for load_index."""
+
+    def test_loads_once_per_directory(self, tmp_path):
+        """Test that repeated loads share one index."""
+        write_index(tmp_path / "a", "one")
+        write_index(tmp_path / "b", "two")
+
+        first = load_index(FakeIndex, str(tmp_path / "a"))
+
+        assert load_index(FakeIndex, str(tmp_path / "a")) is first
+        assert load_index(FakeIndex, str(tmp_path / "b")).text == "two"
+        assert FakeIndex.loads == 2
+
+    def test_reloads_changed_files(self, tmp_path):
+        """Test that a rebuilt index is loaded again."""
+        directory = tmp_path / "index"
+        write_index(directory, "old")
+        assert load_index(FakeIndex, str(directory)).text == "old"
+
+        # A different size is enough, whatever the mtime resolution
+        shutil.rmtree(directory)
+        write_index(directory, "rebuilt")
+
+        assert load_index(FakeIndex, str(directory)).text == "rebuilt"
+        assert FakeIndex.loads == 2
+
+    def test_missing_index(self, tmp_path):
+        """Test that missing and removed indexes load as None."""
+        directory = tmp_path / "index"
+        assert load_index(FakeIndex, str(directory)) is None
+
+        write_index(directory, "text")
+        assert load_index(FakeIndex, str(directory)) is not None
+        shutil.rmtree(directory)
+
+        assert load_index(FakeIndex, str(directory)) is None
+        assert FakeIndex.loads == 1
+
+    def test_symbol_table(self, tmp_path):
+        """Test caching a saved symbol table."""
+        directory = str(tmp_path / "symbols")
+        SymbolTable.build([("a.py", "def main():\n    pass\n")]).save(directory)
+
+        table = load_index(SymbolTable, directory)
+
+        assert load_index(SymbolTable, directory) is table
+        assert table.find_definitions("main")[0]["file_path"] == "a.py"
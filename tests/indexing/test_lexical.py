@@ -0,0 +1,120 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the BM25 lexical index."""
+
+import numpy as np
+import pytest
+
+from repoqa.indexing.lexical import BM25Index, get_lexical_directory, tokenize_code
+
+ROWS = [
+    {
+        "content": "def get_collection_name(repo_url):\n    return repo_url",
+        "file_path": "repoqa/storage/collection_manager.py",
+    },
+    {
+        "content": "OLLAMA_CONTEXT_LENGTH = 4096",
+        "file_path": "repoqa/llm/ollama.py",
+    },
+    {
+        "content": "A collection holds the names of indexed chunks.",
+        "file_path": "README.md",
+    },
+    {
+        "content": "class HTTPServer:\n    def handleRequest(self): ...",
+        "file_path": "server.py",
+    },
+]
+
+
+class TestTokenizeCode:
+    """Test suite for tokenize_code."""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            (
+                "get_collection_name",
+                ["get_collection_name", "get", "collection", "name"],
+            ),
+            ("handleRequest", ["handlerequest", "handle", "request"]),
+            ("HTTPServer", ["httpserver", "http", "server"]),
+            (
+                "OLLAMA_CONTEXT_LENGTH",
+                ["ollama_context_length", "ollama", "context", "length"],
+            ),
+            ("x = 404", ["404"]),
+            ("Where is it?", ["where", "is", "it"]),
+        ],
+    )
+    def test_splits_identifiers(self, text, expected):
+        """Test snake_case, camelCase and acronym splitting."""
+        assert tokenize_code(text) == expected
+
+
+class TestBM25Index:
+    """Test suite for BM25Index."""
+
+    def test_exact_identifier_ranks_first(self):
+        """Test that a chunk defining the queried identifier wins."""
+        index = BM25Index.build(ROWS)
+
+        results = index.search("where is get_collection_name defined?", top_k=2)
+
+        assert results[0]["file_path"] == "repoqa/storage/collection_manager.py"
+        assert results[0]["content"] == ROWS[0]["content"]
+        assert results[0]["bm25"] > results[1]["bm25"] > 0
+
+    def test_subword_and_path_matches(self):
+        """Test matching identifier parts and file path tokens."""
+        index = BM25Index.build(ROWS)
+
+        assert index.search("ollama context length")[0]["file_path"] == (
+            "repoqa/llm/ollama.py"
+        )
+        assert index.search("handle request")[0]["file_path"] == "server.py"
+        assert index.search("storage manager")[0]["file_path"] == (
+            "repoqa/storage/collection_manager.py"
+        )
+
+    def test_no_match_and_empty_index(self):
+        """Test that chunks sharing no term are never returned."""
+        assert BM25Index.build(ROWS).search("kubernetes") == []
+        assert BM25Index.build([]).search("anything") == []
+        assert BM25Index.build(ROWS).search("collection", top_k=0) == []
+
+    def test_metadata_filter(self):
+        """Test that filtered-out chunks are excluded."""
+        index = BM25Index.build(ROWS)
+
+        results = index.search("collection", metadata_filter={"file_path": "README.md"})
+
+        assert [r["file_path"] for r in results] == ["README.md"]
+
+    def test_top_k_orders_by_score(self):
+        """Test truncation to the best scoring chunks."""
+        rows = [
+            {"content": "token " * count + "filler " * 5, "file_path": f"{count}.txt"}
+            for count in range(1, 8)
+        ]
+        index = BM25Index.build(rows)
+
+        results = index.search("token", top_k=3)
+
+        assert [r["file_path"] for r in results] == ["7.txt", "6.txt", "5.txt"]
+
+    def test_save_and_load(self, tmp_path):
+        """Test that a saved index memory-maps its postings on load."""
+        index = BM25Index.build(ROWS, k1=1.5, b=0.5)
+        directory = get_lexical_directory(str(tmp_path), "repo")
+        assert not BM25Index.exists(directory)
+
+        index.save(directory)
+        loaded = BM25Index.load(directory)
+
+        assert BM25Index.exists(directory)
+        assert len(loaded) == len(ROWS)
+        assert (loaded.k1, loaded.b) == (1.5, 0.5)
+        assert isinstance(loaded.docs, np.memmap)
+        assert loaded.search("http server") == index.search("http server")
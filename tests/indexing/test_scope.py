@@ -0,0 +1,84 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for scope metadata and filters."""
+
+import pytest
+
+from repoqa.indexing.scope import (
+    combine_filters,
+    file_metadata,
+    is_test_path,
+    scope_filter,
+)
+
+
+def test_file_metadata():
+    """Test metadata derived from a repository-relative path."""
+    assert file_metadata("services/api/handlers.py") == {
+        "language": "python",
+        "directory": "services",
+        "extension": ".py",
+        "is_test": False,
+    }
+    # Files at the root have no directory; unknown extensions no language
+    assert file_metadata("README.md") == {
+        "language": "markdown",
+        "extension": ".md",
+        "is_test": False,
+    }
+    assert file_metadata("Makefile") == {"is_test": False}
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "tests/helpers.py",
+        "src/__tests__/app.js",
+        "pkg/test_parser.py",
+        "pkg/parser_test.go",
+        "web/app.spec.ts",
+        "web/app.test.tsx",
+        "src/ParserTest.java",
+        "conftest.py",
+    ],
+)
+def test_is_test_path(path):
+    """Test the directory and file name conventions of test files."""
+    assert is_test_path(path)
+
+
+@pytest.mark.parametrize("path", ["pkg/latest.py", "src/contest.py", "testdata.py"])
+def test_is_not_test_path(path):
+    """Test that names merely containing 'test' are not test files."""
+    assert not is_test_path(path)
+
+
+def test_scope_filter():
+    """Test that given restrictions are normalized and all required."""
+    assert scope_filter() is None
+    assert scope_filter(directories=["./services/"]) == {"directory": "services"}
+    assert scope_filter(
+        languages=["Python", "Go"], extensions=["py", ".GO"], tests=False
+    ) == {
+        "$and": [
+            {"language": {"$in": ["python", "go"]}},
+            {"extension": {"$in": [".py", ".go"]}},
+            {"is_test": False},
+        ]
+    }
+
+
+def test_scope_filter_rejects_nested_directories():
+    """Test that only top-level directories are accepted."""
+    with pytest.raises(ValueError, match="top-level"):
+        scope_filter(directories=["services/api"])
+    with pytest.raises(ValueError, match="top-level"):
+        scope_filter(directories=[".."])
+
+
+def test_combine_filters():
+    """Test that filters are required together, skipping missing ones."""
+    assert combine_filters(None, None) is None
+    assert combine_filters({"a": 1}, None) == {"a": 1}
+    assert combine_filters({"a": 1}, {"b": 2}) == {"$and": [{"a": 1}, {"b": 2}]}
@@ -0,0 +1,42 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for SimHash fingerprints."""
+
+from repoqa.indexing.simhash import hamming_distance, simhash, to_hex
+
+CODE = "".join(
+    f"def handle_{i}(request):\n    return respond(request, status={200 + i})\n\n"
+    for i in range(12)
+)
+
+
+def test_simhash_ignores_formatting():
+    """Test that whitespace changes keep the fingerprint."""
+    assert simhash(CODE) == simhash(CODE.replace("    ", "\t"))
+    assert simhash(CODE) == simhash(CODE)
+
+
+def test_simhash_near_duplicates():
+    """Test that small edits change few bits and other code many."""
+    edited = CODE.replace("status=205", "status=404")
+    other = "".join(f"class Model{i}:\n    name = Column(String)\n" for i in range(12))
+
+    assert 0 < hamming_distance(simhash(CODE), simhash(edited)) <= 6
+    assert hamming_distance(simhash(CODE), simhash(other)) > 16
+
+
+def test_simhash_short_text():
+    """Test texts with fewer tokens than a shingle."""
+    assert simhash("") == 0
+    assert simhash("  \n") == 0
+    assert simhash("x") == simhash("  x  ")
+    assert simhash("x") != simhash("y")
+
+
+def test_hex_and_hamming_distance():
+    """Test metadata formatting and bit distances."""
+    assert to_hex(255) == "00000000000000ff"
+    assert int(to_hex(simhash(CODE)), 16) == simhash(CODE)
+    assert hamming_distance(0b1011, 0b0001) == 2
+    assert hamming_distance(2**64 - 1, 0) == 64
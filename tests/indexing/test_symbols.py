@@ -0,0 +1,218 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the symbol table."""
+
+import pytest
+
+from repoqa.indexing.symbols import (
+    SymbolTable,
+    extract_symbols,
+    get_symbol_directory,
+    query_symbols,
+)
+
+CONFIG_PY = '''\
+import os
+
+DEFAULT_PATH = "config.yaml"
+
+
+class Config:
+    """Settings."""
+
+    @property
+    def path(self):
+        return load_config(DEFAULT_PATH)
+
+
+def load_config(path):
+    return os.path.exists(path)
+'''
+
+MAIN_PY = '''\
+from config import Config, load_config
+
+
+def main():
+    config = Config()
+    return load_config(config.path)
+'''
+
+SERVER_GO = """\
+package server
+
+type Server struct {
+    addr string
+}
+
+func (s *Server) Start() error {
+    if s.addr == "" {
+        return nil
+    }
+    return listen(s.addr)
+}
+
+func listen(addr string) error {
+    return nil
+}
+"""
+
+FILES = [
+    ("src/config.py", CONFIG_PY),
+    ("src/main.py", MAIN_PY),
+    ("server/server.go", SERVER_GO),
+    ("README.md", "Call load_config() first."),
+]
+
+
+class TestExtractSymbols:
+    """Test suite for extract_symbols."""
+
+    def test_python_definitions(self):
+        """Test ast-based definitions with qualified names and line ranges."""
+        definitions, _ = extract_symbols("src/config.py", CONFIG_PY)
+
+        found = {(d["qualified_name"], d["kind"]) for d in definitions}
+        assert found == {
+            ("DEFAULT_PATH", "variable"),
+            ("Config", "class"),
+            ("Config.path", "method"),
+            ("load_config", "function"),
+        }
+        method = next(d for d in definitions if d["name"] == "path")
+        # The range starts at the decorator; the signature is the def line
+        assert (method["start_line"], method["end_line"]) == (9, 11)
+        assert method["signature"] == "def path(self):"
+
+    def test_python_references(self):
+        """Test calls, loads and imports from the ast."""
+        _, references = extract_symbols("src/main.py", MAIN_PY)
+
+        assert ("Config", 1, "import") in references
+        assert ("Config", 5, "call") in references
+        assert ("load_config", 6, "call") in references
+        assert ("path", 6, "reference") in references
+
+    def test_python_syntax_error_falls_back(self):
+        """Test the heuristic patterns for Python that does not parse."""
+        definitions, references = extract_symbols(
+            "broken.py", "def ok(x):\n    return (\n\nclass Half:\n"
+        )
+
+        assert [(d["name"], d["kind"]) for d in definitions] == [
+            ("ok", "function"),
+            ("Half", "class"),
+        ]
+        assert references == []
+
+    @pytest.mark.parametrize(
+        "file_path, text, expected",
+        [
+            (
+                "server.go",
+                SERVER_GO,
+                [("Server", "type", 3, 5), ("Start", "method", 7, 12)],
+            ),
+            (
+                "app.ts",
+                "export class App {\n  run(x: number): void {\n    go();\n  }\n}\n"
+                "export const go = async () => {\n};\n",
+                [
+                    ("App", "class", 1, 5),
+                    ("run", "method", 2, 4),
+                    ("go", "function", 6, 7),
+                ],
+            ),
+            (
+                "lib.c",
+                "#define LIMIT 8\nstatic int add(int a, int b)\n"
+                "{\n  return a + b;\n}\n",
+                [("LIMIT", "macro", 1, 1), ("add", "function", 2, 5)],
+            ),
+            (
+                "lib.rs",
+                "pub struct Point {\n    x: i32,\n}\n\npub fn origin() -> Point {\n"
+                "    Point { x: 0 }\n}\n",
+                [("Point", "type", 1, 3), ("origin", "function", 5, 7)],
+            ),
+            (
+                "Util.java",
+                "public class Util {\n    public static int twice(int x) {\n"
+                "        if (x > 0) {\n            return 2 * x;\n        }\n"
+                "        return 0;\n    }\n}\n",
+                [("Util", "class", 1, 8), ("twice", "method", 2, 7)],
+            ),
+        ],
+    )
+    def test_heuristic_definitions(self, file_path, text, expected):
+        """Test ctags-like patterns with brace-matched line ranges."""
+        definitions, _ = extract_symbols(file_path, text)
+
+        found = [
+            (d["name"], d["kind"], d["start_line"], d["end_line"])
+            for d in definitions
+        ][: len(expected)]
+        assert found == expected
+
+    def test_unsupported_files(self):
+        """Test that files of unknown languages yield no symbols."""
+        assert extract_symbols("README.md", "def nothing(): pass") == ([], [])
+
+
+def test_query_symbols():
+    """Test that only identifier-like words of a question are kept."""
+    query = (
+        "Where is load_config defined, who calls `run` or Config.path(), "
+        "and what does the main() loop do with CamelCase e.g. values?"
+    )
+
+    assert query_symbols(query) == ["load_config", "run", "path", "main", "CamelCase"]
+
+
+class TestSymbolTable:
+    """Test suite for SymbolTable."""
+
+    def test_find_definitions(self):
+        """Test lookups by name and qualified name."""
+        table = SymbolTable.build(FILES)
+
+        (definition,) = table.find_definitions("load_config")
+        assert definition["file_path"] == "src/config.py"
+        assert (definition["start_line"], definition["end_line"]) == (14, 15)
+
+        assert table.find_definitions("Config.path")[0]["kind"] == "method"
+        assert table.find_definitions("Start")[0]["file_path"] == "server/server.go"
+        assert table.find_definitions("missing") == []
+
+    def test_find_references(self):
+        """Test references across files, calls first."""
+        table = SymbolTable.build(FILES)
+
+        references = table.find_references("load_config")
+        assert [(r["file_path"], r["line"], r["kind"]) for r in references] == [
+            ("src/config.py", 11, "call"),
+            ("src/main.py", 6, "call"),
+            ("src/main.py", 1, "import"),
+        ]
+        # Heuristic references skip the definition line itself
+        assert table.find_references("listen") == [
+            {"file_path": "server/server.go", "line": 11, "kind": "call"}
+        ]
+        # Only names defined in the repository are recorded
+        assert table.find_references("exists") == []
+        assert len(table.find_references("load_config", limit=1)) == 1
+
+    def test_save_and_load(self, tmp_path):
+        """Test that a saved table reopens read-only."""
+        table = SymbolTable.build(FILES)
+        directory = get_symbol_directory(str(tmp_path), "repo")
+        assert not SymbolTable.exists(directory)
+
+        table.save(directory)
+        loaded = SymbolTable.load(directory)
+
+        assert SymbolTable.exists(directory)
+        assert len(loaded) == len(table)
+        assert loaded.find_definitions("Server") == table.find_definitions("Server")
+        assert loaded.find_references("Config") == table.find_references("Config")
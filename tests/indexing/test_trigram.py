@@ -0,0 +1,142 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the trigram code search index."""
+
+import re
+
+import numpy as np
+import pytest
+
+from repoqa.indexing.trigram import (
+    TrigramIndex,
+    get_trigram_directory,
+    plan_query,
+    trigram_keys,
+)
+
+FILES = [
+    (
+        "repoqa/config.py",
+        "import os\n\n\nclass Config:\n    def load_config(self, path):\n"
+        "        return path\n",
+    ),
+    ("repoqa/errors.py", "class IndexingError(Exception):\n    pass\n"),
+    ("README.md", "# RepoQA\n\nCall load_config() before indexing.\n"),
+    ("notes.txt", "Ünïcode and CONFIG in caps\n"),
+]
+
+
+def _key(trigram: str) -> int:
+    return int(trigram_keys(trigram.encode())[0])
+
+
+class TestPlanQuery:
+    """Test suite for regex query planning."""
+
+    def test_literal_requires_all_trigrams(self):
+        """Test that a literal requires each of its trigrams."""
+        assert plan_query("load") == ("and", [_key("loa"), _key("oad")])
+
+    def test_alternation_requires_a_branch(self):
+        """Test that alternations become unions of their branches."""
+        plan = plan_query("(config|errors)")
+
+        assert plan[0] == "or"
+        assert len(plan[1]) == 2
+
+    @pytest.mark.parametrize("pattern", ["x", ".*", "(foo)?", "[abc]+", "a|bc"])
+    def test_unconstrained_patterns_match_everything(self, pattern):
+        """Test that patterns without a required trigram plan no filter."""
+        assert plan_query(pattern) is None
+
+    def test_repeat_of_at_least_one(self):
+        """Test that a repeated group still requires its content."""
+        assert plan_query("(abc)+") == _key("abc")
+
+    def test_invalid_pattern(self):
+        """Test that invalid regexes raise re.error."""
+        with pytest.raises(re.error):
+            plan_query("(unclosed")
+
+
+class TestTrigramIndex:
+    """Test suite for TrigramIndex."""
+
+    def test_search_reports_lines(self):
+        """Test that matching lines carry their file and line number."""
+        index = TrigramIndex.build(FILES)
+
+        results = index.search(r"def load_config")
+
+        assert results == [
+            {
+                "file_path": "repoqa/config.py",
+                "line": 5,
+                "text": "    def load_config(self, path):",
+            }
+        ]
+
+    def test_regex_and_anchors(self):
+        """Test regex features, with ^ anchoring at line starts."""
+        index = TrigramIndex.build(FILES)
+
+        results = index.search(r"^class \w+(Error)?\(")
+        assert [r["file_path"] for r in results] == ["repoqa/errors.py"]
+
+        results = index.search(r"load_config\(")
+        assert [(r["file_path"], r["line"]) for r in results] == [
+            ("repoqa/config.py", 5),
+            ("README.md", 3),
+        ]
+
+    def test_candidates_narrow_files(self):
+        """Test that only files with the required trigrams are candidates."""
+        index = TrigramIndex.build(FILES)
+
+        assert list(index.candidates(plan_query("IndexingError"))) == [1]
+        assert list(index.candidates(plan_query("zzz"))) == []
+        assert list(index.candidates(None)) == [0, 1, 2, 3]
+
+    def test_ignore_case(self):
+        """Test case-insensitive search through the lowercased trigrams."""
+        index = TrigramIndex.build(FILES)
+
+        assert [r["file_path"] for r in index.search("CONFIG")] == ["notes.txt"]
+        results = index.search("CONFIG", ignore_case=True)
+        assert len({r["file_path"] for r in results}) == 3
+        assert index.search("(?i)ünïcode")[0]["file_path"] == "notes.txt"
+
+    def test_limits_and_path_filter(self):
+        """Test max_results and path filtering."""
+        index = TrigramIndex.build(FILES)
+
+        assert len(index.search("o", max_results=2)) == 2
+        assert index.search("o", max_results=0) == []
+        results = index.search("load_config", path_pattern=r"\.md$")
+        assert [r["file_path"] for r in results] == ["README.md"]
+
+    def test_invalid_pattern(self):
+        """Test that invalid patterns raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid regular expression"):
+            TrigramIndex.build(FILES).search("(unclosed")
+
+    def test_empty_index(self):
+        """Test searching an index without files."""
+        assert TrigramIndex.build([]).search("anything") == []
+
+    def test_save_and_load(self, tmp_path):
+        """Test that a saved index memory-maps postings and contents."""
+        index = TrigramIndex.build(FILES)
+        directory = get_trigram_directory(str(tmp_path), "repo")
+        assert not TrigramIndex.exists(directory)
+
+        index.save(directory)
+        loaded = TrigramIndex.load(directory)
+
+        assert TrigramIndex.exists(directory)
+        assert len(loaded) == len(FILES)
+        assert loaded.postings.dtype == np.uint16
+        assert isinstance(loaded.content, np.memmap)
+        assert loaded.text(3) == FILES[3][1]
+        assert loaded.search(r"class \w+") == index.search(r"class \w+")
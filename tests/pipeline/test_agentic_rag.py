@@ -13,7 +13,7 @@ from langchain_core.documents import Document
 def mock_pipeline_dependencies():
     """Auto-mock dependencies for all tests in this module."""
     with patch("repoqa.pipeline.agentic_rag.SentenceTransformerEmbedding"), patch(
-        "repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings"
+        "repoqa.pipeline.agentic_rag.LangChainEmbeddings"
     ), patch("repoqa.pipeline.agentic_rag.Chroma"), patch(
         "repoqa.pipeline.agentic_rag.create_react_agent"
     ), patch(
@@ -55,11 +55,11 @@ class TestAgenticRAGPipeline:
         assert pipeline.embedding_model_name == "test-model"
         assert pipeline.collection_name == "test-collection"
         assert pipeline.repo_path == repo_path
-        assert len(pipeline.tools) == 4  # Should have 4 tools
+        assert len(pipeline.tools) == 7  # Should have 7 tools
         assert pipeline.accessed_files == set()
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_semantic_search_tool(
@@ -79,7 +79,7 @@ class TestAgenticRAGPipeline:
         docs = [
             Document(
                 page_content="def test():\n    pass",
-                metadata={"file_path": "test.py"},
+                metadata={"file_path": "test.py", "start_line": 3, "end_line": 4},
             )
         ]
         mock_vectorstore.similarity_search.return_value = docs
@@ -106,12 +106,12 @@ class TestAgenticRAGPipeline:
         )
         result = semantic_search_tool.func("test query")
 
-        assert "test.py" in result
+        assert "test.py (lines 3-4)" in result
         assert "def test()" in result
         assert "test.py" in pipeline.accessed_files
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_list_directory_tool(
@@ -149,8 +149,77 @@ class TestAgenticRAGPipeline:
         assert "LICENSE" in result
         assert "src" in result or "[DIR]" in result
 
+    def test_grep_code_tool(self, mock_llm, sample_repo_structure):
+        """Test regex code search through the trigram index."""
+        from repoqa.indexing.trigram import TrigramIndex
+        from repoqa.pipeline.agentic_rag import AgenticRAGPipeline
+
+        pipeline = AgenticRAGPipeline(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(sample_repo_structure.parent),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_path=str(sample_repo_structure),
+            repo_indexer=Mock(),
+        )
+        grep_tool = next(t for t in pipeline.tools if t.name == "grep_code")
+
+        assert "No trigram index" in grep_tool.func("def add")
+
+        utils = sample_repo_structure / "src" / "utils.py"
+        pipeline.trigram_index = TrigramIndex.build([(str(utils), utils.read_text())])
+
+        result = grep_tool.func("`^def (add|subtract)`")
+        assert "src/utils.py:1: def add(a, b):" in result
+        assert "src/utils.py:4: def subtract(a, b):" in result
+        assert str(utils) in pipeline.accessed_files
+
+        assert "No matches found" in grep_tool.func("multiply")
+        assert "Code search failed" in grep_tool.func("(unclosed")
+
+    def test_symbol_tools(self, mock_llm, sample_repo_structure):
+        """Test the definition and reference lookup tools."""
+        from repoqa.indexing.symbols import SymbolTable
+        from repoqa.pipeline.agentic_rag import AgenticRAGPipeline
+
+        pipeline = AgenticRAGPipeline(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(sample_repo_structure.parent),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_path=str(sample_repo_structure),
+            repo_indexer=Mock(),
+        )
+        tools = {tool.name: tool for tool in pipeline.tools}
+
+        assert "No symbol table" in tools["find_definition"].func("add")
+
+        utils = sample_repo_structure / "src" / "utils.py"
+        caller = sample_repo_structure / "src" / "calc.py"
+        caller.write_text("from utils import add\n\nprint(add(1, 2))\n")
+        pipeline.symbol_table = SymbolTable.build(
+            [(str(path), path.read_text()) for path in (utils, caller)]
+        )
+
+        result = tools["find_definition"].func("`add()`")
+        assert "function add at src/utils.py:1-2" in result
+        assert "def add(a, b):" in result
+        assert str(utils) in pipeline.accessed_files
+
+        result = tools["find_references"].func("add")
+        assert result.splitlines()[1:] == [
+            "src/calc.py:3 (call)",
+            "src/calc.py:1 (import)",
+        ]
+        assert "No definition found" in tools["find_definition"].func("multiply")
+        assert "No references found" in tools["find_references"].func("subtract")
+
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_read_file_tool(
@@ -187,8 +256,15 @@ class TestAgenticRAGPipeline:
         assert "Test Repository" in result
         assert "README.md" in pipeline.accessed_files
 
+        # Line ranges read only those lines
+        result = read_file_tool.func("src/utils.py:4-5")
+        assert "Content of src/utils.py:4-5:" in result
+        assert "def subtract(a, b):\n    return a - b\n```" in result
+        assert "def add" not in result
+        assert "src/utils.py" in pipeline.accessed_files
+
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_read_file_nonexistent(
@@ -223,7 +299,7 @@ class TestAgenticRAGPipeline:
         assert "does not exist" in result
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_ask(
@@ -271,7 +347,7 @@ class TestAgenticRAGPipeline:
         assert "test.py" in answer
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_ask_error_handling(
@@ -309,7 +385,7 @@ class TestAgenticRAGPipeline:
         assert "Error" in answer
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_similarity_search_with_score_tool(
@@ -359,7 +435,7 @@ class TestAgenticRAGPipeline:
         assert "sample code" in result
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_semantic_search_no_results(
@@ -402,7 +478,7 @@ class TestAgenticRAGPipeline:
         assert "No relevant documents found" in result
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_semantic_search_error(
@@ -445,7 +521,7 @@ class TestAgenticRAGPipeline:
         assert "failed" in result.lower()
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_list_directory_nonexistent(
@@ -481,7 +557,7 @@ class TestAgenticRAGPipeline:
         assert "does not exist" in result
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_list_directory_file_path(
@@ -515,7 +591,7 @@ class TestAgenticRAGPipeline:
         assert "not a directory" in result
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_list_directory_with_subdirectory(
@@ -549,7 +625,7 @@ class TestAgenticRAGPipeline:
         assert "main.py" in result or "FILE" in result
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_read_file_too_large(
@@ -589,7 +665,7 @@ class TestAgenticRAGPipeline:
         assert "too large" in result.lower()
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_read_file_is_directory(
@@ -623,7 +699,7 @@ class TestAgenticRAGPipeline:
         assert "not a file" in result
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_read_file_empty_path(
@@ -659,7 +735,7 @@ class TestAgenticRAGPipeline:
         assert "cannot be empty" in result
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_ask_repo_not_exists(
@@ -693,7 +769,7 @@ class TestAgenticRAGPipeline:
         assert "does not exist" in answer
 
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_ask_iteration_limit(
@@ -732,8 +808,9 @@ class TestAgenticRAGPipeline:
 
         assert "iteration limit" in answer.lower()
 
+    @patch("repoqa.pipeline.agentic_rag.get_chroma_client")
     @patch("repoqa.pipeline.agentic_rag.Chroma")
-    @patch("repoqa.pipeline.agentic_rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
     @patch("repoqa.pipeline.agentic_rag.create_react_agent")
     @patch("repoqa.pipeline.agentic_rag.AgentExecutor")
     def test_index_repository(
@@ -742,6 +819,7 @@ class TestAgenticRAGPipeline:
         mock_agent,
         mock_embeddings,
         mock_chroma,
+        mock_get_client,
         mock_llm,
         sample_code_chunks,
         tmp_path,
@@ -780,4 +858,47 @@ class TestAgenticRAGPipeline:
         assert result["status"] == "success"
         assert result["documents_added"] == 3
         assert result["file_exploration_enabled"] is True
-        mock_vectorstore.add_documents.assert_called_once()
+        collection = mock_get_client.return_value.get_collection
+        collection.return_value.add.assert_called_once()
+
+    @patch("repoqa.pipeline.agentic_rag.get_chroma_client")
+    @patch("repoqa.pipeline.agentic_rag.LangChainEmbeddings")
+    def test_numpy_backend(
+        self, mock_embeddings, mock_get_client, mock_llm, sample_code_chunks, tmp_path
+    ):
+        """Test indexing into and scored search over the NumPy backend."""
+        from repoqa.pipeline.agentic_rag import AgenticRAGPipeline
+
+        embeddings = mock_embeddings.return_value
+        embeddings.embed_documents.side_effect = lambda texts: [
+            [float("hello" in text), float("Goodbye" in text), 0.1] for text in texts
+        ]
+        embeddings.embed_query.return_value = [0.0, 1.0, 0.0]
+        mock_indexer = Mock()
+        mock_indexer.index_repository.return_value = {"chunks": sample_code_chunks}
+        repo_path = tmp_path / "test_repo"
+        repo_path.mkdir()
+
+        pipeline = AgenticRAGPipeline(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_path=str(repo_path),
+            repo_indexer=mock_indexer,
+            vector_store_backend="numpy",
+        )
+        result = pipeline.index_repository(str(repo_path))
+
+        assert result["documents_added"] == 3
+        assert (tmp_path / "numpy" / "test-collection").is_dir()
+        mock_get_client.return_value.get_collection.return_value.add.assert_not_called()
+
+        tool = next(
+            t for t in pipeline.tools if t.name == "similarity_search_with_score"
+        )
+        output = tool.func("goodbye", k=1)
+        assert "test2.py" in output
+        assert "test1.py" not in output
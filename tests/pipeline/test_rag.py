@@ -13,7 +13,7 @@ from langchain_core.documents import Document
 def mock_pipeline_dependencies():
     """Auto-mock dependencies for all tests in this module."""
     with patch("repoqa.pipeline.rag.SentenceTransformerEmbedding"), patch(
-        "repoqa.pipeline.rag.HuggingFaceEmbeddings"
+        "repoqa.pipeline.rag.LangChainEmbeddings"
     ), patch("repoqa.pipeline.rag.Chroma"):
         yield
 
@@ -47,8 +47,42 @@ class TestRAGPipeline:
         assert pipeline.collection_name == "test-collection"
         assert pipeline.temperature == 0.5
 
+    @patch("repoqa.pipeline.rag.get_shared_dispatcher")
+    @patch("repoqa.pipeline.rag.SentenceTransformerEmbedding")
+    def test_embedding_dispatcher(
+        self, mock_embedding, mock_get_dispatcher, mock_llm, tmp_path
+    ):
+        """Test that queries can be encoded through the shared dispatcher."""
+        from repoqa.pipeline.rag import RAGPipeline
+
+        kwargs = dict(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=Mock(),
+        )
+
+        pipeline = RAGPipeline(**kwargs)
+        assert pipeline.embedding_model_obj.embedding_model is mock_embedding()
+        mock_get_dispatcher.assert_not_called()
+
+        pipeline = RAGPipeline(
+            embedding_dispatcher=True,
+            dispatcher_max_batch_size=16,
+            dispatcher_max_wait_ms=2,
+            **kwargs,
+        )
+        mock_get_dispatcher.assert_called_once_with(mock_embedding(), 16, 2)
+        assert (
+            pipeline.embedding_model_obj.embedding_model
+            is mock_get_dispatcher.return_value
+        )
+
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_safe_retriever(
         self,
         mock_embeddings,
@@ -103,7 +137,7 @@ class TestRAGPipeline:
         assert "test.py" in pipeline.source_files
 
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_format_docs(
         self,
         mock_embeddings,
@@ -146,7 +180,81 @@ class TestRAGPipeline:
         assert "```" in formatted  # Check for code fencing
 
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    def test_safe_retriever_reranks(self, mock_chroma, mock_llm, tmp_path):
+        """Test that candidates are re-ranked and the best are kept."""
+        from repoqa.pipeline.rag import RAGPipeline
+
+        docs = [
+            Document(page_content=f"chunk {i}", metadata={"file_path": f"{i}.py"})
+            for i in range(4)
+        ]
+        vectorstore = mock_chroma.return_value
+        vectorstore.similarity_search.return_value = docs
+
+        pipeline = RAGPipeline(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=Mock(),
+            retrieval_k=2,
+            rerank_model="test-cross-encoder",
+            rerank_candidates=4,
+        )
+        pipeline.reranker = Mock()
+        pipeline.reranker.rerank.side_effect = lambda query, found: found[::-1]
+
+        result = pipeline._safe_retriever("test query")
+
+        vectorstore.similarity_search.assert_called_once_with("test query", k=4)
+        assert result == [docs[3], docs[2]]
+        assert pipeline.source_files == ["3.py", "2.py"]
+
+        # Failed re-ranking keeps the retrieval order
+        pipeline.reranker.rerank.side_effect = RuntimeError("model not found")
+        assert pipeline._safe_retriever("test query") == docs[:2]
+
+    def test_format_docs_packs_into_budget(self, mock_llm, tmp_path):
+        """Test that a token budget drops duplicates and trims documents."""
+        from repoqa.pipeline.rag import RAGPipeline
+
+        pipeline = RAGPipeline(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=Mock(),
+            context_max_tokens=120,
+        )
+        long_body = "\n".join(f"    total_{i} = {i}" for i in range(100))
+        hello = "def hello():\n    pass"
+        docs = [
+            Document(page_content=hello, metadata={"file_path": "a.py"}),
+            Document(page_content=hello, metadata={"file_path": "a.py"}),
+            Document(
+                page_content=f"def compute():\n{long_body}\n    return total_50",
+                metadata={"file_path": "b.py"},
+            ),
+        ]
+
+        formatted = pipeline._format_docs(docs, "what is total_50?")
+
+        assert formatted.count("def hello()") == 1
+        assert "File 2: b.py" in formatted
+        assert "total_50 = 50" in formatted
+        assert "total_0 = 0" not in formatted
+        assert "..." in formatted
+
+        # Without a budget every document is included in full
+        pipeline.context_packer = None
+        assert pipeline._format_docs(docs).count("def hello()") == 2
+
+    @patch("repoqa.pipeline.rag.Chroma")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_format_docs_empty(
         self,
         mock_embeddings,
@@ -182,7 +290,7 @@ class TestRAGPipeline:
         assert "No valid documents found" in formatted
 
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_clean_response(
         self,
         mock_embeddings,
@@ -217,7 +325,7 @@ class TestRAGPipeline:
         assert cleaned == "Simple answer"
 
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_ask(
         self,
         mock_embeddings,
@@ -260,7 +368,7 @@ class TestRAGPipeline:
         assert "utils.py" in answer
 
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_ask_error_handling(
         self,
         mock_embeddings,
@@ -295,12 +403,14 @@ class TestRAGPipeline:
         assert isinstance(answer, str)
         assert len(answer) > 0
 
+    @patch("repoqa.pipeline.rag.get_chroma_client")
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_index_repository(
         self,
         mock_embeddings,
         mock_chroma,
+        mock_get_client,
         mock_llm,
         sample_code_chunks,
         tmp_path,
@@ -335,10 +445,580 @@ class TestRAGPipeline:
         assert result["status"] == "success"
         assert result["documents_added"] == 3
         assert result["chunks_processed"] == 3
-        mock_vectorstore.add_documents.assert_called_once()
+        assert "projection" not in result
+
+        mock_client = mock_get_client.return_value
+        mock_client.get_collection.assert_called_with(name="test-collection")
+        collection = mock_client.get_collection.return_value
+        add_kwargs = collection.add.call_args[1]
+        assert len(add_kwargs["ids"]) == 3
+        assert len(add_kwargs["documents"]) == 3
+        assert add_kwargs["metadatas"][0] == {
+            "file_path": sample_code_chunks[0].file_path
+        }
+        # The indexer used a different model, so documents are re-embedded
+        mock_embeddings.return_value.embed_documents.assert_called_once()
+
+        # Marked incomplete before the writes and complete after them
+        started, finished = [c[1]["metadata"] for c in collection.modify.call_args_list]
+        assert started["repoqa_complete"] is False
+        assert finished["repoqa_complete"] is True
+        assert finished["repoqa_document_count"] == 3
+        assert finished["repoqa_chunk_size"] == mock_indexer.chunk_size
+
+    @patch("repoqa.pipeline.rag.get_chroma_client")
+    @patch("repoqa.pipeline.rag.Chroma")
+    def test_index_repository_saves_lexical_index(
+        self, mock_chroma, mock_get_client, mock_llm, sample_code_chunks, tmp_path
+    ):
+        """Test that the BM25 index is saved and used for hybrid retrieval."""
+        from repoqa.indexing.lexical import BM25Index, get_lexical_directory
+        from repoqa.pipeline.rag import RAGPipeline
+
+        mock_indexer = Mock()
+        mock_indexer.index_repository.return_value = {
+            "chunks": sample_code_chunks,
+            "embeddings": [[0.1] * 384] * len(sample_code_chunks),
+            "lexical_index": BM25Index.build(
+                [
+                    {"content": chunk.content.strip(), "file_path": chunk.file_path}
+                    for chunk in sample_code_chunks
+                ]
+            ),
+            "repo_path": str(tmp_path / "repo"),
+        }
+        kwargs = dict(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=mock_indexer,
+        )
+
+        RAGPipeline(**kwargs).index_repository("test-repo")
+        assert BM25Index.exists(get_lexical_directory(str(tmp_path), "test-collection"))
+
+        # A reopened hybrid pipeline fuses BM25 and vector rankings
+        mock_chroma.return_value.similarity_search.return_value = [
+            Document(
+                page_content="import os\nimport sys",
+                metadata={"file_path": "test3.py"},
+            ),
+            Document(
+                page_content="def hello():\n    print('Hello')\n",
+                metadata={"file_path": "test1.py"},
+            ),
+        ]
+        pipeline = RAGPipeline(retrieval_mode="hybrid", **kwargs)
+        assert pipeline.lexical_index is not None
+
+        docs = pipeline._retrieve_documents("where is hello defined?", k=2)
+        assert [doc.metadata["file_path"] for doc in docs] == ["test1.py", "test3.py"]
+
+        pipeline = RAGPipeline(retrieval_mode="lexical", **kwargs)
+        docs = pipeline._retrieve_documents("goodbye", k=2)
+        assert [doc.metadata["file_path"] for doc in docs] == ["test2.py"]
+        assert docs[0].page_content == "def goodbye():\n    print('Goodbye')"
+
+    @patch("repoqa.pipeline.rag.get_chroma_client")
+    @patch("repoqa.pipeline.rag.Chroma")
+    def test_near_duplicates_suppressed(
+        self, mock_chroma, mock_get_client, mock_llm, tmp_path
+    ):
+        """Test that SimHashes are stored and near duplicates skipped."""
+        from repoqa.indexing.git_indexer import CodeChunk
+        from repoqa.pipeline.rag import RAGPipeline
+
+        mock_indexer = Mock()
+        mock_indexer.index_repository.return_value = {
+            "chunks": [CodeChunk("x = 1", "a.py", simhash="00000000000000ff")],
+            "repo_path": str(tmp_path / "repo"),
+        }
+        kwargs = dict(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=mock_indexer,
+        )
+        pipeline = RAGPipeline(duplicate_bits=6, **kwargs)
+        pipeline.index_repository("test-repo")
+
+        collection = mock_get_client.return_value.get_collection.return_value
+        assert collection.add.call_args.kwargs["metadatas"] == [
+            {"file_path": "a.py", "simhash": "00000000000000ff"}
+        ]
+
+        original = Document(
+            page_content="x = 1",
+            metadata={"file_path": "a.py", "simhash": "00000000000000ff"},
+        )
+        vendored = Document(
+            page_content="x = 1",
+            metadata={"file_path": "vendor/a.py", "simhash": "00000000000000fe"},
+        )
+        other = Document(
+            page_content="y = 2",
+            metadata={"file_path": "b.py", "simhash": "ffffffffffff0000"},
+        )
+        vectorstore = mock_chroma.return_value
+        vectorstore.similarity_search.return_value = [original, vendored, other]
+
+        docs = pipeline._retrieve_documents("what is x?", k=2)
+
+        # Extra candidates replace the dropped near duplicates
+        vectorstore.similarity_search.assert_called_once_with("what is x?", k=4)
+        assert docs == [original, other]
+
+        with pytest.raises(ValueError, match="mmr_lambda"):
+            RAGPipeline(mmr_lambda=1.5, **kwargs)
+
+    @patch("repoqa.pipeline.rag.get_chroma_client")
+    @patch("repoqa.pipeline.rag.Chroma")
+    def test_metadata_filter_scopes_retrieval(
+        self, mock_chroma, mock_get_client, mock_llm, tmp_path
+    ):
+        """Test that scope metadata is stored and every search is filtered."""
+        from repoqa.indexing.git_indexer import CodeChunk
+        from repoqa.indexing.lexical import BM25Index
+        from repoqa.indexing.scope import file_metadata, scope_filter
+        from repoqa.pipeline.rag import RAGPipeline
+
+        chunks = [
+            CodeChunk(f"def {name}(): ...", path, **file_metadata(path))
+            for name, path in [
+                ("charge", "billing/charge.py"),
+                ("test_charge", "billing/test_charge.py"),
+                ("charge_card", "web/charge.js"),
+            ]
+        ]
+        mock_indexer = Mock()
+        mock_indexer.index_repository.return_value = {
+            "chunks": chunks,
+            "lexical_index": BM25Index.build(
+                [
+                    {
+                        "content": c.content,
+                        "file_path": c.file_path,
+                        **file_metadata(c.file_path),
+                    }
+                    for c in chunks
+                ]
+            ),
+            "repo_path": str(tmp_path / "repo"),
+        }
+        kwargs = dict(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=mock_indexer,
+        )
+        RAGPipeline(**kwargs).index_repository("test-repo")
+
+        collection = mock_get_client.return_value.get_collection.return_value
+        assert collection.add.call_args.kwargs["metadatas"][1] == {
+            "file_path": "billing/test_charge.py",
+            "language": "python",
+            "directory": "billing",
+            "extension": ".py",
+            "is_test": True,
+        }
+
+        where = scope_filter(directories=["billing"], tests=False)
+        vectorstore = mock_chroma.return_value
+        vectorstore.similarity_search.return_value = []
+        pipeline = RAGPipeline(retrieval_mode="hybrid", metadata_filter=where, **kwargs)
+
+        docs = pipeline._retrieve_documents("charge", k=3)
+
+        vectorstore.similarity_search.assert_called_once_with(
+            "charge", k=3, filter=where
+        )
+        assert [doc.metadata["file_path"] for doc in docs] == ["billing/charge.py"]
+
+    @patch("repoqa.pipeline.rag.Chroma")
+    def test_neighbor_chunks_merged(self, mock_chroma, mock_llm, tmp_path):
+        """Test that retrieved chunks are merged with their neighbours."""
+        from repoqa.pipeline.rag import RAGPipeline
+
+        def chunk(file_path, index):
+            return Document(
+                page_content=f"{file_path} chunk {index}",
+                metadata={
+                    "file_path": file_path,
+                    "chunk_index": index,
+                    "start_line": 10 * index + 1,
+                    "end_line": 10 * index + 10,
+                },
+            )
+
+        stored = [chunk("a.py", i) for i in range(5)] + [chunk("b.py", 0)]
+        unpositioned = Document(page_content="x = 1", metadata={"file_path": "c.py"})
+
+        def get(where):
+            file_path = where["$and"][0]["file_path"]
+            indexes = where["$and"][1]["chunk_index"]["$in"]
+            found = [
+                doc
+                for doc in stored
+                if doc.metadata["file_path"] == file_path
+                and doc.metadata["chunk_index"] in indexes
+            ]
+            return {
+                "documents": [doc.page_content for doc in found],
+                "metadatas": [doc.metadata for doc in found],
+            }
+
+        vectorstore = mock_chroma.return_value
+        vectorstore.get.side_effect = get
+        vectorstore.similarity_search.return_value = [
+            stored[2],
+            unpositioned,
+            stored[3],
+            stored[5],
+        ]
+
+        pipeline = RAGPipeline(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=Mock(),
+            neighbor_chunks=1,
+        )
+        docs = pipeline._retrieve_documents("query", k=4)
+
+        # Chunk 3 of a.py was merged into the first result
+        assert [doc.page_content for doc in docs] == [
+            "a.py chunk 1\na.py chunk 2\na.py chunk 3",
+            "x = 1",
+            "b.py chunk 0",
+        ]
+        assert docs[0].metadata["start_line"] == 11
+        assert docs[0].metadata["end_line"] == 40
+        assert docs[0].metadata["chunk_index"] == 2
+        assert vectorstore.get.call_count == 2
+
+        # A failed lookup keeps the retrieved chunks
+        vectorstore.get.side_effect = RuntimeError("unsupported filter")
+        assert len(pipeline._retrieve_documents("query", k=4)) == 4
+
+    @patch("repoqa.pipeline.rag.get_chroma_client")
+    def test_faiss_backend_indexes_and_searches(
+        self, mock_get_client, mock_llm, tmp_path
+    ):
+        """Test that a FAISS backend holds the documents instead of Chroma."""
+        from repoqa.indexing.git_indexer import CodeChunk
+        from repoqa.pipeline.rag import RAGPipeline
+
+        chunks = [
+            CodeChunk(
+                content=f"def f{i}(): return {i}",
+                file_path="a.py",
+                chunk_index=i,
+                start_line=i + 1,
+                end_line=i + 1,
+            )
+            for i in range(3)
+        ] + [CodeChunk(content="import os", file_path="b.py", chunk_index=0)]
+        mock_indexer = Mock()
+        mock_indexer.index_repository.return_value = {"chunks": chunks}
+
+        def embed(text):
+            return [float(text.count(str(i))) + 0.1 for i in range(4)]
+
+        with patch("repoqa.pipeline.rag.LangChainEmbeddings") as mock_embeddings:
+            embeddings = mock_embeddings.return_value
+            embeddings.embed_documents.side_effect = lambda texts: [
+                embed(text) for text in texts
+            ]
+            embeddings.embed_query.side_effect = embed
+            pipeline = RAGPipeline(
+                llm_model=mock_llm,
+                embedding_model="test-model",
+                persist_directory=str(tmp_path),
+                collection_name="test-collection",
+                ollama_base_url="http://localhost:11434",
+                temperature=0.5,
+                repo_indexer=mock_indexer,
+                vector_store_backend="faiss",
+                vector_store_options={"mmap": False},
+                neighbor_chunks=1,
+            )
+            pipeline.index_repository("test-repo")
+
+            docs = pipeline._retrieve_documents("f1 1", k=1)
+            scored = pipeline.vectorstore.similarity_search_with_score(
+                "import", k=1, filter={"file_path": "b.py"}
+            )
+
+        assert [doc.page_content for doc in docs] == [
+            "def f0(): return 0\ndef f1(): return 1\ndef f2(): return 2"
+        ]
+        assert (docs[0].metadata["start_line"], docs[0].metadata["end_line"]) == (1, 3)
+        assert scored[0][0].page_content == "import os"
+        assert isinstance(scored[0][1], float)
+        assert (tmp_path / "faiss" / "test-collection").is_dir()
+
+        # The Chroma collection only holds the manifest
+        collection = mock_get_client.return_value.get_collection.return_value
+        collection.add.assert_not_called()
+        metadata = collection.modify.call_args.kwargs["metadata"]
+        assert metadata["repoqa_vector_store"] == "faiss"
+
+        with pytest.raises(ValueError, match="Unsupported vector store backend"):
+            RAGPipeline(
+                llm_model=mock_llm,
+                embedding_model="test-model",
+                persist_directory=str(tmp_path),
+                collection_name="test-collection",
+                ollama_base_url="http://localhost:11434",
+                temperature=0.5,
+                repo_indexer=mock_indexer,
+                vector_store_backend="pinecone",
+            )
+
+    @patch("repoqa.pipeline.rag.get_chroma_client")
+    def test_index_repository_saves_trigram_index(
+        self, mock_get_client, mock_llm, sample_code_chunks, tmp_path
+    ):
+        """Test that the trigram index is saved and reloaded for grep_code."""
+        from repoqa.indexing.trigram import TrigramIndex
+        from repoqa.pipeline.rag import RAGPipeline
+
+        mock_indexer = Mock()
+        mock_indexer.index_repository.return_value = {
+            "chunks": sample_code_chunks,
+            "embeddings": [[0.1] * 384] * len(sample_code_chunks),
+            "trigram_index": TrigramIndex.build(
+                [(chunk.file_path, chunk.content) for chunk in sample_code_chunks]
+            ),
+            "repo_path": str(tmp_path / "repo"),
+        }
+        kwargs = dict(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=mock_indexer,
+        )
+
+        pipeline = RAGPipeline(**kwargs)
+        with pytest.raises(ValueError, match="No trigram index"):
+            pipeline.grep_code("hello")
+        pipeline.index_repository("test-repo")
+
+        # Loaded in every retrieval mode
+        pipeline = RAGPipeline(**kwargs)
+        assert pipeline.grep_code(r"print\('\w+'\)", max_results=1) == [
+            {"file_path": "test1.py", "line": 2, "text": "    print('Hello')"}
+        ]
+
+    @patch("repoqa.pipeline.rag.get_chroma_client")
+    @patch("repoqa.pipeline.rag.Chroma")
+    def test_symbol_table_boosts_definitions(
+        self, mock_chroma, mock_get_client, mock_llm, sample_code_chunks, tmp_path
+    ):
+        """Test that the chunk defining a named identifier is ranked first."""
+        from repoqa.indexing.symbols import SymbolTable
+        from repoqa.pipeline.rag import RAGPipeline
+
+        mock_indexer = Mock()
+        mock_indexer.index_repository.return_value = {
+            "chunks": sample_code_chunks,
+            "embeddings": [[0.1] * 384] * len(sample_code_chunks),
+            "symbol_table": SymbolTable.build(
+                [(chunk.file_path, chunk.content) for chunk in sample_code_chunks]
+            ),
+            "repo_path": str(tmp_path / "repo"),
+        }
+        kwargs = dict(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=mock_indexer,
+        )
+        RAGPipeline(**kwargs).index_repository("test-repo")
+
+        vectorstore = mock_chroma.return_value
+        unrelated = Document(page_content="import os", metadata={"file_path": "a.py"})
+        definition = Document(
+            page_content="def goodbye():", metadata={"file_path": "test2.py"}
+        )
+
+        def similarity_search(query, k, filter=None):
+            return [definition] if filter else [unrelated]
+
+        vectorstore.similarity_search.side_effect = similarity_search
+
+        pipeline = RAGPipeline(**kwargs)
+        assert pipeline.find_definitions("goodbye")[0]["file_path"] == "test2.py"
+        assert pipeline.find_references("hello") == []
+
+        docs = pipeline._retrieve_documents("what does goodbye() print?", k=2)
+        assert docs == [definition, unrelated]
+        vectorstore.similarity_search.assert_any_call(
+            "def goodbye():", k=1, filter={"file_path": "test2.py"}
+        )
+
+        # Plain words are not treated as identifiers
+        assert pipeline._retrieve_documents("what does goodbye print?", k=2) == [
+            unrelated
+        ]
+
+        pipeline = RAGPipeline(symbol_boost=False, **kwargs)
+        assert pipeline._retrieve_documents("goodbye()", k=2) == [unrelated]
+
+        pipeline.symbol_table = None
+        with pytest.raises(ValueError, match="No symbol table"):
+            pipeline.find_definitions("goodbye")
+
+    def test_invalid_retrieval_mode(self, mock_llm, tmp_path):
+        """Test that an unknown retrieval mode is rejected."""
+        from repoqa.pipeline.rag import RAGPipeline
+
+        with pytest.raises(ValueError, match="Unsupported retrieval mode"):
+            RAGPipeline(
+                llm_model=mock_llm,
+                embedding_model="test-model",
+                persist_directory=str(tmp_path),
+                collection_name="test-collection",
+                ollama_base_url="http://localhost:11434",
+                temperature=0.5,
+                repo_indexer=Mock(),
+                retrieval_mode="fuzzy",
+            )
+
+    @patch("repoqa.pipeline.rag.get_chroma_client")
+    def test_index_repository_batches_writes(
+        self, mock_get_client, mock_llm, tmp_path
+    ):
+        """Test that writes follow the client's max batch size."""
+        from repoqa.indexing.git_indexer import CodeChunk
+        from repoqa.pipeline.rag import RAGPipeline
+
+        mock_client = mock_get_client.return_value
+        mock_client.get_max_batch_size.return_value = 2
+        mock_collection = mock_client.get_collection.return_value
+
+        chunks = [CodeChunk(content=f"chunk {i}", file_path="a.py") for i in range(5)]
+        mock_indexer = Mock()
+        mock_indexer.index_repository.return_value = {
+            "chunks": chunks,
+            "embeddings": [[float(i)] * 3 for i in range(5)],
+            "repo_path": str(tmp_path / "repo"),
+        }
+
+        pipeline = RAGPipeline(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=mock_indexer,
+            write_batch_size=10,
+        )
+        # Same model as the pipeline, so the indexer's vectors are reused
+        mock_indexer.embedding_model.model_name = (
+            pipeline.embedding_model_obj.model_name
+        )
+
+        result = pipeline.index_repository("test-repo")
+
+        assert result["documents_added"] == 5
+        calls = mock_collection.add.call_args_list
+        assert [len(c[1]["ids"]) for c in calls] == [2, 2, 1]
+        assert [c[1]["documents"] for c in calls][2] == ["chunk 4"]
+        assert calls[1][1]["embeddings"] == [[2.0] * 3, [3.0] * 3]
+        pipeline.embeddings.embed_documents.assert_not_called()
+
+    @patch("repoqa.pipeline.rag.get_chroma_client")
+    @patch("repoqa.pipeline.rag.Chroma")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
+    def test_index_repository_fits_projection(
+        self,
+        mock_embeddings,
+        mock_chroma,
+        mock_get_client,
+        mock_llm,
+        tmp_path,
+    ):
+        """Test that indexing fits, saves and installs a projection."""
+        import numpy as np
+
+        from repoqa.indexing.git_indexer import CodeChunk
+        from repoqa.pipeline.rag import RAGPipeline
+        from repoqa.storage.collection_manager import get_projection_path
+
+        rng = np.random.default_rng(0)
+        chunks = [CodeChunk(content=f"chunk {i}", file_path="a.py") for i in range(20)]
+        mock_indexer = Mock()
+        mock_indexer.index_repository.return_value = {
+            "chunks": chunks,
+            "embeddings": rng.normal(size=(20, 12)).tolist(),
+            "repo_path": str(tmp_path / "repo"),
+        }
+
+        pipeline = RAGPipeline(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=mock_indexer,
+            projection_method="pca",
+            projection_dim=4,
+        )
+        assert pipeline.embedding_model_obj.projection is None
+        mock_indexer.embedding_model.model_name = (
+            pipeline.embedding_model_obj.model_name
+        )
+
+        result = pipeline.index_repository("test-repo")
+
+        assert result["projection"]["output_dim"] == 4
+        # Stored vectors are the indexer's embeddings after projection
+        mock_collection = mock_get_client.return_value.get_collection
+        stored = mock_collection.return_value.add.call_args[1]["embeddings"]
+        assert len(stored) == 20
+        assert len(stored[0]) == 4
+        assert 0.0 <= result["projection"]["recall_at_10"] <= 1.0
+        assert pipeline.embedding_model_obj.projection.output_dim == 4
+
+        # A new pipeline for the same collection picks up the stored projection
+        assert (tmp_path / "projections").exists()
+        assert get_projection_path(str(tmp_path), "test-collection").endswith(".npz")
+        reopened = RAGPipeline(
+            llm_model=mock_llm,
+            embedding_model="test-model",
+            persist_directory=str(tmp_path),
+            collection_name="test-collection",
+            ollama_base_url="http://localhost:11434",
+            temperature=0.5,
+            repo_indexer=mock_indexer,
+            projection_method="pca",
+            projection_dim=4,
+        )
+        assert reopened.embedding_model_obj.projection.output_dim == 4
 
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_safe_retriever_error_handling(
         self,
         mock_embeddings,
@@ -371,7 +1051,7 @@ class TestRAGPipeline:
         assert docs == []
 
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_retrieve_and_format(
         self,
         mock_embeddings,
@@ -410,7 +1090,7 @@ class TestRAGPipeline:
         assert "```" in result
 
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_format_docs_with_integer_type(
         self,
         mock_embeddings,
@@ -443,7 +1123,7 @@ class TestRAGPipeline:
         assert "No valid documents found" in formatted
 
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_ask_with_empty_response(
         self,
         mock_embeddings,
@@ -484,7 +1164,7 @@ class TestRAGPipeline:
         assert "couldn't generate" in answer
 
     @patch("repoqa.pipeline.rag.Chroma")
-    @patch("repoqa.pipeline.rag.HuggingFaceEmbeddings")
+    @patch("repoqa.pipeline.rag.LangChainEmbeddings")
     def test_clean_response_multiline_think_tags(
         self,
         mock_embeddings,
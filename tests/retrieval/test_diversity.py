@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for near-duplicate suppression and MMR."""
+
+from langchain_core.documents import Document
+
+from repoqa.indexing.simhash import simhash, to_hex
+from repoqa.retrieval.diversity import diversify, fingerprint, similarity
+
+
+def doc(content, file_path="a.py", fingerprint=None):
+    metadata = {"file_path": file_path}
+    if fingerprint is not None:
+        metadata["simhash"] = to_hex(fingerprint)
+    return Document(page_content=content, metadata=metadata)
+
+
+LOADER = "".join(
+    f"def load_{i}(path):\n    with open(path) as f:\n        return parse_{i}(f)\n"
+    for i in range(10)
+)
+VENDORED = LOADER.replace("load_3(path)", "load_3(filename)")
+OTHER = "".join(
+    f"class Cache{i}:\n    def get(self, key):\n        pass\n" for i in range(10)
+)
+
+
+def test_fingerprint_prefers_metadata():
+    """Test that stored fingerprints are used without rehashing."""
+    assert fingerprint(doc("x", fingerprint=42)) == 42
+    assert fingerprint(doc(LOADER)) == simhash(LOADER)
+
+
+def test_similarity():
+    """Test that identical fingerprints score 1 and unrelated ones 0."""
+    assert similarity(7, 7) == 1.0
+    assert similarity(0, 2**32 - 1) == 0.0
+    assert similarity(0, 2**64 - 1) == 0.0
+
+
+def test_near_duplicates_dropped():
+    """Test that a near copy of a better document is skipped."""
+    docs = [doc(LOADER), doc(VENDORED, "vendor/a.py"), doc(OTHER)]
+
+    assert diversify(docs, 3) == [docs[0], docs[2]]
+    assert diversify(docs, 1) == [docs[0]]
+    assert diversify(docs, 3, duplicate_bits=-1) == docs
+
+
+def test_mmr_favours_diverse_documents():
+    """Test that a lower lambda picks a dissimilar document earlier."""
+    first, second, third = 0, 0b111111, 2**64 - 1
+    docs = [doc("a", fingerprint=first), doc("b", fingerprint=second)]
+    docs.append(doc("c", fingerprint=third))
+
+    assert diversify(docs, 2, duplicate_bits=-1) == docs[:2]
+    assert diversify(docs, 2, duplicate_bits=-1, mmr_lambda=0.5) == [
+        docs[0],
+        docs[2],
+    ]
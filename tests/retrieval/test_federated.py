@@ -0,0 +1,173 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for federated search across collections."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from repoqa.embedding.projection import EmbeddingProjection
+from repoqa.retrieval.federated import (
+    FederatedRetriever,
+    get_search_executor,
+    shutdown_search_executors,
+)
+from repoqa.storage.vector_store import VectorStore
+
+
+class StaticStore(VectorStore):
+    """Store returning fixed results, optionally after a delay."""
+
+    def __init__(self, scores, delay=0.0, error=None):
+        self.scores = scores
+        self.delay = delay
+        self.error = error
+        self.queries = []
+
+    def add(self, embeddings, metadata):
+        raise NotImplementedError
+
+    def search(self, query_embedding, top_k=5, metadata_filter=None):
+        self.queries.append((list(query_embedding), metadata_filter))
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [
+            {"content": f"chunk {score}", "score": score}
+            for score in sorted(self.scores)[:top_k]
+        ]
+
+
+@pytest.fixture
+def executor():
+    """Private pool so tests do not share workers."""
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+class TestFederatedRetriever:
+    """Test suite for FederatedRetriever."""
+
+    def test_merges_top_k_by_score(self, executor):
+        """Test that results from all shards are merged best first."""
+        retriever = FederatedRetriever(
+            {
+                "a": StaticStore([0.1, 0.5, 0.9]),
+                "b": StaticStore([0.2, 0.3]),
+                "c": StaticStore([]),
+            },
+            executor=executor,
+        )
+
+        results = retriever.retrieve([1.0, 0.0], k=3)
+
+        assert [(r["collection"], r["score"]) for r in results] == [
+            ("a", 0.1),
+            ("b", 0.2),
+            ("b", 0.3),
+        ]
+
+    def test_passes_query_and_filter_to_every_shard(self, executor):
+        """Test that each shard gets the same query, k and filter."""
+        shards = {"a": StaticStore([0.1]), "b": StaticStore([0.2])}
+        retriever = FederatedRetriever(shards, executor=executor)
+
+        retriever.search([1.0, 0.0], k=2, metadata_filter={"language": "python"})
+
+        for store in shards.values():
+            assert store.queries == [([1.0, 0.0], {"language": "python"})]
+
+    def test_applies_shard_projection(self, executor):
+        """Test that projected collections get a projected query."""
+        shards = {"plain": StaticStore([0.1]), "projected": StaticStore([0.2])}
+        projection = EmbeddingProjection("truncate", np.eye(2, 3))
+        retriever = FederatedRetriever(
+            shards, projections={"projected": projection}, executor=executor
+        )
+
+        retriever.search([3.0, 4.0, 5.0], k=1)
+
+        assert shards["plain"].queries[0][0] == [3.0, 4.0, 5.0]
+        assert shards["projected"].queries[0][0] == pytest.approx([0.6, 0.8])
+
+    def test_failed_shard_is_skipped(self, executor):
+        """Test that one failing collection does not fail the search."""
+        retriever = FederatedRetriever(
+            {"ok": StaticStore([0.4]), "broken": StaticStore([], error=OSError("io"))},
+            executor=executor,
+        )
+
+        found = retriever.search([1.0], k=5)
+
+        assert [r["collection"] for r in found["results"]] == ["ok"]
+        assert found["failed"] == {"broken": "io"}
+
+    def test_slow_shard_times_out(self, executor):
+        """Test that shards slower than the timeout are dropped."""
+        retriever = FederatedRetriever(
+            {"fast": StaticStore([0.4]), "slow": StaticStore([0.1], delay=0.5)},
+            timeout_s=0.1,
+            executor=executor,
+        )
+
+        found = retriever.search([1.0], k=5)
+
+        assert [r["collection"] for r in found["results"]] == ["fast"]
+        assert found["failed"] == {"slow": "timeout"}
+
+    def test_latency_follows_slowest_shard(self, executor):
+        """Test that shards are searched concurrently."""
+        retriever = FederatedRetriever(
+            {name: StaticStore([0.1], delay=0.2) for name in "abcd"},
+            executor=executor,
+        )
+
+        start = time.perf_counter()
+        results = retriever.retrieve([1.0], k=10)
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 4
+        assert elapsed < 0.6
+
+    def test_pool_bounds_concurrency(self):
+        """Test that no more shards run at once than the pool size."""
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        class CountingStore(StaticStore):
+            def search(self, query_embedding, top_k=5, metadata_filter=None):
+                with lock:
+                    running[0] += 1
+                    peak[0] = max(peak[0], running[0])
+                time.sleep(0.02)
+                with lock:
+                    running[0] -= 1
+                return []
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            retriever = FederatedRetriever(
+                {str(i): CountingStore([]) for i in range(8)}, executor=pool
+            )
+            retriever.search([1.0])
+
+        assert peak[0] <= 2
+
+
+class TestSearchExecutor:
+    """Test suite for the shared search pools."""
+
+    def test_shared_per_size(self):
+        """Test that pools are shared by size and can be shut down."""
+        try:
+            assert get_search_executor(3) is get_search_executor(3)
+            assert get_search_executor(3) is not get_search_executor(5)
+        finally:
+            shutdown_search_executors()
+
+        assert get_search_executor(3)._max_workers == 3
+        shutdown_search_executors()
@@ -0,0 +1,125 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for token-budgeted context packing."""
+
+from unittest.mock import Mock, patch
+
+from repoqa.retrieval.packing import (
+    ELISION,
+    HEADER_TOKENS,
+    ContextPacker,
+    estimate_tokens,
+    get_token_counter,
+)
+
+
+def count_lines(text: str) -> int:
+    """Count one token per line, to make budgets easy to reason about."""
+    return len(text.splitlines()) if text.strip() else 0
+
+
+def numbered(count: int, prefix: str = "line") -> str:
+    return "\n".join(f"{prefix} {i}" for i in range(count))
+
+
+class TestTokenCounting:
+    """Test suite for token counting."""
+
+    def test_estimate_tokens(self):
+        """Test that long words split into pieces and symbols count alone."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("def f(x):") == 6
+        assert estimate_tokens("get_collection_name") == 5
+        assert estimate_tokens("a\nb") == 3
+
+    def test_get_token_counter(self):
+        """Test tokenizer loading and the fallback to the estimator."""
+        assert get_token_counter(None) is estimate_tokens
+
+        # An explicit mock keeps patch from importing transformers
+        mock_tokenizer = Mock()
+        with patch("repoqa.retrieval.packing.AutoTokenizer", mock_tokenizer):
+            mock_tokenizer.from_pretrained.return_value.encode.return_value = [1, 2]
+            assert get_token_counter("some/tokenizer")("anything") == 2
+
+            mock_tokenizer.from_pretrained.side_effect = OSError("offline")
+            assert get_token_counter("some/tokenizer") is estimate_tokens
+
+
+class TestContextPacker:
+    """Test suite for ContextPacker."""
+
+    def test_everything_fits(self):
+        """Test that chunks within the budget are kept whole and in order."""
+        packer = ContextPacker(1000, count_tokens=count_lines)
+
+        packed = packer.pack([("a.py", numbered(3)), ("b.py", numbered(2, "b"))])
+
+        assert [(c.file_path, c.tokens, c.trimmed) for c in packed] == [
+            ("a.py", 3, False),
+            ("b.py", 2, False),
+        ]
+
+    def test_drops_overlapping_chunks(self):
+        """Test that chunks mostly included already from a file are dropped."""
+        packer = ContextPacker(1000, count_tokens=count_lines)
+        first = numbered(10)
+        overlapping = numbered(9) + "\nnew line"
+
+        packed = packer.pack(
+            [("a.py", first), ("a.py", overlapping), ("b.py", overlapping)]
+        )
+
+        assert [c.file_path for c in packed] == ["a.py", "b.py"]
+
+    def test_trims_around_relevant_lines(self):
+        """Test that an oversized chunk keeps the lines matching the query."""
+        lines = [f"filler {i}" for i in range(40)]
+        lines[30] = "def load_config(path):"
+        lines[31] = "    return parse(path)"
+        budget = HEADER_TOKENS + 1 + 6
+        packer = ContextPacker(budget, count_tokens=count_lines, min_chunk_tokens=1)
+
+        (chunk,) = packer.pack([("a.py", "\n".join(lines))], "where is load_config?")
+
+        kept = chunk.content.splitlines()
+        assert chunk.trimmed
+        assert kept[0] == kept[-1] == ELISION
+        assert "def load_config(path):" in kept
+        assert kept.index("def load_config(path):") < kept.index(
+            "    return parse(path)"
+        )
+        assert chunk.tokens <= budget - HEADER_TOKENS - 1
+
+    def test_fills_remaining_budget(self):
+        """Test that smaller chunks after a skipped one still fit."""
+        packer = ContextPacker(50, count_tokens=count_lines, min_chunk_tokens=10)
+
+        packed = packer.pack(
+            [
+                ("first.py", numbered(25)),
+                ("huge.py", numbered(100)),
+                ("small.py", "x = 1"),
+            ]
+        )
+
+        # 16 tokens remain after first.py, too few for a useful huge.py
+        assert [c.file_path for c in packed] == ["first.py", "small.py"]
+        assert sum(c.tokens + HEADER_TOKENS + 1 for c in packed) <= 50
+
+    def test_trimmed_chunk_takes_remaining_budget(self):
+        """Test that an oversized chunk is trimmed to the remaining budget."""
+        packer = ContextPacker(50, count_tokens=count_lines, min_chunk_tokens=5)
+
+        packed = packer.pack([("first.py", numbered(25)), ("huge.py", numbered(100))])
+
+        assert [(c.file_path, c.trimmed) for c in packed] == [
+            ("first.py", False),
+            ("huge.py", True),
+        ]
+        assert sum(c.tokens + HEADER_TOKENS + 1 for c in packed) <= 50
+
+    def test_skips_empty_chunks(self):
+        """Test that blank chunks are ignored."""
+        assert ContextPacker(100).pack([("a.py", "  \n ")]) == []
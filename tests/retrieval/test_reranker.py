@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for cross-encoder re-ranking."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from langchain_core.documents import Document
+
+from repoqa.retrieval import reranker as reranker_module
+from repoqa.retrieval.reranker import (
+    CrossEncoderReranker,
+    chunk_id,
+    clear_reranker_cache,
+)
+
+
+def doc(content, file_path="a.py"):
+    return Document(page_content=content, metadata={"file_path": file_path})
+
+
+@pytest.fixture
+def cross_encoder():
+    """Cross-encoder scoring a pair by the length of its chunk."""
+    clear_reranker_cache()
+    model = Mock()
+    model.predict.side_effect = lambda pairs, **kwargs: [
+        float(len(text)) for _, text in pairs
+    ]
+    with patch("repoqa.retrieval.reranker.CrossEncoder", Mock(return_value=model)):
+        yield model
+    clear_reranker_cache()
+
+
+def test_chunk_id():
+    """Test that chunk ids depend on the file path and content."""
+    assert chunk_id(doc("x = 1")) == chunk_id(doc("x = 1"))
+    assert chunk_id(doc("x = 1")) != chunk_id(doc("x = 1", "b.py"))
+    assert chunk_id(doc("x = 1")) != chunk_id(doc("x = 2"))
+
+
+def test_rerank_scores_in_one_batch(cross_encoder):
+    """Test that documents are ordered by score from a single forward pass."""
+    docs = [doc("a"), doc("abc"), doc("ab")]
+
+    ranked = CrossEncoderReranker("test-model").rerank("query", docs, top_k=2)
+
+    assert [d.page_content for d in ranked] == ["abc", "ab"]
+    cross_encoder.predict.assert_called_once()
+    args, kwargs = cross_encoder.predict.call_args
+    assert args[0] == [("query", "a"), ("query", "abc"), ("query", "ab")]
+    assert kwargs["batch_size"] == 3
+
+
+def test_scores_are_cached(cross_encoder):
+    """Test that scores are reused across rerankers by query and chunk."""
+    CrossEncoderReranker("test-model").rerank("query", [doc("a"), doc("ab")])
+    cross_encoder.predict.reset_mock()
+
+    scores = CrossEncoderReranker("test-model").score(
+        "query", [doc("ab"), doc("abcd")]
+    )
+
+    assert scores == [2.0, 4.0]
+    assert cross_encoder.predict.call_args[0][0] == [("query", "abcd")]
+
+    # Another query is scored again
+    CrossEncoderReranker("test-model").score("other", [doc("ab")])
+    assert cross_encoder.predict.call_args[0][0] == [("other", "ab")]
+
+
+def test_cache_size(cross_encoder):
+    """Test that the least recently used scores are evicted."""
+    reranker = CrossEncoderReranker("test-model", cache_size=2)
+    reranker.score("query", [doc("a"), doc("ab"), doc("abc")])
+    cross_encoder.predict.reset_mock()
+
+    reranker.score("query", [doc("a"), doc("abc")])
+
+    assert cross_encoder.predict.call_args[0][0] == [("query", "a")]
+
+
+def test_latency_budget(cross_encoder):
+    """Test that only the candidates fitting the budget are scored."""
+    reranker = CrossEncoderReranker("test-model", budget_ms=20)
+    reranker.warmup()
+    reranker_module._PAIR_MS[reranker._key] = 10.0
+    cross_encoder.predict.reset_mock()
+
+    docs = [doc("a"), doc("ab"), doc("abcd"), doc("abc")]
+    ranked = reranker.rerank("query", docs)
+
+    assert cross_encoder.predict.call_args[0][0] == [("query", "a"), ("query", "ab")]
+    # Unscored documents follow the scored ones in retrieval order
+    assert [d.page_content for d in ranked] == ["ab", "a", "abcd", "abc"]
+
+    # Without a budget every candidate is scored
+    reranker.budget_ms = 0
+    ranked = reranker.rerank("query", docs)
+    assert [d.page_content for d in ranked] == ["abcd", "abc", "ab", "a"]
+
+
+def test_rerank_empty(cross_encoder):
+    """Test that nothing is scored without documents."""
+    assert CrossEncoderReranker("test-model").rerank("query", []) == []
+    cross_encoder.predict.assert_not_called()
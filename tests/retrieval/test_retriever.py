@@ -81,3 +81,170 @@ class TestCodeRetriever:
         results = retriever.retrieve(query_embedding)
 
         assert results == []
+
+    def test_retrieve_batch(self):
+        """Test that batched retrieval is a single store call."""
+        from repoqa.retrieval.retriever import CodeRetriever
+
+        mock_vector_store = Mock()
+        mock_results = [[{"file": "a.py"}], [{"file": "b.py"}]]
+        mock_vector_store.search_batch.return_value = mock_results
+
+        retriever = CodeRetriever(vector_store=mock_vector_store)
+
+        query_embeddings = [[0.1, 0.2], [0.3, 0.4]]
+        results = retriever.retrieve_batch(query_embeddings, k=3)
+
+        assert results == mock_results
+        mock_vector_store.search_batch.assert_called_once_with(
+            query_embeddings, top_k=3
+        )
+
+    def _lexical_index(self):
+        from repoqa.indexing.lexical import BM25Index
+
+        return BM25Index.build(
+            [
+                {"content": "def parse_config(path): ...", "file_path": "config.py"},
+                {"content": "def load_model(name): ...", "file_path": "model.py"},
+            ]
+        )
+
+    def test_hybrid_fuses_rankings(self):
+        """Test reciprocal rank fusion of vector and BM25 results."""
+        from repoqa.retrieval.retriever import CodeRetriever
+
+        mock_vector_store = Mock()
+        mock_vector_store.search.return_value = [
+            {"content": "def load_model(name): ...", "file_path": "model.py"},
+            {"content": "import os", "file_path": "util.py", "score": 0.4},
+        ]
+
+        retriever = CodeRetriever(
+            vector_store=mock_vector_store,
+            lexical_index=self._lexical_index(),
+            mode="hybrid",
+        )
+        results = retriever.retrieve([0.1], k=2, query="load_model")
+
+        assert [r["file_path"] for r in results] == ["model.py", "util.py"]
+        assert results[0]["bm25"] > 0
+        assert results[0]["rrf"] == pytest.approx(2 / 61)
+        assert results[1]["rrf"] == pytest.approx(1 / 62)
+
+    def test_lexical_mode_and_fallback(self):
+        """Test lexical-only retrieval and the fallback to vector search."""
+        from repoqa.retrieval.retriever import CodeRetriever
+
+        mock_vector_store = Mock()
+        mock_vector_store.search.return_value = [{"file_path": "vector.py"}]
+        lexical_index = self._lexical_index()
+
+        retriever = CodeRetriever(
+            mock_vector_store, lexical_index=lexical_index, mode="lexical"
+        )
+        results = retriever.retrieve([0.1], k=1, query="parse config")
+        assert [r["file_path"] for r in results] == ["config.py"]
+        mock_vector_store.search.assert_not_called()
+
+        # No query text or no index: vector search in every mode
+        assert retriever.retrieve([0.1], k=1) == [{"file_path": "vector.py"}]
+        retriever = CodeRetriever(mock_vector_store, mode="hybrid")
+        assert retriever.retrieve([0.1], k=1, query="parse") == [
+            {"file_path": "vector.py"}
+        ]
+
+    def test_hybrid_retrieve_batch(self):
+        """Test batched hybrid retrieval makes one vector store call."""
+        from repoqa.retrieval.retriever import CodeRetriever
+
+        mock_vector_store = Mock()
+        mock_vector_store.search_batch.return_value = [[], []]
+
+        retriever = CodeRetriever(
+            mock_vector_store, lexical_index=self._lexical_index(), mode="hybrid"
+        )
+        results = retriever.retrieve_batch(
+            [[0.1], [0.2]], k=1, queries=["parse_config", "load_model"]
+        )
+
+        assert [r[0]["file_path"] for r in results] == ["config.py", "model.py"]
+        mock_vector_store.search_batch.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "mode, searched",
+        [("lexical", [[0.2]]), ("hybrid", [[0.1], [0.2], [0.3]])],
+    )
+    def test_retrieve_batch_decides_per_query(self, mode, searched):
+        """Test that only queries with text use the lexical index."""
+        from repoqa.retrieval.retriever import CodeRetriever
+
+        mock_vector_store = Mock()
+        mock_vector_store.search_batch.side_effect = lambda embeddings, top_k: [
+            [{"file_path": f"vector{e[0]}.py"}] for e in embeddings
+        ]
+
+        retriever = CodeRetriever(
+            mock_vector_store, lexical_index=self._lexical_index(), mode=mode
+        )
+        results = retriever.retrieve_batch(
+            [[0.1], [0.2], [0.3]], k=2, queries=["parse_config", "", "load_model"]
+        )
+
+        assert results[1] == [{"file_path": "vector0.2.py"}]
+        assert "config.py" in [r["file_path"] for r in results[0]]
+        assert "model.py" in [r["file_path"] for r in results[2]]
+        mock_vector_store.search_batch.assert_called_once_with(searched, top_k=2)
+
+    def test_grep(self):
+        """Test regex search through the trigram index."""
+        from repoqa.indexing.trigram import TrigramIndex
+        from repoqa.retrieval.retriever import CodeRetriever
+
+        trigram_index = TrigramIndex.build(
+            [("a.py", "x = 1\ndef parse_config(path):\n    pass\n")]
+        )
+
+        retriever = CodeRetriever(Mock(), trigram_index=trigram_index)
+
+        assert retriever.grep(r"def \w+_config") == [
+            {"file_path": "a.py", "line": 2, "text": "def parse_config(path):"}
+        ]
+        assert CodeRetriever(Mock()).grep("parse") == []
+
+    def test_invalid_mode(self):
+        """Test that an unknown retrieval mode is rejected."""
+        from repoqa.retrieval.retriever import CodeRetriever
+
+        with pytest.raises(ValueError, match="Unsupported retrieval mode"):
+            CodeRetriever(Mock(), mode="fuzzy")
+
+    def test_reciprocal_rank_fusion(self):
+        """Test that items ranked by several retrievers rise to the top."""
+        from repoqa.retrieval.retriever import reciprocal_rank_fusion
+
+        fused = reciprocal_rank_fusion(
+            [["a", "b", "c"], ["c", "b"]], key=lambda item: item, k=1
+        )
+
+        assert [item for item, _ in fused] == ["c", "b", "a"]
+        assert fused[0][1] == pytest.approx(1 / 4 + 1 / 2)
+        assert fused[2][1] == pytest.approx(1 / 2)
+
+    def test_vector_store_default_search_batch(self):
+        """Test the per-query fallback of VectorStore.search_batch."""
+        from repoqa.storage.vector_store import VectorStore
+
+        class EchoStore(VectorStore):
+            def add(self, embeddings, metadata):
+                pass
+
+            def search(self, query_embedding, top_k=5, metadata_filter=None):
+                return [{"query": query_embedding, "top_k": top_k}]
+
+        results = EchoStore().search_batch([[1.0], [2.0]], top_k=2)
+
+        assert results == [
+            [{"query": [1.0], "top_k": 2}],
+            [{"query": [2.0], "top_k": 2}],
+        ]
@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the answer cache."""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from repoqa.storage.answer_cache import AnswerCache, normalize_query
+
+KEY = ("repo", "abc123", "rag", "qwen3:1.7b")
+
+
+def unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnswerCache(str(tmp_path / "answers.sqlite3"))
+
+
+def test_normalize_query():
+    """Test that case, spacing and trailing punctuation are ignored."""
+    assert normalize_query("  What does  X do?\n") == "what does x do"
+    assert normalize_query("what does x do") == "what does x do"
+
+
+def test_exact_lookup(cache):
+    """Test that a normalized question hits without embedding it."""
+    cache.store(*KEY, "What does X do?", "It does Y.")
+    embed = Mock()
+
+    assert cache.lookup(*KEY, "what does x do", embed=embed) == "It does Y."
+    embed.assert_not_called()
+
+    # Other modes, models and commits do not share answers
+    for other in (
+        ("repo", "abc123", "agent", "qwen3:1.7b"),
+        ("repo", "abc123", "rag", "llama3"),
+        ("repo", "def456", "rag", "qwen3:1.7b"),
+    ):
+        assert cache.lookup(*other, "What does X do?") is None
+
+
+def test_similarity_lookup(cache):
+    """Test that similar questions reuse an answer above the threshold."""
+    cache.store(*KEY, "What does X do?", "It does Y.", embedding=unit(1, 0, 0))
+
+    close = unit(1, 0.1, 0)
+    assert cache.lookup(*KEY, "What is X for?", embed=lambda: close) == "It does Y."
+    far = unit(1, 1, 0)
+    assert cache.lookup(*KEY, "How is X tested?", embed=lambda: far) is None
+
+    cache.similarity_threshold = 1.0
+    assert cache.lookup(*KEY, "What is X for?", embed=lambda: close) is None
+
+
+def test_similarity_lookup_requires_same_identifiers(cache):
+    """Test that questions about different code names never share answers."""
+    cache.store(
+        *KEY, "What does parse_config do?", "It reads YAML.", embedding=unit(1, 0)
+    )
+    same = unit(1, 0)
+
+    question = "What does parse_args do?"
+    assert cache.lookup(*KEY, question, embed=lambda: same) is None
+    question = "What does the parse_config function do?"
+    assert cache.lookup(*KEY, question, embed=lambda: same) == "It reads YAML."
+
+
+def test_new_commit_invalidates(cache):
+    """Test that storing an answer for a new commit drops older ones."""
+    cache.store(*KEY, "What does X do?", "It does Y.")
+    cache.store("other", "abc123", "rag", "qwen3:1.7b", "Q", "A")
+    cache.store("repo", "def456", "rag", "qwen3:1.7b", "Q", "A2")
+
+    assert cache.lookup(*KEY, "What does X do?") is None
+    assert cache.lookup("other", "abc123", "rag", "qwen3:1.7b", "Q") == "A"
+    assert len(cache) == 2
+
+    assert cache.invalidate("repo") == 1
+    assert len(cache) == 1
+
+
+def test_max_entries_and_persistence(cache):
+    """Test that the oldest answers are dropped and entries are persisted."""
+    cache.max_entries = 2
+    for i in range(3):
+        cache.store(*KEY, f"Question {i}", f"Answer {i}")
+
+    reopened = AnswerCache(cache.path)
+    assert len(reopened) == 2
+    assert reopened.lookup(*KEY, "Question 0") is None
+    assert reopened.lookup(*KEY, "Question 2") == "Answer 2"
+
+
+def test_invalidate_without_database(tmp_path):
+    """Test that invalidating does not create the database."""
+    cache = AnswerCache(str(tmp_path / "answers.sqlite3"))
+    assert cache.invalidate("repo") == 0
+    assert not (tmp_path / "answers.sqlite3").exists()
@@ -0,0 +1,47 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for write batching helpers."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from repoqa.storage.batching import (
+    DEFAULT_WRITE_BATCH_SIZE,
+    batch_ranges,
+    get_write_batch_size,
+)
+
+
+class TestBatching:
+    """Test suite for write batching helpers."""
+
+    @pytest.mark.parametrize(
+        "requested,client_max,expected",
+        [
+            (0, 5461, 5461),
+            (100, 5461, 100),
+            (10000, 5461, 5461),
+            (0, None, DEFAULT_WRITE_BATCH_SIZE),
+            (250, None, 250),
+        ],
+    )
+    def test_get_write_batch_size(self, requested, client_max, expected):
+        """Test that requested sizes are capped at the client maximum."""
+        client = Mock()
+        client.get_max_batch_size.return_value = client_max
+
+        assert get_write_batch_size(client, requested) == expected
+
+    def test_get_write_batch_size_without_client_support(self):
+        """Test clients that cannot report a maximum."""
+        client = Mock()
+        client.get_max_batch_size.side_effect = AttributeError
+
+        assert get_write_batch_size(client) == DEFAULT_WRITE_BATCH_SIZE
+
+    def test_batch_ranges(self):
+        """Test that ranges cover all items without overlap."""
+        assert list(batch_ranges(5, 2)) == [(0, 2), (2, 4), (4, 5)]
+        assert list(batch_ranges(0, 2)) == []
@@ -43,13 +43,13 @@ class TestChromaVectorStore:
             name="test-collection"
         )
 
-    @patch("repoqa.storage.chroma_store.chromadb.PersistentClient")
-    def test_initialization_persistent(self, mock_persistent_client_class):
-        """Test initialization with persistent client."""
+    @patch("repoqa.storage.chroma_store.get_chroma_client")
+    def test_initialization_persistent(self, mock_get_client):
+        """Test initialization with the shared persistent client."""
         mock_client = Mock()
         mock_collection = Mock()
         mock_client.get_or_create_collection.return_value = mock_collection
-        mock_persistent_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         store = ChromaVectorStore(
             collection_name="test-collection",
@@ -58,7 +58,7 @@ class TestChromaVectorStore:
 
         assert store.client == mock_client
         assert store.collection == mock_collection
-        mock_persistent_client_class.assert_called_once_with(path="/path/to/db")
+        mock_get_client.assert_called_once_with("/path/to/db")
 
     @patch("repoqa.storage.chroma_store.chromadb.Client")
     def test_add_embeddings(self, mock_client_class):
@@ -85,6 +85,29 @@ class TestChromaVectorStore:
         assert call_kwargs["metadatas"] == metadata
         assert len(call_kwargs["ids"]) == 2
 
+    @patch("repoqa.storage.chroma_store.chromadb.Client")
+    def test_add_embeddings_in_batches(self, mock_client_class):
+        """Test that adds are split at the client's max batch size."""
+        mock_client = Mock()
+        mock_client.get_max_batch_size.return_value = 2
+        mock_collection = Mock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client_class.return_value = mock_client
+
+        store = ChromaVectorStore(batch_size=100)
+        embeddings = [[float(i)] for i in range(5)]
+        metadata = [{"chunk": i} for i in range(5)]
+
+        store.add(embeddings, metadata)
+
+        calls = mock_collection.add.call_args_list
+        assert [c[1]["embeddings"] for c in calls] == [
+            [[0.0], [1.0]],
+            [[2.0], [3.0]],
+            [[4.0]],
+        ]
+        assert len({i for c in calls for i in c[1]["ids"]}) == 5
+
     @patch("repoqa.storage.chroma_store.chromadb.Client")
     def test_add_embeddings_length_mismatch(self, mock_client_class):
         """Test that adding mismatched embeddings and metadata raises error."""
@@ -115,6 +138,7 @@ class TestChromaVectorStore:
 
         # Mock search results
         mock_collection.query.return_value = {
+            "documents": [[None, None]],
             "metadatas": [
                 [
                     {"file": "test1.py", "content": "code1"},
@@ -139,6 +163,7 @@ class TestChromaVectorStore:
         mock_collection.query.assert_called_once_with(
             query_embeddings=[query_embedding],
             n_results=2,
+            include=["documents", "metadatas", "distances"],
         )
 
     @patch("repoqa.storage.chroma_store.chromadb.Client")
@@ -151,6 +176,7 @@ class TestChromaVectorStore:
         mock_client_class.return_value = mock_client
 
         mock_collection.query.return_value = {
+            "documents": [[None]],
             "metadatas": [[{"file": "test1.py", "content": "code1"}]],
             "distances": [[0.1]],
         }
@@ -167,6 +193,7 @@ class TestChromaVectorStore:
         mock_collection.query.assert_called_once_with(
             query_embeddings=[query_embedding],
             n_results=5,
+            include=["documents", "metadatas", "distances"],
             where=metadata_filter,
         )
 
@@ -180,6 +207,7 @@ class TestChromaVectorStore:
         mock_client_class.return_value = mock_client
 
         mock_collection.query.return_value = {
+            "documents": [[None]],
             "metadatas": [[{"file": "test.py", "content": "code"}]],
             "distances": [[0.1]],
         }
@@ -205,6 +233,7 @@ class TestChromaVectorStore:
         mock_client_class.return_value = mock_client
 
         mock_collection.query.return_value = {
+            "documents": [[None]],
             "metadatas": [[{"file": "test.py", "content": "code"}]],
             "distances": [[0.1]],
         }
@@ -218,3 +247,66 @@ class TestChromaVectorStore:
         # Should flatten to 1D
         call_args = mock_collection.query.call_args[1]
         assert call_args["query_embeddings"] == [[0.1, 0.2, 0.3]]
+
+    @patch("repoqa.storage.chroma_store.chromadb.Client")
+    def test_search_batch(self, mock_client_class):
+        """Test that several queries share one collection.query call."""
+        mock_client = Mock()
+        mock_collection = Mock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client_class.return_value = mock_client
+
+        mock_collection.query.return_value = {
+            "documents": [[None], [None]],
+            "metadatas": [
+                [{"file": "a.py", "content": "code a"}],
+                [{"file": "b.py", "content": "code b"}],
+            ],
+            "distances": [[0.1], [0.3]],
+        }
+
+        store = ChromaVectorStore()
+        queries = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+        results = store.search_batch(queries, top_k=1, metadata_filter={"x": 1})
+
+        assert [r[0]["file"] for r in results] == ["a.py", "b.py"]
+        assert results[1][0]["score"] == 0.3
+        mock_collection.query.assert_called_once_with(
+            query_embeddings=queries,
+            n_results=1,
+            include=["documents", "metadatas", "distances"],
+            where={"x": 1},
+        )
+        assert store.search_batch([]) == []
+
+    @patch("repoqa.storage.chroma_store.chromadb.Client")
+    def test_documents_and_get(self, mock_client_class):
+        """Test that pipeline-written documents are returned as content."""
+        mock_collection = Mock()
+        mock_client_class.return_value.get_or_create_collection.return_value = (
+            mock_collection
+        )
+        mock_collection.query.return_value = {
+            "documents": [["def f(): pass"]],
+            "metadatas": [[{"file_path": "a.py"}]],
+            "distances": [[0.2]],
+        }
+        mock_collection.get.return_value = {
+            "documents": ["def f(): pass", None],
+            "metadatas": [{"file_path": "a.py"}, {"content": "x = 1"}],
+        }
+
+        store = ChromaVectorStore()
+
+        assert store.search([0.1, 0.2]) == [
+            {"file_path": "a.py", "content": "def f(): pass", "score": 0.2}
+        ]
+        assert store.get({"file_path": "a.py"}, limit=2) == [
+            {"file_path": "a.py", "content": "def f(): pass"},
+            {"content": "x = 1"},
+        ]
+        mock_collection.get.assert_called_once_with(
+            where={"file_path": "a.py"},
+            limit=2,
+            include=["documents", "metadatas"],
+        )
@@ -4,7 +4,8 @@
 """Tests for collection management utilities."""
 
 import sys
-from unittest.mock import MagicMock, Mock
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
 import pytest
 
@@ -21,12 +22,36 @@ sys.modules["chromadb.config"] = chromadb_mock.config
 sys.modules["chromadb.api"] = chromadb_mock.api
 
 
+class NotFoundError(Exception):
+    """Stand-in for chromadb.errors.NotFoundError."""
+
+
+def not_found(name):
+    """Error ChromaDB raises for a missing collection."""
+    return NotFoundError(f"Collection [{name}] does not exist")
+
+
 @pytest.fixture(autouse=True)
 def reset_chromadb_mock():
-    """Reset chromadb mock between tests."""
+    """Reset chromadb mock, cached clients and validations between tests."""
+    from repoqa.storage.collection_manager import (
+        clear_access_log_cache,
+        clear_answer_caches,
+        clear_client_cache,
+        clear_validation_cache,
+    )
+
+    clear_client_cache()
+    clear_validation_cache()
+    clear_access_log_cache()
+    clear_answer_caches()
     chromadb_mock.PersistentClient.reset_mock()
     chromadb_mock.PersistentClient.return_value = None
     yield
+    clear_client_cache()
+    clear_validation_cache()
+    clear_access_log_cache()
+    clear_answer_caches()
     chromadb_mock.PersistentClient.reset_mock()
     chromadb_mock.PersistentClient.return_value = None
 
@@ -136,6 +161,26 @@ class TestGetCollectionName:
 class TestCollectionManager:
     """Test suite for collection manager functions."""
 
+    def test_get_chroma_client_is_shared(self, tmp_path):
+        """Test that one client is opened per persist directory."""
+        from repoqa.storage.collection_manager import (
+            collection_exists_and_has_documents,
+            get_chroma_client,
+            list_collections,
+        )
+
+        chromadb_mock.PersistentClient.side_effect = lambda path: Mock()
+        try:
+            client = get_chroma_client(str(tmp_path))
+            list_collections(str(tmp_path))
+            collection_exists_and_has_documents(str(tmp_path / "."), "repo")
+
+            assert get_chroma_client(str(tmp_path)) is client
+            assert get_chroma_client(str(tmp_path / "other")) is not client
+            assert chromadb_mock.PersistentClient.call_count == 2
+        finally:
+            chromadb_mock.PersistentClient.side_effect = None
+
     def test_collection_exists_and_has_documents(self):
         """Test checking if collection exists with documents."""
         from repoqa.storage.collection_manager import (
@@ -149,7 +194,6 @@ class TestCollectionManager:
 
         # Mock client
         mock_client = Mock()
-        mock_client.list_collections.return_value = [mock_collection]
         mock_client.get_collection.return_value = mock_collection
 
         # Set up the mock
@@ -159,6 +203,8 @@ class TestCollectionManager:
 
         assert result is True
         mock_client.get_collection.assert_called_once_with(name="test-collection")
+        # Existence is a direct lookup, not a scan of every collection
+        mock_client.list_collections.assert_not_called()
 
     def test_collection_not_exists(self):
         """Test checking non-existent collection."""
@@ -168,7 +214,7 @@ class TestCollectionManager:
 
         # Mock client with no collections
         mock_client = Mock()
-        mock_client.list_collections.return_value = []
+        mock_client.get_collection.side_effect = not_found("nonexistent")
 
         chromadb_mock.PersistentClient.return_value = mock_client
 
@@ -188,7 +234,6 @@ class TestCollectionManager:
         mock_collection.name = "test-collection"
 
         mock_client = Mock()
-        mock_client.list_collections.return_value = [mock_collection]
         mock_client.get_collection.return_value = mock_collection
 
         chromadb_mock.PersistentClient.return_value = mock_client
@@ -205,7 +250,7 @@ class TestCollectionManager:
 
         # Mock client that raises an error
         mock_client = Mock()
-        mock_client.list_collections.side_effect = Exception("Test error")
+        mock_client.get_collection.side_effect = Exception("Test error")
 
         chromadb_mock.PersistentClient.return_value = mock_client
 
@@ -217,13 +262,8 @@ class TestCollectionManager:
         """Test deleting a collection."""
         from repoqa.storage.collection_manager import delete_collection
 
-        # Mock collection
-        mock_collection = Mock()
-        mock_collection.name = "test-collection"
-
         # Mock client
         mock_client = Mock()
-        mock_client.list_collections.return_value = [mock_collection]
 
         chromadb_mock.PersistentClient.return_value = mock_client
 
@@ -232,20 +272,89 @@ class TestCollectionManager:
         assert result is True
         mock_client.delete_collection.assert_called_once_with(name="test-collection")
 
+    def test_delete_collection_removes_projection(self, tmp_path):
+        """Test that deleting a collection removes its projection file."""
+        from repoqa.storage.collection_manager import (
+            delete_collection,
+            get_projection_path,
+        )
+
+        projection_path = get_projection_path(str(tmp_path), "test-collection")
+        (tmp_path / "projections").mkdir()
+        open(projection_path, "wb").close()
+
+        mock_client = Mock()
+        chromadb_mock.PersistentClient.return_value = mock_client
+
+        assert delete_collection(str(tmp_path), "test-collection") is True
+        assert not (tmp_path / "projections" / "test-collection.npz").exists()
+
+    def test_delete_collection_drops_cached_answers(self, tmp_path):
+        """Test that deleting a collection drops its cached answers."""
+        from repoqa.storage.collection_manager import (
+            delete_collection,
+            get_answer_cache,
+        )
+
+        cache = get_answer_cache(str(tmp_path), similarity_threshold=0.9)
+        assert get_answer_cache(str(tmp_path)) is cache
+        assert cache.similarity_threshold == 0.9
+        cache.store("test-collection", "abc123", "rag", "llm", "Q", "A")
+        cache.store("other-collection", "abc123", "rag", "llm", "Q", "A")
+
+        chromadb_mock.PersistentClient.return_value = Mock()
+
+        assert delete_collection(str(tmp_path), "test-collection") is True
+        assert cache.lookup("test-collection", "abc123", "rag", "llm", "Q") is None
+        assert cache.lookup("other-collection", "abc123", "rag", "llm", "Q") == "A"
+
+    def test_delete_collection_without_answer_cache(self, tmp_path):
+        """Test that a disabled answer cache is not opened by deletions."""
+        from repoqa.config import config
+        from repoqa.storage.collection_manager import delete_collection
+
+        chromadb_mock.PersistentClient.return_value = Mock()
+
+        with patch.object(
+            type(config),
+            "answer_cache_enabled",
+            new_callable=PropertyMock,
+            return_value=False,
+        ), patch("repoqa.storage.collection_manager.get_answer_cache") as mock_get:
+            assert delete_collection(str(tmp_path), "test-collection") is True
+
+        mock_get.assert_not_called()
+
+    @pytest.mark.parametrize("backend", ["faiss", "numpy"])
+    def test_delete_collection_removes_store_directory(self, tmp_path, backend):
+        """Test that deleting a collection removes FAISS/NumPy store files."""
+        from repoqa.storage.collection_manager import delete_collection
+
+        index_dir = tmp_path / backend / "test-collection"
+        index_dir.mkdir(parents=True)
+        (index_dir / "metadata.json").write_bytes(b"")
+
+        mock_client = Mock()
+        mock_client.delete_collection.side_effect = not_found("test-collection")
+        chromadb_mock.PersistentClient.return_value = mock_client
+
+        assert delete_collection(str(tmp_path), "test-collection") is True
+        assert not index_dir.exists()
+
     def test_delete_nonexistent_collection(self):
         """Test deleting a non-existent collection."""
         from repoqa.storage.collection_manager import delete_collection
 
         # Mock client with no collections
         mock_client = Mock()
-        mock_client.list_collections.return_value = []
+        mock_client.delete_collection.side_effect = not_found("nonexistent")
 
         chromadb_mock.PersistentClient.return_value = mock_client
 
         result = delete_collection("/path/to/db", "nonexistent")
 
         assert result is True
-        mock_client.delete_collection.assert_not_called()
+        mock_client.delete_collection.assert_called_once_with(name="nonexistent")
 
     def test_delete_collection_error_handling(self):
         """Test error handling when deleting collection."""
@@ -253,7 +362,7 @@ class TestCollectionManager:
 
         # Mock client that raises an error
         mock_client = Mock()
-        mock_client.list_collections.side_effect = Exception("Test error")
+        mock_client.delete_collection.side_effect = Exception("Test error")
 
         chromadb_mock.PersistentClient.return_value = mock_client
 
@@ -318,10 +427,10 @@ class TestCollectionManager:
         mock_collection = Mock()
         mock_collection.count.return_value = 25
         mock_collection.name = "test-collection"
+        mock_collection.metadata = None
 
         # Mock client
         mock_client = Mock()
-        mock_client.list_collections.return_value = [mock_collection]
         mock_client.get_collection.return_value = mock_collection
 
         chromadb_mock.PersistentClient.return_value = mock_client
@@ -334,13 +443,28 @@ class TestCollectionManager:
             "document_count": 25,
         }
 
+    def test_get_collection_info_with_manifest(self):
+        """Test that collection info includes the stored manifest."""
+        from repoqa.storage.collection_manager import get_collection_info
+
+        mock_collection = Mock()
+        mock_collection.count.return_value = 5
+        mock_collection.metadata = {"repoqa_embedding_model": "m", "other": 1}
+        mock_client = Mock()
+        mock_client.get_collection.return_value = mock_collection
+        chromadb_mock.PersistentClient.return_value = mock_client
+
+        result = get_collection_info("/path/to/db", "test-collection")
+
+        assert result["manifest"] == {"embedding_model": "m"}
+
     def test_get_collection_info_nonexistent(self):
         """Test getting info for non-existent collection."""
         from repoqa.storage.collection_manager import get_collection_info
 
         # Mock client with no collections
         mock_client = Mock()
-        mock_client.list_collections.return_value = []
+        mock_client.get_collection.side_effect = not_found("nonexistent")
 
         chromadb_mock.PersistentClient.return_value = mock_client
 
@@ -354,7 +478,7 @@ class TestCollectionManager:
 
         # Mock client that raises an error
         mock_client = Mock()
-        mock_client.list_collections.side_effect = Exception("Test error")
+        mock_client.get_collection.side_effect = Exception("Test error")
 
         chromadb_mock.PersistentClient.return_value = mock_client
 
@@ -363,3 +487,428 @@ class TestCollectionManager:
         assert result["exists"] is False
         assert result["name"] == "test-collection"
         assert "error" in result
+
+
+def make_manifest(**fields):
+    """Manifest for a complete collection built with model 'm'."""
+    from repoqa.storage.manifest import build_manifest
+
+    return build_manifest(
+        embedding_model=fields.pop("embedding_model", "m"),
+        chunker="GitRepoIndexer",
+        chunk_size=fields.pop("chunk_size", 100),
+        **fields,
+    )
+
+
+def collection_with_manifest(manifest, count=10):
+    """Mock client holding one collection with ``manifest`` in its metadata."""
+    from repoqa.storage.manifest import merge_manifest
+
+    mock_collection = Mock()
+    mock_collection.count.return_value = count
+    mock_collection.metadata = merge_manifest(None, manifest) if manifest else None
+    mock_client = Mock()
+    mock_client.get_collection.return_value = mock_collection
+    chromadb_mock.PersistentClient.return_value = mock_client
+    return mock_client
+
+
+class TestValidateCollection:
+    """Test suite for manifest validation of collections."""
+
+    def test_valid_collection_is_cached(self):
+        """Test that a validated collection is only re-checked by its stamp."""
+        from repoqa.storage.collection_manager import validate_collection
+
+        mock_client = collection_with_manifest(make_manifest(complete=True))
+
+        first = validate_collection("/path/to/db", "repo", make_manifest())
+        second = validate_collection("/path/to/db", "repo", make_manifest())
+
+        assert first == second == {"status": "ok", "mismatches": []}
+        assert mock_client.get_collection.call_count == 2
+        mock_client.get_collection.return_value.count.assert_not_called()
+
+    def test_changes_by_other_processes_invalidate_cache(self):
+        """Test that collections deleted or rebuilt elsewhere are noticed."""
+        from repoqa.storage.collection_manager import validate_collection
+        from repoqa.storage.manifest import merge_manifest
+
+        mock_client = collection_with_manifest(make_manifest(complete=True))
+        validate_collection("/path/to/db", "repo", make_manifest())
+
+        # Rebuilt by another worker, which has not finished indexing yet
+        rebuilt = mock_client.get_collection.return_value
+        rebuilt.id = "new-id"
+        rebuilt.metadata = merge_manifest(None, make_manifest(complete=False))
+        result = validate_collection("/path/to/db", "repo", make_manifest())
+        assert result["status"] == "incomplete"
+
+        # Deleted, e.g. evicted by another worker's compaction
+        rebuilt.metadata = merge_manifest(None, make_manifest(complete=True))
+        validate_collection("/path/to/db", "repo", make_manifest())
+        mock_client.get_collection.side_effect = not_found("repo")
+        result = validate_collection("/path/to/db", "repo", make_manifest())
+        assert result["status"] == "missing"
+
+    def test_changed_config_is_stale(self):
+        """Test that a different model or chunk size is reported as stale."""
+        from repoqa.storage.collection_manager import validate_collection
+
+        collection_with_manifest(make_manifest(complete=True, embedding_dim=384))
+        expected = make_manifest(embedding_model="other", chunk_size=50)
+
+        result = validate_collection("/path/to/db", "repo", expected)
+
+        assert result == {
+            "status": "stale",
+            "mismatches": ["embedding_model", "chunk_size"],
+        }
+
+    @pytest.mark.parametrize(
+        "manifest,count,status",
+        [
+            (None, 10, "unversioned"),
+            (None, 0, "missing"),
+            ("incomplete", 10, "incomplete"),
+        ],
+    )
+    def test_unusable_collections(self, manifest, count, status):
+        """Test collections without a manifest or with partial indexes."""
+        from repoqa.storage.collection_manager import validate_collection
+
+        if manifest == "incomplete":
+            manifest = make_manifest(complete=False)
+        collection_with_manifest(manifest, count=count)
+
+        result = validate_collection("/path/to/db", "repo", make_manifest())
+
+        assert result["status"] == status
+
+    def test_missing_collection(self):
+        """Test validating a collection that does not exist."""
+        from repoqa.storage.collection_manager import validate_collection
+
+        mock_client = Mock()
+        mock_client.get_collection.side_effect = not_found("repo")
+        chromadb_mock.PersistentClient.return_value = mock_client
+
+        result = validate_collection("/path/to/db", "repo", make_manifest())
+
+        assert result["status"] == "missing"
+
+    def test_write_and_delete_invalidate_cache(self):
+        """Test that rewriting or deleting a collection forgets its validation."""
+        from repoqa.storage.collection_manager import (
+            delete_collection,
+            get_chroma_client,
+            validate_collection,
+            write_collection_manifest,
+        )
+
+        mock_client = collection_with_manifest(make_manifest(complete=True))
+        validate_collection("/path/to/db", "repo", make_manifest())
+
+        write_collection_manifest(
+            get_chroma_client("/path/to/db"),
+            "/path/to/db",
+            "repo",
+            make_manifest(complete=False),
+        )
+        validate_collection("/path/to/db", "repo", make_manifest())
+        delete_collection("/path/to/db", "repo")
+        validate_collection("/path/to/db", "repo", make_manifest())
+
+        # The write reads the collection too: 1 + 1 + 1 + 1
+        assert mock_client.get_collection.call_count == 4
+        modified = mock_client.get_collection.return_value.modify.call_args[1]
+        assert modified["metadata"]["repoqa_complete"] is False
+
+
+def make_chroma_dir(persist_directory, collections):
+    """Lay out a ChromaDB-like persist directory.
+
+    Args:
+        persist_directory: Directory to populate.
+        collections: ``(name, segment_bytes, document_count)`` tuples.
+
+    Returns:
+        Mock client listing the collections.
+    """
+    import sqlite3
+    import uuid
+
+    db = sqlite3.connect(persist_directory / "chroma.sqlite3")
+    db.execute("CREATE TABLE segments (id TEXT, scope TEXT, collection TEXT)")
+    mock_collections = []
+    for name, segment_bytes, count in collections:
+        collection_id, segment_id = str(uuid.uuid4()), str(uuid.uuid4())
+        db.execute(
+            "INSERT INTO segments VALUES (?, 'VECTOR', ?)", (segment_id, collection_id)
+        )
+        (persist_directory / segment_id).mkdir()
+        (persist_directory / segment_id / "data.bin").write_bytes(b"x" * segment_bytes)
+
+        collection = Mock()
+        collection.name, collection.id = name, collection_id
+        collection.count.return_value = count
+        mock_collections.append(collection)
+    db.commit()
+    db.close()
+
+    mock_client = Mock()
+    mock_client.list_collections.return_value = mock_collections
+    chromadb_mock.PersistentClient.return_value = mock_client
+    return mock_client
+
+
+class TestStorageQuotas:
+    """Test suite for storage usage reporting and LRU eviction."""
+
+    def test_storage_usage(self, tmp_path):
+        """Test per-collection and per-clone sizes and access times."""
+        from repoqa.storage.collection_manager import (
+            get_access_log,
+            get_storage_usage,
+        )
+
+        make_chroma_dir(tmp_path, [("a", 1000, 1), ("b", 3000, 3)])
+        clones = tmp_path / "clones"
+        (clones / "repo").mkdir(parents=True)
+        (clones / "repo" / "f.py").write_bytes(b"x" * 50)
+        get_access_log(str(tmp_path)).touch("collections", "b", now=5.0)
+
+        usage = get_storage_usage(str(tmp_path), str(clones))
+
+        sqlite_size = (tmp_path / "chroma.sqlite3").stat().st_size
+        a, b = usage["collections"]
+        assert a["size_bytes"] == 1000 + sqlite_size // 4
+        assert b["size_bytes"] == 3000 + sqlite_size * 3 // 4
+        assert (a["last_access"], b["last_access"]) == (None, 5.0)
+        assert usage["clones"] == [
+            {"path": str(clones / "repo"), "size_bytes": 50, "last_access": None}
+        ]
+        assert usage["clones_bytes"] == 50
+
+    def test_compact_evicts_least_recently_used(self, tmp_path):
+        """Test LRU eviction, protection and orphaned segment cleanup."""
+        from repoqa.storage.collection_manager import (
+            compact_storage,
+            get_access_log,
+        )
+
+        mock_client = make_chroma_dir(
+            tmp_path, [("old", 10_000, 1), ("older", 10_000, 1), ("new", 10_000, 1)]
+        )
+        orphan = tmp_path / "00000000-0000-0000-0000-000000000000"
+        orphan.mkdir()
+        (orphan / "data.bin").write_bytes(b"x" * 100)
+        log = get_access_log(str(tmp_path))
+        log.touch("collections", "older", now=1.0)
+        log.touch("collections", "old", now=2.0)
+        log.touch("collections", "new", now=3.0)
+
+        result = compact_storage(
+            str(tmp_path),
+            max_collection_bytes=30_000,
+            protected_collections=["older"],
+        )
+
+        assert result["evicted_collections"] == ["old"]
+        assert result["freed_bytes"] >= 100
+        mock_client.delete_collection.assert_called_once_with(name="old")
+        assert not orphan.exists()
+        assert log.last_access("collections", "old") is None
+
+    def test_compact_evicts_clones(self, tmp_path):
+        """Test that clones never accessed are evicted first."""
+        from repoqa.storage.collection_manager import (
+            compact_storage,
+            get_access_log,
+        )
+
+        make_chroma_dir(tmp_path, [])
+        clones = tmp_path / "clones"
+        for name in ("recent", "unknown"):
+            (clones / name).mkdir(parents=True)
+            (clones / name / "f.py").write_bytes(b"x" * 100)
+        get_access_log(str(tmp_path)).touch("clones", str(clones / "recent"))
+
+        result = compact_storage(
+            str(tmp_path), clone_directory=str(clones), max_clone_bytes=150
+        )
+
+        assert result["evicted_clones"] == [str(clones / "unknown")]
+        assert result["evicted_collections"] == []
+        assert (clones / "recent").exists()
+        assert not (clones / "unknown").exists()
+
+
+class TestSnapshots:
+    """Test suite for collection export and import."""
+
+    def make_collection(self, manifest):
+        """Mock collection paging through three documents."""
+        from repoqa.storage.manifest import merge_manifest
+
+        documents = {
+            "ids": ["a", "b", "c"],
+            "embeddings": [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]],
+            "documents": ["doc a", "doc b", "doc c"],
+            "metadatas": [{"file_path": "a.py"}, None, {"file_path": "c.py"}],
+        }
+
+        def get(limit, offset, include):
+            return {k: v[offset : offset + limit] for k, v in documents.items()}
+
+        collection = Mock()
+        collection.count.return_value = 3
+        collection.get.side_effect = get
+        # Like ChromaDB, keep the distance function in the configuration
+        collection.metadata = merge_manifest(None, manifest)
+        collection.configuration = {"hnsw": {"space": "cosine"}}
+        return collection
+
+    def test_export_import_round_trip(self, tmp_path):
+        """Test that an import writes the exported documents without embedding."""
+        from repoqa.storage.collection_manager import (
+            export_collection,
+            get_projection_path,
+            import_collection,
+        )
+
+        source = tmp_path / "source"
+        projection = get_projection_path(str(source), "repo")
+        (source / "projections").mkdir(parents=True)
+        with open(projection, "wb") as f:
+            f.write(b"projection")
+
+        source_client = Mock()
+        source_client.get_max_batch_size.return_value = 2
+        source_client.get_collection.return_value = self.make_collection(
+            make_manifest(complete=True)
+        )
+        chromadb_mock.PersistentClient.return_value = source_client
+        archive = str(tmp_path / "repo.tar.gz")
+
+        info = export_collection(str(source), "repo", archive)
+
+        assert info["count"] == 3
+        assert info["settings"] == {"hnsw:space": "cosine"}
+        assert info["size_bytes"] > 0
+
+        target_client = Mock()
+        target_client.get_max_batch_size.return_value = 2
+        target = target_client.get_or_create_collection.return_value
+        target.metadata = None
+        # Missing when the import starts, then found for manifest writes
+        target_client.get_collection.side_effect = [not_found("copy")] + [target] * 2
+        chromadb_mock.PersistentClient.return_value = target_client
+
+        result = import_collection(str(tmp_path / "target"), archive, "copy")
+
+        assert result["collection_name"] == "copy"
+        target_client.get_or_create_collection.assert_called_once_with(
+            name="copy", metadata={"hnsw:space": "cosine"}
+        )
+        first, second = [c[1] for c in target.add.call_args_list]
+        assert first["ids"] == ["a", "b"]
+        assert first["documents"] == ["doc a", "doc b"]
+        assert first["metadatas"] == [{"file_path": "a.py"}, None]
+        assert first["embeddings"].tolist() == [[1.0, 0.0], [0.0, 1.0]]
+        assert second["ids"] == ["c"]
+
+        # Manifest is incomplete until every batch is written
+        completes = [
+            c[1]["metadata"]["repoqa_complete"] for c in target.modify.call_args_list
+        ]
+        assert completes == [False, True]
+        with open(get_projection_path(str(tmp_path / "target"), "copy"), "rb") as f:
+            assert f.read() == b"projection"
+
+    def test_export_import_index_directories(self, tmp_path):
+        """Test that search indexes and backend stores travel with a snapshot."""
+        from repoqa.indexing.lexical import get_lexical_directory
+        from repoqa.indexing.symbols import get_symbol_directory
+        from repoqa.indexing.trigram import get_trigram_directory
+        from repoqa.storage.collection_manager import (
+            export_collection,
+            import_collection,
+        )
+        from repoqa.storage.faiss_store import get_faiss_directory
+
+        source = str(tmp_path / "source")
+        for get_directory in (
+            get_lexical_directory,
+            get_trigram_directory,
+            get_symbol_directory,
+            get_faiss_directory,
+        ):
+            directory = Path(get_directory(source, "repo"))
+            directory.mkdir(parents=True)
+            (directory / "index.bin").write_text(get_directory.__name__)
+
+        client = Mock()
+        client.get_max_batch_size.return_value = 10
+        client.get_collection.return_value = self.make_collection(
+            make_manifest(complete=True)
+        )
+        chromadb_mock.PersistentClient.return_value = client
+        archive = str(tmp_path / "repo.tar.gz")
+
+        info = export_collection(source, "repo", archive)
+
+        assert info["indexes"] == ["faiss", "lexical", "symbols", "trigram"]
+
+        # Overwriting replaces the target's stale indexes with the archived ones
+        target = str(tmp_path / "target")
+        stale = Path(get_trigram_directory(target, "repo"))
+        stale.mkdir(parents=True)
+        (stale / "old.bin").write_text("old")
+        import_collection(target, archive, overwrite=True)
+
+        for get_directory in (
+            get_lexical_directory,
+            get_trigram_directory,
+            get_symbol_directory,
+            get_faiss_directory,
+        ):
+            directory = Path(get_directory(target, "repo"))
+            assert (directory / "index.bin").read_text() == get_directory.__name__
+        assert not (stale / "old.bin").exists()
+
+    def test_import_existing_collection(self, tmp_path):
+        """Test that importing over an existing collection needs overwrite."""
+        from repoqa.storage.collection_manager import (
+            export_collection,
+            import_collection,
+        )
+
+        client = Mock()
+        client.get_max_batch_size.return_value = 10
+        client.get_collection.return_value = self.make_collection(
+            make_manifest(complete=True)
+        )
+        chromadb_mock.PersistentClient.return_value = client
+        archive = str(tmp_path / "repo.tar.gz")
+        export_collection(str(tmp_path), "repo", archive)
+
+        with pytest.raises(ValueError, match="already exists"):
+            import_collection(str(tmp_path), archive)
+
+        import_collection(str(tmp_path), archive, overwrite=True)
+        client.delete_collection.assert_called_once_with(name="repo")
+
+    def test_export_incomplete_collection(self, tmp_path):
+        """Test that partially indexed collections are not exported."""
+        from repoqa.storage.collection_manager import export_collection
+
+        client = Mock()
+        client.get_collection.return_value = self.make_collection(
+            make_manifest(complete=False)
+        )
+        chromadb_mock.PersistentClient.return_value = client
+
+        with pytest.raises(ValueError, match="not fully indexed"):
+            export_collection(str(tmp_path), "repo", str(tmp_path / "a.tar.gz"))
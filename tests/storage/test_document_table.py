@@ -0,0 +1,101 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the document side table."""
+
+import numpy as np
+import pytest
+
+from repoqa.storage.document_table import DocumentTable
+
+
+@pytest.fixture
+def rows():
+    """Metadata rows with content and a sparse column."""
+    return [
+        {"file_path": "a.py", "chunk": 0, "content": "def a(): pass"},
+        {"file_path": "b.py", "chunk": 1, "content": "def b(): return 'ü'"},
+        {"file_path": "a.py", "chunk": 2, "content": "", "language": "python"},
+    ]
+
+
+class TestDocumentTable:
+    """Test suite for DocumentTable."""
+
+    def test_append_and_row(self, rows):
+        """Test reading rows back before saving."""
+        table = DocumentTable()
+        table.append(rows)
+
+        assert len(table) == 3
+        assert table.row(1) == rows[1]
+        assert table.row(2) == rows[2]
+        # Columns added later are missing from earlier rows
+        assert "language" not in table.row(0)
+
+    def test_save_and_load_round_trip(self, rows, tmp_path):
+        """Test that saved tables load with memory-mapped content."""
+        table = DocumentTable()
+        table.append(rows[:2])
+        table.save(str(tmp_path))
+        table.append(rows[2:])
+        table.save(str(tmp_path))
+
+        loaded = DocumentTable.load(str(tmp_path))
+
+        assert DocumentTable.exists(str(tmp_path))
+        assert len(loaded) == 3
+        assert [loaded.row(i) for i in range(3)] == rows
+        assert isinstance(loaded._blob, np.memmap)
+
+    def test_load_empty_content(self, tmp_path):
+        """Test saving rows whose content is empty."""
+        table = DocumentTable()
+        table.append([{"file_path": "a.py"}])
+        table.save(str(tmp_path))
+
+        assert DocumentTable.load(str(tmp_path)).row(0) == {
+            "file_path": "a.py",
+            "content": "",
+        }
+
+    @pytest.mark.parametrize(
+        "where,expected",
+        [
+            ({"file_path": "a.py"}, [True, False, True]),
+            ({"file_path": {"$ne": "a.py"}}, [False, True, False]),
+            ({"chunk": {"$in": [0, 1]}}, [True, True, False]),
+            ({"chunk": {"$nin": [0, 1]}}, [False, False, True]),
+            ({"chunk": {"$gte": 1}}, [False, True, True]),
+            ({"chunk": {"$lt": 1}}, [True, False, False]),
+            ({"language": "python"}, [False, False, True]),
+            (
+                {"$and": [{"file_path": "a.py"}, {"chunk": {"$gt": 0}}]},
+                [False, False, True],
+            ),
+            ({"$or": [{"chunk": 0}, {"chunk": 1}]}, [True, True, False]),
+        ],
+    )
+    def test_match(self, rows, where, expected):
+        """Test ChromaDB-style metadata filters."""
+        table = DocumentTable()
+        table.append(rows)
+
+        assert table.match(where).tolist() == expected
+
+    def test_find(self, rows):
+        """Test getting matching rows with their content."""
+        table = DocumentTable()
+        table.append(rows)
+
+        assert table.find({"file_path": "a.py"}) == [rows[0], rows[2]]
+        assert table.find({"file_path": "a.py"}, limit=1) == [rows[0]]
+        assert table.find({"file_path": "c.py"}) == []
+
+    def test_match_unsupported_operator(self, rows):
+        """Test that unknown operators are rejected."""
+        table = DocumentTable()
+        table.append(rows)
+
+        with pytest.raises(ValueError, match="Unsupported filter operator"):
+            table.match({"chunk": {"$regex": "x"}})
@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the FAISS vector store."""
+
+import numpy as np
+import pytest
+
+from repoqa.storage.faiss_store import FaissVectorStore, get_faiss_directory
+
+
+def make_data(count, dim=32, seed=0):
+    """Random embeddings with matching metadata."""
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((count, dim)).astype(np.float32)
+    metadata = [
+        {"file_path": f"file{i % 5}.py", "chunk": i, "content": f"chunk {i}"}
+        for i in range(count)
+    ]
+    return embeddings, metadata
+
+
+class TestFaissVectorStore:
+    """Test suite for FaissVectorStore."""
+
+    def test_invalid_index_type(self):
+        """Test that unknown index types are rejected."""
+        with pytest.raises(ValueError, match="Unsupported index type"):
+            FaissVectorStore(index_type="lsh")
+
+    def test_add_length_mismatch(self):
+        """Test adding embeddings and metadata of different lengths."""
+        store = FaissVectorStore()
+
+        with pytest.raises(ValueError, match="same length"):
+            store.add([[0.1, 0.2]], [])
+
+    def test_search_empty_store(self):
+        """Test searching before anything was added."""
+        assert FaissVectorStore().search([0.1, 0.2]) == []
+
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivfpq"])
+    def test_search_finds_exact_match(self, index_type):
+        """Test that each index type returns the query vector first."""
+        embeddings, metadata = make_data(512)
+        store = FaissVectorStore(index_type=index_type)
+        store.add(embeddings, metadata)
+
+        results = store.search(embeddings[42].tolist(), top_k=3)
+
+        assert store.built_index_type == index_type
+        assert len(results) == 3
+        assert results[0]["chunk"] == 42
+        assert results[0]["content"] == "chunk 42"
+        assert results[0]["file_path"] == "file2.py"
+        assert results[0]["score"] == pytest.approx(0.0, abs=0.05)
+
+    def test_search_accepts_nested_query(self):
+        """Test that [[...]] queries are flattened like ChromaVectorStore."""
+        embeddings, metadata = make_data(10)
+        store = FaissVectorStore()
+        store.add(embeddings, metadata)
+
+        results = store.search([embeddings[3].tolist()], top_k=1)
+
+        assert results[0]["chunk"] == 3
+
+    def test_search_batch_matches_search(self):
+        """Test that batched queries return the same results as search."""
+        embeddings, metadata = make_data(100)
+        store = FaissVectorStore()
+        store.add(embeddings, metadata)
+
+        results = store.search_batch(
+            embeddings[:3], top_k=4, metadata_filter={"file_path": "file1.py"}
+        )
+
+        assert len(results) == 3
+        for query, batch_results in zip(embeddings[:3], results):
+            single = store.search(
+                query, top_k=4, metadata_filter={"file_path": "file1.py"}
+            )
+            assert [r["chunk"] for r in batch_results] == [r["chunk"] for r in single]
+            assert [r["score"] for r in batch_results] == pytest.approx(
+                [r["score"] for r in single], abs=1e-5
+            )
+        assert store.search_batch([]) == []
+
+    def test_search_with_metadata_filter(self):
+        """Test that filters restrict results to matching rows."""
+        embeddings, metadata = make_data(100)
+        store = FaissVectorStore()
+        store.add(embeddings, metadata)
+
+        results = store.search(
+            embeddings[0], top_k=5, metadata_filter={"file_path": "file1.py"}
+        )
+
+        assert len(results) == 5
+        assert all(r["file_path"] == "file1.py" for r in results)
+        assert store.search(embeddings[0], metadata_filter={"file_path": "x"}) == []
+
+    def test_auto_index_type_upgrades_with_size(self):
+        """Test that auto mode rebuilds into HNSW once the threshold is hit."""
+        embeddings, metadata = make_data(300)
+        store = FaissVectorStore(hnsw_threshold=200)
+
+        store.add(embeddings[:100], metadata[:100])
+        assert store.built_index_type == "flat"
+
+        store.add(embeddings[100:], metadata[100:])
+        assert store.built_index_type == "hnsw"
+        assert store.count() == 300
+        assert store.search(embeddings[50], top_k=1)[0]["chunk"] == 50
+        assert store.search(embeddings[250], top_k=1)[0]["chunk"] == 250
+
+    def test_persist_and_reload_memory_mapped(self, tmp_path):
+        """Test that a persisted store reloads and accepts further adds."""
+        embeddings, metadata = make_data(200)
+        store = FaissVectorStore("repo", persist_directory=str(tmp_path))
+        store.add(embeddings[:150], metadata[:150])
+
+        assert (tmp_path / "faiss" / "repo" / "index.faiss").exists()
+        assert get_faiss_directory(str(tmp_path), "repo") == store.directory
+
+        reloaded = FaissVectorStore("repo", persist_directory=str(tmp_path))
+        assert reloaded._mmapped
+        assert reloaded.count() == 150
+        assert reloaded.search(embeddings[7], top_k=1)[0]["chunk"] == 7
+
+        reloaded.add(embeddings[150:], metadata[150:])
+        assert not reloaded._mmapped
+
+        final = FaissVectorStore("repo", persist_directory=str(tmp_path), mmap=False)
+        assert final.count() == 200
+        assert final.search(embeddings[180], top_k=1)[0]["content"] == "chunk 180"
@@ -0,0 +1,67 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the LangChain ChromaDB store."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+
+@pytest.fixture
+def store():
+    """LangChainChromaStore with Chroma and the embedding model mocked."""
+    with patch("repoqa.storage.langchain_chroma.Chroma"), patch(
+        "repoqa.storage.langchain_chroma.SentenceTransformerEmbedding"
+    ), patch("repoqa.storage.langchain_chroma.get_chroma_client") as get_client:
+        get_client.return_value = Mock()
+        from repoqa.storage.langchain_chroma import LangChainChromaStore
+
+        yield LangChainChromaStore(
+            collection_name="test-collection", persist_directory="/path/to/db"
+        )
+
+
+class TestLangChainChromaStore:
+    """Test suite for LangChainChromaStore."""
+
+    def test_is_vector_store(self, store):
+        """Test that the store implements the VectorStore interface."""
+        from repoqa.storage.vector_store import VectorStore
+
+        assert isinstance(store, VectorStore)
+        store.client.get_collection.assert_called_once_with(name="test-collection")
+
+    def test_search(self, store):
+        """Test that search returns content, metadata and distance."""
+        store.collection.query.return_value = {
+            "documents": [["def a(): pass"]],
+            "metadatas": [[{"file_path": "a.py"}]],
+            "distances": [[0.25]],
+        }
+
+        results = store.search([0.1, 0.2], top_k=1, metadata_filter={"x": 1})
+
+        assert results == [
+            {"file_path": "a.py", "content": "def a(): pass", "score": 0.25}
+        ]
+        query_kwargs = store.collection.query.call_args[1]
+        assert query_kwargs["query_embeddings"] == [[0.1, 0.2]]
+        assert query_kwargs["where"] == {"x": 1}
+
+    def test_search_batch(self, store):
+        """Test that several queries share one collection.query call."""
+        store.collection.query.return_value = {
+            "documents": [["code a"], ["code b"]],
+            "metadatas": [[{"file_path": "a.py"}], [None]],
+            "distances": [[0.1], [0.2]],
+        }
+
+        results = store.search_batch([[0.1], [0.2]], top_k=1)
+
+        assert results == [
+            [{"file_path": "a.py", "content": "code a", "score": 0.1}],
+            [{"content": "code b", "score": 0.2}],
+        ]
+        store.collection.query.assert_called_once()
+        assert "where" not in store.collection.query.call_args[1]
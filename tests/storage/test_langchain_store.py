@@ -0,0 +1,88 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the LangChain interface to the vector stores."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from repoqa.storage.langchain_store import LangChainVectorStore
+from repoqa.storage.numpy_store import NumpyVectorStore
+
+
+@pytest.fixture
+def embedding():
+    """Embedding function mapping texts onto two dimensions by length."""
+    embedding = Mock()
+    embedding.embed_documents.side_effect = lambda texts: [
+        [float(len(text)), 1.0] for text in texts
+    ]
+    embedding.embed_query.side_effect = lambda text: [float(len(text)), 1.0]
+    return embedding
+
+
+@pytest.fixture
+def store(embedding):
+    """Adapter over an in-memory NumPy store with three chunks of one file."""
+    store = LangChainVectorStore(NumpyVectorStore(), embedding)
+    store.add_texts(
+        ["a", "bbbb", "cccccccc"],
+        [{"file_path": "x.py", "chunk_index": i} for i in range(3)],
+    )
+    return store
+
+
+class TestLangChainVectorStore:
+    """Test suite for LangChainVectorStore."""
+
+    def test_similarity_search_with_score(self, store):
+        """Test that documents come back with cosine distances."""
+        results = store.similarity_search_with_score("bbb", k=2)
+
+        assert [doc.page_content for doc, _ in results] == ["bbbb", "cccccccc"]
+        assert results[0][0].metadata == {"file_path": "x.py", "chunk_index": 1}
+        assert 0.0 <= results[0][1] < results[1][1]
+
+    def test_similarity_search_filter(self, store):
+        """Test that filters restrict the search."""
+        docs = store.similarity_search("a", k=3, filter={"chunk_index": {"$gt": 0}})
+
+        assert [doc.page_content for doc in docs] == ["bbbb", "cccccccc"]
+        assert "score" not in docs[0].metadata
+
+    def test_get(self, store):
+        """Test Chroma-style metadata lookups."""
+        found = store.get(
+            where={
+                "$and": [{"file_path": "x.py"}, {"chunk_index": {"$in": [0, 2]}}]
+            }
+        )
+
+        assert found == {
+            "documents": ["a", "cccccccc"],
+            "metadatas": [
+                {"file_path": "x.py", "chunk_index": 0},
+                {"file_path": "x.py", "chunk_index": 2},
+            ],
+        }
+
+    def test_add_embeddings_skips_embedding(self, embedding):
+        """Test that precomputed embeddings are stored as given."""
+        store = LangChainVectorStore(NumpyVectorStore(), embedding)
+        store.add_embeddings(["x = 1"], [[0.0, 1.0]], [{"file_path": "y.py"}])
+
+        embedding.embed_documents.assert_not_called()
+        assert store.get(where={"file_path": "y.py"})["documents"] == ["x = 1"]
+
+    def test_from_texts(self, embedding, tmp_path):
+        """Test creating a persisted store through get_vector_store."""
+        store = LangChainVectorStore.from_texts(
+            ["a", "bb"],
+            embedding,
+            collection_name="c",
+            persist_directory=str(tmp_path),
+        )
+
+        assert store.store.count() == 2
+        assert (tmp_path / "numpy" / "c").is_dir()
@@ -0,0 +1,78 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Tests for collection manifests."""
+
+from repoqa.storage.manifest import (
+    build_manifest,
+    describe_projection,
+    describe_vector_store,
+    manifest_mismatches,
+    merge_manifest,
+    read_manifest,
+)
+
+
+class TestManifest:
+    """Test suite for manifest helpers."""
+
+    def test_build_manifest_omits_unknown_fields(self):
+        """Test that None fields are left out, as ChromaDB rejects them."""
+        manifest = build_manifest("model", "GitRepoIndexer", 100)
+
+        assert manifest["embedding_model"] == "model"
+        assert manifest["complete"] is False
+        assert "embedding_dim" not in manifest
+        assert "commit" not in manifest
+
+    def test_describe_projection(self):
+        """Test projection descriptions."""
+        assert describe_projection() == "none"
+        assert describe_projection("pca", 128) == "pca:128"
+        assert describe_projection("pca", 128, "/p.npz") == "shared:/p.npz"
+
+    def test_describe_vector_store(self):
+        """Test that the quantized store's codes are part of its description."""
+        assert describe_vector_store() == "chroma"
+        assert describe_vector_store("faiss", {"index_type": "hnsw"}) == "faiss"
+        assert describe_vector_store("quantized") == "quantized:int8"
+        assert (
+            describe_vector_store("quantized", {"quantization": "binary"})
+            == "quantized:binary"
+        )
+
+    def test_merge_and_read_round_trip(self):
+        """Test that merging keeps other metadata and drops index settings."""
+        manifest = build_manifest("model", "GitRepoIndexer", 100, commit="abc")
+        metadata = {"hnsw:space": "cosine", "owner": "me", "repoqa_stale": 1}
+
+        merged = merge_manifest(metadata, manifest)
+
+        assert merged["owner"] == "me"
+        assert "hnsw:space" not in merged
+        assert "repoqa_stale" not in merged
+        assert read_manifest(merged) == manifest
+        assert read_manifest(None) is None
+        assert read_manifest({"owner": "me"}) is None
+
+    def test_mismatches_compare_known_compatibility_fields(self):
+        """Test that only compatibility fields present in expected are compared."""
+        stored = build_manifest(
+            "model", "GitRepoIndexer", 100, embedding_dim=384, commit="abc"
+        )
+        expected = build_manifest("model", "GitRepoIndexer", 100, commit="def")
+
+        assert manifest_mismatches(stored, expected) == []
+        assert manifest_mismatches(
+            stored, {**expected, "embedding_dim": 256, "projection": "pca:256"}
+        ) == ["embedding_dim", "projection"]
+
+    def test_vector_store_defaults_to_chroma(self):
+        """Test that manifests without a backend were written by Chroma."""
+        stored = build_manifest("model", "GitRepoIndexer", 100)
+        del stored["vector_store"]
+
+        assert manifest_mismatches(stored, {"vector_store": "chroma"}) == []
+        assert manifest_mismatches(stored, {"vector_store": "faiss"}) == [
+            "vector_store"
+        ]
@@ -0,0 +1,108 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the memory-mapped NumPy vector store."""
+
+import numpy as np
+import pytest
+
+from repoqa.storage.numpy_store import NumpyVectorStore
+
+
+def make_data(count, dim=16, seed=0):
+    """Random embeddings with matching metadata."""
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((count, dim)).astype(np.float32)
+    metadata = [
+        {"file_path": f"file{i % 4}.py", "chunk": i, "content": f"chunk {i}"}
+        for i in range(count)
+    ]
+    return embeddings, metadata
+
+
+class TestNumpyVectorStore:
+    """Test suite for NumpyVectorStore."""
+
+    def test_search_empty_store(self):
+        """Test searching before anything was added."""
+        assert NumpyVectorStore().search([0.1, 0.2]) == []
+
+    def test_add_validation(self):
+        """Test length and dimension checks on add."""
+        store = NumpyVectorStore()
+        with pytest.raises(ValueError, match="same length"):
+            store.add([[0.1, 0.2]], [])
+
+        store.add([[0.1, 0.2]], [{"content": "a"}])
+        with pytest.raises(ValueError, match="dimension 2"):
+            store.add([[0.1, 0.2, 0.3]], [{"content": "b"}])
+
+    def test_search_is_exact_and_sorted(self):
+        """Test that results match a brute-force ranking."""
+        embeddings, metadata = make_data(200)
+        store = NumpyVectorStore()
+        store.add(embeddings[:120], metadata[:120])
+        store.add(embeddings[120:], metadata[120:])
+
+        query = embeddings[150]
+        results = store.search(query.tolist(), top_k=5)
+
+        normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        assert [r["chunk"] for r in results] == expected.tolist()
+        assert results[0]["score"] == pytest.approx(0.0, abs=1e-5)
+        assert results[0]["content"] == "chunk 150"
+        scores = [r["score"] for r in results]
+        assert scores == sorted(scores)
+
+    def test_search_batch_matches_search(self):
+        """Test that batched queries return the same results as search."""
+        embeddings, metadata = make_data(60)
+        store = NumpyVectorStore()
+        store.add(embeddings, metadata)
+
+        for metadata_filter in (None, {"file_path": "file2.py"}):
+            results = store.search_batch(
+                embeddings[:3].tolist(), top_k=3, metadata_filter=metadata_filter
+            )
+            for query, batch_results in zip(embeddings[:3], results):
+                single = store.search(query, top_k=3, metadata_filter=metadata_filter)
+                assert [r["chunk"] for r in batch_results] == [
+                    r["chunk"] for r in single
+                ]
+                assert [r["score"] for r in batch_results] == pytest.approx(
+                    [r["score"] for r in single], abs=1e-5
+                )
+        assert store.search_batch([]) == []
+
+    def test_search_with_metadata_filter(self):
+        """Test that filters restrict results to matching rows."""
+        embeddings, metadata = make_data(50)
+        store = NumpyVectorStore()
+        store.add(embeddings, metadata)
+
+        results = store.search(
+            [embeddings[0].tolist()],
+            top_k=20,
+            metadata_filter={"file_path": "file1.py"},
+        )
+
+        assert len(results) == 13
+        assert all(r["file_path"] == "file1.py" for r in results)
+        assert store.search(embeddings[0], metadata_filter={"chunk": -1}) == []
+
+    def test_persist_and_reload_memory_mapped(self, tmp_path):
+        """Test that persisted vectors reload as a read-only memmap."""
+        embeddings, metadata = make_data(30)
+        store = NumpyVectorStore("repo", persist_directory=str(tmp_path))
+        store.add(embeddings[:20], metadata[:20])
+        store.add(embeddings[20:], metadata[20:])
+
+        assert (tmp_path / "numpy" / "repo" / "vectors.npy").exists()
+
+        reloaded = NumpyVectorStore("repo", persist_directory=str(tmp_path))
+
+        assert isinstance(reloaded.vectors, np.memmap)
+        assert not reloaded.vectors.flags.writeable
+        assert reloaded.count() == 30
+        assert reloaded.search(embeddings[25], top_k=1)[0]["chunk"] == 25
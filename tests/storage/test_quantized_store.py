@@ -0,0 +1,203 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the quantized vector store."""
+
+import numpy as np
+import pytest
+
+from repoqa.storage.numpy_store import NumpyVectorStore
+from repoqa.storage.quantized_store import (
+    QuantizedVectorStore,
+    get_quantized_directory,
+)
+
+
+def make_data(count, dim=32, seed=0):
+    """Clustered embeddings with matching metadata."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((8, dim))
+    embeddings = centers[rng.integers(0, 8, count)] + 0.3 * rng.standard_normal(
+        (count, dim)
+    )
+    metadata = [
+        {"file_path": f"file{i % 4}.py", "chunk": i, "content": f"chunk {i}"}
+        for i in range(count)
+    ]
+    return embeddings.astype(np.float32), metadata
+
+
+def exact_chunks(embeddings, metadata, queries, top_k):
+    """Chunk ids of the exact top results per query."""
+    store = NumpyVectorStore()
+    store.add(embeddings, metadata)
+    return [[r["chunk"] for r in rows] for rows in store.search_batch(queries, top_k)]
+
+
+@pytest.mark.parametrize("quantization", ["int8", "binary"])
+class TestQuantizedVectorStore:
+    """Test suite for QuantizedVectorStore."""
+
+    def test_search_empty_store(self, quantization):
+        """Test searching before anything was added."""
+        assert QuantizedVectorStore(quantization=quantization).search([0.1, 0.2]) == []
+
+    def test_add_validation(self, quantization):
+        """Test length and dimension checks on add."""
+        store = QuantizedVectorStore(quantization=quantization)
+        with pytest.raises(ValueError, match="same length"):
+            store.add([[0.1, 0.2]], [])
+
+        store.add([[0.1, 0.2]], [{"content": "a"}])
+        with pytest.raises(ValueError, match="dimension 2"):
+            store.add([[0.1, 0.2, 0.3]], [{"content": "b"}])
+
+    def test_rerank_matches_exact_search(self, quantization):
+        """Test that re-ranking a large enough shortlist gives exact results."""
+        embeddings, metadata = make_data(300)
+        store = QuantizedVectorStore(quantization=quantization, rerank_factor=60)
+        store.add(embeddings[:200], metadata[:200])
+        store.add(embeddings[200:], metadata[200:])
+
+        queries = embeddings[[5, 150, 250]]
+        results = store.search_batch(queries, top_k=5)
+
+        assert [[r["chunk"] for r in rows] for rows in results] == exact_chunks(
+            embeddings, metadata, queries, 5
+        )
+        assert results[0][0]["score"] == pytest.approx(0.0, abs=1e-5)
+        assert results[0][0]["content"] == "chunk 5"
+        scores = [r["score"] for r in results[1]]
+        assert scores == sorted(scores)
+
+    def test_codes_only_search(self, quantization):
+        """Test ranking by codes alone with the re-rank disabled."""
+        embeddings, metadata = make_data(100)
+        store = QuantizedVectorStore(quantization=quantization, rerank_factor=0)
+        store.add(embeddings, metadata)
+
+        results = store.search(embeddings[42], top_k=3)
+
+        assert len(results) == 3
+        assert results[0]["chunk"] == 42
+        assert all(0.0 <= r["score"] <= 2.0 for r in results)
+
+    def test_search_with_filter(self, quantization):
+        """Test that metadata filters restrict candidates before ranking."""
+        embeddings, metadata = make_data(80)
+        store = QuantizedVectorStore(quantization=quantization)
+        store.add(embeddings, metadata)
+
+        results = store.search(
+            embeddings[0], top_k=50, metadata_filter={"file_path": "file1.py"}
+        )
+
+        assert len(results) == 20
+        assert {r["file_path"] for r in results} == {"file1.py"}
+        assert store.search(embeddings[0], metadata_filter={"chunk": -1}) == []
+
+    def test_persistence(self, tmp_path, quantization):
+        """Test that codes, vectors and settings are reloaded from disk."""
+        embeddings, metadata = make_data(50)
+        store = QuantizedVectorStore("repo", str(tmp_path), quantization)
+        store.add(embeddings[:30], metadata[:30])
+        store.add(embeddings[30:], metadata[30:])
+        expected = store.search(embeddings[40], top_k=3)
+
+        reloaded = QuantizedVectorStore("repo", str(tmp_path), quantization)
+
+        assert reloaded.count() == 50
+        assert isinstance(reloaded.vectors, np.memmap)
+        assert not isinstance(reloaded.codes, np.memmap)
+        assert reloaded.search(embeddings[40], top_k=3) == expected
+        assert (tmp_path / "quantized" / "repo" / "codes.npy").exists()
+
+    def test_memory_report(self, tmp_path, quantization):
+        """Test code size and compression relative to float32 vectors."""
+        embeddings, metadata = make_data(16, dim=64)
+        store = QuantizedVectorStore("repo", str(tmp_path), quantization)
+        store.add(embeddings, metadata)
+
+        report = store.memory_report()
+
+        assert report["count"] == 16
+        assert report["float32_bytes"] == 16 * 64 * 4
+        expected = 4.0 if quantization == "int8" else 32.0
+        assert report["compression"] == expected
+        assert report["resident_bytes"] == report["code_bytes"]
+
+
+class TestQuantizedStoreSettings:
+    """Test suite for quantized store settings."""
+
+    def test_unsupported_quantization(self):
+        """Test that unknown quantizations are rejected."""
+        with pytest.raises(ValueError, match="Unsupported quantization"):
+            QuantizedVectorStore(quantization="int4")
+
+    def test_reload_with_other_quantization(self, tmp_path):
+        """Test that a collection cannot be opened with different codes."""
+        store = QuantizedVectorStore("repo", str(tmp_path), "int8")
+        store.add([[0.1, 0.2]], [{"content": "a"}])
+
+        with pytest.raises(ValueError, match="int8 quantization"):
+            QuantizedVectorStore("repo", str(tmp_path), "binary")
+
+    def test_int8_clips_values_outside_fitted_range(self):
+        """Test that adds beyond the fitted ranges are clipped until a refit."""
+        store = QuantizedVectorStore(quantization="int8")
+        store.add([[0.1, 1.0]] * 32, [{"content": "a"}] * 32)
+        store.add([[1.0, 0.1]], [{"content": "b"}])
+
+        assert store.fitted_rows == 32
+        assert store.codes.dtype == np.int8
+        assert store.codes[-1, 0] == 127
+
+    @pytest.mark.parametrize("quantization", ["int8", "binary"])
+    def test_single_vector_first_add(self, quantization):
+        """Test that a one-vector first add does not fit degenerate codes."""
+        embeddings, metadata = make_data(40)
+        store = QuantizedVectorStore(quantization=quantization, rerank_factor=0)
+        store.add(embeddings[:1], metadata[:1])
+
+        # Unit ranges: the vector's own sign bits, or a scale of 1
+        assert store.fitted_rows == 0
+        if quantization == "binary":
+            expected = np.packbits(embeddings[:1] > 0, axis=1)
+            assert np.array_equal(store.codes, expected)
+        else:
+            assert np.array_equal(store.scales, np.ones(32))
+
+        for i in range(1, 40):
+            store.add(embeddings[i : i + 1], metadata[i : i + 1])
+
+        # Fitted once 32 vectors were stored; every code was re-encoded
+        assert store.fitted_rows == 32
+        reference = QuantizedVectorStore(quantization=quantization)
+        reference.add(embeddings[:32], metadata[:32])
+        assert np.array_equal(store.codes[:32], reference.codes)
+        assert len({row.tobytes() for row in store.codes}) > 1
+        top = store.search(embeddings[5], top_k=1)[0]
+        assert top["chunk"] == 5
+
+    def test_refit_as_store_doubles(self, tmp_path):
+        """Test that code ranges are refitted and persisted as the store grows."""
+        embeddings, metadata = make_data(130)
+        store = QuantizedVectorStore("repo", str(tmp_path), "binary")
+        store.add(embeddings[:40], metadata[:40])
+        thresholds = store.thresholds.copy()
+        store.add(embeddings[40:79], metadata[40:79])
+        assert store.fitted_rows == 40
+        assert np.array_equal(store.thresholds, thresholds)
+
+        store.add(embeddings[79:130], metadata[79:130])
+
+        assert store.fitted_rows == 130
+        assert np.allclose(store.thresholds, store.vectors.mean(axis=0), atol=1e-6)
+        reloaded = QuantizedVectorStore("repo", str(tmp_path), "binary")
+        assert reloaded.fitted_rows == 130
+        assert np.array_equal(reloaded.codes, store.codes)
+
+    def test_directory(self):
+        """Test the collection directory layout."""
+        assert get_quantized_directory("/data", "repo") == "/data/quantized/repo"
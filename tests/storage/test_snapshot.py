@@ -0,0 +1,161 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Tests for snapshot archives."""
+
+import json
+import tarfile
+
+import numpy as np
+import pytest
+
+from repoqa.storage.snapshot import (
+    SNAPSHOT_FILE,
+    SNAPSHOT_VERSION,
+    open_snapshot,
+    write_snapshot,
+)
+
+
+def make_pages(count=10, dim=4, page_size=4):
+    """Pages of ids, embeddings, documents and metadatas."""
+    vectors = np.arange(count * dim, dtype=np.float64).reshape(count, dim)
+    pages = []
+    for start in range(0, count, page_size):
+        end = min(start + page_size, count)
+        pages.append(
+            (
+                [f"id{i}" for i in range(start, end)],
+                vectors[start:end],
+                [f"doc {i}" for i in range(start, end)],
+                [
+                    {"file_path": f"f{i}.py"} if i % 2 else None
+                    for i in range(start, end)
+                ],
+            )
+        )
+    return vectors, pages
+
+
+class TestSnapshot:
+    """Test suite for snapshot archives."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that ids, float32 vectors, content and metadata survive."""
+        vectors, pages = make_pages()
+        projection = tmp_path / "projection.npz"
+        projection.write_bytes(b"projection")
+        path = str(tmp_path / "snap.tar.gz")
+
+        info = write_snapshot(
+            path,
+            "repo",
+            10,
+            pages,
+            manifest={"embedding_model": "m", "complete": True},
+            settings={"hnsw:space": "cosine"},
+            projection_path=str(projection),
+        )
+
+        assert info["dim"] == 4
+        with open_snapshot(path) as snapshot:
+            assert snapshot.info == info
+            assert snapshot.ids == [f"id{i}" for i in range(10)]
+            assert snapshot.vectors.dtype == np.float32
+            np.testing.assert_array_equal(snapshot.vectors, vectors)
+            assert snapshot.table.content(3) == "doc 3"
+            assert snapshot.metadata(3) == {"file_path": "f3.py"}
+            assert snapshot.metadata(4) is None
+            with open(snapshot.projection_path, "rb") as f:
+                assert f.read() == b"projection"
+
+    def test_empty_collection(self, tmp_path):
+        """Test snapshots of collections without documents."""
+        path = str(tmp_path / "snap.tar.gz")
+
+        write_snapshot(path, "repo", 0, [])
+
+        with open_snapshot(path) as snapshot:
+            assert snapshot.ids == []
+            assert snapshot.info["dim"] == 0
+            assert snapshot.projection_path is None
+
+    def test_count_mismatch(self, tmp_path):
+        """Test that a short page stream is rejected."""
+        _, pages = make_pages()
+
+        with pytest.raises(ValueError, match="Expected 12 documents"):
+            write_snapshot(str(tmp_path / "snap.tar.gz"), "repo", 12, pages)
+
+    def test_rejects_other_archives(self, tmp_path):
+        """Test that archives without snapshot files are rejected."""
+        path = tmp_path / "other.tar.gz"
+        (tmp_path / "file.txt").write_text("x")
+        with tarfile.open(path, "w:gz") as archive:
+            archive.add(tmp_path / "file.txt", arcname="file.txt")
+
+        with pytest.raises(ValueError, match="not a snapshot archive"):
+            with open_snapshot(str(path)):
+                pass
+
+    def test_rejects_newer_versions(self, tmp_path):
+        """Test that snapshots from a newer format version are rejected."""
+        _, pages = make_pages(count=2)
+        path = str(tmp_path / "snap.tar.gz")
+        write_snapshot(path, "repo", 2, pages)
+
+        # Rewrite snapshot.json with a future version
+        workdir = tmp_path / "extracted"
+        with tarfile.open(path, "r:gz") as archive:
+            names = archive.getnames()
+            for name in names:
+                (workdir / name).parent.mkdir(parents=True, exist_ok=True)
+                (workdir / name).write_bytes(archive.extractfile(name).read())
+        info = json.loads((workdir / SNAPSHOT_FILE).read_text())
+        info["version"] = SNAPSHOT_VERSION + 1
+        (workdir / SNAPSHOT_FILE).write_text(json.dumps(info))
+        with tarfile.open(path, "w:gz") as archive:
+            for name in names:
+                archive.add(workdir / name, arcname=name)
+
+        with pytest.raises(ValueError, match="newer than the supported"):
+            with open_snapshot(path):
+                pass
+
+    def test_index_directories(self, tmp_path):
+        """Test that index directories are archived with their nesting."""
+        _, pages = make_pages(count=2)
+        lexical = tmp_path / "lexical"
+        (lexical / "nested").mkdir(parents=True)
+        (lexical / "postings.npy").write_bytes(b"postings")
+        (lexical / "nested" / "extra.json").write_text("{}")
+        path = str(tmp_path / "snap.tar.gz")
+
+        info = write_snapshot(
+            path, "repo", 2, pages, index_directories={"lexical": str(lexical)}
+        )
+
+        assert info["indexes"] == ["lexical"]
+        with open_snapshot(path) as snapshot:
+            directory = snapshot.index_directories["lexical"]
+            with open(f"{directory}/postings.npy", "rb") as f:
+                assert f.read() == b"postings"
+            with open(f"{directory}/nested/extra.json") as f:
+                assert f.read() == "{}"
+
+    def test_ignores_paths_outside_indexes(self, tmp_path):
+        """Test that members escaping the index directory are not extracted."""
+        _, pages = make_pages(count=2)
+        path = str(tmp_path / "snap.tar.gz")
+        write_snapshot(path, "repo", 2, pages)
+        (tmp_path / "evil.txt").write_text("x")
+        with tarfile.open(path, "r:gz") as archive:
+            names = archive.getnames()
+            archive.extractall(tmp_path / "extracted")
+        with tarfile.open(path, "w:gz") as archive:
+            for name in names:
+                archive.add(tmp_path / "extracted" / name, arcname=name)
+            archive.add(tmp_path / "evil.txt", arcname="indexes/../../evil.txt")
+
+        with open_snapshot(path) as snapshot:
+            assert snapshot.index_directories == {}
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Unit tests for the vector store factory."""
+
+from unittest.mock import patch
+
+import pytest
+
+from repoqa.storage.faiss_store import FaissVectorStore
+from repoqa.storage.numpy_store import NumpyVectorStore
+from repoqa.storage.quantized_store import QuantizedVectorStore
+from repoqa.storage.store_factory import get_vector_store
+
+
+class TestStoreFactory:
+    """Test suite for get_vector_store."""
+
+    def test_faiss_backend(self, tmp_path):
+        """Test creating a FAISS store with its default settings."""
+        store = get_vector_store("repo", str(tmp_path), backend="faiss")
+
+        assert isinstance(store, FaissVectorStore)
+        assert store.collection_name == "repo"
+        assert store.index_type == "auto"
+
+    def test_numpy_backend(self, tmp_path):
+        """Test creating a NumPy store."""
+        store = get_vector_store("repo", str(tmp_path), backend="numpy")
+
+        assert isinstance(store, NumpyVectorStore)
+        assert store.persist_directory == str(tmp_path)
+
+    def test_quantized_backend(self, tmp_path):
+        """Test creating a quantized store with its default settings."""
+        store = get_vector_store("repo", str(tmp_path), backend="quantized")
+
+        assert isinstance(store, QuantizedVectorStore)
+        assert store.quantization == "int8"
+        assert store.rerank_factor == 10
+
+    @patch("repoqa.storage.chroma_store.ChromaVectorStore")
+    def test_chroma_backend(self, mock_store):
+        """Test creating a Chroma store."""
+        store = get_vector_store("repo", "/path/to/db", backend="chroma")
+
+        assert store == mock_store.return_value
+        mock_store.assert_called_once_with(
+            collection_name="repo", persist_directory="/path/to/db"
+        )
+
+    def test_backend_options(self, tmp_path):
+        """Test that backend-specific settings are passed to the store."""
+        store = get_vector_store(
+            "repo", str(tmp_path), backend="faiss", index_type="hnsw", mmap=False
+        )
+
+        assert store.index_type == "hnsw"
+        assert store.mmap is False
+
+    @patch("repoqa.storage.chroma_store.ChromaVectorStore")
+    def test_default_backend(self, mock_store):
+        """Test that Chroma, the store the pipelines use, is the default."""
+        assert get_vector_store("repo") == mock_store.return_value
+
+    def test_unsupported_backend(self):
+        """Test that unknown backends are rejected."""
+        with pytest.raises(ValueError, match="Unsupported vector store backend"):
+            get_vector_store("repo", backend="qdrant")
@@ -0,0 +1,70 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Tests for disk usage and access tracking."""
+
+import json
+
+from repoqa.storage.usage import ACCESS_RESOLUTION_S, AccessLog, path_size
+
+
+class TestPathSize:
+    """Test suite for path_size."""
+
+    def test_file_directory_and_missing(self, tmp_path):
+        """Test sizes of files, directory trees and missing paths."""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a.bin").write_bytes(b"x" * 10)
+        (tmp_path / "sub" / "b.bin").write_bytes(b"x" * 5)
+
+        assert path_size(str(tmp_path / "a.bin")) == 10
+        assert path_size(str(tmp_path)) == 15
+        assert path_size(str(tmp_path / "missing")) == 0
+
+
+class TestAccessLog:
+    """Test suite for AccessLog."""
+
+    def test_touch_is_persisted_and_throttled(self, tmp_path):
+        """Test that repeated accesses within the resolution are not rewritten."""
+        path = tmp_path / "log.json"
+        log = AccessLog(str(path))
+
+        log.touch("collections", "repo", now=10.0)
+        log.touch("collections", "repo", now=10.0 + ACCESS_RESOLUTION_S / 2)
+        assert log.last_access("collections", "repo") == 10.0
+
+        log.touch("collections", "repo", now=10.0 + ACCESS_RESOLUTION_S)
+        assert AccessLog(str(path)).last_access("collections", "repo") == (
+            10.0 + ACCESS_RESOLUTION_S
+        )
+
+    def test_logs_from_several_processes_are_merged(self, tmp_path):
+        """Test that saving keeps entries written by another log instance."""
+        path = str(tmp_path / "log.json")
+        first, second = AccessLog(path), AccessLog(path)
+
+        first.touch("collections", "a", now=100.0)
+        second.touch("clones", "/clones/b", now=200.0)
+
+        with open(path) as f:
+            data = json.load(f)
+        assert data == {"collections": {"a": 100.0}, "clones": {"/clones/b": 200.0}}
+
+    def test_forget(self, tmp_path):
+        """Test that forgotten entries are removed from disk."""
+        path = str(tmp_path / "log.json")
+        log = AccessLog(path)
+        log.touch("collections", "a", now=100.0)
+
+        log.forget("collections", "a")
+
+        assert log.last_access("collections", "a") is None
+        assert AccessLog(path).last_access("collections", "a") is None
+
+    def test_unreadable_log_starts_empty(self, tmp_path):
+        """Test that a corrupt file is treated as an empty log."""
+        path = tmp_path / "log.json"
+        path.write_text("{not json")
+
+        assert AccessLog(str(path)).last_access("collections", "a") is None
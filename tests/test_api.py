@@ -3,8 +3,9 @@
 
 """Integration tests for API endpoints."""
 
+import asyncio
 import sys
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, PropertyMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -23,6 +24,34 @@ def client():
         return TestClient(app)
 
 
+def on_event_loop(*_, **__):
+    """Check whether the caller runs on an event loop thread."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+@pytest.fixture(autouse=True)
+def no_access_log():
+    """Keep /ask from writing an access log into the configured directory."""
+    with patch("repoqa.api.record_access") as mock_record_access:
+        yield mock_record_access
+
+
+@pytest.fixture
+def admin_headers():
+    """Configure an admin token and return headers presenting it."""
+    from repoqa.config import config
+
+    with patch.object(
+        type(config), "api_admin_token", new_callable=PropertyMock
+    ) as mock_token:
+        mock_token.return_value = "secret"
+        yield {"Authorization": "Bearer secret"}
+
+
 class TestAPI:
     """Test suite for API endpoints."""
 
@@ -45,14 +74,14 @@ class TestAPI:
         assert data["status"] == "healthy"
 
     @patch("repoqa.api.RepoQA")
-    @patch("repoqa.api.collection_exists_and_has_documents")
+    @patch("repoqa.api.validate_collection")
     @patch("repoqa.api.get_llm")
     def test_ask_endpoint_new_repo(
-        self, mock_get_llm, mock_collection_exists, mock_repoqa, client
+        self, mock_get_llm, mock_validate, mock_repoqa, client
     ):
         """Test ask endpoint with new repository."""
         # Mock collection doesn't exist
-        mock_collection_exists.return_value = False
+        mock_validate.return_value = {"status": "missing", "mismatches": []}
 
         # Mock RepoQA instance
         mock_instance = Mock()
@@ -87,14 +116,14 @@ class TestAPI:
         mock_instance.ask.assert_called_once_with("What is this repo about?")
 
     @patch("repoqa.api.RepoQA")
-    @patch("repoqa.api.collection_exists_and_has_documents")
+    @patch("repoqa.api.validate_collection")
     @patch("repoqa.api.get_llm")
     def test_ask_endpoint_existing_repo(
-        self, mock_get_llm, mock_collection_exists, mock_repoqa, client
+        self, mock_get_llm, mock_validate, mock_repoqa, client
     ):
         """Test ask endpoint with existing indexed repository."""
-        # Mock collection exists
-        mock_collection_exists.return_value = True
+        # Mock collection exists with a matching manifest
+        mock_validate.return_value = {"status": "ok", "mismatches": []}
 
         # Mock RepoQA instance
         mock_instance = Mock()
@@ -123,19 +152,19 @@ class TestAPI:
 
     @patch("repoqa.api.RepoQA")
     @patch("repoqa.api.delete_collection")
-    @patch("repoqa.api.collection_exists_and_has_documents")
+    @patch("repoqa.api.validate_collection")
     @patch("repoqa.api.get_llm")
     def test_ask_endpoint_force_update(
         self,
         mock_get_llm,
-        mock_collection_exists,
+        mock_validate,
         mock_delete_collection,
         mock_repoqa,
         client,
     ):
         """Test ask endpoint with force update."""
         # Mock collection exists but will be deleted
-        mock_collection_exists.return_value = True
+        mock_validate.return_value = {"status": "ok", "mismatches": []}
         mock_delete_collection.return_value = True
 
         # Mock RepoQA instance
@@ -164,14 +193,349 @@ class TestAPI:
         mock_delete_collection.assert_called_once()
         mock_instance.index_repository.assert_called_once()
 
+    @pytest.mark.parametrize("status", ["stale", "incomplete", "unversioned"])
+    @patch("repoqa.api.RepoQA")
+    @patch("repoqa.api.delete_collection")
+    @patch("repoqa.api.validate_collection")
+    @patch("repoqa.api.get_llm")
+    def test_ask_endpoint_rebuilds_invalid_collection(
+        self,
+        mock_get_llm,
+        mock_validate,
+        mock_delete_collection,
+        mock_repoqa,
+        status,
+        client,
+    ):
+        """Test that a collection failing manifest validation is rebuilt."""
+        from repoqa.config import config
+
+        mock_validate.return_value = {"status": status, "mismatches": []}
+        mock_instance = Mock()
+        mock_instance.ask.return_value = "Answer"
+        mock_repoqa.return_value = mock_instance
+
+        response = client.post(
+            "/ask",
+            json={
+                "repo": "https://github.com/test/repo.git",
+                "question": "Test question",
+            },
+        )
+
+        assert response.status_code == 200
+        mock_delete_collection.assert_called_once()
+        mock_instance.index_repository.assert_called_once()
+        expected = mock_validate.call_args[0][2]
+        assert expected["embedding_model"] == config.embedding_model
+        assert expected["chunk_size"] == config.vectorstore_chunk_size
+
+    @patch("repoqa.api.compact_storage")
+    @patch("repoqa.api.RepoQA")
+    @patch("repoqa.api.validate_collection")
+    @patch("repoqa.api.get_llm")
+    def test_ask_endpoint_enforces_disk_quotas(
+        self,
+        mock_get_llm,
+        mock_validate,
+        mock_repoqa,
+        mock_compact,
+        no_access_log,
+        client,
+    ):
+        """Test that indexing evicts old data but keeps the current repo."""
+        from repoqa.config import config
+
+        mock_validate.return_value = {"status": "missing", "mismatches": []}
+        mock_repoqa.return_value.ask.return_value = "Answer"
+        mock_compact.return_value = {"evicted_collections": []}
+
+        with patch.object(
+            type(config),
+            "vectorstore_max_disk_mb",
+            new_callable=PropertyMock,
+            return_value=10,
+        ):
+            response = client.post(
+                "/ask",
+                json={
+                    "repo": "https://github.com/test/repo.git",
+                    "question": "Test question",
+                },
+            )
+
+        assert response.status_code == 200
+        collection_name, clone_path = no_access_log.call_args[0][1:]
+        assert clone_path.endswith("repo")
+        kwargs = mock_compact.call_args[1]
+        assert kwargs["max_collection_bytes"] == 10 * 1024 * 1024
+        assert kwargs["protected_collections"] == [collection_name]
+        assert kwargs["protected_clones"] == [clone_path]
+
+    @patch("repoqa.api.compact_storage")
+    @patch("repoqa.api.delete_collection")
+    @patch("repoqa.api.RepoQA")
+    @patch("repoqa.api.validate_collection")
+    @patch("repoqa.api.get_llm")
+    def test_ask_endpoint_runs_off_event_loop(
+        self,
+        mock_get_llm,
+        mock_validate,
+        mock_repoqa,
+        mock_delete,
+        mock_compact,
+        client,
+    ):
+        """Test that /ask validates, rebuilds and indexes in the threadpool."""
+        from repoqa.config import config
+
+        calls = {}
+
+        def record(name, result=None):
+            def call(*_, **__):
+                calls[name] = on_event_loop()
+                return result
+
+            return call
+
+        instance = Mock()
+        instance.index_repository.side_effect = record("index", {})
+        instance.ask.side_effect = record("ask", "Answer")
+        mock_validate.side_effect = record(
+            "validate", {"status": "stale", "mismatches": []}
+        )
+        mock_delete.side_effect = record("delete", True)
+        mock_repoqa.side_effect = record("init", instance)
+        mock_compact.side_effect = record("quotas", {})
+
+        with patch.object(
+            type(config),
+            "vectorstore_max_disk_mb",
+            new_callable=PropertyMock,
+            return_value=10,
+        ):
+            response = client.post(
+                "/ask",
+                json={
+                    "repo": "https://github.com/test/repo.git",
+                    "question": "Test question",
+                },
+            )
+
+        assert response.status_code == 200
+        assert calls == dict.fromkeys(
+            ["validate", "delete", "init", "index", "quotas", "ask"], False
+        )
+
+    @patch("repoqa.api.get_storage_usage")
+    def test_admin_storage(self, mock_usage, client, admin_headers):
+        """Test the storage usage endpoint."""
+        mock_usage.return_value = {"collections": [], "clones": []}
+
+        response = client.get("/admin/storage", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"collections": [], "clones": []}
+
+    @patch("repoqa.api.compact_storage")
+    def test_admin_compact(self, mock_compact, client, admin_headers):
+        """Test that compaction quotas can be overridden per request."""
+        mock_compact.return_value = {"evicted_collections": ["old"]}
+
+        response = client.post(
+            "/admin/compact", json={"max_collections_mb": 1}, headers=admin_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"evicted_collections": ["old"]}
+        assert mock_compact.call_args[1]["max_collection_bytes"] == 1024 * 1024
+        assert mock_compact.call_args[1]["protected_collections"] == []
+
+        assert client.post("/admin/compact", headers=admin_headers).status_code == 200
+        invalid = client.post(
+            "/admin/compact", json={"max_clones_mb": -1}, headers=admin_headers
+        )
+        assert invalid.status_code == 422
+
+    @patch("repoqa.api.compact_storage")
+    @patch("repoqa.api.get_storage_usage")
+    def test_admin_requires_token(self, mock_usage, mock_compact, client):
+        """Test that admin endpoints are disabled or need the bearer token."""
+        from repoqa.config import config
+
+        # Disabled without a configured token
+        assert client.get("/admin/storage").status_code == 403
+        assert client.post("/admin/compact").status_code == 403
+
+        with patch.object(
+            type(config), "api_admin_token", new_callable=PropertyMock
+        ) as mock_token:
+            mock_token.return_value = "secret"
+            for headers in ({}, {"Authorization": "Bearer wrong"}):
+                assert client.get("/admin/storage", headers=headers).status_code == 401
+                response = client.post("/admin/compact", headers=headers)
+                assert response.status_code == 401
+
+        mock_usage.assert_not_called()
+        mock_compact.assert_not_called()
+
+    @patch("repoqa.api.SentenceTransformerEmbedding")
+    @patch("repoqa.api.get_vector_store")
+    @patch("repoqa.api.validate_collection")
+    def test_search_endpoint(self, mock_validate, mock_store, mock_embedding, client):
+        """Test searching several repositories with one query embedding."""
+        from repoqa.storage.collection_manager import get_collection_name
+
+        repos = ["https://github.com/test/a.git", "https://github.com/test/b.git"]
+        stale = get_collection_name("https://github.com/test/c.git")
+        names = [get_collection_name(repo) for repo in repos]
+        mock_validate.side_effect = lambda _, name, __: {
+            "status": "stale" if name == stale else "ok",
+            "mismatches": [],
+        }
+        stores = {
+            names[0]: Mock(**{"search.return_value": [{"content": "a", "score": 0.3}]}),
+            names[1]: Mock(**{"search.return_value": [{"content": "b", "score": 0.1}]}),
+        }
+        mock_store.side_effect = lambda name, *_, **__: stores[name]
+        mock_embedding.return_value.encode.return_value = [[0.1, 0.2]]
+
+        response = client.post(
+            "/search",
+            json={
+                "query": "payments client",
+                "repos": repos + ["https://github.com/test/c.git"],
+                "top_k": 2,
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [(r["collection"], r["content"]) for r in data["results"]] == [
+            (names[1], "b"),
+            (names[0], "a"),
+        ]
+        assert data["searched"] == names
+        assert data["skipped"] == {stale: "stale"}
+        mock_embedding.return_value.encode.assert_called_once_with("payments client")
+        for store in stores.values():
+            store.search.assert_called_once_with(
+                [0.1, 0.2], top_k=2, metadata_filter=None
+            )
+
+    @patch("repoqa.api.get_vector_store")
+    @patch("repoqa.api.validate_collection")
     @patch("repoqa.api.RepoQA")
-    @patch("repoqa.api.collection_exists_and_has_documents")
+    @patch("repoqa.api.get_llm")
+    def test_vector_store_backend(
+        self, mock_get_llm, mock_repoqa, mock_validate, mock_store, client
+    ):
+        """Test that /ask and /search open the configured backend's store."""
+        from repoqa.api import expected_manifest, vector_store_options
+        from repoqa.config import config
+
+        mock_validate.return_value = {"status": "ok", "mismatches": []}
+        mock_repoqa.return_value.ask.return_value = "answer"
+        mock_store.return_value.search.return_value = []
+
+        with patch.object(
+            type(config), "vectorstore_backend", new_callable=PropertyMock
+        ) as mock_backend, patch("repoqa.api.SentenceTransformerEmbedding"):
+            mock_backend.return_value = "faiss"
+            assert expected_manifest()["vector_store"] == "faiss"
+
+            response = client.post(
+                "/ask", json={"repo": "/tmp/repo", "question": "What?"}
+            )
+            assert response.status_code == 200
+            kwargs = mock_repoqa.call_args.kwargs
+            assert kwargs["vector_store_backend"] == "faiss"
+            assert kwargs["vector_store_options"] == {
+                "index_type": config.faiss_index_type,
+                "hnsw_threshold": config.faiss_hnsw_threshold,
+                "ivfpq_threshold": config.faiss_ivfpq_threshold,
+                "mmap": config.faiss_mmap,
+            }
+
+            response = client.post(
+                "/search", json={"query": "q", "repos": ["/tmp/repo"]}
+            )
+            assert response.status_code == 200
+            args = mock_store.call_args
+            assert args.args[2] == "faiss"
+            assert args.kwargs == kwargs["vector_store_options"]
+
+            mock_backend.return_value = "quantized"
+            with patch.object(
+                type(config), "quantized_quantization", new_callable=PropertyMock
+            ) as mock_quantization:
+                mock_quantization.return_value = "binary"
+                assert vector_store_options() == {
+                    "quantization": "binary",
+                    "rerank_factor": config.quantized_rerank_factor,
+                }
+                assert expected_manifest()["vector_store"] == "quantized:binary"
+
+    @patch("repoqa.api.build_federated_retriever")
+    @patch("repoqa.api.list_collections")
+    def test_search_endpoint_defaults_to_all_collections(
+        self, mock_list, mock_build, client
+    ):
+        """Test that omitting repos searches every collection."""
+        mock_list.return_value = ["one", "two"]
+        mock_build.side_effect = RuntimeError("boom")
+
+        response = client.post("/search", json={"query": "anything"})
+
+        assert response.status_code == 500
+        mock_build.assert_called_once_with(["one", "two"])
+        assert client.post("/search", json={"query": ""}).status_code == 422
+
+    @patch("repoqa.api.SentenceTransformerEmbedding")
+    @patch("repoqa.api.build_federated_retriever")
+    @patch("repoqa.api.list_collections")
+    def test_search_endpoint_runs_off_event_loop(
+        self, mock_list, mock_build, mock_embedding, client
+    ):
+        """Test that /search opens and searches collections in the threadpool."""
+        from repoqa.config import config
+
+        mock_list.side_effect = lambda *_: [on_event_loop()]
+        retriever = Mock(shards=[])
+        retriever.search.side_effect = lambda *_, **__: {
+            "results": [],
+            "failed": {"search": str(on_event_loop())},
+        }
+        mock_build.side_effect = lambda names: (
+            retriever,
+            {"build": str(on_event_loop()), "list": str(names[0])},
+        )
+        mock_embedding.side_effect = lambda **_: Mock(
+            **{"encode.return_value": [[on_event_loop()]]}
+        )
+
+        with patch.object(
+            type(config), "embedding_dispatcher_enabled", new_callable=PropertyMock
+        ) as mock_enabled:
+            mock_enabled.return_value = False
+            response = client.post("/search", json={"query": "anything"})
+
+        assert response.status_code == 200
+        assert response.json()["skipped"] == {
+            "build": "False",
+            "list": "False",
+            "search": "False",
+        }
+        retriever.search.assert_called_once_with([False], k=10, metadata_filter=None)
+
+    @patch("repoqa.api.RepoQA")
+    @patch("repoqa.api.validate_collection")
     @patch("repoqa.api.get_llm")
     def test_ask_endpoint_error_handling(
-        self, mock_get_llm, mock_collection_exists, mock_repoqa, client
+        self, mock_get_llm, mock_validate, mock_repoqa, client
     ):
         """Test ask endpoint error handling."""
-        mock_collection_exists.return_value = False
+        mock_validate.return_value = {"status": "missing", "mismatches": []}
 
         # Mock RepoQA to raise an exception
         mock_repoqa.side_effect = Exception("Test error")
@@ -206,3 +570,98 @@ class TestAPI:
             },
         )
         assert response.status_code == 422
+
+    @patch("repoqa.api.RepoQA")
+    @patch("repoqa.api.validate_collection")
+    @patch("repoqa.api.get_llm")
+    def test_ask_endpoint_scope(self, mock_get_llm, mock_validate, mock_repoqa, client):
+        """Test that scope fields become the pipelines' metadata filter."""
+        mock_validate.return_value = {"status": "ok", "mismatches": []}
+        mock_repoqa.return_value.ask.return_value = "Scoped answer."
+
+        response = client.post(
+            "/ask",
+            json={
+                "repo": "https://github.com/test/repo.git",
+                "question": "How are payments retried?",
+                "directories": ["services"],
+                "languages": ["Python"],
+                "tests": False,
+            },
+        )
+
+        assert response.status_code == 200
+        assert mock_repoqa.call_args.kwargs["metadata_filter"] == {
+            "$and": [
+                {"language": "python"},
+                {"directory": "services"},
+                {"is_test": False},
+            ]
+        }
+
+        # Unscoped questions search everything
+        client.post(
+            "/ask",
+            json={"repo": "https://github.com/test/repo.git", "question": "Why?"},
+        )
+        assert mock_repoqa.call_args.kwargs["metadata_filter"] is None
+
+        # Only top-level directories can be filtered
+        response = client.post(
+            "/ask",
+            json={
+                "repo": "https://github.com/test/repo.git",
+                "question": "Why?",
+                "directories": ["services/payments"],
+            },
+        )
+        assert response.status_code == 500
+        assert "top-level" in response.json()["detail"]
+
+    @patch("repoqa.api.get_shared_dispatcher")
+    @patch("repoqa.api.SentenceTransformerEmbedding")
+    @patch("repoqa.api.build_federated_retriever")
+    def test_search_endpoint_dispatcher(
+        self, mock_build, mock_embedding, mock_get_dispatcher, client
+    ):
+        """Test that search queries can share the embedding dispatcher."""
+        from repoqa.config import config
+
+        retriever = Mock(shards={"one": Mock()})
+        retriever.search.return_value = {"results": [], "failed": {}}
+        mock_build.return_value = (retriever, {})
+        mock_get_dispatcher.return_value.aencode = AsyncMock(return_value=[0.3])
+
+        with patch.object(
+            type(config),
+            "embedding_dispatcher_enabled",
+            new_callable=PropertyMock,
+            return_value=True,
+        ):
+            response = client.post("/search", json={"query": "retry policy"})
+
+        assert response.status_code == 200
+        mock_get_dispatcher.return_value.aencode.assert_awaited_once_with(
+            "retry policy"
+        )
+        mock_embedding.return_value.encode.assert_not_called()
+        assert retriever.search.call_args[0][0] == [0.3]
+
+    @patch("repoqa.api.SentenceTransformerEmbedding")
+    @patch("repoqa.api.build_federated_retriever")
+    def test_search_endpoint_scope(self, mock_build, mock_embedding, client):
+        """Test that searches across repositories accept the same scope."""
+        retriever = Mock(shards={"one": Mock()})
+        retriever.search.return_value = {"results": [], "failed": {}}
+        mock_build.return_value = (retriever, {})
+        mock_embedding.return_value.encode.return_value = [[0.1, 0.2]]
+
+        response = client.post(
+            "/search",
+            json={"query": "retry policy", "repos": ["one"], "extensions": ["go"]},
+        )
+
+        assert response.status_code == 200
+        retriever.search.assert_called_once_with(
+            [0.1, 0.2], k=10, metadata_filter={"extension": ".go"}
+        )
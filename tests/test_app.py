@@ -164,3 +164,153 @@ class TestRepoQA:
 
         assert answer == "This is the answer."
         mock_pipeline.ask.assert_called_once_with("What is this repository about?")
+
+    @patch("repoqa.app.get_collection_manifest")
+    @patch("repoqa.app.RAGPipeline")
+    @patch("repoqa.app.SentenceTransformerEmbedding")
+    @patch("repoqa.app.GitRepoIndexer")
+    def test_ask_with_answer_cache(
+        self,
+        mock_indexer_class,
+        mock_embedding_class,
+        mock_pipeline_class,
+        mock_get_manifest,
+        tmp_path,
+    ):
+        """Test that repeated and similar questions are answered from cache."""
+        from repoqa.app import RepoQA
+        from repoqa.storage.answer_cache import AnswerCache
+
+        mock_pipeline = mock_pipeline_class.return_value
+        mock_pipeline.ask.return_value = "This is the answer."
+        mock_embedding_class.return_value.encode.return_value = [[1.0, 0.0]]
+        mock_get_manifest.return_value = {"commit": "abc123", "complete": True}
+        cache = AnswerCache(str(tmp_path / "answers.sqlite3"))
+
+        repo_qa = RepoQA(
+            llm_model=Mock(),
+            embedding_model="test-model",
+            collection_name="test-collection",
+            collection_chunk_size=1024,
+            ollama_base_url="http://localhost:11434",
+            mode="rag",
+            repo_path="./test_repo",
+            persist_directory=str(tmp_path),
+            temperature=0.5,
+            answer_cache=cache,
+            llm_name="test-llm",
+        )
+
+        assert repo_qa.ask("What is this repository about?") == "This is the answer."
+        assert repo_qa.ask("what is this repository about") == "This is the answer."
+        assert repo_qa.ask("Describe this repository") == "This is the answer."
+        mock_pipeline.ask.assert_called_once()
+        key = ("test-collection", "abc123", "rag", "test-llm")
+        assert cache.lookup(*key, "What is this repository about?")
+
+        # Failures are not cached
+        mock_pipeline.ask.return_value = "Error generating response: timeout"
+        mock_embedding_class.return_value.encode.return_value = [[0.0, 1.0]]
+        repo_qa.ask("How is it tested?")
+        repo_qa.ask("How is it tested?")
+        assert mock_pipeline.ask.call_count == 3
+
+        # Answers that merely start with "Error" are cached
+        mock_pipeline.ask.return_value = "Error handling is done in one place."
+        mock_embedding_class.return_value.encode.return_value = [[0.6, 0.8]]
+        repo_qa.ask("How are errors handled?")
+        repo_qa.ask("How are errors handled?")
+        assert mock_pipeline.ask.call_count == 4
+
+        # Collections without a known commit bypass the cache
+        mock_get_manifest.return_value = {"commit": None, "complete": True}
+        repo_qa.ask("What is this repository about?")
+        assert mock_pipeline.ask.call_count == 5
+
+        # Scoped questions are cached apart from unscoped ones
+        mock_get_manifest.return_value = {"commit": "abc123", "complete": True}
+        mock_pipeline.ask.return_value = "The answer about src."
+        scoped = RepoQA(
+            llm_model=Mock(),
+            embedding_model="test-model",
+            collection_name="test-collection",
+            collection_chunk_size=1024,
+            ollama_base_url="http://localhost:11434",
+            mode="rag",
+            repo_path="./test_repo",
+            persist_directory=str(tmp_path),
+            answer_cache=cache,
+            llm_name="test-llm",
+            metadata_filter={"directory": "src"},
+        )
+        assert mock_pipeline_class.call_args.kwargs["metadata_filter"] == {
+            "directory": "src"
+        }
+        assert scoped.ask("What is this repository about?") == "The answer about src."
+        assert scoped.ask("What is this repository about?") == "The answer about src."
+        assert mock_pipeline.ask.call_count == 6
+
+    @patch("repoqa.app.get_shared_dispatcher")
+    @patch("repoqa.app.RAGPipeline")
+    @patch("repoqa.app.SentenceTransformerEmbedding")
+    @patch("repoqa.app.GitRepoIndexer")
+    def test_embedding_dispatcher(
+        self,
+        mock_indexer_class,
+        mock_embedding_class,
+        mock_pipeline_class,
+        mock_get_dispatcher,
+    ):
+        """Test that the dispatcher settings reach the model and pipeline."""
+        from repoqa.app import RepoQA
+
+        repo_qa = RepoQA(
+            llm_model=Mock(),
+            embedding_model="test-model",
+            collection_name="test-collection",
+            collection_chunk_size=1024,
+            ollama_base_url="http://localhost:11434",
+            mode="rag",
+            repo_path="./test_repo",
+            persist_directory="./chroma_data",
+            embedding_dispatcher=True,
+            dispatcher_max_batch_size=16,
+            dispatcher_max_wait_ms=2,
+        )
+
+        dispatcher = mock_get_dispatcher.return_value
+        mock_get_dispatcher.assert_called_once_with(
+            mock_embedding_class.return_value, 16, 2
+        )
+        assert repo_qa.embedding_model is dispatcher
+        mock_indexer_class.assert_called_once_with(dispatcher, chunk_size=1024)
+        kwargs = mock_pipeline_class.call_args.kwargs
+        assert kwargs["embedding_dispatcher"] is True
+        assert kwargs["dispatcher_max_batch_size"] == 16
+        assert kwargs["dispatcher_max_wait_ms"] == 2
+
+    @patch("repoqa.app.RAGPipeline")
+    @patch("repoqa.app.SentenceTransformerEmbedding")
+    @patch("repoqa.app.GitRepoIndexer")
+    def test_warmup(self, mock_indexer_class, mock_embedding_class, mock_pipeline_class):
+        """Test that warmup loads the shared embedding model."""
+        from repoqa.app import RepoQA
+
+        mock_embedding = Mock()
+        mock_embedding_class.return_value = mock_embedding
+
+        repo_qa = RepoQA(
+            llm_model=Mock(),
+            embedding_model="test-model",
+            collection_name="test-collection",
+            collection_chunk_size=1024,
+            ollama_base_url="http://localhost:11434",
+            mode="rag",
+            repo_path="./test_repo",
+            persist_directory="./chroma_data",
+            temperature=0.5,
+        )
+        repo_qa.warmup()
+
+        mock_embedding.warmup.assert_called_once()
+        mock_indexer_class.assert_called_once_with(mock_embedding, chunk_size=1024)
@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Tests for the storage management CLI."""
+
+import json
+from unittest.mock import patch
+
+from repoqa.cli import main
+
+
+class TestCLI:
+    """Test suite for the CLI."""
+
+    @patch("repoqa.cli.get_storage_usage")
+    def test_storage(self, mock_usage, capsys):
+        """Test that storage usage is printed as JSON."""
+        mock_usage.return_value = {"collections": [], "clones": []}
+
+        main(["--persist-directory", "/db", "--clone-directory", "/c", "storage"])
+
+        mock_usage.assert_called_once_with("/db", "/c")
+        assert json.loads(capsys.readouterr().out) == mock_usage.return_value
+
+    @patch("repoqa.cli.compact_storage")
+    def test_compact(self, mock_compact, capsys):
+        """Test that quotas are converted from MiB to bytes."""
+        mock_compact.return_value = {"evicted_collections": ["a"]}
+
+        main(["--persist-directory", "/db", "compact", "--max-collections-mb", "2"])
+
+        kwargs = mock_compact.call_args[1]
+        assert mock_compact.call_args[0] == ("/db",)
+        assert kwargs["max_collection_bytes"] == 2 * 1024 * 1024
+        assert json.loads(capsys.readouterr().out) == {"evicted_collections": ["a"]}
+
+    @patch("repoqa.cli.export_collection")
+    def test_export(self, mock_export, capsys):
+        """Test exporting a collection to an archive."""
+        mock_export.return_value = {"count": 3}
+
+        main(["--persist-directory", "/db", "export", "repo", "out.tar.gz"])
+
+        mock_export.assert_called_once_with("/db", "repo", "out.tar.gz")
+        assert json.loads(capsys.readouterr().out) == {"count": 3}
+
+    @patch("repoqa.cli.import_collection")
+    def test_import(self, mock_import, capsys):
+        """Test importing an archive under a new name."""
+        mock_import.return_value = {"collection_name": "copy"}
+
+        main(
+            [
+                "--persist-directory",
+                "/db",
+                "import",
+                "in.tar.gz",
+                "--collection",
+                "copy",
+                "--overwrite",
+            ]
+        )
+
+        mock_import.assert_called_once_with(
+            "/db", "in.tar.gz", collection_name="copy", overwrite=True
+        )
@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Afif Al Mamun
+
+"""Startup-time budget tests for the API module."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Measured at ~0.8s with all heavy dependencies installed; the budget leaves
+# headroom for slower CI machines while still catching eager torch imports.
+STARTUP_BUDGET_SECONDS = 3.0
+
+HEAVY_MODULES = [
+    "torch",
+    "sentence_transformers",
+    "transformers",
+    "chromadb",
+    "langchain_chroma",
+    "langchain_huggingface",
+    "langchain_ollama",
+    "langchain.agents",
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import repoqa.api
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": sorted(m for m in %r if m in sys.modules)}))
+"""
+
+
+def _run_probe():
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE % HEAVY_MODULES],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).parent.parent,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def probe():
+    """Import the API once in a fresh interpreter and report the result."""
+    return _run_probe()
+
+
+class TestStartup:
+    """Test suite for import-time behaviour of repoqa.api."""
+
+    def test_heavy_modules_not_imported(self, probe):
+        """Test that importing the API defers heavy ML dependencies."""
+        assert probe["loaded"] == []
+
+    def test_import_within_budget(self, probe):
+        """Test that importing the API stays within the startup budget."""
+        assert probe["elapsed"] < STARTUP_BUDGET_SECONDS